@@ -0,0 +1,94 @@
+"""
+Mock 端到端压测
+
+通过本地 Mock LLM 服务驱动真实的 OpenAIProvider / AnthropicProvider，
+覆盖 SDK 连接池、重试以及响应解析分支。
+
+Usage:
+    PYTHONPATH=src python benchmarks/mock_load_test.py \
+        --provider openai --requests 200 --concurrency 16 \
+        --schedule "ok*8,429,500,slow,malformed"
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from memosyne.lithoformer.infrastructure.schemas import QUESTION_SCHEMA
+from memosyne.reanimator.infrastructure.schemas import TERM_RESULT_SCHEMA
+from memosyne.shared.infrastructure.llm import AnthropicProvider, MockLLMServer, OpenAIProvider
+
+SCHEMAS = {
+    "term": TERM_RESULT_SCHEMA,
+    "quiz": QUESTION_SCHEMA,
+}
+
+
+def build_provider(kind: str, server: MockLLMServer, max_retries: int):
+    if kind == "anthropic":
+        provider = AnthropicProvider(model="claude-mock", api_key="sk-ant-mock", base_url=server.anthropic_base_url)
+        provider.client = provider.client.with_options(max_retries=max_retries, timeout=5.0)
+        return provider
+    provider = OpenAIProvider(
+        model="gpt-mock", api_key="sk-mock", max_retries=max_retries, base_url=server.openai_base_url
+    )
+    provider.client = provider.client.with_options(timeout=5.0)
+    return provider
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock LLM 端到端压测")
+    parser.add_argument("--provider", choices=["openai", "anthropic"], default="openai")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), default="term")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--schedule", default="ok*8,429,500,slow,malformed")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    parser.add_argument("--max-retries", type=int, default=2)
+    args = parser.parse_args()
+
+    schema = SCHEMAS[args.schema]
+
+    with MockLLMServer(
+        schedule=args.schedule, latency=args.latency, slow_delay=args.slow_delay, hang_seconds=6.0
+    ) as server:
+        provider = build_provider(args.provider, server, args.max_retries)
+
+        def call(i: int) -> tuple[bool, float, int]:
+            t0 = time.perf_counter()
+            try:
+                _, tokens = provider.complete_structured(
+                    system_prompt="You are a mock benchmark.",
+                    user_prompt=f"request #{i}",
+                    schema=schema["schema"],
+                    schema_name=schema["name"],
+                )
+                return True, time.perf_counter() - t0, tokens.total_tokens
+            except Exception:  # noqa: BLE001
+                return False, time.perf_counter() - t0, 0
+
+        t_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(call, range(args.requests)))
+        elapsed = time.perf_counter() - t_start
+        server_stats = server.stats
+
+    outcomes = Counter("ok" if ok else "failed" for ok, _, _ in results)
+    latencies = sorted(lat for _, lat, _ in results)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+
+    print(f"[Provider   ] {args.provider} / schema={schema['name']}")
+    print(f"[Requests   ] {args.requests} (concurrency={args.concurrency})")
+    print(f"[Outcomes   ] ok={outcomes['ok']} failed={outcomes['failed']}")
+    print(f"[Throughput ] {args.requests / elapsed:.1f} req/s in {elapsed:.2f}s")
+    print(f"[Latency    ] p50={statistics.median(latencies) * 1000:.0f}ms p95={p95 * 1000:.0f}ms")
+    print(f"[Tokens     ] {sum(t for _, _, t in results)}")
+    print(f"[Server     ] {server_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+存档重新处理基准：列式规则（pandas）vs 逐行 apply_business_rules / get_chinese_tag
+
+把 data/output/archived 的真实存档复制扩充到指定行数（默认 10 万行），
+分别用列式版本与逐行领域函数处理，比较耗时并逐字段核对结果一致。
+
+Usage:
+    PYTHONPATH=src python benchmarks/reprocess_benchmark.py
+    PYTHONPATH=src python benchmarks/reprocess_benchmark.py --rows 500000
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from memosyne.reanimator.domain.models import LLMResponse
+from memosyne.reanimator.domain.services import apply_business_rules, get_chinese_tag
+from memosyne.reanimator.infrastructure.reprocess import (
+    RULE_COLUMNS,
+    apply_business_rules_frame,
+    apply_tag_mapping_frame,
+    diff_frames,
+    load_archives,
+)
+from memosyne.shared.infrastructure.storage import TermListRepo
+
+ROOT = Path(__file__).resolve().parents[1]
+ARCHIVE_DIR = ROOT / "data" / "output" / "archived"
+TERM_LIST = ROOT / "db" / "term_list_v1.csv"
+
+_MEMO_ID = re.compile(r"^M\d{6}$")
+_ENGLISH_TAG = re.compile(r"^[A-Za-z][A-Za-z .&/-]*$")
+
+
+def scalar(frame: pd.DataFrame, mapping: dict[str, str]) -> pd.DataFrame:
+    """逐行调用领域函数（LLM 运行时的处理方式）"""
+    out = frame.copy()
+    columns = {column: out[column].tolist() for column in RULE_COLUMNS}
+    for i, (memo_id, word, en_def) in enumerate(zip(out["memo_id"], out["word"], out["en_def"])):
+        if not _MEMO_ID.match(memo_id.strip()):
+            continue
+        response = LLMResponse.model_construct(
+            pos=columns["pos"][i], ipa=columns["ipa"][i], en_def=en_def, example=columns["example"][i],
+            pp_fix=columns["pp_fix"][i], pp_means=columns["pp_means"][i],
+        )
+        response = apply_business_rules(word.strip(), response)
+        columns["pos"][i], columns["ipa"][i], columns["example"][i] = response.pos, response.ipa, response.example
+        columns["pp_fix"][i], columns["pp_means"][i] = response.pp_fix, response.pp_means
+        tag = columns["tag"][i].strip()
+        if _ENGLISH_TAG.match(tag):
+            columns["tag"][i] = get_chinese_tag(tag, mapping) or columns["tag"][i]
+    for column, values in columns.items():
+        out[column] = values
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="存档重新处理基准（列式 vs 逐行）")
+    parser.add_argument("--rows", type=int, default=100_000, help="扩充后的行数")
+    args = parser.parse_args()
+
+    repo = TermListRepo()
+    repo.load(TERM_LIST)
+    archive = load_archives([ARCHIVE_DIR])
+    base = archive.frame
+    frame = pd.concat([base] * (args.rows // len(base) + 1), ignore_index=True).head(args.rows)
+    print(f"[Input         ] {len(frame):,} rows (from {len(base):,} archived rows in {len(archive.files)} files)")
+
+    started = time.perf_counter()
+    vectorized = apply_tag_mapping_frame(apply_business_rules_frame(frame), repo.mapping)
+    diff = diff_frames(frame, vectorized)
+    columnar = time.perf_counter() - started
+    print(f"[Columnar      ] {columnar:6.2f}s  ({len(diff):,} field changes)")
+
+    started = time.perf_counter()
+    expected = scalar(frame, repo.mapping)
+    per_row = time.perf_counter() - started
+    print(f"[Per-row       ] {per_row:6.2f}s")
+
+    mismatches = {column: int((expected[column] != vectorized[column]).sum()) for column in RULE_COLUMNS}
+    assert not any(mismatches.values()), mismatches
+    print(f"[Equivalent    ] all {len(RULE_COLUMNS)} rule columns match ({per_row / columnar:.1f}× faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+派发顺序基准：文件顺序（FIFO）vs 最长优先（LPT）
+
+模拟模式（默认）：
+    取 data/input/lithoformer 的真实题目块，按 单题耗时 = 固定开销 + 字符数 ÷ 处理速度 估算，
+    分别以 FIFO / LPT 顺序做贪心调度，比较不同并发下的总耗时（makespan）。
+    除逐个文件外，另构造偏斜输入：短题在前、最长的病例题集中在文件末尾。
+
+流水线模式（--pipeline）：
+    用按题目长度休眠的假 LLM 驱动真实的 StagedQuizPipeline（三个阶段、有界队列），
+    测量两种派发顺序的实际墙钟时间，并确认题目序号与原位置一致。
+
+Usage:
+    PYTHONPATH=src python benchmarks/schedule_benchmark.py
+    PYTHONPATH=src python benchmarks/schedule_benchmark.py --workers 2 4 8 --base 1.5 --speed 80
+    PYTHONPATH=src python benchmarks/schedule_benchmark.py --pipeline --concurrency 4 --scale 0.0005
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from memosyne.lithoformer.application import StagedQuizPipeline, StageSpec
+from memosyne.lithoformer.domain.services import block_weight, split_markdown_into_questions
+from memosyne.shared.utils import lpt_order, simulate_makespan
+
+ROOT = Path(__file__).resolve().parents[1]
+QUIZ_DIR = ROOT / "data" / "input" / "lithoformer"
+
+
+def load_runs() -> dict[str, list[dict[str, str]]]:
+    """每个输入文件一次运行"""
+    runs: dict[str, list[dict[str, str]]] = {}
+    for path in sorted(QUIZ_DIR.glob("*.md")):
+        blocks = split_markdown_into_questions(path.read_text(encoding="utf-8"))
+        if blocks:
+            runs[path.name] = blocks
+    return runs
+
+
+def skewed_run(runs: dict[str, list[dict[str, str]]], size: int, heavy: int) -> list[dict[str, str]]:
+    """偏斜输入：size - heavy 道短题在前，最长的 heavy 道病例题在文件末尾"""
+    pool = sorted((block for blocks in runs.values() for block in blocks), key=block_weight)
+    short = pool[: max(0, size - heavy)]
+    return short + pool[-heavy:] if heavy else short
+
+
+def _report(label: str, blocks: list[dict[str, str]], workers: list[int], base: float, speed: float) -> None:
+    durations = [base + block_weight(block) / speed for block in blocks]
+    order = lpt_order([block_weight(block) for block in blocks])
+    cells = []
+    for count in workers:
+        fifo = simulate_makespan(durations, count)
+        lpt = simulate_makespan(durations, count, order)
+        bound = max(sum(durations) / count, max(durations, default=0.0))
+        cells.append(f"×{count}: {fifo:7.1f}s → {lpt:7.1f}s ({1 - lpt / fifo:5.1%}, LB {bound:6.1f}s)")
+    print(f"[{label:<14}] n={len(blocks):<4} " + "  ".join(cells))
+
+
+def run_simulation(workers: list[int], base: float, speed: float, size: int, heavy: int) -> None:
+    runs = load_runs()
+    print(f"[Latency model ] {base}s + chars / {speed} chars/s (LB = max(total / workers, longest item))")
+    for name, blocks in runs.items():
+        _report(name, blocks, workers, base, speed)
+    _report("skewed", skewed_run(runs, size, heavy), workers, base, speed)
+
+
+class SleepingLLM:
+    """按题目长度休眠的假 LLM（满足流水线用到的 LLMPort 方法）"""
+
+    _USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+    def __init__(self, scale: float, base: float):
+        self.scale = scale
+        self.base = base
+
+    def _sleep(self, payload: dict) -> None:
+        text = "".join(str(value) for value in payload.values())
+        time.sleep(self.base + len(text) * self.scale)
+
+    def extract_structure(self, block: dict) -> tuple[dict, dict]:
+        self._sleep(block)
+        return {
+            "qtype": "MCQ",
+            "stem": block.get("question", ""),
+            "options": {"A": "a", "B": "b"},
+            "answer": "A",
+            "steps": [],
+            "cloze_answers": [],
+        }, self._USAGE
+
+    def translate_question(self, payload: dict) -> tuple[dict, dict]:
+        self._sleep(payload)
+        return {
+            "stem_translation": "译",
+            "options_translation": {"A": "甲", "B": "乙"},
+            "steps_translation": [],
+            "cloze_answers_translation": [],
+        }, self._USAGE
+
+    def analyse_question(self, payload: dict) -> tuple[dict, dict]:
+        self._sleep(payload)
+        return {"analysis": {"domain": "领域", "rationale": "理由"}}, self._USAGE
+
+
+def run_pipeline(concurrency: int, scale: float, base: float, size: int, heavy: int) -> None:
+    blocks = skewed_run(load_runs(), size, heavy)
+    llm = SleepingLLM(scale, base)
+    specs = {stage: StageSpec(concurrency=concurrency) for stage in ("structure", "translate", "analyse")}
+    print(f"[Pipeline      ] n={len(blocks)} heavy={heavy} concurrency={concurrency}/stage")
+    timings: dict[str, float] = {}
+    for dispatch in ("fifo", "lpt"):
+        pipeline = StagedQuizPipeline(llm, specs, preparse=False, queue_size=2 * concurrency, dispatch=dispatch)
+        started = time.perf_counter()
+        jobs = list(pipeline.run(blocks))
+        timings[dispatch] = time.perf_counter() - started
+        # 序号绑定原位置：无论派发顺序如何，第 i 题始终是 blocks[i - 1]
+        assert all(job.block is blocks[job.index - 1] for job in jobs)
+        assert sorted(job.index for job in jobs) == list(range(1, len(blocks) + 1))
+        print(f"[{dispatch:<14}] {timings[dispatch]:6.2f}s")
+    print(f"[Improvement   ] {1 - timings['lpt'] / timings['fifo']:.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="派发顺序基准（FIFO vs LPT）")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8], help="模拟的并发数")
+    parser.add_argument("--base", type=float, default=1.5, help="单次调用固定开销（秒）")
+    parser.add_argument("--speed", type=float, default=80.0, help="处理速度（字符 / 秒）")
+    parser.add_argument("--size", type=int, default=60, help="偏斜输入的题目数")
+    parser.add_argument("--heavy", type=int, default=6, help="偏斜输入末尾的长题数")
+    parser.add_argument("--pipeline", action="store_true", help="驱动真实的 StagedQuizPipeline 计时")
+    parser.add_argument("--concurrency", type=int, default=4, help="流水线模式每个阶段的并发数")
+    parser.add_argument("--scale", type=float, default=0.0005, help="流水线模式每个字符的休眠秒数")
+    args = parser.parse_args()
+
+    if args.pipeline:
+        run_pipeline(args.concurrency, args.scale, args.base * args.scale * args.speed, args.size, args.heavy)
+    else:
+        run_simulation(args.workers, args.base, args.speed, args.size, args.heavy)
+
+
+if __name__ == "__main__":
+    main()
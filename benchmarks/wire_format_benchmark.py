@@ -0,0 +1,213 @@
+"""
+结构化输出线上格式基准：verbose vs compact
+
+离线模式（默认）：
+    取真实样本（data/output/archived 的术语 CSV、data/input/lithoformer 的题目块），
+    分别编码为 verbose / compact JSON，统计补全 Token 并校验解码后的往返一致性。
+    题目的翻译与解析在两种格式中内容相同，按英文长度生成等长占位，只比较结构开销。
+
+在线模式（--live）：
+    用同一批样本分别以两种格式调用真实 Provider（或指向 Mock 服务的 *_BASE_URL），
+    按 Provider 返回的 usage 汇总补全 Token。
+
+Usage:
+    PYTHONPATH=src python benchmarks/wire_format_benchmark.py
+    PYTHONPATH=src python benchmarks/wire_format_benchmark.py --live --provider openai --model gpt-4o-mini --samples 10
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from pathlib import Path
+
+from memosyne.lithoformer.domain.models import QuizItem
+from memosyne.lithoformer.domain.preparse import preparse_block
+from memosyne.lithoformer.domain.services import split_markdown_into_questions
+from memosyne.lithoformer.infrastructure.schemas import decode_question_compact, encode_question_compact
+from memosyne.reanimator.domain.models import LLMResponse
+from memosyne.reanimator.infrastructure.schemas import decode_term_compact, encode_term_compact
+
+ROOT = Path(__file__).resolve().parents[1]
+TERM_DIR = ROOT / "data" / "output" / "archived"
+QUIZ_DIR = ROOT / "data" / "input" / "lithoformer"
+
+
+def _token_counter():
+    """优先使用 tiktoken（o200k_base）；未安装时按 ASCII 4 字符 / 非 ASCII 1 字符估算"""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken/o200k_base"
+    except ImportError:
+        def estimate(text: str) -> int:
+            ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+            return max(1, ascii_chars // 4 + (len(text) - ascii_chars))
+
+        return estimate, "estimate (ascii/4 + non-ascii)"
+
+
+def load_term_payloads(limit: int) -> list[dict]:
+    """从归档 CSV 还原 LLM 返回字段（TermResult，跳过不符合当前校验规则的旧数据）"""
+    payloads: list[dict] = []
+    for path in sorted(TERM_DIR.glob("*.csv")):
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                if not row.get("EnDef") or not row.get("Example"):
+                    continue
+                payload = {
+                    "IPA": row.get("IPA", ""),
+                    "POS": row.get("POS", ""),
+                    "Rarity": row.get("Rarity", ""),
+                    "EnDef": row["EnDef"],
+                    "Example": row["Example"],
+                    "PPfix": row.get("PPfix", ""),
+                    "PPmeans": row.get("PPmeans", ""),
+                    "TagEN": "",
+                }
+                try:
+                    LLMResponse.model_validate(payload)
+                except ValueError:
+                    continue
+                payloads.append(payload)
+                if len(payloads) >= limit:
+                    return payloads
+    return payloads
+
+
+def _zh(text: str) -> str:
+    """按英文长度生成中文占位（中文译文约为英文字符数的 1/3）"""
+    return "译" * max(1, len(text) // 3) if text else ""
+
+
+def load_quiz_payloads(limit: int) -> tuple[list[dict], list[dict]]:
+    """从输入 Markdown 的可预解析题目块构造 (QuizQuestion, QuizEnrichment) 样本"""
+    full: list[dict] = []
+    blocks: list[dict] = []
+    for path in sorted(QUIZ_DIR.glob("*.md")):
+        for block in split_markdown_into_questions(path.read_text(encoding="utf-8")):
+            parsed = preparse_block(block)
+            if parsed is None:
+                continue
+            item = parsed.to_dict()
+            wrong = [letter for letter, text in item["options"].items() if text and letter != item["answer"]]
+            item.update({
+                "stem_translation": _zh(item["stem"]),
+                "steps_translation": [_zh(step) for step in item["steps"]],
+                "options_translation": {letter: _zh(text) for letter, text in item["options"].items()},
+                "cloze_answers_translation": [_zh(text) for text in item["cloze_answers"]],
+                "analysis": {
+                    "domain": "临床心理",
+                    "rationale": "译" * 80,
+                    "key_points": ["译" * 40] * 3,
+                    "distractors": [{"option": letter, "reason": "译" * 30} for letter in wrong],
+                },
+            })
+            full.append(item)
+            blocks.append(block)
+            if len(full) >= limit:
+                return full, blocks
+    return full, blocks
+
+
+def _enrichment(item: dict) -> dict:
+    keys = ("stem_translation", "steps_translation", "options_translation", "cloze_answers_translation", "analysis")
+    return {key: item[key] for key in keys}
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _report(label: str, verbose_tokens: int, compact_tokens: int, count: int) -> None:
+    saved = verbose_tokens - compact_tokens
+    ratio = saved / verbose_tokens if verbose_tokens else 0.0
+    print(
+        f"[{label:<16}] n={count:<5} verbose={verbose_tokens:>9,}  compact={compact_tokens:>9,}  "
+        f"saved={saved:>8,} ({ratio:.1%})  per-call {verbose_tokens / max(count, 1):.0f}→{compact_tokens / max(count, 1):.0f}"
+    )
+
+
+def run_offline(samples: int) -> None:
+    count_tokens, method = _token_counter()
+    print(f"[Tokenizer       ] {method}")
+
+    terms = load_term_payloads(samples)
+    verbose = compact = 0
+    for payload in terms:
+        encoded = encode_term_compact(payload)
+        # 往返一致性：解码后必须通过同一 Pydantic 校验
+        assert LLMResponse.model_validate(decode_term_compact(encoded)) == LLMResponse.model_validate(payload)
+        verbose += count_tokens(_dumps(payload))
+        compact += count_tokens(_dumps(encoded))
+    _report("TermResult", verbose, compact, len(terms))
+
+    questions, _ = load_quiz_payloads(samples)
+    verbose = compact = enrich_verbose = enrich_compact = 0
+    for item in questions:
+        encoded = encode_question_compact(item)
+        assert QuizItem.model_validate(decode_question_compact(encoded)) == QuizItem.model_validate(item)
+        verbose += count_tokens(_dumps(item))
+        compact += count_tokens(_dumps(encoded))
+        enrichment = _enrichment(item)
+        enrich_verbose += count_tokens(_dumps(enrichment))
+        enrich_compact += count_tokens(_dumps(encode_question_compact(enrichment)))
+    _report("QuizQuestion", verbose, compact, len(questions))
+    _report("QuizEnrichment", enrich_verbose, enrich_compact, len(questions))
+
+
+def run_live(provider_name: str, model: str, samples: int) -> None:
+    from memosyne.lithoformer.infrastructure import LithoformerLLMAdapter
+    from memosyne.reanimator.infrastructure import ReanimatorLLMAdapter
+    from memosyne.shared.config import get_settings
+    from memosyne.shared.infrastructure.llm import create_provider
+
+    settings = get_settings()
+    provider = create_provider(provider_name, model, settings)
+
+    words: list[tuple[str, str]] = []
+    for path in sorted(TERM_DIR.glob("*.csv")):
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            words.extend((row["Word"], row["ZhDef"]) for row in csv.DictReader(f) if row.get("Word"))
+        if len(words) >= samples:
+            break
+    words = words[:samples]
+    _, blocks = load_quiz_payloads(samples)
+
+    totals: dict[str, dict[str, int]] = {}
+    for wire_format in ("verbose", "compact"):
+        term_adapter = ReanimatorLLMAdapter.from_provider(provider, wire_format=wire_format)
+        quiz_adapter = LithoformerLLMAdapter.from_provider(provider, wire_format=wire_format)
+        term_tokens = quiz_tokens = 0
+        for word, zh_def in words:
+            response, usage = term_adapter.process_term(word, zh_def)
+            LLMResponse.model_validate(response)
+            term_tokens += usage["completion_tokens"]
+        for index, block in enumerate(blocks, start=1):
+            response, usage = quiz_adapter.parse_question({**block, "index": index})
+            QuizItem.model_validate(response)
+            quiz_tokens += usage["completion_tokens"]
+        totals[wire_format] = {"term": term_tokens, "quiz": quiz_tokens}
+
+    print(f"[Provider        ] {provider_name} / {model}")
+    _report("TermResult", totals["verbose"]["term"], totals["compact"]["term"], len(words))
+    _report("QuizQuestion", totals["verbose"]["quiz"], totals["compact"]["quiz"], len(blocks))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="结构化输出线上格式基准（verbose vs compact）")
+    parser.add_argument("--samples", type=int, default=500, help="每类样本数量上限")
+    parser.add_argument("--live", action="store_true", help="调用真实 Provider，按 usage 统计补全 Token")
+    parser.add_argument("--provider", choices=["openai", "anthropic"], default="openai")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    args = parser.parse_args()
+
+    if args.live:
+        run_live(args.provider, args.model, args.samples)
+    else:
+        run_offline(args.samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,17 @@ Quick Start:
     ...     model="gpt-4o-mini"
     ... )
     >>> print(f"Token 使用: {result['token_usage']}")
+    >>>
+    >>> # 运行前估算（不调用 LLM）
+    >>> plan = plan_lithoform("quiz.md", model="gpt-4o-mini")
+    >>> print(f"预计成本: {plan['cost']}")
 """
 
 __version__ = "0.9.0"
 __author__ = "Memosyne Team"
 
 # 导出主要 API
-from .api import reanimate, lithoform
+from .api import reanimate, lithoform, plan_reanimate, plan_lithoform
 
 # 向后兼容别名
 process_terms = reanimate  # v2.0 之前的名称
@@ -35,6 +39,8 @@ parse_quiz = lithoform     # v2.0 之前的名称
 __all__ = [
     "reanimate",
     "lithoform",
+    "plan_reanimate",
+    "plan_lithoform",
     "process_terms",  # backward compatibility
     "parse_quiz",     # backward compatibility
     "__version__",
@@ -19,17 +19,27 @@ Example:
     ...     model="gpt-4o-mini"
     ... )
 """
+import logging
+import sqlite3
 from pathlib import Path
 from typing import Literal
 
 # Shared 层导入（DDD: Shared Kernel / Infrastructure）
 from .shared.config import get_settings
-from .shared.infrastructure.llm import OpenAIProvider, AnthropicProvider
+from .shared.infrastructure.llm import (
+    backend_usage,
+    create_provider,
+    hedge_stats,
+    hedge_unreported_usage,
+    key_usage,
+)
 from .shared.utils import (
     BatchIDGenerator,
     unique_path,
     get_code_from_model,
     generate_output_filename,
+    configure_tracing,
+    MetricsExporter,
 )
 
 # 子域导入（DDD: Bounded Contexts）
@@ -38,55 +48,95 @@ from .reanimator.infrastructure import (
     ReanimatorLLMAdapter,
     CSVTermAdapter,
     TermListAdapter,
+    build_escalation_adapter,
+    build_fallback_adapter,
+    plan_terms,
 )
-from .lithoformer.application import ParseQuizUseCase
+from .lithoformer.application import ParseQuizUseCase, QuizRebuilder
 from .lithoformer.infrastructure import (
     LithoformerLLMAdapter,
     FileAdapter,
     FormatterAdapter,
+    ManifestStore,
+    SidecarHeader,
+    build_records,
+    records_from_manifest,
+    sidecar_path,
+    write_sidecar,
+    build_escalation_adapter as build_quiz_escalation_adapter,
+    build_stage_specs,
+    plan_quiz,
+    quiz_generator,
+)
+
+# 分析存储（storage 包依赖子域模型，需在子域之后导入）
+from .shared.infrastructure.storage import (
+    check_columnar_format,
+    export_quiz_items,
+    open_memo_store,
+    open_run_recorder,
+    open_translation_memory,
 )
 from .lithoformer.domain.services import (
     infer_titles_from_markdown,
     infer_titles_from_filename,
     infer_question_seed,
+    split_markdown_into_questions,
 )
 
 
 def reanimate(
     input_csv: str | Path,
-    start_memo_index: int,
+    start_memo_index: int | None = None,
     output_csv: str | Path | None = None,
     model: str = "gpt-4o-mini",
     provider: Literal["openai", "anthropic"] = "openai",
     batch_note: str = "",
     temperature: float | None = None,
     show_progress: bool = True,
+    wire_format: Literal["verbose", "compact"] | None = None,
 ) -> dict:
     """
     处理术语列表（Reanimator Pipeline - 术语处理）
 
     Args:
         input_csv: 输入 CSV 文件路径（包含 word, zh_def 列）
-        start_memo_index: 起始 Memo 编号（如 221 表示从 M000222 开始）
+        start_memo_index: 起始 Memo 编号（如 221 表示从 M000222 开始；
+            None 时从 db/mmsdb 的计数器原子预留连续区间，中止时自动归还）
         output_csv: 输出 CSV 文件路径（默认自动生成到 data/output/reanimator/）
         model: 模型 ID（默认 gpt-4o-mini）
         provider: LLM 提供商（openai 或 anthropic）
         batch_note: 批次备注
         temperature: 温度参数（None 使用模型默认值）
         show_progress: 是否显示进度条
+        wire_format: 结构化输出线上格式（None 使用 LLM_WIRE_FORMAT；compact 减少补全 Token）
 
     Returns:
         字典，包含：
         - success: bool - 是否成功
         - output_path: str - 输出文件路径
         - batch_id: str - 批次 ID
-        - processed_count: int - 处理的术语数量
+        - processed_count: int - 成功处理的术语数量（部分失败时小于 total_count）
+        - total_count: int - 输入术语数量
+        - rejected_count: int - 重试后仍失败的术语数量
+        - rejects_path: str | None - 失败术语文件（Word,ZhDef,Reason,Attempts）
+        - start_memo_index: int - 实际使用的起始 Memo 编号
         - results: list[TermOutput] - 处理结果列表
+        - token_usage: dict - Token 使用统计（含字段级修复）
+        - repair: dict - 字段级修复统计（repaired / repair_calls / repair_*_tokens）
+        - llm_retries: int - Provider 层重试次数（429 / 5xx / 超时）
+        - hedging: dict | None - 对冲请求统计（未启用时为 None；wasted_* 为败者消耗的 Token，已计入 token_usage）
+        - backends: dict | None - 按后端的调用 / 失败 / Token 用量（未启用负载均衡时为 None）
+        - api_keys: dict | None - 按 API Key（脱敏）的调用 / 失败 / 隔离次数（未配置 Key 池时为 None）
+        - cascade: dict | None - 模型级联路由（escalated*）与分层用量（tier_<fast|strong|retry>_*；未配置 CASCADE_MODEL 时为 None）
+        - plan: dict - 运行前估算（Token / 成本 / 耗时 / 推荐并发，见 plan_reanimate），可与 token_usage 对照
+        - trace_path: str | None - 分阶段 trace 文件（配置 TRACE_PATH 时）
+        - run_id: str | None - 历史分析记录 ID（ANALYTICS_ENABLED 时）
 
     Raises:
         FileNotFoundError: 输入文件不存在
         ValueError: 参数错误
-        LLMError: LLM 调用失败
+        LLMError: LLM Provider 初始化失败（单个术语失败不抛出，见 rejected_count / rejects_path）
 
     Example:
         >>> result = reanimate(
@@ -100,6 +150,7 @@ def reanimate(
     """
     settings = get_settings()
     settings.ensure_dirs()
+    tracer = configure_tracing(enabled=settings.trace_path is not None)
 
     # 1. 解析输入路径
     input_path = Path(input_csv)
@@ -109,8 +160,9 @@ def reanimate(
         raise FileNotFoundError(f"输入文件不存在: {input_path}")
 
     # 2. 读取输入术语（使用新的 Infrastructure Adapter）
-    csv_adapter = CSVTermAdapter.create()
-    term_inputs = csv_adapter.read_input(input_path)
+    csv_adapter = CSVTermAdapter.from_settings(settings)
+    with tracer.span("read", path=input_path.name):
+        term_inputs = csv_adapter.read_input(input_path)
     if not term_inputs:
         raise ValueError(f"输入文件为空或格式错误: {input_path}")
 
@@ -120,42 +172,69 @@ def reanimate(
         timezone=settings.batch_timezone
     )
     batch_id = batch_gen.generate(term_count=len(term_inputs))
+    plan = plan_terms(settings, term_inputs, model, wire_format=wire_format)
 
     # 4. 创建 LLM Provider
-    if provider == "openai":
-        llm_provider = OpenAIProvider(
-            model=model,
-            api_key=settings.openai_api_key,
-            temperature=temperature if temperature is not None else settings.default_temperature
-        )
-    elif provider == "anthropic":
-        if not settings.anthropic_api_key:
-            raise ValueError("Anthropic API Key 未配置")
-        llm_provider = AnthropicProvider(
-            model=model,
-            api_key=settings.anthropic_api_key,
-            temperature=temperature if temperature is not None else settings.default_temperature
-        )
-    else:
-        raise ValueError(f"不支持的 provider: {provider}")
+    llm_provider = create_provider(provider, model, settings, temperature=temperature)
 
     # 5. 创建 Infrastructure Adapters（依赖注入）
-    llm_adapter = ReanimatorLLMAdapter.from_provider(llm_provider)
+    llm_adapter = ReanimatorLLMAdapter.from_provider(
+        llm_provider, wire_format=wire_format or settings.llm_wire_format
+    )
     term_list_adapter = TermListAdapter.from_settings(settings)
-
-    # 6. 创建 Use Case（Application 层）
-    use_case = ProcessTermsUseCase(
-        llm=llm_adapter,
-        term_list=term_list_adapter,
-        start_memo_index=start_memo_index,
-        batch_id=batch_id,
-        batch_note=batch_note,
+    recorder = open_run_recorder(
+        settings, pipeline="reanimator", provider=provider, model=model,
+        batch_id=batch_id, input_name=input_path.name,
     )
 
-    # 7. 执行 Use Case
-    process_result = use_case.execute(term_inputs, show_progress=show_progress)
+    fallback_llm = build_fallback_adapter(settings, llm_adapter)
+    escalation_llm = build_escalation_adapter(settings, llm_adapter)
+
+    # 6. 分配 Memo 区间（未指定起点时原子预留；此后任何异常都归还区间）
+    reservation = None
+    if start_memo_index is None:
+        memo_store = csv_adapter.memo_store
+        if memo_store is None:
+            raise ValueError("未指定 start_memo_index，且 Memo 记录库未启用（MEMO_STORE_ENABLED）")
+        reservation = memo_store.reserve_memo_range(len(term_inputs), batch_id=batch_id)
+        start_memo_index = reservation.start_index
+
+    process_result = None
+    try:
+        # 7. 创建 Use Case（Application 层）
+        use_case = ProcessTermsUseCase(
+            llm=llm_adapter,
+            term_list=term_list_adapter,
+            start_memo_index=start_memo_index,
+            batch_id=batch_id,
+            batch_note=batch_note,
+            recorder=recorder,
+            repair_rounds=settings.llm_repair_rounds,
+            retry_rounds=settings.reanimator_retry_rounds,
+            retry_backoff=settings.reanimator_retry_backoff,
+            fallback_llm=fallback_llm,
+            escalation_llm=escalation_llm,
+            require_tag=settings.cascade_require_tag,
+            min_definition_words=settings.cascade_min_definition_words,
+        )
 
-    # 8. 确定输出路径（使用智能命名）
+        # 8. 执行 Use Case（配置 METRICS_PORT / METRICS_SNAPSHOT_PATH 时同时导出指标）
+        with MetricsExporter.from_settings(settings):
+            try:
+                process_result = use_case.execute(term_inputs, show_progress=show_progress)
+                # 对冲败者在胜者返回后才完成的 Token 补入总计
+                process_result.token_usage = process_result.token_usage + hedge_unreported_usage(llm_provider)
+            finally:
+                if recorder:
+                    recorder.flush()
+    finally:
+        if reservation:
+            # 中止时整体归还，成功时归还未用尾部
+            reservation.commit(len(process_result.items) if process_result else 0)
+    if recorder:
+        recorder.close()
+
+    # 9. 确定输出路径（使用智能命名）
     if output_csv is None:
         # 获取模型代码
         try:
@@ -176,21 +255,44 @@ def reanimate(
         if not output_path.is_absolute():
             output_path = settings.reanimator_output_dir / output_path
 
-    # 9. 写出结果（使用 Infrastructure Adapter）
-    csv_adapter.write_output(output_path, process_result.items)
+    # 10. 写出结果（使用 Infrastructure Adapter）
+    with tracer.span("write", path=output_path.name, rows=len(process_result.items)):
+        csv_adapter.write_output(output_path, process_result.items)
+
+    # 11. 重试后仍失败的术语写入 rejects 文件（Word,ZhDef 列可直接重新处理）
+    rejects_path = None
+    if process_result.failures:
+        rejects_path = output_path.with_name(f"{output_path.stem}.rejects.csv")
+        csv_adapter.write_rejects(rejects_path, process_result.failures)
+
+    trace_path = tracer.export(settings.trace_path) if settings.trace_path else None
 
     return {
         "success": True,
         "output_path": str(output_path),
         "batch_id": batch_id,
         "processed_count": process_result.success_count,
+        "start_memo_index": start_memo_index,
         "total_count": process_result.total_count,
+        "rejected_count": len(process_result.failures),
+        "rejects_path": str(rejects_path) if rejects_path else None,
         "results": process_result.items,
         "token_usage": {
             "prompt_tokens": process_result.token_usage.prompt_tokens,
             "completion_tokens": process_result.token_usage.completion_tokens,
             "total_tokens": process_result.token_usage.total_tokens,
         },
+        "repair": {key: value for key, value in process_result.stats.items() if key.startswith("repair")},
+        "llm_retries": process_result.stats.get("llm_retries", 0),
+        "hedging": hedge_stats(llm_provider),
+        "backends": backend_usage(llm_provider),
+        "api_keys": key_usage(llm_provider),
+        "cascade": {
+            key: value for key, value in process_result.stats.items() if key.startswith(("escalated", "tier_"))
+        } or None,
+        "plan": plan.to_dict(),
+        "trace_path": str(trace_path) if trace_path else None,
+        "run_id": recorder.run_id if recorder else None,
     }
 
 
@@ -203,6 +305,9 @@ def lithoform(
     title_sub: str | None = None,
     temperature: float | None = None,
     show_progress: bool = True,
+    wire_format: Literal["verbose", "compact"] | None = None,
+    staged: bool | None = None,
+    incremental: bool | None = None,
 ) -> dict:
     """
     解析 Quiz Markdown 文档（Lithoformer - Quiz 解析）
@@ -216,19 +321,41 @@ def lithoform(
         title_sub: 副标题（None 则自动从文件名推断）
         temperature: 温度参数（None 使用模型默认值）
         show_progress: 是否显示进度条
+        wire_format: 结构化输出线上格式（None 使用 LLM_WIRE_FORMAT；compact 减少补全 Token）
+        staged: 结构 / 翻译 / 解析分阶段流水线（None 使用 LITHOFORMER_STAGED；
+            各阶段模型与并发见 LITHOFORMER_<STAGE>_MODEL / _CONCURRENCY）
+        incremental: 增量重建（None 使用 LITHOFORMER_INCREMENTAL，默认关闭；同一输入以相同模型 /
+            提供商 / 线上格式再次运行时只处理新增 / 改动的题目，未改动题目沿用 L 编号，
+            清单见 LITHOFORMER_MANIFEST_DIR）
 
     Returns:
         字典，包含：
         - success: bool - 是否成功
         - output_path: str - 输出文件路径
         - item_count: int - 解析的题目数量
+        - preparsed_count: int - 本地预解析的题目数量（LLM 只补充翻译与解析）
         - title_main: str - 主标题
         - title_sub: str - 副标题
-        - token_usage: dict - Token 使用统计
+        - token_usage: dict - Token 使用统计（含字段级修复）
+        - repair: dict - 字段级修复统计（repaired / repair_calls / repair_*_tokens）
+        - minimize: dict | None - 输入精简统计（minimized 题数 / minimized_tokens_saved 约省提示词 Token / pictures 图片占位数）
+        - llm_retries: int - Provider 层重试次数（429 / 5xx / 超时）
+        - hedging: dict | None - 对冲请求统计（未启用时为 None；wasted_* 为败者消耗的 Token，已计入 token_usage）
+        - backends: dict | None - 按后端的调用 / 失败 / Token 用量（未启用负载均衡时为 None）
+        - api_keys: dict | None - 按 API Key（脱敏）的调用 / 失败 / 隔离次数（未配置 Key 池时为 None）
+        - cascade: dict | None - 模型级联路由（escalated*）与分层用量（tier_<fast|strong>_*；未配置 CASCADE_MODEL 时为 None）
+        - plan: dict - 运行前估算（Token / 成本 / 耗时 / 推荐并发，见 plan_lithoform；增量重建时只计需处理的题目），
+          可与 token_usage 对照
+        - sidecar_path: str | None - 结构化旁路文件（LITHOFORMER_SIDECAR 时；见 cli.rerender）
+        - columnar_path: str | None - 列式副本（COLUMNAR_FORMAT 不为 off 时）
+        - rebuild: dict | None - 增量重建统计（reused 沿用 / changed 改动 / added 新增 / removed 删除；未启用时为 None）
+        - trace_path: str | None - 分阶段 trace 文件（配置 TRACE_PATH 时）
+        - run_id: str | None - 历史分析记录 ID（ANALYTICS_ENABLED 时）
 
     Raises:
         FileNotFoundError: 输入文件不存在
         ValueError: 参数错误
+        ImportError: COLUMNAR_FORMAT=parquet 但未安装 pyarrow（调用 LLM 之前检查）
         LLMError: LLM 调用失败
 
     Example:
@@ -241,6 +368,8 @@ def lithoform(
     """
     settings = get_settings()
     settings.ensure_dirs()
+    check_columnar_format(settings.columnar_format)
+    tracer = configure_tracing(enabled=settings.trace_path is not None)
 
     # 1. 解析输入路径
     input_path = Path(input_md)
@@ -251,7 +380,8 @@ def lithoform(
 
     # 2. 读取 Markdown（使用新的 Infrastructure Adapter）
     file_adapter = FileAdapter.create()
-    md_text = file_adapter.read_markdown(input_path)
+    with tracer.span("read", path=input_path.name):
+        md_text = file_adapter.read_markdown(input_path)
 
     # 3. 推断标题（如果未提供）
     if title_main is None or title_sub is None:
@@ -267,31 +397,62 @@ def lithoform(
             title_sub = title_sub or inferred_sub
 
     # 4. 创建 LLM Provider
-    if provider == "openai":
-        llm_provider = OpenAIProvider(
-            model=model,
-            api_key=settings.openai_api_key,
-            temperature=temperature if temperature is not None else settings.default_temperature
-        )
-    elif provider == "anthropic":
-        if not settings.anthropic_api_key:
-            raise ValueError("Anthropic API Key 未配置")
-        llm_provider = AnthropicProvider(
-            model=model,
-            api_key=settings.anthropic_api_key,
-            temperature=temperature if temperature is not None else settings.default_temperature
-        )
-    else:
-        raise ValueError(f"不支持的 provider: {provider}")
+    llm_provider = create_provider(provider, model, settings, temperature=temperature)
+    use_staged = settings.lithoformer_staged if staged is None else staged
+    wire_format = wire_format or settings.llm_wire_format
 
     # 5. 创建 Infrastructure Adapters（依赖注入）
-    llm_adapter = LithoformerLLMAdapter.from_provider(llm_provider)
+    llm_adapter = LithoformerLLMAdapter.from_provider(llm_provider, wire_format=wire_format)
+    recorder = open_run_recorder(
+        settings, pipeline="lithoformer", provider=provider, model=model, input_name=input_path.name,
+    )
 
     # 6. 创建 Use Case（Application 层）
-    use_case = ParseQuizUseCase(llm=llm_adapter)
+    use_case = ParseQuizUseCase(
+        llm=llm_adapter,
+        recorder=recorder,
+        preparse=settings.lithoformer_preparse,
+        stages=build_stage_specs(settings, llm_adapter) if use_staged else None,
+        queue_size=settings.lithoformer_stage_queue_size,
+        dispatch=settings.lithoformer_dispatch,
+        minimize=settings.lithoformer_minimize,
+        translation_memory=open_translation_memory(settings),
+        repair_rounds=settings.llm_repair_rounds,
+        escalation_llm=build_quiz_escalation_adapter(settings, llm_adapter),
+        min_rationale_chars=settings.cascade_min_rationale_chars,
+    )
 
-    # 7. 执行 Use Case
-    process_result = use_case.execute(md_text, show_progress=show_progress)
+    # 7. 执行 Use Case（配置 METRICS_PORT / METRICS_SNAPSHOT_PATH 时同时导出指标）
+    formatter_adapter = FormatterAdapter.create()
+    question_seed = infer_question_seed(input_path)
+    use_incremental = settings.lithoformer_incremental if incremental is None else incremental
+    rebuilder = (
+        QuizRebuilder(use_case, formatter_adapter, ManifestStore.from_settings(settings))
+        if use_incremental else None
+    )
+    blocks = split_markdown_into_questions(md_text)
+    if rebuilder:
+        pending = rebuilder.prepare(
+            md_text,
+            source=str(input_path.resolve()),
+            generator=quiz_generator(model, provider, wire_format),
+            question_start=question_seed,
+        ).pending
+        blocks = [blocks[position - 1] for position in pending]
+    plan = plan_quiz(settings, blocks, model, wire_format=wire_format, staged=use_staged)
+    with MetricsExporter.from_settings(settings):
+        try:
+            if rebuilder:
+                process_result = rebuilder.execute(md_text, show_progress=show_progress)
+            else:
+                process_result = use_case.execute(md_text, show_progress=show_progress)
+            # 对冲败者在胜者返回后才完成的 Token 补入总计
+            process_result.token_usage = process_result.token_usage + hedge_unreported_usage(llm_provider)
+        finally:
+            if recorder:
+                recorder.flush()
+            if use_case.translation_memory:
+                use_case.translation_memory.close()
 
     # 8. 生成 BatchID（基于题目数量）
     batch_gen = BatchIDGenerator(
@@ -299,16 +460,23 @@ def lithoform(
         timezone=settings.batch_timezone
     )
     batch_id = batch_gen.generate(term_count=process_result.success_count)
-
-    # 9. 格式化输出（使用 Infrastructure Adapter）
-    formatter_adapter = FormatterAdapter.create()
-    out_text = formatter_adapter.format(
-        process_result.items,
-        title_main,
-        title_sub,
-        batch_code=batch_id,
-        question_start=infer_question_seed(input_path),
-    )
+    if recorder:
+        recorder.close(batch_id)
+
+    # 9. 格式化输出（使用 Infrastructure Adapter；增量重建时拼接未改动题目的上次输出）
+    with tracer.span("format", items=len(process_result.items)):
+        if rebuilder:
+            out_text, question_codes = rebuilder.render(process_result, title_main, title_sub, batch_code=batch_id)
+        else:
+            out_text = formatter_adapter.format(
+                process_result.items,
+                title_main,
+                title_sub,
+                batch_code=batch_id,
+                question_start=question_seed,
+                pictures=use_case.pictures,
+            )
+            question_codes = formatter_adapter.question_codes(process_result.items, question_start=question_seed)
 
     # 10. 确定输出路径（使用智能命名）
     if output_txt is None:
@@ -331,15 +499,46 @@ def lithoform(
         if not output_path.is_absolute():
             output_path = settings.lithoformer_output_dir / output_path
 
-    # 11. 写出结果（使用 Infrastructure Adapter）
-    file_adapter.write_text(output_path, out_text)
+    # 11. 写出结果（使用 Infrastructure Adapter；旁写结构化 .items.jsonl 供离线重新渲染，可选列式副本）
+    with tracer.span("write", path=output_path.name, chars=len(out_text)):
+        file_adapter.write_text(output_path, out_text)
+    records = (
+        records_from_manifest(rebuilder.manifest, batch_id=batch_id)
+        if rebuilder
+        else build_records(question_codes, batch_id=batch_id, pictures=use_case.pictures, model=model)
+    )
+    sidecar = None
+    if settings.lithoformer_sidecar:
+        sidecar = write_sidecar(
+            sidecar_path(output_path),
+            SidecarHeader(
+                title_main=title_main, title_sub=title_sub, batch_id=batch_id, source=input_path.name, model=model,
+            ),
+            records,
+        )
+    columnar = export_quiz_items(
+        output_path, [(record.code, record.batch, record.item) for record in records], fmt=settings.columnar_format
+    )
+
+    # 12. 登记题目到生成记录库（db/mmsdb；增量重建时只登记新编号）
+    memo_store = open_memo_store(settings)
+    if memo_store:
+        try:
+            memo_store.add_quiz_items(question_codes, batch_id=batch_id, source=output_path.name)
+        except sqlite3.Error as exc:
+            logging.getLogger(__name__).warning("生成记录库写入失败（%s），已跳过：%s", memo_store.path, exc)
+
+    trace_path = tracer.export(settings.trace_path) if settings.trace_path else None
 
     return {
         "success": True,
         "output_path": str(output_path),
+        "sidecar_path": str(sidecar) if sidecar else None,
+        "columnar_path": str(columnar) if columnar else None,
         "batch_id": batch_id,
         "item_count": process_result.success_count,
         "total_count": process_result.total_count,
+        "preparsed_count": process_result.stats.get("preparsed", 0),
         "title_main": title_main,
         "title_sub": title_sub,
         "token_usage": {
@@ -347,11 +546,87 @@ def lithoform(
             "completion_tokens": process_result.token_usage.completion_tokens,
             "total_tokens": process_result.token_usage.total_tokens,
         },
+        "repair": {key: value for key, value in process_result.stats.items() if key.startswith("repair")},
+        "minimize": use_case.minimize_stats or None,
+        "llm_retries": process_result.stats.get("llm_retries", 0),
+        "hedging": hedge_stats(llm_provider),
+        "backends": backend_usage(llm_provider),
+        "api_keys": key_usage(llm_provider),
+        "cascade": {
+            key: value for key, value in process_result.stats.items() if key.startswith(("escalated", "tier_"))
+        } or None,
+        "plan": plan.to_dict(),
+        "rebuild": {
+            key: process_result.stats.get(key, 0) for key in ("reused", "changed", "added", "removed")
+        } if rebuilder else None,
+        "trace_path": str(trace_path) if trace_path else None,
+        "run_id": recorder.run_id if recorder else None,
     }
 
 
+def plan_reanimate(
+    input_csv: str | Path,
+    model: str = "gpt-4o-mini",
+    wire_format: Literal["verbose", "compact"] | None = None,
+    concurrency: int = 1,
+) -> dict:
+    """
+    运行前估算术语处理（不调用 LLM）
+
+    按实际提示词近似每个术语的 Token，用分析库历史（ANALYTICS_ENABLED）校准，
+    结合价格表与 LLM_KEY_RPM / LLM_KEY_TPM 估算成本、耗时与推荐并发。
+
+    Returns:
+        RunPlan.to_dict()：items / calls / prompt_tokens / completion_tokens / total_tokens /
+        cost（美元，未知模型为 None）/ duration（秒）/ concurrency / recommended_concurrency /
+        rpm / tpm / calibration（model / pipeline / none）/ samples
+
+    Example:
+        >>> plan = plan_reanimate("221.csv", model="gpt-4o-mini")
+        >>> print(f"预计 ${plan['cost']:.2f}，约 {plan['duration'] / 60:.0f} 分钟")
+    """
+    settings = get_settings()
+    input_path = Path(input_csv)
+    if not input_path.is_absolute():
+        input_path = settings.reanimator_input_dir / input_path
+    if not input_path.exists():
+        raise FileNotFoundError(f"输入文件不存在: {input_path}")
+    term_inputs = CSVTermAdapter.from_settings(settings).read_input(input_path)
+    return plan_terms(settings, term_inputs, model, wire_format=wire_format, concurrency=concurrency).to_dict()
+
+
+def plan_lithoform(
+    input_md: str | Path,
+    model: str = "gpt-4o-mini",
+    wire_format: Literal["verbose", "compact"] | None = None,
+    staged: bool | None = None,
+    concurrency: int | None = None,
+) -> dict:
+    """
+    运行前估算 Quiz 解析（不调用 LLM）
+
+    与 lithoform 的调用路径一致（本地预解析 / 分阶段模式会改变请求数与提示词长度），
+    其余同 plan_reanimate。concurrency 为 None 时取 1（分阶段模式取最窄阶段的并发）。
+
+    Example:
+        >>> plan = plan_lithoform("chapter3.md", staged=True)
+        >>> plan["recommended_concurrency"]
+    """
+    settings = get_settings()
+    input_path = Path(input_md)
+    if not input_path.is_absolute():
+        input_path = settings.lithoformer_input_dir / input_path
+    if not input_path.exists():
+        raise FileNotFoundError(f"输入文件不存在: {input_path}")
+    blocks = split_markdown_into_questions(FileAdapter.create().read_markdown(input_path))
+    return plan_quiz(
+        settings, blocks, model, wire_format=wire_format, staged=staged, concurrency=concurrency
+    ).to_dict()
+
 
 __all__ = [
     "reanimate",
     "lithoform",
+    "plan_reanimate",
+    "plan_lithoform",
 ]
@@ -5,22 +5,27 @@ from .interfaces import (
     BaseLLMProvider,
     TermListRepository,
     CSVRepository,
+    RunRecorder,
     MemosymeError,
     LLMError,
     ConfigError,
     ValidationError,
 )
-from .models import TokenUsage, ProcessResult
+from .models import TokenUsage, ProcessResult, CallRecord, ItemFailure, TierUsage
 
 __all__ = [
     "LLMProvider",
     "BaseLLMProvider",
     "TermListRepository",
     "CSVRepository",
+    "RunRecorder",
     "MemosymeError",
     "LLMError",
     "ConfigError",
     "ValidationError",
     "TokenUsage",
     "ProcessResult",
+    "CallRecord",
+    "ItemFailure",
+    "TierUsage",
 ]
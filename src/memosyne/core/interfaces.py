@@ -11,7 +11,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Protocol, runtime_checkable, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from .models import TokenUsage
+    from .models import CallRecord, TokenUsage
 
 
 # ============================================================
@@ -126,6 +126,14 @@ class CSVRepository(Protocol):
         ...
 
 
+class RunRecorder(Protocol):
+    """运行记录器协议（逐次 LLM 调用的历史分析记录）"""
+
+    def record(self, record: "CallRecord") -> None:
+        """追加一条调用记录"""
+        ...
+
+
 # ============================================================
 # 自定义异常
 # ============================================================
@@ -135,8 +143,27 @@ class MemosymeError(Exception):
 
 
 class LLMError(MemosymeError):
-    """LLM 调用异常"""
-    pass
+    """
+    LLM 调用异常
+
+    Attributes:
+        status_code: HTTP 状态码（无响应时为 None）
+        retry_after: 服务端要求的等待秒数（Retry-After）
+        transient: 是否为可重试的暂时性错误（429 / 5xx / 超时 / 连接中断）
+    """
+
+    def __init__(
+        self,
+        message: str = "",
+        *,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+        transient: bool = False,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.transient = transient
 
 
 class ConfigError(MemosymeError):
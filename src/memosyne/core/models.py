@@ -3,7 +3,7 @@ Core Models - 核心共享数据模型
 
 包含跨域共享的基础模型，如 Token 使用统计等
 """
-from typing import TypeVar, Generic
+from typing import Generic, Literal, TypeVar
 from pydantic import BaseModel, Field
 
 
@@ -18,11 +18,13 @@ class TokenUsage(BaseModel):
         prompt_tokens: 提示词 Token 数
         completion_tokens: 补全 Token 数
         total_tokens: 总 Token 数
+        cached_tokens: 命中提示词缓存的 Token 数（包含在 prompt_tokens 中）
     """
 
     prompt_tokens: int = Field(default=0, ge=0)
     completion_tokens: int = Field(default=0, ge=0)
     total_tokens: int = Field(default=0, ge=0)
+    cached_tokens: int = Field(default=0, ge=0)
 
     def __add__(self, other: "TokenUsage") -> "TokenUsage":
         """支持 TokenUsage 相加"""
@@ -32,12 +34,70 @@ class TokenUsage(BaseModel):
             prompt_tokens=self.prompt_tokens + other.prompt_tokens,
             completion_tokens=self.completion_tokens + other.completion_tokens,
             total_tokens=self.total_tokens + other.total_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
         )
 
     def __repr__(self) -> str:
         return f"TokenUsage(prompt={self.prompt_tokens}, completion={self.completion_tokens}, total={self.total_tokens})"
 
 
+class TierUsage(BaseModel):
+    """
+    模型级联中单个层级的累计用量
+
+    Attributes:
+        calls: 该层级处理的条目数
+        tokens: Token 消耗（含修复请求）
+        latency: 累计耗时（秒）
+    """
+
+    calls: int = Field(default=0, ge=0)
+    tokens: TokenUsage = Field(default_factory=TokenUsage)
+    latency: float = Field(default=0.0, ge=0)
+
+    def __add__(self, other: "TierUsage") -> "TierUsage":
+        """支持 TierUsage 相加（合并同一层级的用量）"""
+        if not isinstance(other, TierUsage):
+            raise TypeError(f"Cannot add TierUsage with {type(other)}")
+        return TierUsage(
+            calls=self.calls + other.calls,
+            tokens=self.tokens + other.tokens,
+            latency=self.latency + other.latency,
+        )
+
+    def add(self, tokens: TokenUsage, latency: float) -> "TierUsage":
+        """累加一次处理，返回新的 TierUsage"""
+        return self + TierUsage(calls=1, tokens=tokens, latency=latency)
+
+    def to_stats(self, tier: str) -> dict[str, int]:
+        """展开为 ProcessResult.stats 键（tier_<层级>_*，耗时为毫秒）"""
+        return {
+            f"tier_{tier}_calls": self.calls,
+            f"tier_{tier}_prompt_tokens": self.tokens.prompt_tokens,
+            f"tier_{tier}_completion_tokens": self.tokens.completion_tokens,
+            f"tier_{tier}_latency_ms": round(self.latency * 1000),
+        }
+
+
+class ItemFailure(BaseModel):
+    """
+    最终失败的条目（重试后仍失败，写入 rejects 文件）
+
+    Attributes:
+        index: 条目序号（输入顺序，从 0 开始）
+        key: 条目标识（如词条）
+        reason: 最后一次失败的原因
+        attempts: 尝试次数（含重试）
+        fields: 原始输入字段（便于修正后重新处理）
+    """
+
+    index: int = Field(..., ge=0)
+    key: str
+    reason: str
+    attempts: int = Field(default=1, ge=1)
+    fields: dict[str, str] = Field(default_factory=dict)
+
+
 class ProcessResult(BaseModel, Generic[T]):
     """
     处理结果容器（泛型）
@@ -46,15 +106,77 @@ class ProcessResult(BaseModel, Generic[T]):
     - 成功处理的项目列表
     - 成功/失败计数
     - Token 使用统计
+    - 流水线自定义计数（stats，如本地预解析题数）
+    - 最终失败的条目（failures，部分成功时 success_count < total_count）
+    - 成功项目在输入中的序号（positions，与 items 一一对应；流水线未提供时为空）
     """
 
     items: list[T] = Field(default_factory=list)
+    positions: list[int] = Field(default_factory=list)
     success_count: int = Field(default=0, ge=0)
     total_count: int = Field(default=0, ge=0)
     token_usage: TokenUsage = Field(default_factory=TokenUsage)
+    stats: dict[str, int] = Field(default_factory=dict)
+    failures: list["ItemFailure"] = Field(default_factory=list)
 
     def __repr__(self) -> str:
         return f"ProcessResult(success={self.success_count}/{self.total_count}, tokens={self.token_usage})"
 
 
-__all__ = ["TokenUsage", "ProcessResult"]
+class CallRecord(BaseModel):
+    """
+    单次 LLM 调用记录（用于历史分析）
+
+    运行级字段（pipeline / provider / batch_id）由 RunRecorder 补全，
+    用例只需提供条目级信息；model 为空时同样取运行的模型。
+
+    Attributes:
+        index: 条目序号
+        model: 实际响应的模型（级联强模型、重试备用模型与运行的模型不同）
+        tier: 级联层级（fast / strong / retry）
+        latency: 调用耗时（秒）
+        prompt_tokens / completion_tokens / cached_tokens: Token 统计
+        retries: SDK 内部重试次数
+        outcome: success=有效, invalid=未通过校验, error=调用或解析失败
+        error: 失败原因
+    """
+
+    index: int = Field(ge=0)
+    latency: float = Field(default=0.0, ge=0)
+    prompt_tokens: int = Field(default=0, ge=0)
+    completion_tokens: int = Field(default=0, ge=0)
+    cached_tokens: int = Field(default=0, ge=0)
+    retries: int = Field(default=0, ge=0)
+    outcome: Literal["success", "invalid", "error"] = "success"
+    error: str | None = None
+    model: str | None = None
+    tier: str | None = None
+
+    @classmethod
+    def from_usage(
+        cls,
+        index: int,
+        latency: float,
+        usage: TokenUsage,
+        *,
+        retries: int = 0,
+        outcome: Literal["success", "invalid", "error"] = "success",
+        error: str | None = None,
+        model: str | None = None,
+        tier: str | None = None,
+    ) -> "CallRecord":
+        return cls(
+            index=index,
+            latency=latency,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_tokens=usage.cached_tokens,
+            retries=retries,
+            outcome=outcome,
+            error=error,
+            model=model,
+            tier=tier,
+        )
+
+
+__all__ = ["TokenUsage", "ProcessResult", "CallRecord"]
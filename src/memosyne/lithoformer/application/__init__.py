@@ -1,11 +1,19 @@
 """Lithoformer Application Layer"""
-from .ports import LLMPort, FileRepositoryPort, FormatterPort
+from .ports import LLMPort, FileRepositoryPort, FormatterPort, ManifestPort, TranslationMemoryPort
+from .pipeline import STAGES, StagedQuizPipeline, StageSpec
 from .use_cases import ParseQuizUseCase, QuizProcessingEvent
+from .rebuild import QuizRebuilder
 
 __all__ = [
     "LLMPort",
     "FileRepositoryPort",
     "FormatterPort",
+    "ManifestPort",
+    "TranslationMemoryPort",
     "ParseQuizUseCase",
     "QuizProcessingEvent",
+    "QuizRebuilder",
+    "STAGES",
+    "StageSpec",
+    "StagedQuizPipeline",
 ]
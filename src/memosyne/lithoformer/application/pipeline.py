@@ -0,0 +1,386 @@
+"""
+Lithoformer Application - Staged Pipeline
+
+分阶段流水线：结构 → 翻译 → 解析
+
+- 每个阶段有独立的 LLM（可用不同模型）、Schema 与并发数
+- 阶段之间以有界队列连接：第 N 题做解析时，第 N+1 题已在做结构提取；
+  下游处理不过来时上游自然阻塞（背压），内存占用有上限
+- 阶段失败（调用异常或阶段输出未通过检查）只重跑该阶段，不重跑前序阶段
+- 结构阶段优先使用本地预解析（domain.preparse），成功时不调用 LLM
+- 翻译阶段先查翻译记忆，已知的选项 / 步骤片段提示模型留空，合并时再补全
+- 默认按预测成本最长优先（LPT）派发：长病例题先进入流水线，短题填补空隙，
+  避免文件末尾的长题独自拉长总耗时；题目序号始终绑定原位置
+
+完成顺序与输入顺序可能不同，调用方按 index 归位（见 ParseQuizUseCase）。
+"""
+from __future__ import annotations
+
+import queue
+import re
+import threading
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Iterator, Literal, Mapping
+
+from ..domain.preparse import preparse_block
+from ..domain.services import block_weight
+from ..domain.translation_memory import known_slots, lookup_keys
+from .ports import LLMPort, TranslationMemoryPort
+from ...core.models import TokenUsage
+from ...shared.utils import get_tracer, lpt_order, pop_call_model, pop_call_retries
+
+Stage = Literal["structure", "translate", "analyse"]
+StageStatus = Literal["pending", "running", "retrying", "done", "local", "failed", "skipped"]
+Dispatch = Literal["lpt", "fifo"]
+
+STAGES: tuple[Stage, ...] = ("structure", "translate", "analyse")
+
+# 阶段状态回调：(题目序号, 阶段, 状态)，在工作线程中调用
+StageCallback = Callable[[int, str, str], None]
+
+_POLL_SECONDS = 0.1
+
+
+@dataclass(slots=True)
+class StageSpec:
+    """
+    单个阶段的配置
+
+    Attributes:
+        llm: 本阶段使用的 LLM（None 使用用例的默认 llm）
+        concurrency: 本阶段的工作线程数
+        retries: 本阶段失败后的重跑次数（只重跑本阶段）
+    """
+
+    llm: LLMPort | None = None
+    concurrency: int = 1
+    retries: int = 1
+
+
+@dataclass(slots=True)
+class StageCall:
+    """单个阶段的 LLM 调用汇总（含本阶段重跑；model 为实际响应的模型）"""
+
+    stage: str
+    model: str | None = None
+    tokens: TokenUsage = field(default_factory=TokenUsage)
+    latency: float = 0.0
+    retries: int = 0
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class StagedJob:
+    """流水线中的单题状态（同一时刻只被一个阶段持有）"""
+
+    index: int
+    block: dict[str, str]
+    started: float = field(default_factory=perf_counter)
+    structure: dict | None = None
+    translation: dict = field(default_factory=dict)
+    analysis: dict = field(default_factory=dict)
+    stages: dict[str, str] = field(default_factory=lambda: dict.fromkeys(STAGES, "pending"))
+    tokens: TokenUsage = field(default_factory=TokenUsage)
+    llm_latency: float = 0.0
+    retries: int = 0
+    error: str | None = None
+    preparsed: bool = False
+    memory: dict[str, str] = field(default_factory=dict)
+    calls: list[StageCall] = field(default_factory=list)  # 各阶段的调用（本地预解析的阶段不计）
+
+    def merged(self) -> dict:
+        """合并三个阶段的输出（结构字段优先）"""
+        return {**self.translation, **self.analysis, **(self.structure or {})}
+
+
+class StagedQuizPipeline:
+    """
+    分阶段流水线执行器
+
+    Example:
+        >>> pipeline = StagedQuizPipeline(adapter, {"analyse": StageSpec(llm=big_model, concurrency=4)})
+        >>> for job in pipeline.run(blocks):
+        ...     print(job.index, job.stages)
+    """
+
+    def __init__(
+        self,
+        llm: LLMPort,
+        stages: Mapping[str, StageSpec] | None = None,
+        *,
+        preparse: bool = True,
+        queue_size: int = 8,
+        on_stage: StageCallback | None = None,
+        translation_memory: TranslationMemoryPort | None = None,
+        dispatch: Dispatch = "lpt",
+        cost: Callable[[dict[str, str]], float] = block_weight,
+    ):
+        """
+        Args:
+            llm: 默认 LLM（未单独配置的阶段使用）
+            stages: 各阶段配置（缺省的阶段使用 StageSpec() 默认值）
+            preparse: 结构阶段是否优先使用本地预解析
+            queue_size: 阶段间队列容量
+            on_stage: 阶段状态变化回调（如 TUI 逐行刷新）
+            translation_memory: 片段翻译记忆（翻译阶段预填）
+            dispatch: 派发顺序（lpt：预测成本降序；fifo：文件顺序）
+            cost: 题目块的预测成本（默认按字符数）
+        """
+        stages = stages or {}
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"未知的流水线阶段: {', '.join(sorted(unknown))}")
+        self.specs: dict[str, StageSpec] = {}
+        for stage in STAGES:
+            spec = stages.get(stage) or StageSpec()
+            self.specs[stage] = StageSpec(
+                llm=spec.llm or llm,
+                concurrency=max(1, spec.concurrency),
+                retries=max(0, spec.retries),
+            )
+        self.preparse = preparse
+        self.queue_size = max(1, queue_size)
+        self.on_stage = on_stage
+        self.translation_memory = translation_memory
+        self.dispatch = dispatch
+        self.cost = cost
+        self._stop = threading.Event()
+
+    def run(self, blocks: list[dict[str, str]], *, indices: list[int] | None = None) -> Iterator[StagedJob]:
+        """
+        执行流水线，按完成顺序产出 StagedJob
+
+        indices 为各题目块的题号（默认 1..n；增量重建时只传入部分题目）。
+        提前关闭生成器时会停止所有工作线程。
+        """
+        self._stop.clear()
+        inboxes: list[queue.Queue] = [queue.Queue(maxsize=self.queue_size) for _ in STAGES]
+        results: queue.Queue = queue.Queue()
+
+        threads: list[threading.Thread] = [
+            threading.Thread(target=self._feed, args=(blocks, indices, inboxes[0]), name="lithoformer-feed", daemon=True)
+        ]
+        for position, stage in enumerate(STAGES):
+            outbox = inboxes[position + 1] if position + 1 < len(STAGES) else results
+            for n in range(self.specs[stage].concurrency):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, inboxes[position], outbox, results),
+                    name=f"lithoformer-{stage}-{n}",
+                    daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+
+        try:
+            for _ in range(len(blocks)):
+                yield results.get()
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    # ------------------------------------------------------------------
+    # 工作线程
+    # ------------------------------------------------------------------
+    def dispatch_order(self, blocks: list[dict[str, str]]) -> list[int]:
+        """派发顺序（blocks 下标）"""
+        if self.dispatch == "lpt":
+            return lpt_order([self.cost(block) for block in blocks])
+        return list(range(len(blocks)))
+
+    def _feed(self, blocks: list[dict[str, str]], indices: list[int] | None, inbox: queue.Queue) -> None:
+        for position in self.dispatch_order(blocks):
+            index = indices[position] if indices is not None else position + 1
+            if not self._put(inbox, StagedJob(index=index, block=blocks[position])):
+                return
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue, results: queue.Queue) -> None:
+        while not self._stop.is_set():
+            try:
+                job: StagedJob = inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            try:
+                self._run_stage(stage, job)
+            except Exception as exc:  # 回调等意外异常也不能让工作线程退出
+                job.error = job.error or f"{stage}: {exc}"
+                job.stages[stage] = "failed"
+            # 失败的题目跳过后续阶段，直接交给结果队列
+            self._put(outbox if job.error is None else results, job)
+
+    def _put(self, target: queue.Queue, item: StagedJob) -> bool:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _set_status(self, job: StagedJob, stage: str, status: StageStatus) -> None:
+        job.stages[stage] = status
+        if self.on_stage is not None:
+            self.on_stage(job.index, stage, status)
+
+    def _run_stage(self, stage: Stage, job: StagedJob) -> None:
+        spec = self.specs[stage]
+        tracer = get_tracer()
+
+        with tracer.span(f"stage.{stage}", index=job.index) as span:
+            if stage == "structure" and self.preparse:
+                preparsed = preparse_block(job.block)
+                if preparsed is not None:
+                    job.structure = preparsed.to_dict()
+                    job.preparsed = True
+                    span.set(local=True)
+                    self._set_status(job, stage, "local")
+                    return
+
+            if stage == "translate":
+                job.memory = recall_translations(self.translation_memory, job.structure or {})
+
+            self._set_status(job, stage, "running")
+            call = StageCall(stage)
+            job.calls.append(call)
+            attempts = 0
+            while True:
+                attempts += 1
+                started = perf_counter()
+                try:
+                    output, token_dict = self._call(stage, spec.llm, job)
+                    call.tokens = call.tokens + TokenUsage(**token_dict)
+                    problem = _STAGE_CHECKS[stage](job, output)
+                except Exception as exc:  # 捕获 LLMError 和其它异常
+                    output, problem = None, str(exc) or type(exc).__name__
+                call.retries += pop_call_retries()
+                call.model = pop_call_model() or call.model
+                call.latency += perf_counter() - started
+
+                if problem is None:
+                    self._finish_call(job, call)
+                    self._store(stage, job, output)
+                    span.set(attempts=attempts)
+                    self._set_status(job, stage, "done")
+                    return
+                if attempts > spec.retries:
+                    break
+                self._set_status(job, stage, "retrying")
+
+            span.set(attempts=attempts, error=problem)
+            call.error = problem
+            self._finish_call(job, call)
+            job.error = f"{stage}: {problem}"
+            self._set_status(job, stage, "failed")
+            for later in STAGES[STAGES.index(stage) + 1:]:
+                self._set_status(job, later, "skipped")
+
+    @staticmethod
+    def _finish_call(job: StagedJob, call: StageCall) -> None:
+        job.tokens = job.tokens + call.tokens
+        job.retries += call.retries
+        job.llm_latency += call.latency
+
+    @staticmethod
+    def _call(stage: Stage, llm: LLMPort, job: StagedJob) -> tuple[dict, dict]:
+        context = job.block.get("context", "")
+        structure = job.structure or {}
+        if stage == "structure":
+            return llm.extract_structure({
+                "context": context,
+                "question": job.block.get("question", ""),
+                "answer": job.block.get("answer", ""),
+                "index": str(job.index),
+            })
+        payload = {**structure, "context": context, "index": str(job.index)}
+        if stage == "translate":
+            known = known_slots(structure, job.memory)
+            if known:
+                payload["known_translations"] = known
+            return llm.translate_question(payload)
+        return llm.analyse_question(payload)
+
+    @staticmethod
+    def _store(stage: Stage, job: StagedJob, output: dict) -> None:
+        if stage == "structure":
+            job.structure = output
+        elif stage == "translate":
+            job.translation = output
+        else:
+            job.analysis = output
+
+
+def recall_translations(memory: TranslationMemoryPort | None, data: dict) -> dict[str, str]:
+    """查询题目片段的翻译记忆（记忆不可用时按无记忆处理，不影响解析）"""
+    if memory is None:
+        return {}
+    keys = lookup_keys(data)
+    if not keys:
+        return {}
+    try:
+        return memory.lookup(keys)
+    except Exception:
+        return {}
+
+
+# ============================================================
+# 阶段输出检查（不通过则只重跑该阶段）
+# ============================================================
+def _check_structure(job: StagedJob, output: dict) -> str | None:
+    qtype = (output.get("qtype") or "").strip().upper()
+    answer = (output.get("answer") or "").strip().upper()
+    if not (output.get("stem") or "").strip():
+        return "题干为空"
+    if qtype == "MCQ":
+        if not any((text or "").strip() for text in (output.get("options") or {}).values()):
+            return "MCQ 缺少选项"
+        if not re.search(r"[A-F]", answer):
+            return "MCQ 答案不是 A-F 字母"
+    elif qtype == "ORDER":
+        if not output.get("steps"):
+            return "ORDER 缺少步骤"
+        if not re.fullmatch(r"[A-F](\s*,\s*[A-F])*", answer):
+            return "ORDER 答案不是逗号分隔的字母序列"
+    elif qtype == "CLOZE":
+        if not output.get("cloze_answers"):
+            return "CLOZE 缺少填空答案"
+    else:
+        return f"未知题型：{qtype or '（空）'}"
+    return None
+
+
+def _check_translation(job: StagedJob, output: dict) -> str | None:
+    structure = job.structure or {}
+    if not (output.get("stem_translation") or "").strip():
+        return "缺少题干翻译"
+    if len(output.get("steps_translation") or []) != len(structure.get("steps") or []):
+        return "步骤翻译数量与步骤不一致"
+    if len(output.get("cloze_answers_translation") or []) != len(structure.get("cloze_answers") or []):
+        return "填空翻译数量与答案不一致"
+    options = structure.get("options") or {}
+    translations = output.get("options_translation") or {}
+    known = known_slots(structure, job.memory)
+    missing = [
+        key for key, text in options.items()
+        if (text or "").strip() and key not in known and not (translations.get(key) or "").strip()
+    ]
+    if missing:
+        return f"缺少选项翻译：{''.join(missing)}"
+    return None
+
+
+def _check_analysis(job: StagedJob, output: dict) -> str | None:
+    analysis = output.get("analysis")
+    if not isinstance(analysis, dict):
+        return "缺少解析"
+    if not (analysis.get("domain") or "").strip() or not (analysis.get("rationale") or "").strip():
+        return "解析缺少领域或理由"
+    return None
+
+
+_STAGE_CHECKS: dict[str, Callable[[StagedJob, dict], str | None]] = {
+    "structure": _check_structure,
+    "translate": _check_translation,
+    "analyse": _check_analysis,
+}
@@ -1,9 +1,10 @@
 """
 Lithoformer Application Ports - Port interfaces (Dependency Inversion)
 """
-from typing import Protocol, runtime_checkable
+from typing import Iterable, Protocol, runtime_checkable
 from pathlib import Path
 
+from ..domain.manifest import QuizManifest
 from ..domain.models import QuizItem
 
 
@@ -26,6 +27,91 @@ class LLMPort(Protocol):
         """
         ...
 
+    def enrich_question(self, payload: dict) -> tuple[dict, dict]:
+        """
+        Add translations and analysis to a locally pre-parsed question
+
+        Args:
+            payload: PreparsedQuestion fields plus context/index
+
+        Returns:
+            (enrichment_dict, token_usage_dict) - translation fields and analysis only
+
+        Raises:
+            LLMError: LLM call failed
+        """
+        ...
+
+    def extract_structure(self, payload: dict[str, str]) -> tuple[dict, dict]:
+        """
+        Staged pipeline: extract qtype/stem/options/steps/answer only
+
+        Args:
+            payload: Dict containing context/question/answer texts
+
+        Returns:
+            (structure_dict, token_usage_dict)
+        """
+        ...
+
+    def translate_question(self, payload: dict) -> tuple[dict, dict]:
+        """
+        Staged pipeline: translate an already structured question
+
+        Args:
+            payload: Structure fields plus context/index
+
+        Returns:
+            (translation_dict, token_usage_dict)
+        """
+        ...
+
+    def analyse_question(self, payload: dict) -> tuple[dict, dict]:
+        """
+        Staged pipeline: analyse an already structured question
+
+        Args:
+            payload: Structure fields plus context/index
+
+        Returns:
+            ({"analysis": ...}, token_usage_dict)
+        """
+        ...
+
+    def repair_question(self, payload: dict, problems: dict[str, str]) -> tuple[dict, dict]:
+        """
+        Field-level repair: regenerate only the fields that failed validation
+
+        Args:
+            payload: Original block (context/question/answer/index) plus "current" item dict
+            problems: {field name: validation error}
+
+        Returns:
+            (fixes_dict, token_usage_dict) - only the requested fields
+        """
+        ...
+
+
+@runtime_checkable
+class TranslationMemoryPort(Protocol):
+    """Segment translation memory (implemented by Infrastructure)"""
+
+    def lookup(self, keys: Iterable[str]) -> dict[str, str]:
+        """
+        Look up normalized English segments
+
+        Args:
+            keys: Normalized segments (see domain.translation_memory.normalize_segment)
+
+        Returns:
+            {segment: Simplified Chinese translation} for known segments only
+        """
+        ...
+
+    def remember(self, pairs: Iterable[tuple[str, str]]) -> int:
+        """Store (normalized segment, translation) pairs harvested from validated items"""
+        ...
+
 
 @runtime_checkable
 class FileRepositoryPort(Protocol):
@@ -52,3 +138,34 @@ class FormatterPort(Protocol):
     ) -> str:
         """Format quiz items to output text"""
         ...
+
+    def question_codes(
+        self,
+        items: list[QuizItem],
+        *,
+        question_start: int | None = None,
+        question_prefix: str = "L",
+    ) -> list[tuple[str, QuizItem]]:
+        """Question codes (L-codes) matching the formatted output"""
+        ...
+
+    def render(self, item: QuizItem, title_main: str, title_sub: str = "") -> str | None:
+        """Render one question without batch / question code (None for answer-summary pseudo items)"""
+        ...
+
+    def stamp(self, body: str, *, batch_code: str = "", code: str = "") -> str:
+        """Append the batch code and question code to a rendered question"""
+        ...
+
+
+@runtime_checkable
+class ManifestPort(Protocol):
+    """Incremental rebuild manifest storage (implemented by Infrastructure)"""
+
+    def load(self, source: str) -> QuizManifest | None:
+        """Manifest of the previous run for this input (None if absent or unreadable)"""
+        ...
+
+    def save(self, manifest: QuizManifest) -> None:
+        """Persist the manifest of the current run"""
+        ...
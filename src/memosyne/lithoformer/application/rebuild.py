@@ -0,0 +1,180 @@
+"""
+Lithoformer Application - Incremental rebuild
+
+QuizRebuilder 包装 ParseQuizUseCase：同一输入文件再次运行时，
+只把新增 / 改动的题目块发给 LLM（见 domain.manifest），
+未改动的题目沿用上次的 QuizItem 与 L 编号，输出按题序拼接上次的文本（批次号换成本次的）。
+模型、提供商、线上格式或提示词版本变化时全部重做（见 QuizGenerator）。
+"""
+from ..domain.manifest import (
+    ManifestEntry,
+    QuizGenerator,
+    QuizManifest,
+    RebuildPlan,
+    block_fingerprint,
+    plan_rebuild,
+)
+from ..domain.minimize import restore_pictures
+from ..domain.models import QuizItem
+from ..domain.services import split_markdown_into_questions
+from .ports import FormatterPort, ManifestPort
+from .use_cases import ParseQuizUseCase
+from ...core.models import ProcessResult
+from ...shared.utils import get_tracer
+
+
+class QuizRebuilder:
+    """
+    增量重建
+
+    Example:
+        >>> rebuilder = QuizRebuilder(use_case, FormatterAdapter.create(), ManifestStore.from_settings(settings))
+        >>> plan = rebuilder.prepare(markdown, source=str(input_path), generator=generator, question_start=seed)
+        >>> result = rebuilder.execute(markdown)  # 只处理 plan.pending
+        >>> text, fresh = rebuilder.render(result, title_main, title_sub, batch_code=batch_id)
+    """
+
+    def __init__(self, use_case: ParseQuizUseCase, formatter: FormatterPort, manifests: ManifestPort):
+        self.use_case = use_case
+        self.formatter = formatter
+        self.manifests = manifests
+        self.plan = RebuildPlan()
+        self.manifest: QuizManifest | None = None  # render() 保存的新清单
+        self._manifest: QuizManifest | None = None
+        self._source = ""
+        self._generator: QuizGenerator | None = None
+        self._fingerprints: list[str] = []
+        self._question_start = 0
+        self._question_prefix = "L"
+
+    def prepare(
+        self,
+        markdown: str,
+        *,
+        source: str,
+        generator: QuizGenerator,
+        question_start: int = 0,
+        question_prefix: str = "L",
+    ) -> RebuildPlan:
+        """比对清单，得出重建计划（不调用 LLM；plan.pending 即本次需要处理的题目）"""
+        blocks = split_markdown_into_questions(markdown)
+        self._source = source
+        self._generator = generator
+        self._question_start = question_start
+        self._question_prefix = question_prefix
+        self._fingerprints = [block_fingerprint(block) for block in blocks]
+        self._manifest = self.manifests.load(source)
+        with get_tracer().span("rebuild.plan", blocks=len(blocks)) as span:
+            self.plan = plan_rebuild(
+                self._manifest,
+                self._fingerprints,
+                question_start=question_start,
+                question_prefix=question_prefix,
+                generator=generator,
+            )
+            span.set(reused=len(self.plan.reuse), pending=len(self.plan.pending), removed=self.plan.removed)
+        return self.plan
+
+    def execute(self, markdown: str, *, show_progress: bool = True) -> ProcessResult[QuizItem]:
+        """
+        按 prepare() 的计划执行解析（只调用 LLM 处理改动的题目）
+
+        stats 额外包含 reused / changed / added / removed。
+        """
+        result = self.use_case.execute(
+            markdown,
+            show_progress=show_progress,
+            reuse={position: entry.item for position, entry in self.plan.reuse.items() if entry.item is not None},
+        )
+        result.stats.update(changed=self.plan.changed, added=len(self.plan.added), removed=self.plan.removed)
+        return result
+
+    def render(
+        self,
+        result: ProcessResult[QuizItem],
+        title_main: str,
+        title_sub: str = "",
+        *,
+        batch_code: str = "",
+    ) -> tuple[str, list[tuple[str, QuizItem]]]:
+        """
+        拼接输出并保存新清单
+
+        未改动的题目（标题也未变时）直接使用上次的文本，批次号换成本次的；
+        其余题目重新渲染：沿用的 / 原位改动的题目用原 L 编号，新增题目分配新编号。
+
+        Returns:
+            (输出文本, 本次新生成的 [(L 编号, QuizItem)]，用于登记生成记录)
+        """
+        title = f"{title_main}\x1f{title_sub}"
+        same_title = self._manifest is not None and self._manifest.title == title
+        items = dict(zip(result.positions, result.items))
+        next_number = self.plan.next_number
+        entries: list[ManifestEntry] = []
+        texts: list[str] = []
+        fresh: list[tuple[str, QuizItem]] = []
+
+        for position, fingerprint in enumerate(self._fingerprints, start=1):
+            item = items.get(position)
+            previous = self.plan.reuse.get(position)
+            if item is None:
+                # 失败的题目保留原编号，下次运行重做时继续沿用
+                entries.append(ManifestEntry(
+                    position=position, fingerprint=fingerprint, code=self.plan.inherit.get(position)
+                ))
+                continue
+            if previous is not None and same_title and previous.rendered is not None:
+                rendered = self._restamp(previous, batch_code)
+                if rendered is not None:
+                    entries.append(previous.model_copy(
+                        update={"position": position, "rendered": rendered, "batch": batch_code}
+                    ))
+                    texts.append(rendered)
+                    continue
+
+            body = self.formatter.render(item, title_main, title_sub)
+            if body is None:  # 答案总结句伪题：不输出、不占编号
+                entries.append(ManifestEntry(position=position, fingerprint=fingerprint, item=item))
+                continue
+            code = previous.code if previous is not None else self.plan.inherit.get(position)
+            if code is None:
+                code = f"{self._question_prefix}{self._question_start + next_number:06d}"
+                next_number += 1
+            table = previous.pictures if previous is not None else self.use_case.pictures
+            model = previous.model if previous is not None else (self._generator.model if self._generator else "")
+            pictures = {placeholder: original for placeholder, original in table.items() if placeholder in body}
+            text = restore_pictures(self.formatter.stamp(body, batch_code=batch_code, code=code), pictures)
+            entries.append(ManifestEntry(
+                position=position,
+                fingerprint=fingerprint,
+                item=item,
+                code=code,
+                rendered=text,
+                batch=batch_code,
+                pictures=pictures,
+                model=model,
+            ))
+            texts.append(text)
+            if previous is None:
+                fresh.append((code, item))
+
+        self.manifest = QuizManifest(
+            source=self._source,
+            title=title,
+            question_start=self._question_start,
+            question_prefix=self._question_prefix,
+            generator=self._generator,
+            next_number=next_number,
+            entries=entries,
+        )
+        self.manifests.save(self.manifest)
+        return "\n".join(texts), fresh
+
+    def _restamp(self, entry: ManifestEntry, batch_code: str) -> str | None:
+        """把上次文本末尾的批次号 / 题号换成本次的（末尾不符时返回 None，改为重新渲染）"""
+        old = self.formatter.stamp("", batch_code=entry.batch, code=entry.code or "")
+        if not entry.rendered.endswith(old):
+            return None
+        return entry.rendered[: len(entry.rendered) - len(old)] + self.formatter.stamp(
+            "", batch_code=batch_code, code=entry.code or ""
+        )
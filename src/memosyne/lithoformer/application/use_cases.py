@@ -3,20 +3,34 @@ Lithoformer Application Use Cases
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from time import perf_counter
-from typing import Iterable, Iterator, Literal
+from typing import Iterable, Iterator, Literal, Mapping
 
+from ..domain.minimize import minimize_blocks
 from ..domain.models import QuizItem
+from ..domain.preparse import preparse_block
+from ..domain.translation_memory import fill_from_memory, harvest_pairs, known_slots
 from ..domain.services import (
-    is_quiz_item_valid,
+    find_invalid_fields,
+    low_confidence_reasons,
     split_markdown_into_questions,
 )
-from .ports import LLMPort
+from .pipeline import Dispatch, StageCallback, StagedJob, StagedQuizPipeline, StageSpec, recall_translations
+from .ports import LLMPort, TranslationMemoryPort
 
 # 导入核心模型
-from ...core.models import ProcessResult, TokenUsage
-from ...shared.utils import Progress, indeterminate_progress
+from ...core.interfaces import RunRecorder
+from ...core.models import CallRecord, ProcessResult, TierUsage, TokenUsage
+from ...shared.utils import (
+    Progress,
+    approx_tokens,
+    get_metrics,
+    get_tracer,
+    indeterminate_progress,
+    pop_call_model,
+    pop_call_retries,
+)
 
 
 @dataclass(slots=True)
@@ -34,6 +48,15 @@ class QuizProcessingEvent:
         total_tokens: 截至当前的 Token 累计值
         error: 解析失败原因
         elapsed: 本题耗时（秒）
+        preparsed: 是否由本地预解析提取结构（LLM 只补充翻译与解析）
+        stages: 分阶段模式下各阶段的最终状态（structure / translate / analyse）
+        repair_tokens: 字段级修复消耗的 Token（已计入 tokens）
+        repair_calls: 字段级修复调用次数
+        retries: Provider 层重试次数（SDK / 策略层）
+        tier: 产出最终结果的级联层级（fast / strong）
+        escalation: 升级到强模型的原因（invalid / low_confidence，未升级为 None）
+        tier_usage: 各层级的 Token 与耗时（升级时两层都计入 tokens）
+        reused: 增量重建时沿用上次结果（未调用 LLM）
     """
 
     index: int
@@ -45,6 +68,15 @@ class QuizProcessingEvent:
     total_tokens: TokenUsage
     error: str | None
     elapsed: float
+    preparsed: bool = False
+    stages: dict[str, str] = field(default_factory=dict)
+    repair_tokens: TokenUsage = field(default_factory=TokenUsage)
+    repair_calls: int = 0
+    retries: int = 0
+    tier: str = "fast"
+    escalation: str | None = None
+    tier_usage: dict[str, TierUsage] = field(default_factory=dict)
+    reused: bool = False
 
 
 class ParseQuizUseCase:
@@ -53,22 +85,83 @@ class ParseQuizUseCase:
 
     Workflow:
     1. Receive markdown content
-    2. Call LLM to parse quiz
-    3. Filter valid items
-    4. Return processing result
+    2. Minimize blocks (strip export noise, §Pic.N§ image placeholders)
+    3. Call LLM to parse quiz
+    4. Filter valid items
+    5. Return processing result
+
+    Staged mode (stages is not None):
+        structure → translate → analyse run as separate overlapping stages,
+        each with its own LLM / concurrency (see pipeline.StagedQuizPipeline).
+
+    Model cascade (escalation_llm is not None):
+        every question goes to ``llm`` (the cheap tier) first; invalid or
+        low-confidence results (see low_confidence_reasons) are redone once on
+        ``escalation_llm``. If the strong tier fails too, a usable cheap-tier
+        item is kept. Both tiers' tokens are charged to the question.
     """
 
-    def __init__(self, llm: LLMPort):
+    def __init__(
+        self,
+        llm: LLMPort,
+        recorder: RunRecorder | None = None,
+        *,
+        preparse: bool = True,
+        stages: Mapping[str, StageSpec] | None = None,
+        queue_size: int = 8,
+        translation_memory: TranslationMemoryPort | None = None,
+        repair_rounds: int = 2,
+        escalation_llm: LLMPort | None = None,
+        min_rationale_chars: int = 40,
+        dispatch: Dispatch = "lpt",
+        minimize: bool = True,
+    ):
         """
         Args:
             llm: LLM port (injected by Infrastructure)
+            recorder: Optional per-call recorder for run analytics
+            preparse: Extract structure locally for well-formed blocks
+                (the LLM then only returns translations and analysis)
+            stages: Per-stage config; enables the staged pipeline when given
+                (an empty mapping runs every stage on ``llm``)
+            queue_size: Bounded queue size between stages
+            translation_memory: Segment translation memory; known option/step
+                translations are pre-filled and the LLM is told to skip them
+            repair_rounds: Max field-level repair requests per item when
+                validation fails (0 disables repair)
+            escalation_llm: Strong tier of the model cascade (None disables it)
+            min_rationale_chars: Rationales shorter than this count as low
+                confidence when cascading
+            dispatch: Staged dispatch order; "lpt" starts the longest blocks
+                first, "fifo" keeps file order (indices stay positional)
+            minimize: Strip LMS export noise and replace embedded images with
+                §Pic.N§ placeholders before prompting (see prepare_blocks)
         """
         self.llm = llm
+        self.recorder = recorder
+        self.preparse = preparse
+        self.stages = stages
+        self.queue_size = queue_size
+        self.translation_memory = translation_memory
+        self.repair_rounds = max(0, repair_rounds)
+        self.escalation_llm = escalation_llm
+        self.min_rationale_chars = max(0, min_rationale_chars)
+        self.dispatch = dispatch
+        self.minimize = minimize
+        self.pictures: dict[str, str] = {}
+        self.minimize_stats: dict[str, int] = {}
+
+    @property
+    def staged(self) -> bool:
+        """是否使用分阶段流水线"""
+        return self.stages is not None
 
     def execute(
         self,
         markdown: str,
         show_progress: bool = True,
+        *,
+        reuse: Mapping[int, QuizItem] | None = None,
     ) -> ProcessResult[QuizItem]:
         """
         Execute use case: parse quiz markdown
@@ -76,6 +169,8 @@ class ParseQuizUseCase:
         Args:
             markdown: Quiz markdown content
             show_progress: Whether to show progress
+            reuse: Question index (1-based) → item from a previous run; these
+                blocks are not sent to the LLM (incremental rebuild)
 
         Returns:
             ProcessResult[QuizItem]
@@ -85,8 +180,16 @@ class ParseQuizUseCase:
         """
         question_blocks = self._split_markdown(markdown)
         total_count = len(question_blocks)
-        valid_items: list[QuizItem] = []
+        valid_items: list[tuple[int, QuizItem]] = []
         token_snapshot = TokenUsage()
+        preparsed_count = 0
+        repair_tokens = TokenUsage()
+        repair_stats = {"repaired": 0, "repair_calls": 0}
+        llm_retries = 0
+        tiers: dict[str, TierUsage] = {}
+        escalations = {"invalid": 0, "low_confidence": 0}
+        reused = 0
+        completed = 0
 
         with Progress(
             total=total_count,
@@ -97,31 +200,69 @@ class ParseQuizUseCase:
             for event in self._stream_blocks(
                 question_blocks,
                 show_spinner=show_progress,
+                reuse=reuse,
             ):
-                token_snapshot = event.total_tokens
+                reused += event.reused
+                if not event.reused:
+                    token_snapshot = event.total_tokens
+                preparsed_count += event.preparsed
+                repair_tokens = repair_tokens + event.repair_tokens
+                repair_stats["repair_calls"] += event.repair_calls
+                # 便宜模型修复失败后由强模型重做的题目不算修复成功
+                repair_stats["repaired"] += (
+                    bool(event.repair_calls) and event.status == "success" and event.escalation != "invalid"
+                )
+                llm_retries += event.retries
+                for tier, usage in event.tier_usage.items():
+                    tiers[tier] = tiers.get(tier, TierUsage()) + usage
+                if event.escalation:
+                    escalations[event.escalation] += 1
+                completed += 1
                 desc = (
                     f"Validating quiz items "
-                    f"[{event.index}/{event.total}] "
+                    f"[{completed}/{event.total}] "
                     f"[Tokens: {event.total_tokens.total_tokens:,}]"
                 )
                 if show_progress and progress:
                     progress.advance(desc=desc)
 
                 if event.status == "success" and event.item:
-                    valid_items.append(event.item)
+                    valid_items.append((event.index, event.item))
                     if show_progress and progress and event.item.analysis:
                         progress.set_postfix(领域=event.item.analysis.domain)
                 elif event.status != "success" and show_progress and progress:
                     progress.set_postfix(错误=event.error or "解析失败")
 
+        # 分阶段模式按完成顺序产出事件，输出按原题序归位
+        valid_items.sort(key=lambda pair: pair[0])
+        cascade: dict[str, int] = {}
+        if self.escalation_llm is not None:
+            cascade = {
+                "escalated": sum(escalations.values()),
+                "escalated_invalid": escalations["invalid"],
+                "escalated_low_confidence": escalations["low_confidence"],
+            }
+            for tier, usage in tiers.items():
+                cascade.update(usage.to_stats(tier))
         return ProcessResult(
-            items=valid_items,
+            items=[item for _, item in valid_items],
+            positions=[index for index, _ in valid_items],
             success_count=len(valid_items),
             total_count=total_count,
             token_usage=token_snapshot,
+            stats={
+                "preparsed": preparsed_count,
+                **repair_stats,
+                "repair_prompt_tokens": repair_tokens.prompt_tokens,
+                "repair_completion_tokens": repair_tokens.completion_tokens,
+                "llm_retries": llm_retries,
+                **self.minimize_stats,
+                **({"reused": reused} if reuse is not None else {}),
+                **cascade,
+            },
         )
 
-    def stream(self, markdown: str) -> Iterable[QuizProcessingEvent]:
+    def stream(self, markdown: str, *, on_stage: StageCallback | None = None) -> Iterable[QuizProcessingEvent]:
         """
         逐题解析 Markdown，生成流式事件。
 
@@ -129,16 +270,58 @@ class ParseQuizUseCase:
 
         Args:
             markdown: Quiz markdown content
+            on_stage: 分阶段模式下的阶段状态回调（工作线程中调用）
 
         Yields:
-            QuizProcessingEvent
+            QuizProcessingEvent（分阶段模式下按完成顺序）
         """
         question_blocks = self._split_markdown(markdown)
-        yield from self._stream_blocks(question_blocks)
+        yield from self._stream_blocks(question_blocks, on_stage=on_stage)
+
+    def stream_blocks(
+        self,
+        blocks: list[dict[str, str]],
+        *,
+        on_stage: StageCallback | None = None,
+    ) -> Iterator[QuizProcessingEvent]:
+        """对已切分的题目块生成流式事件（TUI 在 Detect 阶段已完成切分）"""
+        yield from self._stream_blocks(blocks, on_stage=on_stage)
+
+    def prepare_blocks(self, blocks: list[dict[str, str]]) -> list[dict[str, str]]:
+        """
+        调用 LLM 之前精简题目块（domain.minimize），每次运行调用一次
+
+        图片占位的旁表保存在 self.pictures（输出时用 restore_pictures 还原），
+        精简统计保存在 self.minimize_stats（execute 的 stats 同样包含）。
+        未启用精简时原样返回。
+        """
+        self.pictures = {}
+        self.minimize_stats = {}
+        if not self.minimize:
+            return blocks
+        with get_tracer().span("minimize", blocks=len(blocks)) as span:
+            results = minimize_blocks(blocks)
+            saved = sum(
+                approx_tokens(result.original.get(key) or "") - approx_tokens(result.block.get(key) or "")
+                for result in results
+                if result.changed
+                for key in ("context", "question", "answer")
+            )
+            for result in results:
+                self.pictures.update(result.pictures)
+            self.minimize_stats = {
+                "minimized": sum(result.changed for result in results),
+                "minimized_tokens_saved": saved,
+                "pictures": len(self.pictures),
+            }
+            span.set(**self.minimize_stats)
+        return [result.block for result in results]
 
     @staticmethod
     def _split_markdown(markdown: str) -> list[dict[str, str]]:
-        question_blocks = split_markdown_into_questions(markdown)
+        with get_tracer().span("split", chars=len(markdown)) as span:
+            question_blocks = split_markdown_into_questions(markdown)
+            span.set(blocks=len(question_blocks))
         if not question_blocks:
             raise ValueError("未在 Markdown 中解析到任何题目内容")
         return question_blocks
@@ -156,44 +339,117 @@ class ParseQuizUseCase:
         处理单个题目块，返回事件和累积 Token。
 
         提供给 TUI 等外部组件复用，以便插入自定义的进度控制。
+        启用模型级联时，必要的强模型重做也在这里完成。
         """
+        event = self._process_once(
+            block, index, total_count, total_tokens, llm=self.llm, tier="fast", show_spinner=show_spinner
+        )
+        event = self._cascade(event, show_spinner=show_spinner)
+        get_metrics().record_item("lithoformer", event.status, remaining=total_count - index)
+        return event, event.total_tokens
+
+    def _process_once(
+        self,
+        block: dict[str, str],
+        index: int,
+        total_count: int,
+        total_tokens: TokenUsage,
+        *,
+        llm: LLMPort,
+        tier: str,
+        show_spinner: bool = False,
+    ) -> QuizProcessingEvent:
+        """用指定 LLM 处理单个题目块一次（记录调用，不计入条目指标）"""
         start_time = perf_counter()
         status: Literal["success", "invalid", "error"]
         item: QuizItem | None = None
         error_message: str | None = None
         token_usage = TokenUsage()
-
-        try:
-            with indeterminate_progress(
-                f"Calling LLM for item #{index}...",
-                enabled=show_spinner,
-            ):
-                item_dict, token_dict = self.llm.parse_question(
-                    {
-                        "context": block.get("context", ""),
-                        "question": block.get("question", ""),
-                        "answer": block.get("answer", ""),
-                        "index": str(index),
-                    }
+        llm_latency: float | None = None
+        retries = 0
+        model: str | None = None
+        memory: dict[str, str] = {}
+        repair_tokens = TokenUsage()
+        repair_calls = 0
+        tracer = get_tracer()
+
+        with tracer.span("question", index=index, tier=tier) as question_span:
+            with tracer.span("preparse", index=index) as preparse_span:
+                preparsed = preparse_block(block) if self.preparse else None
+                preparse_span.set(local=preparsed is not None)
+            try:
+                with indeterminate_progress(
+                    f"Calling LLM for item #{index}...",
+                    enabled=show_spinner,
+                ):
+                    if preparsed is not None:
+                        structure = preparsed.to_dict()
+                        memory = recall_translations(self.translation_memory, structure)
+                        payload = {**structure, "context": block.get("context", ""), "index": str(index)}
+                        known = known_slots(structure, memory)
+                        if known:
+                            payload["known_translations"] = known
+                        enrichment, token_dict = llm.enrich_question(payload)
+                        item_dict = {**enrichment, **structure}
+                    else:
+                        item_dict, token_dict = llm.parse_question(
+                            {
+                                "context": block.get("context", ""),
+                                "question": block.get("question", ""),
+                                "answer": block.get("answer", ""),
+                                "index": str(index),
+                            }
+                        )
+
+                llm_latency = perf_counter() - start_time
+                retries = pop_call_retries()
+                model = pop_call_model()
+                token_usage = TokenUsage(**token_dict)
+                new_total_tokens = total_tokens + token_usage
+
+                if preparsed is None:
+                    # 结构由 LLM 给出：调用后再查记忆，只补全模型留空的译文
+                    memory = recall_translations(self.translation_memory, item_dict)
+
+                with tracer.span("normalize", index=index):
+                    normalized = _normalize_question_dict(item_dict, memory)
+
+                candidate, error_message, repair_tokens, repair_calls = self._validate(
+                    index, block, normalized, memory, llm
                 )
-
-            token_usage = TokenUsage(**token_dict)
-            new_total_tokens = total_tokens + token_usage
-
-            candidate = QuizItem(**_normalize_question_dict(item_dict))
-
-            if is_quiz_item_valid(candidate):
-                status = "success"
-                item = candidate
-            else:
-                status = "invalid"
-                error_message = "LLM 输出未通过业务规则校验"
-        except Exception as exc:  # 捕获 LLMError 和其它异常
-            status = "error"
-            error_message = str(exc)
-            new_total_tokens = total_tokens
+                retries += pop_call_retries()
+                token_usage = token_usage + repair_tokens
+                new_total_tokens = total_tokens + token_usage
+
+                if candidate is not None:
+                    status = "success"
+                    item = candidate
+                    self._learn_translations(candidate)
+                else:
+                    status = "invalid"
+            except Exception as exc:  # 捕获 LLMError 和其它异常
+                status = "error"
+                error_message = str(exc)
+                retries += pop_call_retries()
+                model = model or pop_call_model()
+                new_total_tokens = total_tokens
+
+            question_span.set(status=status, total_tokens=token_usage.total_tokens)
 
         elapsed = perf_counter() - start_time
+        if self.recorder is not None:
+            self.recorder.record(
+                CallRecord.from_usage(
+                    index,
+                    llm_latency if llm_latency is not None else elapsed,
+                    token_usage,
+                    retries=retries,
+                    outcome=status,
+                    error=error_message,
+                    model=model,
+                    tier=tier,
+                )
+            )
 
         event = QuizProcessingEvent(
             index=index,
@@ -205,24 +461,102 @@ class ParseQuizUseCase:
             total_tokens=new_total_tokens,
             error=error_message,
             elapsed=elapsed,
+            preparsed=preparsed is not None,
+            repair_tokens=repair_tokens,
+            repair_calls=repair_calls,
+            retries=retries,
+            tier=tier,
+            tier_usage={tier: TierUsage().add(token_usage, elapsed)},
+        )
+        return event
+
+    def _cascade(self, event: QuizProcessingEvent, *, show_spinner: bool = False) -> QuizProcessingEvent:
+        """
+        模型级联：便宜模型的结果校验失败或可疑时交给强模型重做一次
+
+        强模型成功（或便宜模型本就没有可用结果）时采用强模型的事件，
+        否则保留便宜模型的题目；两层的 Token / 耗时 / 修复都计入本题。
+        """
+        if self.escalation_llm is None:
+            return event
+        reason: str | None = None
+        doubts: list[str] = []
+        if event.status == "invalid":
+            reason = "invalid"
+        elif event.status == "success" and event.item is not None:
+            doubts = low_confidence_reasons(event.item, min_rationale_chars=self.min_rationale_chars)
+            reason = "low_confidence" if doubts else None
+        if reason is None:
+            return event
+
+        with get_tracer().span("escalate", index=event.index, reason=reason, fields=",".join(doubts)):
+            strong = self._process_once(
+                event.block,
+                event.index,
+                event.total,
+                event.total_tokens,
+                llm=self.escalation_llm,
+                tier="strong",
+                show_spinner=show_spinner,
+            )
+        keep = strong if strong.status == "success" or event.status != "success" else event
+        tier_usage = dict(event.tier_usage)
+        for tier, usage in strong.tier_usage.items():
+            tier_usage[tier] = tier_usage.get(tier, TierUsage()) + usage
+        return replace(
+            keep,
+            tokens=event.tokens + strong.tokens,
+            total_tokens=strong.total_tokens,
+            elapsed=event.elapsed + strong.elapsed,
+            preparsed=event.preparsed,
+            stages=event.stages,
+            repair_tokens=event.repair_tokens + strong.repair_tokens,
+            repair_calls=event.repair_calls + strong.repair_calls,
+            retries=event.retries + strong.retries,
+            escalation=reason,
+            tier_usage=tier_usage,
         )
-        return event, new_total_tokens
 
     def _stream_blocks(
         self,
         blocks: list[dict[str, str]],
         *,
         show_spinner: bool = False,
+        on_stage: StageCallback | None = None,
+        reuse: Mapping[int, QuizItem] | None = None,
     ) -> Iterator[QuizProcessingEvent]:
         """
         核心迭代逻辑，供 execute() 和 stream() 复用。
+
+        reuse 中的题目直接产出沿用事件（reused=True，不调用 LLM、不计 Token），其余照常处理。
         """
-        total_tokens = TokenUsage()
+        blocks = self.prepare_blocks(blocks)
         total_count = len(blocks)
+        reuse = {index: item for index, item in (reuse or {}).items() if 1 <= index <= total_count}
+        for index in sorted(reuse):
+            yield QuizProcessingEvent(
+                index=index,
+                total=total_count,
+                status="success",
+                item=reuse[index],
+                block=blocks[index - 1],
+                tokens=TokenUsage(),
+                total_tokens=TokenUsage(),
+                error=None,
+                elapsed=0.0,
+                reused=True,
+            )
+        pending = [index for index in range(1, total_count + 1) if index not in reuse]
+
+        if self.staged:
+            yield from self._stream_staged(blocks, pending, on_stage=on_stage)
+            return
 
-        for index, block in enumerate(blocks, start=1):
+        total_tokens = TokenUsage()
+
+        for index in pending:
             event, total_tokens = self.process_block(
-                block,
+                blocks[index - 1],
                 index,
                 total_count,
                 total_tokens,
@@ -230,9 +564,177 @@ class ParseQuizUseCase:
             )
             yield event
 
+    def _stream_staged(
+        self,
+        blocks: list[dict[str, str]],
+        pending: list[int],
+        *,
+        on_stage: StageCallback | None = None,
+    ) -> Iterator[QuizProcessingEvent]:
+        pipeline = StagedQuizPipeline(
+            self.llm,
+            self.stages,
+            preparse=self.preparse,
+            queue_size=self.queue_size,
+            on_stage=on_stage,
+            translation_memory=self.translation_memory,
+            dispatch=self.dispatch,
+        )
+        total_tokens = TokenUsage()
+        total_count = len(blocks)
+
+        jobs = pipeline.run([blocks[index - 1] for index in pending], indices=pending)
+        for completed, job in enumerate(jobs, start=1):
+            event = self._cascade(self._finish_job(job, total_count, total_tokens))
+            get_metrics().record_item("lithoformer", event.status, remaining=len(pending) - completed)
+            total_tokens = event.total_tokens
+            yield event
+
+    def _finish_job(
+        self,
+        job: StagedJob,
+        total_count: int,
+        total_tokens: TokenUsage,
+    ) -> QuizProcessingEvent:
+        """合并各阶段输出并做最终校验（与单次调用模式的校验一致）"""
+        status: Literal["success", "invalid", "error"]
+        item: QuizItem | None = None
+        error_message = job.error
+        repair_tokens = TokenUsage()
+        repair_calls = 0
+        repair_latency = 0.0
+        repair_retries = 0
+        tracer = get_tracer()
+
+        if job.error is not None:
+            status = "error"
+        else:
+            try:
+                with tracer.span("normalize", index=job.index):
+                    normalized = _normalize_question_dict(job.merged(), job.memory)
+                started = perf_counter()
+                candidate, error_message, repair_tokens, repair_calls = self._validate(
+                    job.index, job.block, normalized, job.memory, self.llm
+                )
+                repair_latency = perf_counter() - started
+                repair_retries = pop_call_retries()
+                job.retries += repair_retries
+                job.tokens = job.tokens + repair_tokens
+                if candidate is not None:
+                    status = "success"
+                    item = candidate
+                    self._learn_translations(candidate)
+                else:
+                    status = "invalid"
+            except Exception as exc:
+                status = "error"
+                error_message = str(exc)
+
+        if self.recorder is not None:
+            # 每个阶段一条记录（各阶段可用不同模型）；失败只记在出错的阶段，前序阶段本身成功
+            for call in job.calls:
+                outcome = "error" if call.error is not None else ("success" if job.error is not None else status)
+                self.recorder.record(
+                    CallRecord.from_usage(
+                        job.index,
+                        call.latency,
+                        call.tokens,
+                        retries=call.retries,
+                        outcome=outcome,
+                        error=call.error or (error_message if outcome != "success" else None),
+                        model=call.model,
+                        tier="fast",
+                    )
+                )
+            if repair_calls:
+                self.recorder.record(
+                    CallRecord.from_usage(
+                        job.index,
+                        repair_latency,
+                        repair_tokens,
+                        retries=repair_retries,
+                        outcome=status,
+                        error=error_message,
+                        model=pop_call_model(),
+                        tier="fast",
+                    )
+                )
 
-def _normalize_question_dict(data: dict) -> dict:
-    """Ensure LLM output conforms to domain expectations."""
+        elapsed = perf_counter() - job.started
+        return QuizProcessingEvent(
+            index=job.index,
+            total=total_count,
+            status=status,
+            item=item,
+            block=job.block,
+            tokens=job.tokens,
+            total_tokens=total_tokens + job.tokens,
+            error=error_message,
+            elapsed=elapsed,
+            preparsed=job.preparsed,
+            stages=dict(job.stages),
+            repair_tokens=repair_tokens,
+            repair_calls=repair_calls,
+            retries=job.retries,
+            tier_usage={"fast": TierUsage().add(job.tokens, elapsed)},
+        )
+
+    def _validate(
+        self,
+        index: int,
+        block: dict[str, str],
+        data: dict,
+        memory: Mapping[str, str],
+        llm: LLMPort,
+    ) -> tuple[QuizItem | None, str | None, TokenUsage, int]:
+        """
+        校验归一化后的题目；未通过时只就出错字段发起修复请求（最多 repair_rounds 轮）
+
+        Returns:
+            (通过校验的 QuizItem 或 None, 错误信息, 修复消耗的 Token, 修复调用次数)
+        """
+        tracer = get_tracer()
+        with tracer.span("validate", index=index):
+            item, problems = find_invalid_fields(data)
+
+        used = TokenUsage()
+        calls = 0
+        if problems and self.repair_rounds:
+            with tracer.span("repair", index=index, fields=",".join(problems)) as span:
+                while problems and calls < self.repair_rounds:
+                    calls += 1
+                    payload = {**block, "index": str(index), "current": data}
+                    try:
+                        fixes, token_dict = llm.repair_question(payload, problems)
+                    except Exception:  # 修复失败按原校验结果处理
+                        break
+                    used = used + TokenUsage(**token_dict)
+                    fixes = {key: value for key, value in fixes.items() if key in problems}
+                    data = _normalize_question_dict({**data, **fixes}, memory)
+                    item, problems = find_invalid_fields(data)
+                span.set(rounds=calls, repaired=not problems)
+
+        if problems:
+            return None, "LLM 输出未通过业务规则校验：" + "、".join(problems), used, calls
+        return item, None, used, calls
+
+    def _learn_translations(self, item: QuizItem) -> None:
+        """收录已验证题目的片段译文（记忆写入失败不影响本题结果）"""
+        if self.translation_memory is None:
+            return
+        try:
+            self.translation_memory.remember(harvest_pairs(item))
+        except Exception:
+            pass
+
+
+def _normalize_question_dict(data: dict, memory: Mapping[str, str] | None = None) -> dict:
+    """
+    Ensure LLM output conforms to domain expectations.
+
+    ``memory`` (normalized segment → translation) fills option / step
+    translations the LLM left empty because they were already known.
+    """
     result = dict(data)
 
     # Normalize qtype / answer casing
@@ -311,4 +813,8 @@ def _normalize_question_dict(data: dict) -> dict:
         cloze_trans = cloze_trans[: len(cloze)]
     result["cloze_answers_translation"] = [str(text).strip() for text in cloze_trans]
 
+    # Reconcile with translation memory (model output wins when present)
+    if memory:
+        fill_from_memory(result, memory)
+
     return result
@@ -8,10 +8,24 @@ Usage:
     Or use the convenience script:
     ./run_lithoform.sh
 """
+import sqlite3
 from pathlib import Path
 
 from ...shared.config import get_settings
-from ...shared.infrastructure.llm import OpenAIProvider, AnthropicProvider
+from ...shared.infrastructure.llm import (
+    backend_usage,
+    create_provider,
+    hedge_stats,
+    hedge_unreported_usage,
+    key_usage,
+)
+from ...shared.infrastructure.storage import (
+    check_columnar_format,
+    export_quiz_items,
+    open_memo_store,
+    open_run_recorder,
+    open_translation_memory,
+)
 from ...shared.utils import (
     BatchIDGenerator,
     resolve_model_input,
@@ -19,14 +33,31 @@ from ...shared.utils import (
     get_code_from_model,
     generate_output_filename,
     unique_path,
+    configure_tracing,
+    MetricsExporter,
 )
 from ...shared.cli.prompts import ask
-from ..application import ParseQuizUseCase
-from ..infrastructure import LithoformerLLMAdapter, FileAdapter, FormatterAdapter
+from ..application import ParseQuizUseCase, QuizRebuilder
+from ..infrastructure import (
+    LithoformerLLMAdapter,
+    FileAdapter,
+    FormatterAdapter,
+    ManifestStore,
+    SidecarHeader,
+    build_records,
+    records_from_manifest,
+    sidecar_path,
+    write_sidecar,
+    build_escalation_adapter,
+    build_stage_specs,
+    plan_quiz,
+    quiz_generator,
+)
 from ..domain.services import (
     infer_titles_from_filename,
     infer_titles_from_markdown,
     infer_question_seed,
+    split_markdown_into_questions,
 )
 
 
@@ -36,6 +67,12 @@ def main():
 
     settings = get_settings()
     settings.ensure_dirs()
+    try:
+        check_columnar_format(settings.columnar_format)
+    except ImportError as e:
+        print(e)
+        return
+    tracer = configure_tracing(enabled=settings.trace_path is not None)
 
     model_input = ask("Engine (4-digit code like o4oo/cs45):")
     input_raw = ask("Input Markdown file (default data/input/lithoformer/...):", required=False)
@@ -71,7 +108,8 @@ def main():
     # Read input
     file_adapter = FileAdapter.create()
     try:
-        markdown = file_adapter.read_markdown(input_path)
+        with tracer.span("read", path=input_path.name):
+            markdown = file_adapter.read_markdown(input_path)
     except Exception as e:
         print(f"Failed to read input: {e}")
         return
@@ -86,55 +124,200 @@ def main():
     print(f"[Title   ] {title_main} | {title_sub}")
 
     # Create LLM Provider
-    if provider_type == "anthropic":
+    if provider_type == "anthropic" and settings.llm_cassette_mode != "replay":
         if not settings.anthropic_api_key:
             print("Anthropic provider selected，但未配置 ANTHROPIC_API_KEY。请在 .env 中填写后重试。")
             return
-        llm_provider = AnthropicProvider(model=model_id, api_key=settings.anthropic_api_key, temperature=settings.default_temperature)
-    else:
-        llm_provider = OpenAIProvider(model=model_id, api_key=settings.openai_api_key, temperature=settings.default_temperature)
+    llm_provider = create_provider(provider_type, model_id, settings)
 
     # Create adapters
-    llm_adapter = LithoformerLLMAdapter.from_provider(llm_provider)
+    llm_adapter = LithoformerLLMAdapter.from_provider(llm_provider, wire_format=settings.llm_wire_format)
 
     # Create use case
-    use_case = ParseQuizUseCase(llm=llm_adapter)
+    recorder = open_run_recorder(
+        settings, pipeline="lithoformer", provider=provider_type, model=model_id, input_name=input_path.name,
+    )
+    stages = build_stage_specs(settings, llm_adapter) if settings.lithoformer_staged else None
+    if stages:
+        print("[Pipeline] staged: " + " → ".join(
+            f"{name}×{spec.concurrency}" for name, spec in stages.items()
+        ))
+    use_case = ParseQuizUseCase(
+        llm=llm_adapter,
+        recorder=recorder,
+        preparse=settings.lithoformer_preparse,
+        stages=stages,
+        queue_size=settings.lithoformer_stage_queue_size,
+        dispatch=settings.lithoformer_dispatch,
+        minimize=settings.lithoformer_minimize,
+        translation_memory=open_translation_memory(settings),
+        repair_rounds=settings.llm_repair_rounds,
+        escalation_llm=build_escalation_adapter(settings, llm_adapter),
+        min_rationale_chars=settings.cascade_min_rationale_chars,
+    )
+
+    # Incremental rebuild: only new / changed questions go to the LLM on re-runs
+    formatter_adapter = FormatterAdapter.create()
+    question_seed = infer_question_seed(input_path)
+    rebuilder = (
+        QuizRebuilder(use_case, formatter_adapter, ManifestStore.from_settings(settings))
+        if settings.lithoformer_incremental else None
+    )
+    blocks = split_markdown_into_questions(markdown)
+    if rebuilder:
+        pending = rebuilder.prepare(
+            markdown,
+            source=str(input_path.resolve()),
+            generator=quiz_generator(model_id, provider_type, settings.llm_wire_format),
+            question_start=question_seed,
+        ).pending
+        blocks = [blocks[position - 1] for position in pending]
+
+    # Pre-flight estimate over the questions that will actually be sent
+    # (no LLM calls; calibrated against analytics history when enabled)
+    try:
+        plan = plan_quiz(settings, blocks, model_id, wire_format=settings.llm_wire_format)
+        for position, line in enumerate(plan.describe()):
+            print(f"{'[Plan    ]' if position == 0 else ' ' * 10} {line}")
+    except Exception as e:
+        print(f"[Plan    ] unavailable: {e}")
 
     # Execute
     try:
-        result = use_case.execute(markdown, show_progress=True)
+        with MetricsExporter.from_settings(settings) as exporter:
+            if exporter.url:
+                print(f"[Metrics ] {exporter.url}")
+            try:
+                if rebuilder:
+                    result = rebuilder.execute(markdown)
+                else:
+                    result = use_case.execute(markdown, show_progress=True)
+            finally:
+                if use_case.translation_memory:
+                    use_case.translation_memory.close()
+        result.token_usage = result.token_usage + hedge_unreported_usage(llm_provider)
         print(f"✅ Parsed {result.success_count} questions")
         print(f"   Token usage: {result.token_usage}")
+        if result.total_count:
+            preparsed = result.stats.get("preparsed", 0)
+            print(f"   Pre-parsed locally: {preparsed}/{result.total_count} ({preparsed / result.total_count:.0%})")
+        if rebuilder and "reused" in result.stats:
+            stats = result.stats
+            print(
+                f"   Rebuild: {stats['reused']} reused, {stats['changed']} changed, "
+                f"{stats['added']} added, {stats['removed']} removed"
+            )
+        if result.stats.get("minimized"):
+            stats = result.stats
+            pictures = f", {stats['pictures']} pictures" if stats.get("pictures") else ""
+            print(
+                f"   Minimized: {stats['minimized']} blocks, "
+                f"~{stats['minimized_tokens_saved']:,} prompt tokens saved{pictures}"
+            )
+        if result.stats.get("repair_calls"):
+            stats = result.stats
+            print(
+                f"   Repaired: {stats['repaired']} ({stats['repair_calls']} calls, "
+                f"{stats['repair_prompt_tokens']:,} prompt + {stats['repair_completion_tokens']:,} completion tokens)"
+            )
+        if result.stats.get("llm_retries"):
+            print(f"   Provider retries: {result.stats['llm_retries']}")
+        if "escalated" in result.stats:
+            stats = result.stats
+            print(
+                f"   Escalated: {stats['escalated']} ({stats['escalated_invalid']} invalid, "
+                f"{stats['escalated_low_confidence']} low confidence)"
+            )
+            for tier in ("fast", "strong", "retry"):
+                if stats.get(f"tier_{tier}_calls"):
+                    tokens = stats[f"tier_{tier}_prompt_tokens"] + stats[f"tier_{tier}_completion_tokens"]
+                    print(
+                        f"   Tier {tier}: {stats[f'tier_{tier}_calls']} calls, {tokens:,} tokens, "
+                        f"{stats[f'tier_{tier}_latency_ms'] / 1000:.1f}s"
+                    )
+        hedging = hedge_stats(llm_provider)
+        if hedging and hedging["hedged"]:
+            print(
+                f"   Hedged: {hedging['hedged']}/{hedging['calls']} calls ({hedging['hedge_wins']} won, "
+                f"{hedging['wasted_prompt_tokens'] + hedging['wasted_completion_tokens']:,} extra tokens)"
+            )
+        for label, usage in (backend_usage(llm_provider) or {}).items():
+            print(
+                f"   Backend {label}: {usage['calls']} calls, {usage['errors']} errors, "
+                f"{usage['total_tokens']:,} tokens"
+            )
+        for label, usage in (key_usage(llm_provider) or {}).items():
+            print(
+                f"   Key {label}: {usage['calls']} calls, {usage['errors']} errors, "
+                f"{usage['quarantines']} quarantined, {usage['total_tokens']:,} tokens"
+            )
     except Exception as e:
         import traceback
         print(f"Parsing failed: {e}")
         traceback.print_exc()
+        if recorder:
+            recorder.close()
         return
 
     # Generate BatchID
     batch_gen = BatchIDGenerator(output_dir=settings.lithoformer_output_dir, timezone=settings.batch_timezone)
     batch_id = batch_gen.generate(term_count=result.success_count)
+    if recorder:
+        recorder.close(batch_id)
 
     # Generate output filename
     output_filename = generate_output_filename(batch_id=batch_id, model_code=model_code, input_filename=str(input_path), ext="txt")
     output_path = unique_path(settings.lithoformer_output_dir / output_filename)
 
     # Format output
-    formatter_adapter = FormatterAdapter.create()
-    output_text = formatter_adapter.format(
-        result.items,
-        title_main,
-        title_sub,
-        batch_code=batch_id,
-        question_start=infer_question_seed(input_path),
-    )
+    with tracer.span("format", items=len(result.items)):
+        if rebuilder:
+            output_text, question_codes = rebuilder.render(result, title_main, title_sub, batch_code=batch_id)
+        else:
+            output_text = formatter_adapter.format(
+                result.items,
+                title_main,
+                title_sub,
+                batch_code=batch_id,
+                question_start=question_seed,
+                pictures=use_case.pictures,
+            )
+            question_codes = formatter_adapter.question_codes(result.items, question_start=question_seed)
 
     # Write output
     try:
-        file_adapter.write_text(output_path, output_text)
+        with tracer.span("write", path=output_path.name, chars=len(output_text)):
+            file_adapter.write_text(output_path, output_text)
         print(f"✅ Complete: {output_path}")
+        records = (
+            records_from_manifest(rebuilder.manifest, batch_id=batch_id)
+            if rebuilder
+            else build_records(question_codes, batch_id=batch_id, pictures=use_case.pictures, model=model_id)
+        )
+        if settings.lithoformer_sidecar:
+            header = SidecarHeader(
+                title_main=title_main, title_sub=title_sub, batch_id=batch_id, source=input_path.name, model=model_id,
+            )
+            print(f"   Sidecar: {write_sidecar(sidecar_path(output_path), header, records)}")
+        columnar = export_quiz_items(
+            output_path, [(record.code, record.batch, record.item) for record in records], fmt=settings.columnar_format
+        )
+        if columnar:
+            print(f"   Columnar: {columnar}")
     except Exception as e:
         print(f"Failed to write output: {e}")
+        return
+
+    # Register quiz items in the memo store (db/mmsdb)
+    memo_store = open_memo_store(settings)
+    if memo_store:
+        try:
+            memo_store.add_quiz_items(question_codes, batch_id=batch_id, source=output_path.name)
+        except sqlite3.Error as e:
+            print(f"[MemoDB  ] skipped, write failed: {e}")
+
+    if settings.trace_path:
+        print(f"   Trace: {tracer.export(settings.trace_path)}")
 
 
 if __name__ == "__main__":
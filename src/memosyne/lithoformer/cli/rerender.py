@@ -0,0 +1,112 @@
+"""
+Lithoformer Re-render - 从结构化旁路文件批量重新生成 ShouldBe 文本（不调用 LLM）
+
+修改 QuizFormatter（HTML 版式、解析段落措辞、((::...)) 交错方式）后，
+用每次运行写出的 <output>.items.jsonl 重新渲染整个存档，多进程并行。
+
+Usage:
+    python -m memosyne.lithoformer.cli.rerender                          # 默认 LITHOFORMER_OUTPUT_DIR，覆盖同名 .txt
+    python -m memosyne.lithoformer.cli.rerender data/output --check      # 只统计会变化的文件
+    python -m memosyne.lithoformer.cli.rerender archive/ --out /tmp/new --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..infrastructure.formatter_adapter import FormatterAdapter
+from ..infrastructure.sidecar import SIDECAR_SUFFIX, output_path_for, read_sidecar, render_sidecar
+
+_formatter: FormatterAdapter | None = None
+
+
+def find_sidecars(paths: list[Path]) -> list[Path]:
+    """展开目录（递归），返回全部旁路文件"""
+    found: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(sorted(path.rglob(f"*{SIDECAR_SUFFIX}")))
+        elif path.name.endswith(SIDECAR_SUFFIX):
+            found.append(path)
+    return found
+
+
+def rerender_one(path: str, out_dir: str | None = None, check: bool = False) -> tuple[str, int, str]:
+    """
+    重新渲染单个旁路文件（工作进程内执行）
+
+    Returns:
+        (旁路文件, 题目数, 状态：unchanged / changed / written / error: ...)
+    """
+    global _formatter
+    if _formatter is None:  # 每个工作进程只创建一次
+        _formatter = FormatterAdapter.create()
+    try:
+        header, records = read_sidecar(Path(path))
+        text = render_sidecar(header, records, _formatter)
+    except Exception as exc:
+        return path, 0, f"error: {exc}"
+
+    target = output_path_for(Path(path))
+    if out_dir:
+        target = Path(out_dir) / target.name
+    previous = target.read_text(encoding="utf-8") if target.exists() else None
+    if previous == text:
+        return path, len(records), "unchanged"
+    if check:
+        return path, len(records), "changed"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text, encoding="utf-8")
+    return path, len(records), "written"
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI 入口"""
+    parser = argparse.ArgumentParser(description="从 .items.jsonl 旁路文件重新生成 ShouldBe 文本")
+    parser.add_argument("paths", nargs="*", type=Path, help="旁路文件或目录（递归，默认 LITHOFORMER_OUTPUT_DIR）")
+    parser.add_argument("--out", type=Path, default=None, help="输出目录（默认覆盖旁路文件旁的 .txt）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程数")
+    parser.add_argument("--check", action="store_true", help="只报告会变化的文件，不写出")
+    args = parser.parse_args(argv)
+
+    paths = args.paths
+    if not paths:
+        from ...shared.config import get_settings
+        paths = [get_settings().lithoformer_output_dir]
+    sidecars = find_sidecars(paths)
+    if not sidecars:
+        print("（未找到 .items.jsonl 旁路文件）")
+        return 0
+
+    started = time.perf_counter()
+    out_dir = str(args.out) if args.out else None
+    counts: dict[str, int] = {}
+    questions = 0
+    workers = max(1, min(args.workers, len(sidecars)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            rerender_one,
+            [str(path) for path in sidecars],
+            [out_dir] * len(sidecars),
+            [args.check] * len(sidecars),
+            chunksize=max(1, len(sidecars) // (workers * 4)),
+        )
+        for path, count, status in results:
+            questions += count
+            kind = "error" if status.startswith("error") else status
+            counts[kind] = counts.get(kind, 0) + 1
+            if kind != "unchanged":
+                print(f"[{kind:<9}] {path}" + (f"  {status}" if kind == "error" else ""))
+
+    elapsed = time.perf_counter() - started
+    summary = "，".join(f"{kind} {count}" for kind, count in sorted(counts.items()))
+    print(f"{len(sidecars)} 个文件 / {questions:,} 道题（{summary}），{workers} 进程，{elapsed:.2f}s")
+    return 1 if counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
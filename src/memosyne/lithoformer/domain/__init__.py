@@ -12,13 +12,20 @@ from .models import (
 )
 from .services import (
     is_quiz_item_valid,
+    find_invalid_fields,
     filter_valid_items,
+    low_confidence_reasons,
     infer_titles_from_filename,
     infer_titles_from_markdown,
     split_markdown_into_questions,
+    block_weight,
     detect_quiz_type,
     count_questions_by_type,
 )
+from .preparse import PreparsedQuestion, preparse_block
+from .minimize import MinimizedBlock, minimize_block, minimize_blocks, restore_pictures
+from .manifest import ManifestEntry, QuizGenerator, QuizManifest, RebuildPlan, block_fingerprint, plan_rebuild
+from .translation_memory import harvest_pairs, normalize_segment
 from .exceptions import (
     LithoformerDomainError,
     InvalidQuizError,
@@ -35,12 +42,33 @@ __all__ = [
     "DistractorAnalysis",
     # Services
     "is_quiz_item_valid",
+    "find_invalid_fields",
     "filter_valid_items",
+    "low_confidence_reasons",
     "infer_titles_from_filename",
     "infer_titles_from_markdown",
     "split_markdown_into_questions",
+    "block_weight",
     "detect_quiz_type",
     "count_questions_by_type",
+    # Pre-parser
+    "PreparsedQuestion",
+    "preparse_block",
+    # Input minimization
+    "MinimizedBlock",
+    "minimize_block",
+    "minimize_blocks",
+    "restore_pictures",
+    # Incremental rebuild
+    "block_fingerprint",
+    "ManifestEntry",
+    "QuizGenerator",
+    "QuizManifest",
+    "RebuildPlan",
+    "plan_rebuild",
+    # Translation memory
+    "normalize_segment",
+    "harvest_pairs",
     # Exceptions
     "LithoformerDomainError",
     "InvalidQuizError",
@@ -0,0 +1,153 @@
+"""
+Lithoformer Domain - Incremental rebuild manifest
+
+每份输入 Markdown 对应一份清单：按位置记录每个题目块的内容指纹、
+校验通过的 QuizItem、L 编号与上次输出的题目文本。
+
+重新运行同一文件时，新题目块列表与清单做序列比对（difflib）：
+- 未改动（指纹相同且上次成功）：沿用 QuizItem 与 L 编号，输出直接拼接上次的文本
+- 原位改动（比对中的替换段）：重新调用 LLM，沿用原位置的 L 编号
+- 新增：重新调用 LLM，分配清单中从未用过的新编号
+- 删除：编号作废，不再复用
+
+清单同时记录生成条件（模型、提供商、线上格式、提示词 / Schema 版本）；
+任一项变化时沿用旧结果没有意义，全部题目重做。
+
+本模块只定义规则，清单的存储由 Infrastructure 实现。
+"""
+import hashlib
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+
+from pydantic import BaseModel, Field
+
+from .models import QuizItem
+
+_SPACE = re.compile(r"\s+")
+_FIELDS = ("context", "question", "answer")
+
+
+def block_fingerprint(block: dict[str, str]) -> str:
+    """
+    题目块内容指纹（忽略空白差异）
+
+    Example:
+        >>> block_fingerprint({"question": "Which  one?", "answer": "B"}) == block_fingerprint(
+        ...     {"question": "Which one?\\n", "answer": "B"})
+        True
+    """
+    text = "\x1f".join(_SPACE.sub(" ", block.get(key) or "").strip() for key in _FIELDS)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ManifestEntry(BaseModel):
+    """清单中的一道题（position 从 1 开始）"""
+
+    position: int = Field(ge=1)
+    fingerprint: str
+    item: QuizItem | None = None  # 校验失败的题目为 None（下次运行重做）
+    code: str | None = None  # L 编号（伪题 / 失败题为 None）
+    rendered: str | None = None  # 上次输出的题目文本（含批次号与题号）
+    batch: str = ""  # rendered 中的批次号
+    pictures: dict[str, str] = Field(default_factory=dict)  # 本题用到的图片占位 → 原图
+    model: str = ""  # 生成本题的模型（沿用的题目保留原值）
+
+
+class QuizGenerator(BaseModel):
+    """生成条件（任一项不同时不沿用上次的结果）"""
+
+    model: str
+    provider: str = ""
+    wire_format: str = ""
+    prompt_version: str = ""  # 提示词与 Schema 的指纹
+
+
+class QuizManifest(BaseModel):
+    """单份输入的重建清单"""
+
+    source: str
+    title: str = ""  # 上次输出的标题（标题变化时不拼接旧文本）
+    question_start: int = 0
+    question_prefix: str = "L"
+    generator: QuizGenerator | None = None  # 早期清单无此字段 → 全部重做
+    next_number: int = 1  # 下一个未用过的编号（删除的编号不复用）
+    entries: list[ManifestEntry] = Field(default_factory=list)
+
+
+@dataclass(slots=True)
+class RebuildPlan:
+    """
+    新题目块列表相对清单的差异
+
+    Attributes:
+        reuse: 位置 → 可直接沿用的清单条目
+        inherit: 位置 → 原位改动的题目沿用的 L 编号
+        pending: 需要调用 LLM 的位置（改动 + 新增 + 上次失败）
+        added: 新增的位置
+        removed: 被删除的清单条目数
+        next_number: 新编号的起点
+    """
+
+    reuse: dict[int, ManifestEntry] = field(default_factory=dict)
+    inherit: dict[int, str] = field(default_factory=dict)
+    pending: list[int] = field(default_factory=list)
+    added: list[int] = field(default_factory=list)
+    removed: int = 0
+    next_number: int = 1
+
+    @property
+    def changed(self) -> int:
+        return len(self.pending) - len(self.added)
+
+
+def plan_rebuild(
+    manifest: QuizManifest | None,
+    fingerprints: list[str],
+    *,
+    question_start: int = 0,
+    question_prefix: str = "L",
+    generator: QuizGenerator | None = None,
+) -> RebuildPlan:
+    """
+    比对新题目块指纹与清单，得出重建计划
+
+    清单不存在、题号基准 / 前缀变化或生成条件（generator）不同时，
+    全部题目重做（与首次运行一致）。
+    """
+    if (
+        manifest is None
+        or (manifest.question_start, manifest.question_prefix) != (question_start, question_prefix)
+        or manifest.generator is None
+        or manifest.generator != generator
+    ):
+        return RebuildPlan(pending=list(range(1, len(fingerprints) + 1)), added=list(range(1, len(fingerprints) + 1)))
+
+    entries = manifest.entries
+    plan = RebuildPlan(next_number=manifest.next_number)
+    matcher = SequenceMatcher(None, [entry.fingerprint for entry in entries], fingerprints, autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == "equal":
+            for old, new in zip(range(old_start, old_end), range(new_start, new_end)):
+                entry = entries[old]
+                if entry.item is not None:
+                    plan.reuse[new + 1] = entry
+                else:
+                    _redo(plan, new + 1, entry)
+            continue
+        # replace / insert / delete：成对的视为原位改动，多出的新块为新增，多出的旧块为删除
+        paired = min(old_end - old_start, new_end - new_start)
+        for offset in range(paired):
+            _redo(plan, new_start + offset + 1, entries[old_start + offset])
+        for new in range(new_start + paired, new_end):
+            plan.pending.append(new + 1)
+            plan.added.append(new + 1)
+        plan.removed += (old_end - old_start) - paired
+    plan.pending.sort()
+    return plan
+
+
+def _redo(plan: RebuildPlan, position: int, entry: ManifestEntry) -> None:
+    plan.pending.append(position)
+    if entry.code:
+        plan.inherit[position] = entry.code
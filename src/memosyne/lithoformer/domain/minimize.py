@@ -0,0 +1,121 @@
+"""
+Lithoformer Domain - Input minimization
+
+LMS 导出的题目块带有大量对解析无用、却计入提示词 Token 的噪声。
+调用 LLM 之前先精简每个题目块：
+
+- 内嵌图片（base64 data URI、Markdown / HTML 图片）替换为 §Pic.N§ 占位，
+  原文保存在旁表中；编号在整份输入中唯一，接在已有占位编号之后
+- 删除成绩页残留：单独成行的 "Correct answer:" / "Incorrect answer:"、行尾的 ", Not Selected"
+- 规范空白：不换行空格 / 零宽字符、行内连续空白、行首尾空白、三个以上连续换行
+
+QuizFormatter 在输出时仍会清理同类残留；这里在源头去掉，既省 Token，
+也让更多题目块通过本地预解析（preparse 遇到残留会回退到完整提示词）。
+输出需要原图时用 restore_pictures 按旁表还原。
+"""
+import re
+from dataclasses import dataclass, field
+
+_PICTURE = re.compile(
+    r"!\[[^\]\n]*\]\([^)\n]*\)"  # Markdown 图片（含 data URI）
+    r"|<img\b[^>]*>"  # HTML 图片
+    r"|data:image/[\w.+-]+;base64,[A-Za-z0-9+/=]+",  # 裸 data URI
+    re.IGNORECASE,
+)
+_PLACEHOLDER = re.compile(r"§Pic\.(\d+)§")
+_GRADE_LINE = re.compile(r"^(Correct|Incorrect)\s*answer:$", re.IGNORECASE)
+_NOT_SELECTED = re.compile(r",\s*Not Selected\s*$", re.IGNORECASE)
+_INVISIBLE = re.compile(r"[\u200b\u200c\u200d\u2060\ufeff]")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0\u3000]+")
+_EXCESS_BREAKS = re.compile(r"\n{3,}")
+
+_FIELDS = ("context", "question", "answer")
+
+
+@dataclass(slots=True)
+class MinimizedBlock:
+    """
+    精简后的题目块
+
+    Attributes:
+        block: 精简后的题目块（发给 LLM）
+        original: 原始题目块
+        pictures: 占位符（"§Pic.N§"）→ 原始图片文本
+    """
+
+    block: dict[str, str]
+    original: dict[str, str]
+    pictures: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return self.block != self.original
+
+
+def minimize_text(text: str, pictures: dict[str, str], next_picture: int) -> tuple[str, int]:
+    """
+    精简一段文本，新图片登记到 pictures，返回 (精简后文本, 下一个图片编号)
+
+    Example:
+        >>> minimize_text("Pick one:  \\n![x](data:image/png;base64,iVBOR)\\nA. Yes, Not Selected", {}, 1)
+        ('Pick one:\\n§Pic.1§\\nA. Yes', 2)
+    """
+    if not text:
+        return text, next_picture
+
+    def replace(match: re.Match) -> str:
+        nonlocal next_picture
+        placeholder = f"§Pic.{next_picture}§"
+        pictures[placeholder] = match.group(0)
+        next_picture += 1
+        return placeholder
+
+    text = _PICTURE.sub(replace, text)
+    text = _INVISIBLE.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    lines: list[str] = []
+    for raw in text.split("\n"):
+        line = _NOT_SELECTED.sub("", _INLINE_SPACE.sub(" ", raw)).strip()
+        if _GRADE_LINE.match(line):
+            continue
+        lines.append(line)
+    return _EXCESS_BREAKS.sub("\n\n", "\n".join(lines)).strip(), next_picture
+
+
+def minimize_block(block: dict[str, str], *, next_picture: int = 1) -> MinimizedBlock:
+    """精简单个题目块（图片从 next_picture 开始编号）"""
+    minimized = dict(block)
+    pictures: dict[str, str] = {}
+    for key in _FIELDS:
+        if key in block:
+            minimized[key], next_picture = minimize_text(block[key] or "", pictures, next_picture)
+    return MinimizedBlock(block=minimized, original=block, pictures=pictures)
+
+
+def minimize_blocks(blocks: list[dict[str, str]]) -> list[MinimizedBlock]:
+    """
+    精简整份输入的题目块（图片编号全局唯一，接在输入中已有的 §Pic.N§ 之后）
+
+    Example:
+        >>> results = minimize_blocks(split_markdown_into_questions(markdown))
+        >>> pictures = {k: v for result in results for k, v in result.pictures.items()}
+    """
+    existing = [
+        int(number)
+        for block in blocks
+        for key in _FIELDS
+        for number in _PLACEHOLDER.findall(block.get(key) or "")
+    ]
+    next_picture = max(existing, default=0) + 1
+    results: list[MinimizedBlock] = []
+    for block in blocks:
+        result = minimize_block(block, next_picture=next_picture)
+        next_picture += len(result.pictures)
+        results.append(result)
+    return results
+
+
+def restore_pictures(text: str, pictures: dict[str, str]) -> str:
+    """把精简时引入的 §Pic.N§ 占位还原为原始图片（输入中原有的占位保持不变）"""
+    if not pictures or not text:
+        return text
+    return _PLACEHOLDER.sub(lambda match: pictures.get(match.group(0), match.group(0)), text)
@@ -97,40 +97,55 @@ class QuizItem(BaseModel):
 
     def is_valid(self) -> bool:
         """Check if quiz item is valid"""
+        return not self.invalid_fields()
+
+    def invalid_fields(self) -> dict[str, str]:
+        """
+        Field-level counterpart of is_valid()
+
+        Returns:
+            {field name: reason} for every field that makes the item incomplete
+            (empty when the item is valid)
+        """
+        problems: dict[str, str] = {}
         if not self.stem:
-            return False
+            problems["stem"] = "stem is empty"
 
         if self.qtype == "MCQ":
-            if not (self.options.to_dict() and self.answer):
-                return False
+            if not self.options.to_dict():
+                problems["options"] = "MCQ has no options"
+            if not self.answer:
+                problems["answer"] = "MCQ has no answer"
         elif self.qtype == "CLOZE":
             if not self.cloze_answers:
-                return False
+                problems["cloze_answers"] = "CLOZE has no answers"
         elif self.qtype == "ORDER":
-            if not (self.steps and self.answer):
-                return False
+            if not self.steps:
+                problems["steps"] = "ORDER has no steps"
+            if not self.answer:
+                problems["answer"] = "ORDER has no answer"
         else:
-            return False
+            problems["qtype"] = f"unknown qtype: {self.qtype}"
 
-        if not self.analysis or not self.analysis.domain.strip():
-            return False
-        if not self.analysis.rationale.strip():
-            return False
+        if not self.analysis or not self.analysis.domain.strip() or not self.analysis.rationale.strip():
+            problems["analysis"] = "analysis must have a non-empty domain and rationale"
 
         if not self.stem_translation.strip():
-            return False
+            problems["stem_translation"] = "stem translation is empty"
 
         if self.qtype == "MCQ":
             if not any((self.options_translation.model_dump().get(letter) or "").strip() for letter in ["A", "B", "C", "D", "E", "F"]):
-                return False
+                problems["options_translation"] = "option translations are empty"
         elif self.qtype == "ORDER":
             if len(self.steps) != len(self.steps_translation):
-                return False
+                problems["steps_translation"] = f"expected {len(self.steps)} step translations, got {len(self.steps_translation)}"
         elif self.qtype == "CLOZE":
             if len(self.cloze_answers) != len(self.cloze_answers_translation):
-                return False
+                problems["cloze_answers_translation"] = (
+                    f"expected {len(self.cloze_answers)} cloze translations, got {len(self.cloze_answers_translation)}"
+                )
 
-        return True
+        return problems
 
     @model_validator(mode="after")
     def validate_answer_format(self):
@@ -0,0 +1,141 @@
+"""
+Lithoformer Domain - Local Pre-parser
+
+本地确定性解析格式规范的 ```Question``` / ```Answer``` 题目块：
+题型、题干、字母选项、排序步骤、填空答案与答案键全部在本地提取，
+LLM 只需补充翻译与解析（见 infrastructure.prompts 的 ENRICH 提示词）。
+
+只处理"有把握"的情形，其余返回 None 交给完整提示词：
+- MCQ：题干 + 从 a 起连续的字母选项（≥2 个且均有文本），答案为选项中的字母
+- ORDER：字母行 + 逗号分隔的字母序列答案（如 "B, A, C, D"）
+- CLOZE：无选项，题干空格（___）数量与答案行数一致
+- 含成绩页残留（Not Selected / Correct answer 等）、图片占位、无字母选项等一律回退
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Literal
+
+_OPTION_LINE = re.compile(r"^\s*([A-Fa-f])[.)]\s+(\S.*?)\s*$")
+_BARE_LETTER_LINE = re.compile(r"^\s*[A-Fa-f][.)]?\s*$")
+_BLANK = re.compile(r"_{3,}")
+_SEQUENCE_ANSWER = re.compile(r"^[A-Fa-f](\s*[,，]\s*[A-Fa-f])+\.?$")
+_SINGLE_ANSWER = re.compile(r"^\(?([A-Fa-f])[.)]?$")
+_ARTIFACTS = re.compile(
+    r"Not Selected|Correct answer|Incorrect answer|§Pic\.|\{\{", re.IGNORECASE
+)
+
+_LETTERS = "ABCDEF"
+
+
+@dataclass(slots=True)
+class PreparsedQuestion:
+    """本地解析结果（对应 QuizItem 的结构字段，不含翻译与解析）"""
+
+    qtype: Literal["MCQ", "CLOZE", "ORDER"]
+    stem: str
+    answer: str = ""
+    options: dict[str, str] = field(default_factory=lambda: dict.fromkeys(_LETTERS, ""))
+    steps: list[str] = field(default_factory=list)
+    cloze_answers: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """转为 QuizItem 字段字典（翻译字段由 LLM 补充）"""
+        return {
+            "qtype": self.qtype,
+            "stem": self.stem,
+            "steps": list(self.steps),
+            "options": dict(self.options),
+            "answer": self.answer,
+            "cloze_answers": list(self.cloze_answers),
+        }
+
+
+def _join_stem(lines: list[str]) -> str:
+    """题干多行以 <br> 连接（与完整提示词的换行约定一致）"""
+    return "<br>".join(line.strip() for line in lines if line.strip())
+
+
+def preparse_block(block: dict[str, str]) -> PreparsedQuestion | None:
+    """
+    尝试本地解析题目块
+
+    Args:
+        block: split_markdown_into_questions 产出的 {"context", "question", "answer"}
+
+    Returns:
+        PreparsedQuestion；无法确定时返回 None（回退到完整 LLM 解析）
+
+    Example:
+        >>> block = {"question": "Dendrites are\\n\\ta. glia\\n\\tb. input zone", "answer": "b"}
+        >>> preparse_block(block).answer
+        'B'
+    """
+    question = (block.get("question") or "").strip()
+    answer = (block.get("answer") or "").strip()
+    if not question or not answer or _ARTIFACTS.search(question):
+        return None
+
+    lines = question.splitlines()
+    answer_lines = [line.strip() for line in answer.splitlines() if line.strip()]
+
+    # 定位选项区：第一行字母选项之后必须全部是字母选项（允许空行）
+    first_option = next((i for i, line in enumerate(lines) if _OPTION_LINE.match(line)), None)
+
+    if first_option is None:
+        if any(_BARE_LETTER_LINE.match(line) for line in lines):
+            return None
+        return _preparse_cloze(lines, answer_lines)
+
+    stem_lines = lines[:first_option]
+    if not any(line.strip() for line in stem_lines):
+        return None
+
+    entries: list[tuple[str, str]] = []
+    for line in lines[first_option:]:
+        if not line.strip():
+            continue
+        match = _OPTION_LINE.match(line)
+        if not match:
+            return None
+        entries.append((match.group(1).upper(), match.group(2)))
+
+    letters = [letter for letter, _ in entries]
+    if len(entries) < 2 or letters != list(_LETTERS[: len(entries)]):
+        return None
+
+    if len(answer_lines) != 1:
+        return None
+    key = answer_lines[0]
+
+    if _SEQUENCE_ANSWER.match(key):
+        sequence = [ch.upper() for ch in re.findall(r"[A-Fa-f]", key)]
+        if sorted(sequence) != sorted(letters):
+            return None
+        return PreparsedQuestion(
+            qtype="ORDER",
+            stem=_join_stem(stem_lines),
+            steps=[f"{letter}. {text}" for letter, text in entries],
+            answer=",".join(sequence),
+        )
+
+    single = _SINGLE_ANSWER.match(key)
+    if not single or single.group(1).upper() not in letters:
+        return None
+
+    options = dict.fromkeys(_LETTERS, "")
+    options.update(entries)
+    return PreparsedQuestion(
+        qtype="MCQ",
+        stem=_join_stem(stem_lines),
+        options=options,
+        answer=single.group(1).upper(),
+    )
+
+
+def _preparse_cloze(lines: list[str], answer_lines: list[str]) -> PreparsedQuestion | None:
+    stem = _join_stem(lines)
+    blanks = len(_BLANK.findall(stem))
+    # 答案行数与空格数不一致（如同义备选答案）时交给 LLM 判断
+    if blanks == 0 or blanks != len(answer_lines):
+        return None
+    return PreparsedQuestion(qtype="CLOZE", stem=stem, cloze_answers=answer_lines)
@@ -10,9 +10,14 @@ Business rules:
 1. Quiz validation (check completeness)
 2. Title inference from filename
 3. Quiz type detection
+4. Low-confidence detection (drives model cascade escalation)
+5. Block size (predicted cost for longest-first dispatch)
 """
 import re
 from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
 
 from .models import QuizItem
 
@@ -74,6 +79,16 @@ def split_markdown_into_questions(markdown: str) -> list[dict[str, str]]:
     return blocks
 
 
+def block_weight(block: dict[str, str]) -> int:
+    """
+    题目块的预测处理成本（上下文 + 题目 + 答案的字符数）
+
+    提示词与输出（翻译、解析、干扰项）都随题目长度增长，字符数与单题耗时单调相关，
+    足以决定最长优先的派发顺序。
+    """
+    return sum(len(block.get(key) or "") for key in ("context", "question", "answer"))
+
+
 def is_quiz_item_valid(item: QuizItem) -> bool:
     """
     Check if quiz item is valid (complete)
@@ -92,6 +107,37 @@ def is_quiz_item_valid(item: QuizItem) -> bool:
     return item.is_valid()
 
 
+def find_invalid_fields(data: dict[str, Any]) -> tuple[QuizItem | None, dict[str, str]]:
+    """
+    Locate the fields that keep a normalized quiz dict from becoming a valid item
+
+    Combines Pydantic errors (schema / answer format) with the completeness rules
+    of QuizItem.invalid_fields(); used to drive field-level repair requests.
+
+    Args:
+        data: Normalized quiz dict
+
+    Returns:
+        (item, problems) - item is None when Pydantic rejects the dict;
+        problems maps top-level field names to reasons (empty when valid)
+
+    Example:
+        >>> item, problems = find_invalid_fields({"qtype": "MCQ", "stem": "Q?", "stem_translation": "", ...})
+        >>> problems
+        {'stem_translation': 'String should have at least 1 character'}
+    """
+    try:
+        item = QuizItem(**data)
+    except ValidationError as exc:
+        problems: dict[str, str] = {}
+        for error in exc.errors():
+            # model_validator 错误没有字段位置，唯一的 after 校验是答案格式
+            field = str(error["loc"][0]) if error["loc"] else "answer"
+            problems.setdefault(field, error["msg"])
+        return None, problems
+    return item, item.invalid_fields()
+
+
 def filter_valid_items(items: list[QuizItem]) -> list[QuizItem]:
     """
     Filter out invalid quiz items
@@ -110,6 +156,35 @@ def filter_valid_items(items: list[QuizItem]) -> list[QuizItem]:
     return [item for item in items if item.is_valid()]
 
 
+def low_confidence_reasons(item: QuizItem, *, min_rationale_chars: int = 40) -> list[str]:
+    """
+    Flag a valid item whose content looks too thin to trust (model cascade escalation)
+
+    Args:
+        item: Quiz item that already passed is_valid()
+        min_rationale_chars: Minimum rationale length
+
+    Returns:
+        List of suspicious field names (empty when the item looks trustworthy)
+
+    Example:
+        >>> low_confidence_reasons(item_with_one_word_rationale)
+        ['analysis.rationale']
+    """
+    reasons: list[str] = []
+    analysis = item.analysis
+    if analysis is None or len(analysis.rationale.strip()) < min_rationale_chars:
+        reasons.append("analysis.rationale")
+    if item.qtype == "MCQ":
+        options = item.options.to_dict()
+        if any(letter not in options for letter in item.answer):
+            reasons.append("answer")
+        # With several options, at least one distractor should be explained
+        if len(options) > 1 and analysis is not None and not analysis.distractors:
+            reasons.append("analysis.distractors")
+    return reasons
+
+
 def infer_titles_from_markdown(markdown: str) -> tuple[str, str]:
     """
     Infer titles from Markdown content
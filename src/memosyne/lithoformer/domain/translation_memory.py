@@ -0,0 +1,118 @@
+"""
+Lithoformer Domain - Translation Memory rules
+
+选项 / 步骤中的高频片段（"All of the above"、"True"、DSM 诊断名等）
+在题库中反复出现。翻译记忆以"规范化英文片段 → 简体中文"保存已验证的译文：
+
+- 调用前：查出已知片段，提示模型对应翻译字段留空（少生成 Token）
+- 调用后：用记忆补全留空的翻译（模型已给出的译文优先）
+- 校验通过后：把题目中的片段译文收入记忆
+
+本模块只定义规则（规范化、槽位、补全、收集），存储由 Infrastructure 实现。
+"""
+import re
+from typing import Any, Iterable, Mapping
+
+from .models import QuizItem
+
+_LETTERS = "ABCDEF"
+_LABEL = re.compile(r"^\s*(?:[A-Fa-f]|\d{1,2})[.)．、]\s*")
+_SPACE = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s.。;；]+$")
+
+# 过长的片段几乎不会重复出现，不进入记忆
+MAX_SEGMENT_CHARS = 160
+
+
+def normalize_segment(text: str) -> str:
+    """
+    规范化英文片段（去掉字母 / 数字标号、统一空白与大小写、去掉句末标点）
+
+    Example:
+        >>> normalize_segment("D.  All of the above.")
+        'all of the above'
+    """
+    text = _LABEL.sub("", (text or "").replace("<br>", " "))
+    text = _TRAILING.sub("", _SPACE.sub(" ", text).strip())
+    return text.casefold()
+
+
+def strip_label(text: str) -> str:
+    """去掉译文开头的字母 / 数字标号（步骤译文可能带 "A. "）"""
+    return _LABEL.sub("", text or "").strip()
+
+
+def translation_slots(data: Mapping[str, Any]) -> dict[str, str]:
+    """
+    需要翻译的片段槽位 → 原文
+
+    槽位键：选项用字母（"A"），步骤用 "step:<序号>"（从 1 开始）。
+    """
+    slots: dict[str, str] = {}
+    for letter, text in (data.get("options") or {}).items():
+        if str(text or "").strip():
+            slots[str(letter).upper()] = str(text)
+    for position, text in enumerate(data.get("steps") or [], start=1):
+        if str(text or "").strip():
+            slots[f"step:{position}"] = str(text)
+    return slots
+
+
+def lookup_keys(data: Mapping[str, Any]) -> list[str]:
+    """题目中可查询记忆的规范化片段（去重，跳过过长片段）"""
+    keys: list[str] = []
+    for text in translation_slots(data).values():
+        key = normalize_segment(text)
+        if key and len(key) <= MAX_SEGMENT_CHARS and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def known_slots(data: Mapping[str, Any], memory: Mapping[str, str]) -> dict[str, str]:
+    """记忆中已有译文的槽位 → 译文"""
+    known: dict[str, str] = {}
+    for slot, text in translation_slots(data).items():
+        translation = memory.get(normalize_segment(text))
+        if translation:
+            known[slot] = translation
+    return known
+
+
+def fill_from_memory(data: dict[str, Any], memory: Mapping[str, str]) -> list[str]:
+    """
+    用记忆补全留空的选项 / 步骤译文（原地修改，返回被补全的槽位）
+
+    需在翻译字段对齐之后调用（options_translation 含 A-F，steps_translation 与 steps 等长）。
+    """
+    if not memory:
+        return []
+    filled: list[str] = []
+    options_translation = data.get("options_translation") or {}
+    steps_translation = data.get("steps_translation") or []
+    for slot, translation in known_slots(data, memory).items():
+        if slot.startswith("step:"):
+            position = int(slot.split(":", 1)[1]) - 1
+            if position < len(steps_translation) and not str(steps_translation[position] or "").strip():
+                steps_translation[position] = translation
+                filled.append(slot)
+        elif not str(options_translation.get(slot) or "").strip():
+            options_translation[slot] = translation
+            filled.append(slot)
+    return filled
+
+
+def harvest_pairs(item: QuizItem) -> list[tuple[str, str]]:
+    """从已验证的题目收集 (规范化英文片段, 译文)"""
+    pairs: list[tuple[str, str]] = []
+    options = item.options.model_dump()
+    options_translation = item.options_translation.model_dump()
+    sources: Iterable[tuple[str, str]] = [
+        *((options[letter], options_translation.get(letter, "")) for letter in _LETTERS),
+        *zip(item.steps, item.steps_translation),
+    ]
+    for english, chinese in sources:
+        key = normalize_segment(english)
+        translation = strip_label(chinese)
+        if key and translation and len(key) <= MAX_SEGMENT_CHARS:
+            pairs.append((key, translation))
+    return pairs
@@ -1,6 +1,42 @@
 """Lithoformer Infrastructure Layer"""
-from .llm_adapter import LithoformerLLMAdapter
+from .llm_adapter import (
+    LithoformerLLMAdapter,
+    build_escalation_adapter,
+    build_stage_specs,
+    prompt_version,
+    quiz_generator,
+)
 from .file_adapter import FileAdapter
 from .formatter_adapter import FormatterAdapter
+from .manifest_store import ManifestStore
+from .sidecar import (
+    SidecarHeader,
+    SidecarRecord,
+    build_records,
+    read_sidecar,
+    records_from_manifest,
+    render_sidecar,
+    sidecar_path,
+    write_sidecar,
+)
+from .planning import plan_quiz
 
-__all__ = ["LithoformerLLMAdapter", "FileAdapter", "FormatterAdapter"]
+__all__ = [
+    "LithoformerLLMAdapter",
+    "FileAdapter",
+    "FormatterAdapter",
+    "ManifestStore",
+    "SidecarHeader",
+    "SidecarRecord",
+    "sidecar_path",
+    "build_records",
+    "records_from_manifest",
+    "write_sidecar",
+    "read_sidecar",
+    "render_sidecar",
+    "build_stage_specs",
+    "build_escalation_adapter",
+    "prompt_version",
+    "quiz_generator",
+    "plan_quiz",
+]
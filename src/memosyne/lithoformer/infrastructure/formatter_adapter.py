@@ -1,4 +1,7 @@
 """Lithoformer Infrastructure - Formatter Adapter"""
+from typing import Mapping
+
+from ..domain.minimize import restore_pictures
 from ..domain.models import QuizItem
 from .formatters.quiz_formatter import QuizFormatter
 
@@ -18,9 +21,15 @@ class FormatterAdapter:
         batch_code: str = "",
         question_start: int | None = None,
         question_prefix: str = "L",
+        pictures: Mapping[str, str] | None = None,
     ) -> str:
-        """Format quiz items"""
-        return self._formatter.format(
+        """
+        Format quiz items
+
+        pictures: placeholder side table from input minimization
+        (ParseQuizUseCase.pictures); placeholders are restored to the original images
+        """
+        text = self._formatter.format(
             items,
             title_main,
             title_sub,
@@ -28,6 +37,29 @@ class FormatterAdapter:
             question_start=question_start,
             question_prefix=question_prefix,
         )
+        return restore_pictures(text, dict(pictures or {}))
+
+    def question_codes(
+        self,
+        items: list[QuizItem],
+        *,
+        question_start: int | None = None,
+        question_prefix: str = "L",
+    ) -> list[tuple[str, QuizItem]]:
+        """Question codes (L-codes) matching the formatted output"""
+        return self._formatter.question_codes(
+            items,
+            question_start=question_start,
+            question_prefix=question_prefix,
+        )
+
+    def render(self, item: QuizItem, title_main: str, title_sub: str = "") -> str | None:
+        """Render one question without batch / question code (None for pseudo items)"""
+        return self._formatter.render(item, title_main, title_sub)
+
+    def stamp(self, body: str, *, batch_code: str = "", code: str = "") -> str:
+        """Append the batch code and question code to a rendered question"""
+        return self._formatter.stamp(body, batch_code=batch_code, code=code)
 
     @classmethod
     def create(cls) -> "FormatterAdapter":
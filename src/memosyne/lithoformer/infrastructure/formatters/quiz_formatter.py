@@ -284,6 +284,11 @@ def _extract_order_sequences_from_stem(stem: str) -> tuple[str, dict]:
 # ============================================================
 # QuizFormatter 类
 # ============================================================
+def _is_answer_summary(qtype: str, stem_en: str, options: dict) -> bool:
+    """是否为"答案总结句"伪题（格式化时跳过，不占题号）"""
+    return qtype != "CLOZE" and not _has_any_option_text(options) and bool(_ANS_SUMMARY_RE.search(stem_en))
+
+
 class QuizFormatter:
     """
     Quiz 格式化器
@@ -321,124 +326,149 @@ class QuizFormatter:
         Returns:
             格式化后的文本（ShouldBe.txt 格式）
         """
-        blocks = []
-        head = f"<b>{title_main}:<br>{title_sub}</b>"
+        bodies = [body for body in (self.render(item, title_main, title_sub) for item in items) if body is not None]
         base_number = question_start or 0
 
-        for idx, item in enumerate(items, start=1):
-            qtype = item.qtype.upper()
-            stem_en = item.stem.strip()
-            stem_cn = _normalize_translation_text(item.stem_translation)
-            steps = item.steps or []
-            steps_cn = [
-                _normalize_translation_text(text)
-                for text in (item.steps_translation or [])
-            ]
-            opts = item.options.model_dump()  # 转为 dict
-            opts_cn = {
-                key: _normalize_translation_text(value)
-                for key, value in item.options_translation.model_dump().items()
-            }
-            ans = item.answer.strip().upper()
-            cloz = item.cloze_answers or []
-
-            # 统一换行 & 图片占位
-            stem_en = _inject_pic_linebreaks(_normalize_linebreaks_to_br(stem_en))
-            # 清理题干垃圾
-            stem_en = _sanitize_stem(stem_en)
-
-            # 跳过"答案总结句"伪题（仅当非 CLOZE & 无选项文本）
-            if qtype != "CLOZE" and not _has_any_option_text(opts) and _ANS_SUMMARY_RE.search(stem_en):
-                continue
-
-            # —— CLOZE 误判兜底：有选项却是 CLOZE → 当 MCQ，且还原 {{...}} 为 _______ ——
-            if qtype == "CLOZE" and _has_any_option_text(opts):
-                qtype = "MCQ"
-                stem_en = _restore_underscores(stem_en)
-
-            if qtype == "CLOZE":
-                # 正常 CLOZE：按答案覆盖
-                stem_render_en = _replace_cloze(stem_en, cloz)
-                stem_render_en = _collapse_br(stem_render_en)
-                body = _combine_bilingual(stem_render_en, stem_cn)
-                analysis_html = _format_analysis(item)
-                blocks.append(f"{head}<br><br>{body}{analysis_html}")
-                continue
-
-            if qtype == "ORDER":
-                # 兜底：从 stem 提取序列选项（若 options 空）
-                if not _has_any_option_text(opts):
-                    stem_en, recovered = _extract_order_sequences_from_stem(stem_en)
-                    # 合并（仅填充空位）
-                    for k in ["A", "B", "C", "D", "E", "F"]:
-                        if not (opts.get(k) or "").strip():
-                            opts[k] = recovered.get(k, "")
-                # 从 stem 剔除 steps（避免重复）
-                stem_en = _strip_steps_from_stem(stem_en, steps)
-                # 渲染
-                lines = [f"[{_combine_bilingual(stem_en, stem_cn)}"]
-                for step_en, step_cn in zip(steps, steps_cn):
-                    s = _NOT_SELECTED.sub("", s).rstrip()
-                    if s and not _NAKED_LETTER.match(s):
-                        lines.append(f" {_combine_bilingual(s, step_cn)}")
-                # 标准化 & 输出序列选项
-                for letter in ["A", "B", "C", "D", "E", "F"]:
-                    text = (opts.get(letter) or "").strip()
-                    text_cn = (opts_cn.get(letter) or "").strip()
-                    if text:
-                        normalized_seq = _normalize_sequence(text)
-                        lines.append(f"{letter}. {_combine_bilingual(normalized_seq, text_cn)}")
-                lines.append(f"]::({ans})")
-                body = _collapse_br("<br>".join(lines))
-                analysis_html = _format_analysis(item)
-                blocks.append(f"{head}<br><br>{body}{analysis_html}")
-                continue
-
-            # MCQ：图题若选项全空 → 回填 A..D = "A/B/C/D"
-            if not _has_any_option_text(opts) and "§Pic." in stem:
-                for k, v in zip(["A", "B", "C", "D"], ["A", "B", "C", "D"]):
-                    opts[k] = v
-                    opts_cn.setdefault(k, "")
-
-            # 规范化选项文本（去内层前缀）
-            for k in list(opts.keys()):
-                if opts.get(k):
-                    opts[k] = _strip_option_prefix(opts[k])
+        question_blocks = [
+            self.stamp(body, batch_code=batch_code, code=f"{question_prefix}{base_number + offset:06d}")
+            for offset, body in enumerate(bodies, start=1)
+        ]
+        # 每题之间物理换行
+        return "\n".join(question_blocks)
 
-            # —— 去题干里的"重复选项句子" ——
-            stem_en = _remove_option_texts_from_stem(stem_en, opts)
-            stem_render = _combine_bilingual(stem_en, stem_cn)
+    def render(self, item: QuizItem, title_main: str, title_sub: str = "") -> str | None:
+        """
+        渲染单道题（不含批次号 / 题号）
 
-            # MCQ 渲染
-            lines = [f"[{stem_render}"]
+        Returns:
+            题目 HTML；"答案总结句"伪题返回 None（不输出、不占题号）
+        """
+        head = f"<b>{title_main}:<br>{title_sub}</b>"
+        qtype = item.qtype.upper()
+        stem_en = item.stem.strip()
+        stem_cn = _normalize_translation_text(item.stem_translation)
+        steps = item.steps or []
+        steps_cn = [
+            _normalize_translation_text(text)
+            for text in (item.steps_translation or [])
+        ]
+        opts = item.options.model_dump()  # 转为 dict
+        opts_cn = {
+            key: _normalize_translation_text(value)
+            for key, value in item.options_translation.model_dump().items()
+        }
+        ans = item.answer.strip().upper()
+        cloz = item.cloze_answers or []
+
+        # 统一换行 & 图片占位
+        stem_en = _inject_pic_linebreaks(_normalize_linebreaks_to_br(stem_en))
+        # 清理题干垃圾
+        stem_en = _sanitize_stem(stem_en)
+
+        # 跳过"答案总结句"伪题（仅当非 CLOZE & 无选项文本）
+        if _is_answer_summary(qtype, stem_en, opts):
+            return None
+
+        # —— CLOZE 误判兜底：有选项却是 CLOZE → 当 MCQ，且还原 {{...}} 为 _______ ——
+        if qtype == "CLOZE" and _has_any_option_text(opts):
+            qtype = "MCQ"
+            stem_en = _restore_underscores(stem_en)
+
+        if qtype == "CLOZE":
+            # 正常 CLOZE：按答案覆盖
+            stem_render_en = _replace_cloze(stem_en, cloz)
+            stem_render_en = _collapse_br(stem_render_en)
+            body = _combine_bilingual(stem_render_en, stem_cn)
+            analysis_html = _format_analysis(item)
+            return f"{head}<br><br>{body}{analysis_html}"
+
+        if qtype == "ORDER":
+            # 兜底：从 stem 提取序列选项（若 options 空）
+            if not _has_any_option_text(opts):
+                stem_en, recovered = _extract_order_sequences_from_stem(stem_en)
+                # 合并（仅填充空位）
+                for k in ["A", "B", "C", "D", "E", "F"]:
+                    if not (opts.get(k) or "").strip():
+                        opts[k] = recovered.get(k, "")
+            # 从 stem 剔除 steps（避免重复）
+            stem_en = _strip_steps_from_stem(stem_en, steps)
+            # 渲染
+            lines = [f"[{_combine_bilingual(stem_en, stem_cn)}"]
+            for step_en, step_cn in zip(steps, steps_cn):
+                s = _NOT_SELECTED.sub("", step_en).rstrip()
+                if s and not _NAKED_LETTER.match(s):
+                    lines.append(f" {_combine_bilingual(s, step_cn)}")
+            # 标准化 & 输出序列选项
             for letter in ["A", "B", "C", "D", "E", "F"]:
                 text = (opts.get(letter) or "").strip()
                 text_cn = (opts_cn.get(letter) or "").strip()
                 if text:
-                    lines.append(f"{letter}. {_combine_bilingual(text, text_cn)}")
+                    normalized_seq = _normalize_sequence(text)
+                    lines.append(f"{letter}. {_combine_bilingual(normalized_seq, text_cn)}")
             lines.append(f"]::({ans})")
             body = _collapse_br("<br>".join(lines))
             analysis_html = _format_analysis(item)
+            return f"{head}<br><br>{body}{analysis_html}"
+
+        # MCQ：图题若选项全空 → 回填 A..D = "A/B/C/D"
+        if not _has_any_option_text(opts) and "§Pic." in stem_en:
+            for k, v in zip(["A", "B", "C", "D"], ["A", "B", "C", "D"]):
+                opts[k] = v
+                opts_cn.setdefault(k, "")
+
+        # 规范化选项文本（去内层前缀）
+        for k in list(opts.keys()):
+            if opts.get(k):
+                opts[k] = _strip_option_prefix(opts[k])
+
+        # —— 去题干里的"重复选项句子" ——
+        stem_en = _remove_option_texts_from_stem(stem_en, opts)
+        stem_render = _combine_bilingual(stem_en, stem_cn)
+
+        # MCQ 渲染
+        lines = [f"[{stem_render}"]
+        for letter in ["A", "B", "C", "D", "E", "F"]:
+            text = (opts.get(letter) or "").strip()
+            text_cn = (opts_cn.get(letter) or "").strip()
+            if text:
+                lines.append(f"{letter}. {_combine_bilingual(text, text_cn)}")
+        lines.append(f"]::({ans})")
+        body = _collapse_br("<br>".join(lines))
+        analysis_html = _format_analysis(item)
+
+        return f"{head}<br><br>{body}{analysis_html}"
+
+    @staticmethod
+    def stamp(body: str, *, batch_code: str = "", code: str = "") -> str:
+        """在题目末尾追加右对齐的批次号与题号"""
+        meta_parts = []
+        if batch_code:
+            meta_parts.append(f"<div style=\"text-align: right;\">{batch_code}</div>")
+        if code:
+            meta_parts.append(f"<div style=\"text-align: right;\">{code}</div>")
+        return f"{body}{''.join(meta_parts)}"
+
+    def question_codes(
+        self,
+        items: list[QuizItem],
+        *,
+        question_start: int | None = None,
+        question_prefix: str = "L",
+    ) -> list[tuple[str, QuizItem]]:
+        """
+        计算每道题的题号（与 format 输出一致，伪题不占号）
 
-            blocks.append(f"{head}<br><br>{body}{analysis_html}")
-
-        if not blocks:
-            return ""
-
-        question_blocks: list[str] = []
-        for offset, block in enumerate(blocks, start=1):
-            code_number = base_number + offset
-            question_code = f"{question_prefix}{code_number:06d}"
-            meta_parts = []
-            if batch_code:
-                meta_parts.append(f"<div style=\"text-align: right;\">{batch_code}</div>")
-            if question_code:
-                meta_parts.append(f"<div style=\"text-align: right;\">{question_code}</div>")
-            metadata_html = "".join(meta_parts)
-            question_blocks.append(f"{block}{metadata_html}")
-
-        # 每题之间物理换行
-        return "\n".join(question_blocks)
+        Returns:
+            [(题号, QuizItem), ...]
+        """
+        base_number = question_start or 0
+        codes: list[tuple[str, QuizItem]] = []
+        for item in items:
+            stem_en = _sanitize_stem(_inject_pic_linebreaks(_normalize_linebreaks_to_br(item.stem.strip())))
+            if _is_answer_summary(item.qtype.upper(), stem_en, item.options.model_dump()):
+                continue
+            codes.append((f"{question_prefix}{base_number + len(codes) + 1:06d}", item))
+        return codes
 
 
 # ============================================================
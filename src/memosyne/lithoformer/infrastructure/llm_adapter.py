@@ -12,23 +12,62 @@ DDD 原则（Phase 4.6）：
 - Prompts 和 Schemas 属于子域业务逻辑
 - 不应放在 Shared Kernel 中
 - Adapter 负责组装完整的请求
+
+线上格式（wire_format）：
+- verbose：完整字段名 + 固定 A-F 选项对象（默认）
+- compact：短键 + 选项数组；响应在返回前解码为 verbose 字段
 """
-from typing import Any
+import hashlib
+import json
+from functools import cache
+from typing import Any, Literal
 
 from ...core.interfaces import LLMProvider, LLMError
-from .prompts import LITHOFORMER_SYSTEM_PROMPT, LITHOFORMER_USER_TEMPLATE
-from .schemas import QUESTION_SCHEMA
+from ...shared.infrastructure.llm import provider_for_model
+from ...shared.utils import get_metrics, get_tracer
+from ..application.pipeline import STAGES, StageSpec
+from ..domain.manifest import QuizGenerator
+from ..domain.preparse import preparse_block
+from . import prompts, schemas
+from .prompts import (
+    LITHOFORMER_ANALYSE_SYSTEM_PROMPT,
+    LITHOFORMER_COMPACT_KEY_LEGEND,
+    LITHOFORMER_ENRICH_SYSTEM_PROMPT,
+    LITHOFORMER_ENRICH_USER_TEMPLATE,
+    LITHOFORMER_KNOWN_TRANSLATIONS_NOTE,
+    LITHOFORMER_REPAIR_USER_TEMPLATE,
+    LITHOFORMER_STRUCTURE_SYSTEM_PROMPT,
+    LITHOFORMER_SYSTEM_PROMPT,
+    LITHOFORMER_TRANSLATE_SYSTEM_PROMPT,
+    LITHOFORMER_USER_TEMPLATE,
+)
+from .schemas import (
+    QUESTION_ANALYSIS_COMPACT_SCHEMA,
+    QUESTION_ANALYSIS_SCHEMA,
+    QUESTION_COMPACT_SCHEMA,
+    QUESTION_ENRICH_COMPACT_SCHEMA,
+    QUESTION_ENRICH_SCHEMA,
+    QUESTION_SCHEMA,
+    QUESTION_STRUCTURE_COMPACT_SCHEMA,
+    QUESTION_STRUCTURE_SCHEMA,
+    QUESTION_TRANSLATION_COMPACT_SCHEMA,
+    QUESTION_TRANSLATION_SCHEMA,
+    decode_question_compact,
+    question_repair_schema,
+)
 
 
 class LithoformerLLMAdapter:
     """Lithoformer LLM Adapter (implements LLMPort)"""
 
-    def __init__(self, provider: LLMProvider):
+    def __init__(self, provider: LLMProvider, wire_format: Literal["verbose", "compact"] = "verbose"):
         """
         Args:
             provider: LLM 提供商（OpenAI/Anthropic）
+            wire_format: 线上格式（verbose / compact）
         """
         self.provider = provider
+        self.wire_format = wire_format
 
     def parse_question(self, payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, int]]:
         """
@@ -44,55 +83,414 @@ class LithoformerLLMAdapter:
             LLMError: LLM 调用失败
         """
         try:
-            context = (payload.get("context") or "").strip()
-            question = (payload.get("question") or "").strip()
-            answer = (payload.get("answer") or "").strip()
+            user_prompt = self._question_prompt(payload)
+            return self._call(LITHOFORMER_SYSTEM_PROMPT, user_prompt, QUESTION_SCHEMA, QUESTION_COMPACT_SCHEMA)
+
+        except LLMError:
+            # LLM 错误直接向上传播
+            raise
+
+        except Exception as e:
+            # 其他错误包装为 LLMError
+            raise LLMError(f"LLM 调用失败：{e}") from e
+
+    def enrich_question(self, payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        为本地预解析的题目补充翻译与解析（实现 LLMPort.enrich_question）
+
+        Args:
+            payload: PreparsedQuestion.to_dict() 的字段 + context / index
 
-            if not question:
-                raise LLMError("题目内容为空，无法解析")
+        Returns:
+            (enrichment_dict, token_usage_dict) - 仅含翻译字段与 analysis
 
-            user_prompt = LITHOFORMER_USER_TEMPLATE.format(
-                context=context if context else "",
-                question=question,
-                answer=answer,
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        try:
+            user_prompt = self._structure_prompt(payload)
+            return self._call(
+                LITHOFORMER_ENRICH_SYSTEM_PROMPT, user_prompt, QUESTION_ENRICH_SCHEMA, QUESTION_ENRICH_COMPACT_SCHEMA
             )
 
-            # 调用底层 LLM Provider 的通用方法
-            llm_response, token_usage = self.provider.complete_structured(
-                system_prompt=LITHOFORMER_SYSTEM_PROMPT,
-                user_prompt=user_prompt,
-                schema=QUESTION_SCHEMA["schema"],
-                schema_name=QUESTION_SCHEMA["name"]
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise LLMError(f"LLM 调用失败：{e}") from e
+
+    def extract_structure(self, payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        分阶段流水线 - 结构阶段：只提取题型、题干、选项 / 步骤与答案
+
+        Args:
+            payload: 包含 context/question/answer 的字典
+
+        Returns:
+            (structure_dict, token_usage_dict)
+
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        try:
+            user_prompt = self._question_prompt(payload)
+            return self._call(
+                LITHOFORMER_STRUCTURE_SYSTEM_PROMPT,
+                user_prompt,
+                QUESTION_STRUCTURE_SCHEMA,
+                QUESTION_STRUCTURE_COMPACT_SCHEMA,
             )
 
-            if not isinstance(llm_response, dict):
-                raise LLMError("LLM 返回的数据格式不正确")
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise LLMError(f"LLM 调用失败：{e}") from e
+
+    def translate_question(self, payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        分阶段流水线 - 翻译阶段：为已解析的结构补充中文翻译
 
-            token_dict = {
-                "prompt_tokens": token_usage.prompt_tokens,
-                "completion_tokens": token_usage.completion_tokens,
-                "total_tokens": token_usage.total_tokens,
-            }
+        Args:
+            payload: 结构字段 + context / index
 
-            return llm_response, token_dict
+        Returns:
+            (translation_dict, token_usage_dict)
+
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        try:
+            user_prompt = self._structure_prompt(payload)
+            return self._call(
+                LITHOFORMER_TRANSLATE_SYSTEM_PROMPT,
+                user_prompt,
+                QUESTION_TRANSLATION_SCHEMA,
+                QUESTION_TRANSLATION_COMPACT_SCHEMA,
+            )
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise LLMError(f"LLM 调用失败：{e}") from e
+
+    def analyse_question(self, payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        分阶段流水线 - 解析阶段：为已解析的结构生成中文解析
+
+        Args:
+            payload: 结构字段 + context / index
+
+        Returns:
+            ({"analysis": {...}}, token_usage_dict)
+
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        try:
+            user_prompt = self._structure_prompt(payload)
+            return self._call(
+                LITHOFORMER_ANALYSE_SYSTEM_PROMPT,
+                user_prompt,
+                QUESTION_ANALYSIS_SCHEMA,
+                QUESTION_ANALYSIS_COMPACT_SCHEMA,
+            )
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise LLMError(f"LLM 调用失败：{e}") from e
+
+    def repair_question(
+        self,
+        payload: dict[str, Any],
+        problems: dict[str, str],
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        字段级修复：只重新生成未通过校验的字段（实现 LLMPort.repair_question）
+
+        子 Schema 只含出错字段，统一使用 verbose 字段名。
+
+        Args:
+            payload: 原始题目块（context/question/answer/index）+ "current"（当前解析结果）
+            problems: {字段名: 校验错误}
+
+        Returns:
+            (fixes_dict, token_usage_dict) - 只含需修复的字段
+
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        try:
+            fields = list(problems)
+            with get_tracer().span("prompt.build", index=payload.get("index"), repair=",".join(fields)):
+                user_prompt = LITHOFORMER_REPAIR_USER_TEMPLATE.format(
+                    context=(payload.get("context") or "").strip(),
+                    question=(payload.get("question") or "").strip(),
+                    answer=(payload.get("answer") or "").strip(),
+                    current=json.dumps(payload.get("current") or {}, ensure_ascii=False),
+                    problems="\n".join(f"- {field}: {reason}" for field, reason in problems.items()),
+                    fields=", ".join(fields),
+                )
+            fixes, token_dict = self._complete(LITHOFORMER_SYSTEM_PROMPT, user_prompt, question_repair_schema(fields))
+            return {key: value for key, value in fixes.items() if key in problems}, token_dict
 
         except LLMError:
-            # LLM 错误直接向上传播
             raise
 
         except Exception as e:
-            # 其他错误包装为 LLMError
             raise LLMError(f"LLM 调用失败：{e}") from e
 
+    @staticmethod
+    def _question_prompt(payload: dict[str, Any]) -> str:
+        """原始题目块 → 用户提示词"""
+        context = (payload.get("context") or "").strip()
+        question = (payload.get("question") or "").strip()
+        answer = (payload.get("answer") or "").strip()
+
+        if not question:
+            raise LLMError("题目内容为空，无法解析")
+
+        with get_tracer().span("prompt.build", index=payload.get("index")):
+            return LITHOFORMER_USER_TEMPLATE.format(context=context, question=question, answer=answer)
+
+    @staticmethod
+    def _structure_prompt(payload: dict[str, Any]) -> str:
+        """已解析的结构 → 用户提示词（翻译 / 解析共用；翻译记忆命中时附加跳过说明）"""
+        with get_tracer().span("prompt.build", index=payload.get("index")):
+            prompt = LITHOFORMER_ENRICH_USER_TEMPLATE.format(
+                context=(payload.get("context") or "").strip(),
+                qtype=payload["qtype"],
+                stem=payload["stem"],
+                body=_format_structure(payload),
+                answer=payload.get("answer") or "、".join(payload.get("cloze_answers") or []),
+            )
+            known = payload.get("known_translations")
+            if known:
+                prompt += LITHOFORMER_KNOWN_TRANSLATIONS_NOTE.format(slots=_format_known_slots(known))
+            return prompt
+
+    def _call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        compact_schema: dict[str, Any],
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        """按线上格式选择 Schema（compact 时追加键说明）"""
+        if self.wire_format == "compact":
+            return self._complete(
+                system_prompt + LITHOFORMER_COMPACT_KEY_LEGEND, user_prompt, compact_schema, compact=True
+            )
+        return self._complete(system_prompt, user_prompt, schema)
+
+    def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        *,
+        compact: bool = False,
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        # 调用底层 LLM Provider 的通用方法
+        with get_metrics().track_llm_call(
+            "lithoformer",
+            getattr(self.provider, "provider_name", type(self.provider).__name__),
+            getattr(self.provider, "model", ""),
+        ) as call:
+            llm_response, token_usage = self.provider.complete_structured(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                schema=schema["schema"],
+                schema_name=schema["name"]
+            )
+            call["usage"] = token_usage
+
+        if not isinstance(llm_response, dict):
+            raise LLMError("LLM 返回的数据格式不正确")
+        if compact:
+            llm_response = decode_question_compact(llm_response)
+
+        token_dict = {
+            "prompt_tokens": token_usage.prompt_tokens,
+            "completion_tokens": token_usage.completion_tokens,
+            "total_tokens": token_usage.total_tokens,
+            "cached_tokens": token_usage.cached_tokens,
+        }
+
+        return llm_response, token_dict
+
     @classmethod
-    def from_provider(cls, provider: LLMProvider) -> "LithoformerLLMAdapter":
+    def from_provider(
+        cls,
+        provider: LLMProvider,
+        wire_format: Literal["verbose", "compact"] = "verbose",
+    ) -> "LithoformerLLMAdapter":
         """
         工厂方法：从 LLM Provider 创建适配器
 
         Args:
             provider: LLM 提供商
+            wire_format: 线上格式（verbose / compact）
 
         Returns:
             LithoformerLLMAdapter 实例
         """
-        return cls(provider=provider)
+        return cls(provider=provider, wire_format=wire_format)
+
+
+def request_texts(
+    block: dict[str, str],
+    index: int = 1,
+    *,
+    wire_format: Literal["verbose", "compact"] = "verbose",
+    preparse: bool = True,
+    staged: bool = False,
+) -> list[str]:
+    """
+    单道题目将发送的全部请求文本（系统提示词 + 用户提示词 + Schema），供运行前估算 Token
+
+    与 ParseQuizUseCase 的调用路径一致：预解析成功时只有补充请求（分阶段模式为翻译 + 解析），
+    否则为整题解析（分阶段模式为结构 + 翻译 + 解析；结构未知时按原题文本近似）。不需要 Provider。
+    """
+    payload = {
+        "context": block.get("context", ""),
+        "question": block.get("question", ""),
+        "answer": block.get("answer", ""),
+        "index": str(index),
+    }
+    preparsed = preparse_block(block) if preparse else None
+    if preparsed is not None:
+        structure = {**preparsed.to_dict(), "context": payload["context"], "index": payload["index"]}
+    else:
+        structure = {"qtype": "", "stem": payload["question"], "answer": payload["answer"], **payload}
+
+    requests: list[tuple[str, str, dict[str, Any], dict[str, Any]]] = []
+    if staged:
+        if preparsed is None:
+            requests.append((
+                LITHOFORMER_STRUCTURE_SYSTEM_PROMPT,
+                LithoformerLLMAdapter._question_prompt(payload),
+                QUESTION_STRUCTURE_SCHEMA,
+                QUESTION_STRUCTURE_COMPACT_SCHEMA,
+            ))
+        prompt = LithoformerLLMAdapter._structure_prompt(structure)
+        requests.append((LITHOFORMER_TRANSLATE_SYSTEM_PROMPT, prompt, QUESTION_TRANSLATION_SCHEMA, QUESTION_TRANSLATION_COMPACT_SCHEMA))
+        requests.append((LITHOFORMER_ANALYSE_SYSTEM_PROMPT, prompt, QUESTION_ANALYSIS_SCHEMA, QUESTION_ANALYSIS_COMPACT_SCHEMA))
+    elif preparsed is not None:
+        requests.append((
+            LITHOFORMER_ENRICH_SYSTEM_PROMPT,
+            LithoformerLLMAdapter._structure_prompt(structure),
+            QUESTION_ENRICH_SCHEMA,
+            QUESTION_ENRICH_COMPACT_SCHEMA,
+        ))
+    else:
+        requests.append((
+            LITHOFORMER_SYSTEM_PROMPT,
+            LithoformerLLMAdapter._question_prompt(payload),
+            QUESTION_SCHEMA,
+            QUESTION_COMPACT_SCHEMA,
+        ))
+
+    texts = []
+    for system_prompt, user_prompt, schema, compact_schema in requests:
+        if wire_format == "compact":
+            system_prompt, schema = system_prompt + LITHOFORMER_COMPACT_KEY_LEGEND, compact_schema
+        texts.append("\n".join((system_prompt, user_prompt, json.dumps(schema["schema"], ensure_ascii=False))))
+    return texts
+
+
+@cache
+def prompt_version() -> str:
+    """提示词与 Schema 的指纹（任一常量改动后变化，增量重建据此判断旧结果是否可沿用）"""
+    constants = {
+        f"{module.__name__}.{name}": value
+        for module in (prompts, schemas)
+        for name, value in vars(module).items()
+        if name.isupper()
+    }
+    text = json.dumps(constants, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def quiz_generator(model: str, provider: str, wire_format: str) -> QuizGenerator:
+    """
+    本次运行的生成条件（写入增量重建清单）
+
+    Example:
+        >>> rebuilder.prepare(markdown, source=source, generator=quiz_generator(model, "openai", "compact"))
+    """
+    return QuizGenerator(model=model, provider=provider, wire_format=wire_format, prompt_version=prompt_version())
+
+
+def build_stage_specs(settings, adapter: LithoformerLLMAdapter) -> dict[str, StageSpec]:
+    """
+    按 Settings 组装分阶段流水线配置
+
+    未配置 LITHOFORMER_<STAGE>_MODEL 的阶段复用本次运行的 adapter；
+    配置了模型的阶段各自创建 Provider（沿用 adapter 的线上格式）。
+
+    Example:
+        >>> specs = build_stage_specs(settings, adapter)
+        >>> ParseQuizUseCase(llm=adapter, stages=specs, queue_size=settings.lithoformer_stage_queue_size)
+    """
+    specs: dict[str, StageSpec] = {}
+    for stage in STAGES:
+        llm = adapter
+        model_value = getattr(settings, f"lithoformer_{stage}_model")
+        if model_value:
+            provider = provider_for_model(settings, model_value)
+            llm = LithoformerLLMAdapter.from_provider(provider, wire_format=adapter.wire_format)
+        specs[stage] = StageSpec(
+            llm=llm,
+            concurrency=getattr(settings, f"lithoformer_{stage}_concurrency"),
+            retries=settings.lithoformer_stage_retries,
+        )
+    return specs
+
+
+def build_escalation_adapter(settings, adapter: LithoformerLLMAdapter) -> LithoformerLLMAdapter | None:
+    """
+    按 CASCADE_MODEL 创建模型级联的强模型适配器（沿用 adapter 的线上格式）
+
+    Returns:
+        未配置时返回 None（不启用级联）
+
+    Example:
+        >>> strong = build_escalation_adapter(settings, adapter)
+        >>> ParseQuizUseCase(llm=adapter, escalation_llm=strong)
+    """
+    model_value = settings.cascade_model
+    if not model_value:
+        return None
+    provider = provider_for_model(settings, model_value)
+    return LithoformerLLMAdapter.from_provider(provider, wire_format=adapter.wire_format)
+
+
+def _format_known_slots(known: dict[str, str]) -> str:
+    """{"A": ..., "step:2": ...} → 选项 A；步骤 2"""
+    options = [slot for slot in known if not slot.startswith("step:")]
+    steps = [slot.split(":", 1)[1] for slot in known if slot.startswith("step:")]
+    parts = []
+    if options:
+        parts.append("选项 " + "、".join(options))
+    if steps:
+        parts.append("步骤 " + "、".join(steps))
+    return "；".join(parts)
+
+
+def _format_structure(payload: dict[str, Any]) -> str:
+    """把预解析的选项 / 步骤 / 填空答案渲染为提示词片段"""
+    lines: list[str] = []
+    for letter, text in (payload.get("options") or {}).items():
+        if text:
+            lines.append(f"{letter}. {text}")
+    for step in payload.get("steps") or []:
+        lines.append(step)
+    cloze = payload.get("cloze_answers") or []
+    if cloze:
+        lines.append("填空答案（按空格顺序）：")
+        lines.extend(f"{i}. {text}" for i, text in enumerate(cloze, start=1))
+    return "\n".join(lines)
@@ -0,0 +1,44 @@
+"""Lithoformer Infrastructure - Manifest Store"""
+import hashlib
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from ..domain.manifest import QuizManifest
+
+
+class ManifestStore:
+    """
+    Incremental rebuild manifests as JSON files (implements ManifestPort)
+
+    One file per input: ``<stem>-<sha1(source)[:8]>.json``
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path_for(self, source: str) -> Path:
+        """Manifest file of an input"""
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:8]
+        return self.directory / f"{Path(source).stem}-{digest}.json"
+
+    def load(self, source: str) -> QuizManifest | None:
+        """Load the previous manifest (None if missing, unreadable or for another input)"""
+        path = self.path_for(source)
+        try:
+            manifest = QuizManifest.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError, ValidationError):
+            return None
+        return manifest if manifest.source == source else None
+
+    def save(self, manifest: QuizManifest) -> None:
+        """Write the manifest (atomic replace)"""
+        path = self.path_for(manifest.source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(manifest.model_dump_json(indent=1), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def from_settings(cls, settings) -> "ManifestStore":
+        return cls(settings.lithoformer_manifest_dir)
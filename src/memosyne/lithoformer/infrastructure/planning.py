@@ -0,0 +1,78 @@
+"""
+Lithoformer Infrastructure - Run Planner
+
+Pre-flight estimate for a quiz run: approximates every request a block will
+send (preparse / staged aware), calibrates against the analytics history and
+projects cost, wall time and a recommended concurrency (see shared.utils.planning).
+"""
+from typing import Literal
+
+from ...shared.infrastructure.llm import account_rate_limits
+from ...shared.infrastructure.storage import load_call_profile
+from ...shared.utils import RunPlan, approx_tokens, build_plan, get_provider_from_model
+from ..domain.minimize import minimize_blocks
+from .llm_adapter import request_texts
+
+# 无历史时每道题的补全 Token（翻译 + 解析占大头）
+_DEFAULT_COMPLETION = {"verbose": 500, "compact": 380}
+
+
+def plan_quiz(
+    settings,
+    blocks: list[dict[str, str]],
+    model: str,
+    *,
+    wire_format: Literal["verbose", "compact"] | None = None,
+    staged: bool | None = None,
+    concurrency: int | None = None,
+) -> RunPlan:
+    """
+    Estimate one Lithoformer run
+
+    Args:
+        settings: Settings
+        blocks: Question blocks (split_markdown_into_questions)
+        model: Model ID
+        wire_format: Wire format (None uses LLM_WIRE_FORMAT)
+        staged: Staged pipeline (None uses LITHOFORMER_STAGED)
+        concurrency: Concurrency for the duration estimate (None: 1, or the
+            narrowest stage in staged mode)
+
+    Example:
+        >>> plan = plan_quiz(settings, split_markdown_into_questions(markdown), "gpt-4o-mini")
+        >>> plan.to_dict()["cost"]
+    """
+    wire_format = wire_format or settings.llm_wire_format
+    staged = settings.lithoformer_staged if staged is None else staged
+    if concurrency is None:
+        concurrency = 1
+        if staged:
+            concurrency = min(
+                settings.lithoformer_structure_concurrency,
+                settings.lithoformer_translate_concurrency,
+                settings.lithoformer_analyse_concurrency,
+            )
+
+    if settings.lithoformer_minimize:
+        blocks = [result.block for result in minimize_blocks(blocks)]
+    estimates: list[int] = []
+    requests = 0
+    for index, block in enumerate(blocks, start=1):
+        texts = request_texts(
+            block, index, wire_format=wire_format, preparse=settings.lithoformer_preparse, staged=staged
+        )
+        requests += len(texts)
+        estimates.append(sum(approx_tokens(text) for text in texts))
+
+    rpm, tpm = account_rate_limits(get_provider_from_model(model), settings)
+    return build_plan(
+        "lithoformer",
+        model,
+        estimates,
+        profile=load_call_profile(settings, "lithoformer", model),
+        default_completion=_DEFAULT_COMPLETION.get(wire_format, 500),
+        default_calls_per_item=requests / len(blocks) if blocks else 1.0,
+        concurrency=concurrency,
+        rpm=rpm,
+        tpm=tpm,
+    )
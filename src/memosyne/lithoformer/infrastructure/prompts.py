@@ -3,6 +3,15 @@ Lithoformer Prompts - Quiz 解析提示词
 
 可通过 Settings 配置覆盖：
 - LITHOFORMER_SYSTEM_PROMPT
+
+ENRICH 提示词用于本地预解析成功的题目（domain.preparse）：
+结构字段已在本地提取，模型只返回翻译与解析。
+
+LITHOFORMER_COMPACT_KEY_LEGEND 在 compact 线上格式下追加到系统提示词末尾，
+说明短键与字段的对应关系（见 schemas.QUESTION_COMPACT_SCHEMA）。
+
+STRUCTURE / TRANSLATE / ANALYSE 提示词用于分阶段流水线（ParseQuizUseCase 的 staged 模式），
+翻译与解析阶段复用 ENRICH 用户模板渲染已解析的结构。
 """
 
 LITHOFORMER_SYSTEM_PROMPT = """You are a licensed clinical psychology exam tutor.
@@ -51,3 +60,120 @@ LITHOFORMER_USER_TEMPLATE = """以下提供单道题目及其标准答案，请
 {answer}
 ```
 """
+
+
+LITHOFORMER_ENRICH_SYSTEM_PROMPT = """You are a licensed clinical psychology exam tutor.
+
+The question below has ALREADY been parsed into its structure (type, stem, options/steps, answer key).
+Do NOT repeat the English stem, options or steps. Return STRICT JSON with ONLY the translations and the analysis.
+
+ANALYSIS REQUIREMENTS（全部使用简体中文）
+- analysis.domain: 简洁的学术或诊断标签（中文，例如 “焦虑障碍”）。
+- analysis.rationale: 用中文说明为什么正确答案正确，可引用 DSM-5-TR 或权威理论术语（英文术语可保留原文）。
+- analysis.key_points: 2-4 条中文关键知识点，每条 1-2 句补充背景或核心概念。
+- analysis.distractors: 针对每个错误选项（大写字母）给出中文理由，可引用原选项文本。
+- 语气专业、基于证据，可穿插必要的英文专有名词，但说明必须为中文。
+
+TRANSLATION FORMAT（全部使用简体中文）
+- `stem_translation`: 对完整题干的逐句翻译（保留 '____' 空格与 '<br>' 换行）。
+- `steps_translation`: 与给出的 steps 一一对应（无 steps 时为 []）。
+- `options_translation`: 逐项翻译 A-F 选项内容，未给出的选项填空字符串；无需包含选项字母。
+- `cloze_answers_translation`: 与给出的填空答案一一对应（无填空时为 []）。
+
+STRICT OUTPUT CONTRACT
+- 返回 EXACT JSON，且只能包含 schema 中定义的字段。
+- 绝不输出额外的文字、markdown 或注释。
+"""
+
+LITHOFORMER_ENRICH_USER_TEMPLATE = """以下题目已完成结构化解析，请只补充翻译与解析。
+
+{context}
+
+题型：{qtype}
+题干：
+{stem}
+{body}
+正确答案：{answer}
+"""
+
+
+LITHOFORMER_COMPACT_KEY_LEGEND = """
+WIRE FORMAT (overrides the field names above)
+- Use short keys: t=qtype, s=stem, st=stem_translation, sp=steps, spt=steps_translation, o=options, ot=options_translation, a=answer, c=cloze_answers, ct=cloze_answers_translation, an=analysis.
+- analysis keys: d=domain, r=rationale, k=key_points, x=distractors; each distractor is {"o": option letter, "r": reason}.
+- `o` / `ot` are ARRAYS in A, B, C… order listing only the choices that exist (no letters, no empty padding); use [] when there are no choices.
+- Keys not requested by the schema must be omitted; every other rule above still applies to the corresponding short key.
+"""
+
+
+# ============================================================
+# 分阶段流水线提示词（结构 → 翻译 → 解析，各阶段可使用不同模型）
+# ============================================================
+
+LITHOFORMER_STRUCTURE_SYSTEM_PROMPT = """You extract the STRUCTURE of one exam question. Do NOT translate and do NOT analyse.
+
+MANDATES
+- Copy stems, ordering steps and option texts VERBATIM; preserve punctuation and numbering. Represent explicit line breaks with '<br>'.
+- Treat every line that appears before the first labelled choice (A./B./C./...) as part of the stem, including long case vignettes, headers, and blank lines—never summarise, trim, or relocate this content.
+- NEVER move answer choices into the stem. Place every labelled choice (A-F) into the options object (unused keys -> empty string).
+- If the question contains lettered choices, treat it as MCQ even if the stem contains blanks '____'; the answer field MUST be the correct letter(s).
+- For true CLOZE questions (no choices) keep blanks as '____' in stem and list fills verbatim in cloze_answers; answer is "".
+- For ORDER questions place each ordered step (e.g. 'A. Step one') into steps and encode the correct order in answer (e.g. "B,A,C,D").
+
+STRICT OUTPUT CONTRACT
+- Return EXACT JSON with only the schema fields. No extra text, markdown or comments.
+"""
+
+LITHOFORMER_TRANSLATE_SYSTEM_PROMPT = """You translate one already-parsed exam question into Simplified Chinese. Do NOT analyse.
+
+TRANSLATION FORMAT（全部使用简体中文）
+- `stem_translation`: 对完整题干的逐句翻译（保留 '____' 空格与 '<br>' 换行）。
+- `steps_translation`: 与给出的 steps 一一对应（无 steps 时为 []）。
+- `options_translation`: 逐项翻译 A-F 选项内容，未给出的选项填空字符串；无需包含选项字母。
+- `cloze_answers_translation`: 与给出的填空答案一一对应（无填空时为 []）。
+- 翻译应忠实传达原意，保持与英文字段的结构和顺序对应。
+
+STRICT OUTPUT CONTRACT
+- 返回 EXACT JSON，且只能包含 schema 中定义的字段。
+- 绝不输出额外的文字、markdown 或注释。
+"""
+
+LITHOFORMER_ANALYSE_SYSTEM_PROMPT = """You are a licensed clinical psychology exam tutor. The question below has already been parsed; return ONLY the analysis.
+
+ANALYSIS REQUIREMENTS（全部使用简体中文）
+- analysis.domain: 简洁的学术或诊断标签（中文，例如 “焦虑障碍”）。
+- analysis.rationale: 用中文说明为什么正确答案正确，可引用 DSM-5-TR 或权威理论术语（英文术语可保留原文）。
+- analysis.key_points: 2-4 条中文关键知识点，每条 1-2 句补充背景或核心概念。
+- analysis.distractors: 针对每个错误选项（大写字母）给出中文理由，可引用原选项文本。
+- 语气专业、基于证据，可穿插必要的英文专有名词，但说明必须为中文。
+
+STRICT OUTPUT CONTRACT
+- 返回 EXACT JSON，且只能包含 schema 中定义的字段。
+- 绝不输出额外的文字、markdown 或注释。
+"""
+
+
+# 翻译记忆命中时追加到 ENRICH / TRANSLATE 用户提示词末尾
+LITHOFORMER_KNOWN_TRANSLATIONS_NOTE = """
+以下片段已有固定译文，系统会自动填入：{slots}。
+对应的翻译字段请输出空字符串（数组格式保留位置），不要重复翻译。
+"""
+
+
+# 字段级修复：只重新生成未通过校验的字段（系统提示词沿用 LITHOFORMER_SYSTEM_PROMPT）
+LITHOFORMER_REPAIR_USER_TEMPLATE = """以下题目已解析，但部分字段未通过校验，请只重新生成这些字段。
+
+原始题目：
+{context}
+{question}
+
+标准答案：
+{answer}
+
+当前解析结果（JSON）：
+{current}
+
+未通过校验的字段：
+{problems}
+
+只返回以下字段：{fields}。其余字段保持不变，不要输出。"""
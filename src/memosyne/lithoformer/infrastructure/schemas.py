@@ -9,7 +9,15 @@ Quiz Schema - Quiz 题目 JSON Schema
   - MCQ: options 必填，steps=[], cloze_answers=[], answer="A"-"F"
   - CLOZE: cloze_answers 必填，steps=[], options 可省略或填空字符串, answer=""
   - ORDER: steps 必填，options 可省略, cloze_answers=[], answer=""
+
+compact 线上格式（QUESTION_COMPACT_SCHEMA / QUESTION_ENRICH_COMPACT_SCHEMA）：
+- 短键（t/s/st/sp/spt/o/ot/a/c/ct/an），解析字段为 d/r/k/x
+- 选项以数组表示（按 A、B、C… 顺序，只列出实际存在的选项），不再输出固定 A-F 对象
+- decode_question_compact 在 Pydantic 校验前还原为 verbose 字段
 """
+from typing import Any
+
+_LETTERS = "ABCDEF"
 
 QUESTION_SCHEMA = {
     "name": "QuizQuestion",
@@ -125,3 +133,241 @@ QUESTION_SCHEMA = {
         ]
     }
 }
+
+
+# 本地预解析成功时使用的精简 Schema：只要翻译与解析，结构字段在本地合并
+QUESTION_ENRICH_SCHEMA = {
+    "name": "QuizEnrichment",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            name: QUESTION_SCHEMA["schema"]["properties"][name]
+            for name in (
+                "stem_translation",
+                "steps_translation",
+                "options_translation",
+                "cloze_answers_translation",
+                "analysis",
+            )
+        },
+        "required": [
+            "stem_translation",
+            "steps_translation",
+            "options_translation",
+            "cloze_answers_translation",
+            "analysis",
+        ],
+    },
+}
+
+
+# ============================================================
+# compact 线上格式
+# ============================================================
+
+# compact 键 → verbose 字段
+QUESTION_COMPACT_KEYS = {
+    "t": "qtype",
+    "s": "stem",
+    "st": "stem_translation",
+    "sp": "steps",
+    "spt": "steps_translation",
+    "o": "options",
+    "ot": "options_translation",
+    "a": "answer",
+    "c": "cloze_answers",
+    "ct": "cloze_answers_translation",
+    "an": "analysis",
+}
+
+ANALYSIS_COMPACT_KEYS = {
+    "d": "domain",
+    "r": "rationale",
+    "k": "key_points",
+    "x": "distractors",
+}
+
+_STRING_ARRAY = {"type": "array", "items": {"type": "string"}}
+
+_ANALYSIS_COMPACT = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "d": {"type": "string"},
+        "r": {"type": "string"},
+        "k": _STRING_ARRAY,
+        "x": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "properties": {
+                    "o": {"type": "string"},
+                    "r": {"type": "string"},
+                },
+                "required": ["o", "r"],
+            },
+        },
+    },
+    "required": ["d", "r", "k", "x"],
+}
+
+_COMPACT_PROPERTIES = {
+    "t": QUESTION_SCHEMA["schema"]["properties"]["qtype"],
+    "s": {"type": "string"},
+    "st": {"type": "string"},
+    "sp": _STRING_ARRAY,
+    "spt": _STRING_ARRAY,
+    "o": _STRING_ARRAY,
+    "ot": _STRING_ARRAY,
+    "a": {"type": "string"},
+    "c": _STRING_ARRAY,
+    "ct": _STRING_ARRAY,
+    "an": _ANALYSIS_COMPACT,
+}
+
+QUESTION_COMPACT_SCHEMA = {
+    "name": "QuizQuestionCompact",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": _COMPACT_PROPERTIES,
+        "required": list(_COMPACT_PROPERTIES),
+    },
+}
+
+QUESTION_ENRICH_COMPACT_SCHEMA = {
+    "name": "QuizEnrichmentCompact",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {key: _COMPACT_PROPERTIES[key] for key in ("st", "spt", "ot", "ct", "an")},
+        "required": ["st", "spt", "ot", "ct", "an"],
+    },
+}
+
+
+def _letters_to_dict(values: Any) -> Any:
+    """选项数组 → A-F 对象（不足补空字符串，超出 6 项截断）"""
+    if not isinstance(values, list):
+        return values
+    options = dict.fromkeys(_LETTERS, "")
+    for letter, text in zip(_LETTERS, values):
+        options[letter] = text
+    return options
+
+
+def _dict_to_letters(options: dict[str, str]) -> list[str]:
+    """A-F 对象 → 选项数组（去掉末尾的空选项）"""
+    values = [options.get(letter, "") for letter in _LETTERS]
+    while values and not values[-1]:
+        values.pop()
+    return values
+
+
+def decode_question_compact(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    compact 响应 → verbose 字段（QUESTION_SCHEMA / QUESTION_ENRICH_SCHEMA 形状）
+
+    未知键原样保留，交给 QuizItem 校验报错。
+    """
+    decoded: dict[str, Any] = {}
+    for key, value in data.items():
+        name = QUESTION_COMPACT_KEYS.get(key, key)
+        if name in ("options", "options_translation"):
+            value = _letters_to_dict(value)
+        elif name == "analysis" and isinstance(value, dict):
+            analysis = {ANALYSIS_COMPACT_KEYS.get(k, k): v for k, v in value.items()}
+            distractors = analysis.get("distractors")
+            if isinstance(distractors, list):
+                analysis["distractors"] = [
+                    {"option": d.get("o", ""), "reason": d.get("r", "")} if isinstance(d, dict) else d
+                    for d in distractors
+                ]
+            value = analysis
+        decoded[name] = value
+    return decoded
+
+
+def encode_question_compact(data: dict[str, Any]) -> dict[str, Any]:
+    """verbose 字段 → compact 键（用于基准测试与 Mock）"""
+    reverse = {full: short for short, full in QUESTION_COMPACT_KEYS.items()}
+    encoded: dict[str, Any] = {}
+    for name, value in data.items():
+        if name in ("options", "options_translation") and isinstance(value, dict):
+            value = _dict_to_letters(value)
+        elif name == "analysis" and isinstance(value, dict):
+            value = {
+                "d": value.get("domain", ""),
+                "r": value.get("rationale", ""),
+                "k": list(value.get("key_points", [])),
+                "x": [
+                    {"o": d.get("option", ""), "r": d.get("reason", "")}
+                    for d in value.get("distractors", [])
+                ],
+            }
+        encoded[reverse.get(name, name)] = value
+    return encoded
+
+
+# ============================================================
+# 分阶段流水线（结构 → 翻译 → 解析）
+# ============================================================
+
+def _verbose_subset(name: str, fields: tuple[str, ...]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {field: QUESTION_SCHEMA["schema"]["properties"][field] for field in fields},
+            "required": list(fields),
+        },
+    }
+
+
+def _compact_subset(name: str, fields: tuple[str, ...]) -> dict[str, Any]:
+    reverse = {full: short for short, full in QUESTION_COMPACT_KEYS.items()}
+    keys = [reverse[field] for field in fields]
+    return {
+        "name": name,
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {key: _COMPACT_PROPERTIES[key] for key in keys},
+            "required": keys,
+        },
+    }
+
+
+STRUCTURE_FIELDS = ("qtype", "stem", "steps", "options", "answer", "cloze_answers")
+TRANSLATION_FIELDS = ("stem_translation", "steps_translation", "options_translation", "cloze_answers_translation")
+ANALYSIS_FIELDS = ("analysis",)
+
+QUESTION_STRUCTURE_SCHEMA = _verbose_subset("QuizStructure", STRUCTURE_FIELDS)
+QUESTION_TRANSLATION_SCHEMA = _verbose_subset("QuizTranslation", TRANSLATION_FIELDS)
+QUESTION_ANALYSIS_SCHEMA = _verbose_subset("QuizAnalysis", ANALYSIS_FIELDS)
+
+QUESTION_STRUCTURE_COMPACT_SCHEMA = _compact_subset("QuizStructureCompact", STRUCTURE_FIELDS)
+QUESTION_TRANSLATION_COMPACT_SCHEMA = _compact_subset("QuizTranslationCompact", TRANSLATION_FIELDS)
+QUESTION_ANALYSIS_COMPACT_SCHEMA = _compact_subset("QuizAnalysisCompact", ANALYSIS_FIELDS)
+
+
+# ============================================================
+# 字段级修复（只重新生成未通过校验的字段）
+# ============================================================
+
+def question_repair_schema(fields: list[str]) -> dict[str, Any]:
+    """
+    字段级修复用的子 Schema
+
+    修复请求只含少数字段，统一使用 verbose 字段名（不随 wire_format 切换）。
+    """
+    properties = QUESTION_SCHEMA["schema"]["properties"]
+    return _verbose_subset("QuizRepair", tuple(field for field in fields if field in properties))
@@ -0,0 +1,122 @@
+"""
+Lithoformer Infrastructure - Structured sidecar
+
+Every run writes ``<output>.items.jsonl`` next to the ShouldBe ``.txt``:
+a header line (titles, batch, source) followed by one line per output question
+(L-code, batch code, validated QuizItem, picture placeholders used by the question).
+
+The sidecar is enough to regenerate the ``.txt`` with the current QuizFormatter,
+so formatter changes never require re-running the LLM (see cli.rerender).
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from pydantic import BaseModel, Field
+
+from ..domain.manifest import QuizManifest
+from ..domain.minimize import restore_pictures
+from ..domain.models import QuizItem
+from .formatter_adapter import FormatterAdapter
+
+SIDECAR_SUFFIX = ".items.jsonl"
+SIDECAR_VERSION = 1
+
+
+class SidecarHeader(BaseModel):
+    """First line of a sidecar"""
+
+    kind: str = "header"
+    version: int = SIDECAR_VERSION
+    title_main: str
+    title_sub: str = ""
+    batch_id: str = ""
+    source: str = ""  # input file name
+    model: str = ""  # model of this run (per-question model is SidecarRecord.model)
+
+
+class SidecarRecord(BaseModel):
+    """One output question"""
+
+    code: str
+    batch: str = ""  # batch code printed with the question (reused questions keep their original batch)
+    item: QuizItem
+    pictures: dict[str, str] = Field(default_factory=dict)
+    model: str = ""  # model that generated the item (reused questions keep their original model)
+
+
+def sidecar_path(output_path: Path) -> Path:
+    """``data/output/lithoformer/X.txt`` → ``data/output/lithoformer/X.items.jsonl``"""
+    return output_path.with_name(output_path.stem + SIDECAR_SUFFIX)
+
+
+def output_path_for(path: Path) -> Path:
+    """Inverse of sidecar_path"""
+    return path.with_name(path.name[: -len(SIDECAR_SUFFIX)] + ".txt")
+
+
+def build_records(
+    question_codes: Iterable[tuple[str, QuizItem]],
+    *,
+    batch_id: str,
+    pictures: Mapping[str, str] | None = None,
+    model: str = "",
+) -> list[SidecarRecord]:
+    """Records for a full run (FormatterAdapter.question_codes + ParseQuizUseCase.pictures)"""
+    records = []
+    for code, item in question_codes:
+        dumped = item.model_dump_json()
+        used = {key: value for key, value in (pictures or {}).items() if key in dumped}
+        records.append(SidecarRecord(code=code, batch=batch_id, item=item, pictures=used, model=model))
+    return records
+
+
+def records_from_manifest(manifest: QuizManifest, *, batch_id: str) -> list[SidecarRecord]:
+    """Records for an incremental run (QuizRebuilder.manifest, in output order)"""
+    return [
+        SidecarRecord(
+            code=entry.code, batch=entry.batch or batch_id, item=entry.item, pictures=entry.pictures, model=entry.model,
+        )
+        for entry in manifest.entries
+        if entry.item is not None and entry.code and entry.rendered
+    ]
+
+
+def write_sidecar(path: Path, header: SidecarHeader, records: Iterable[SidecarRecord]) -> Path:
+    """Write a sidecar (compact JSON, one object per line)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write(header.model_dump_json() + "\n")
+        for record in records:
+            fh.write(record.model_dump_json(exclude_defaults=True) + "\n")
+    return path
+
+
+def read_sidecar(path: Path) -> tuple[SidecarHeader, list[SidecarRecord]]:
+    """Read a sidecar (raises ValueError on a missing / unsupported header)"""
+    with path.open("r", encoding="utf-8") as fh:
+        lines = [line for line in fh if line.strip()]
+    if not lines:
+        raise ValueError(f"empty sidecar: {path}")
+    first = json.loads(lines[0])
+    if first.get("kind") != "header" or first.get("version", 0) > SIDECAR_VERSION:
+        raise ValueError(f"unsupported sidecar header: {path}")
+    header = SidecarHeader.model_validate(first)
+    return header, [SidecarRecord.model_validate_json(line) for line in lines[1:]]
+
+
+def render_sidecar(
+    header: SidecarHeader,
+    records: Iterable[SidecarRecord],
+    formatter: FormatterAdapter | None = None,
+) -> str:
+    """Regenerate the ShouldBe text from a sidecar (no LLM calls)"""
+    formatter = formatter or FormatterAdapter.create()
+    texts = []
+    for record in records:
+        body = formatter.render(record.item, header.title_main, header.title_sub)
+        if body is None:
+            continue
+        text = formatter.stamp(body, batch_code=record.batch or header.batch_id, code=record.code)
+        texts.append(restore_pictures(text, record.pictures))
+    return "\n".join(texts)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from rich.text import Text
 from textual.reactive import Reactive, reactive
@@ -22,6 +22,29 @@ class QuestionRow:
     output_chars: int = 0
     elapsed: float = 0.0
     error: str | None = None
+    stages: dict[str, str] = field(default_factory=dict)
+
+
+# 分阶段流水线：阶段缩写与状态符号
+_STAGE_LABELS = {"structure": "S", "translate": "T", "analyse": "A"}
+_STAGE_SYMBOLS = {
+    "pending": "·",
+    "running": "…",
+    "retrying": "↻",
+    "done": "✓",
+    "local": "L",
+    "failed": "✗",
+    "skipped": "-",
+}
+
+
+def format_stages(stages: dict[str, str]) -> str:
+    """Render per-stage status, e.g. ``S✓ T… A·`` (empty when not staged)."""
+    return " ".join(
+        f"{label}{_STAGE_SYMBOLS.get(stages[name], '?')}"
+        for name, label in _STAGE_LABELS.items()
+        if name in stages
+    )
 
 
 class QuestionsTable(DataTable):
@@ -47,6 +70,7 @@ class QuestionsTable(DataTable):
         self.add_column("题型", key="qtype", width=10)
         self.add_column("输出字符数", key="output_chars", width=14)
         self.add_column("所用时间", key="elapsed", width=12)
+        self.add_column("阶段", key="stages", width=12)
 
     def clear(self) -> None:  # type: ignore[override]
         """Clear the table rows and reset the cursor."""
@@ -77,6 +101,7 @@ class QuestionsTable(DataTable):
             question.qtype,
             str(question.output_chars),
             f"{question.elapsed:.2f}s",
+            format_stages(question.stages),
             key=question.row_key,
         )
 
@@ -102,6 +127,10 @@ class QuestionsTable(DataTable):
         if elapsed is not None:
             self.update_cell(row_key, "elapsed", f"{elapsed:.2f}s")
 
+    def update_question_stages(self, row_key: str, stages: dict[str, str]) -> None:
+        """Update the per-stage status cell (staged pipeline)."""
+        self.update_cell(row_key, "stages", format_stages(stages))
+
     @staticmethod
     def _get_status_style(status: str) -> str:
         """Get the Rich style for a given status."""
@@ -114,4 +143,4 @@ class QuestionsTable(DataTable):
         return styles.get(status, "white")
 
 
-__all__ = ["QuestionRow", "QuestionsTable"]
+__all__ = ["QuestionRow", "QuestionsTable", "format_stages"]
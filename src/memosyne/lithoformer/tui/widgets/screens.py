@@ -6,6 +6,7 @@ import asyncio
 import inspect
 import logging
 import re
+import sqlite3
 import threading
 from dataclasses import dataclass
 from datetime import datetime
@@ -22,9 +23,18 @@ from textual.widgets import Button, Input, ProgressBar, RichLog, Static
 
 from ....core.models import TokenUsage
 from ....shared.config import get_settings
-from ....shared.infrastructure.llm import AnthropicProvider, OpenAIProvider
+from ....shared.infrastructure.llm import create_provider
+from ....shared.infrastructure.storage import (
+    check_columnar_format,
+    export_quiz_items,
+    open_memo_store,
+    open_run_recorder,
+    open_translation_memory,
+)
 from ....shared.utils import (
     BatchIDGenerator,
+    MetricsExporter,
+    RunPlan,
     generate_output_filename,
     get_provider_from_model,
     resolve_model_input,
@@ -37,8 +47,20 @@ from ...domain.services import (
     infer_titles_from_markdown,
     infer_question_seed,
     split_markdown_into_questions,
+    block_weight,
+)
+from ...infrastructure import (
+    FileAdapter,
+    FormatterAdapter,
+    LithoformerLLMAdapter,
+    SidecarHeader,
+    build_escalation_adapter,
+    build_records,
+    build_stage_specs,
+    plan_quiz,
+    sidecar_path,
+    write_sidecar,
 )
-from ...infrastructure import FileAdapter, FormatterAdapter, LithoformerLLMAdapter
 from ..constants import ASCII_LOGO
 from ..logging_utils import build_textual_handler
 from .filters import (
@@ -76,6 +98,7 @@ class DetectionResult:
     output_filename: str
     detected_at: datetime
     questions: list[QuestionRow]
+    plan: RunPlan | None = None
 
 
 class MainScreen(Screen):
@@ -114,6 +137,7 @@ class MainScreen(Screen):
         self._processed_count: int = 0
 
         self._run_task: asyncio.Task[None] | None = None
+        self._metrics_exporter: MetricsExporter | None = None
 
         self.logger = logging.getLogger("memosyne.lithoformer.tui")
 
@@ -301,6 +325,13 @@ class MainScreen(Screen):
         self.action_mode = "detect"
         self._reset_progress_bars()
 
+        try:
+            self._metrics_exporter = MetricsExporter.from_settings(self.settings).start()
+            if self._metrics_exporter.url:
+                self.logger.info("指标端点：%s", self._metrics_exporter.url)
+        except OSError as exc:
+            self.logger.warning("指标端点启动失败：%s", exc)
+
         self.logger.info("Lithoformer TUI 已启动")
 
     async def on_unmount(self) -> None:
@@ -308,6 +339,9 @@ class MainScreen(Screen):
         if self._log_handler:
             logging.getLogger().removeHandler(self._log_handler)
             self._log_handler = None
+        if self._metrics_exporter:
+            self._metrics_exporter.stop()
+            self._metrics_exporter = None
 
     # endregion ------------------------------------------------------------------
 
@@ -479,14 +513,44 @@ class MainScreen(Screen):
         self._processed_count = 0
         self._total_tokens = 0
 
-        use_case = ParseQuizUseCase(llm=adapter)
-        formatter = FormatterAdapter.create()
-        file_adapter = FileAdapter.create()
-
         if self._run_task:
             self.logger.warning("解析任务仍在运行，忽略新的 START 请求")
             return
 
+        recorder = open_run_recorder(
+            self.settings,
+            pipeline="lithoformer",
+            provider=detection.provider,
+            model=detection.model_id,
+            batch_id=detection.batch_id,
+            input_name=detection.file_path.name,
+        )
+        try:
+            stages = build_stage_specs(self.settings, adapter) if self.settings.lithoformer_staged else None
+            escalation = build_escalation_adapter(self.settings, adapter)
+        except Exception as exc:
+            self.logger.error("创建分阶段流水线 / 级联模型失败：%s", exc)
+            if recorder:
+                recorder.close()
+            self.action_mode = "detect"
+            self._set_action_state("detect")
+            return
+        use_case = ParseQuizUseCase(
+            llm=adapter,
+            recorder=recorder,
+            preparse=self.settings.lithoformer_preparse,
+            stages=stages,
+            queue_size=self.settings.lithoformer_stage_queue_size,
+            dispatch=self.settings.lithoformer_dispatch,
+            minimize=self.settings.lithoformer_minimize,
+            translation_memory=open_translation_memory(self.settings),
+            repair_rounds=self.settings.llm_repair_rounds,
+            escalation_llm=escalation,
+            min_rationale_chars=self.settings.cascade_min_rationale_chars,
+        )
+        formatter = FormatterAdapter.create()
+        file_adapter = FileAdapter.create()
+
         self._run_task = asyncio.create_task(
             self._process_questions(detection, use_case, formatter, file_adapter),
             name="LithoformerRunTask",
@@ -504,21 +568,12 @@ class MainScreen(Screen):
             items: list = []
             total_questions = len(detection.questions)
             running_tokens = TokenUsage()
+            preparsed_count = 0
 
-            for index, block in enumerate(detection.blocks, start=1):
-                self._mark_row_in_progress(index)
-                self._set_status(f"状态：解析第 {index}/{total_questions} 题…")
-                self._update_single_progress(reset=True)
-                await asyncio.sleep(0)
-
+            if use_case.staged:
                 try:
-                    event, running_tokens = await asyncio.to_thread(
-                        use_case.process_block,
-                        block,
-                        index,
-                        total_questions,
-                        running_tokens,
-                        show_spinner=False,
+                    items, preparsed_count = await self._process_staged(
+                        detection, use_case, formatter, total_questions
                     )
                 except Exception as exc:  # pragma: no cover - defensive
                     self.logger.error("解析过程中发生错误：%s", exc)
@@ -526,31 +581,87 @@ class MainScreen(Screen):
                     self.action_mode = "detect"
                     self._set_action_state("detect")
                     return
-
-                self._apply_event_to_row(event, formatter, detection.title_main, detection.title_sub)
-                if event.status == "success" and event.item:
-                    items.append(event.item)
-
-                self._processed_count += 1
-                self._total_tokens = running_tokens.total_tokens
-                self._update_single_progress(done=True)
-                self._update_total_progress(self._processed_count, total_questions)
-                self._refresh_stats(total_questions)
-                await asyncio.sleep(0)
+            else:
+                for index, block in enumerate(use_case.prepare_blocks(detection.blocks), start=1):
+                    self._mark_row_in_progress(index)
+                    self._set_status(f"状态：解析第 {index}/{total_questions} 题…")
+                    self._update_single_progress(reset=True)
+                    await asyncio.sleep(0)
+
+                    try:
+                        event, running_tokens = await asyncio.to_thread(
+                            use_case.process_block,
+                            block,
+                            index,
+                            total_questions,
+                            running_tokens,
+                            show_spinner=False,
+                        )
+                    except Exception as exc:  # pragma: no cover - defensive
+                        self.logger.error("解析过程中发生错误：%s", exc)
+                        self._set_status("状态：解析失败")
+                        self.action_mode = "detect"
+                        self._set_action_state("detect")
+                        return
+
+                    self._apply_event_to_row(event, formatter, detection.title_main, detection.title_sub)
+                    preparsed_count += event.preparsed
+                    if event.status == "success" and event.item:
+                        items.append(event.item)
+
+                    self._processed_count += 1
+                    self._total_tokens = running_tokens.total_tokens
+                    self._update_single_progress(done=True)
+                    self._update_total_progress(self._processed_count, total_questions)
+                    self._refresh_stats(total_questions)
+                    await asyncio.sleep(0)
 
             try:
                 output_dir = Path(self.output_path_input.value.strip() or self.settings.lithoformer_output_dir)
                 output_dir.mkdir(parents=True, exist_ok=True)
                 output_path = unique_path(output_dir / detection.output_filename)
                 sequence_source = self.sequence_input.value.strip() or detection.sequence
+                question_seed = infer_question_seed(sequence_source)
                 output_text = formatter.format(
                     items,
                     detection.title_main,
                     detection.title_sub,
                     batch_code=detection.batch_id,
-                    question_start=infer_question_seed(sequence_source),
+                    question_start=question_seed,
+                    pictures=use_case.pictures,
                 )
                 file_adapter.write_text(output_path, output_text)
+                question_codes = formatter.question_codes(items, question_start=question_seed)
+                records = build_records(
+                    question_codes, batch_id=detection.batch_id, pictures=use_case.pictures, model=detection.model_id
+                )
+                if self.settings.lithoformer_sidecar:
+                    write_sidecar(
+                        sidecar_path(output_path),
+                        SidecarHeader(
+                            title_main=detection.title_main,
+                            title_sub=detection.title_sub,
+                            batch_id=detection.batch_id,
+                            source=detection.file_path.name,
+                            model=detection.model_id,
+                        ),
+                        records,
+                    )
+                export_quiz_items(
+                    output_path,
+                    [(record.code, record.batch, record.item) for record in records],
+                    fmt=self.settings.columnar_format,
+                )
+                memo_store = open_memo_store(self.settings)
+                if memo_store:
+                    try:
+                        memo_store.add_quiz_items(
+                            question_codes,
+                            batch_id=detection.batch_id,
+                            source=output_path.name,
+                        )
+                    except sqlite3.Error as exc:
+                        self.logger.warning("生成记录库写入失败，已跳过：%s", exc)
             except Exception as exc:
                 self.logger.error("写入输出文件失败：%s", exc)
                 self._set_status("状态：写入失败")
@@ -559,19 +670,86 @@ class MainScreen(Screen):
                 return
 
             self.logger.info(
-                "解析完成：%s（成功 %d/%d，Tokens %s）",
+                "解析完成：%s（成功 %d/%d，本地预解析 %d，Tokens %s）",
                 detection.output_filename,
                 len(items),
                 total_questions,
+                preparsed_count,
                 f"{self._total_tokens:,}",
             )
+            if use_case.minimize_stats.get("minimized"):
+                self.logger.info(
+                    "输入精简：%d 题，约节省提示词 Tokens %s，图片占位 %d",
+                    use_case.minimize_stats["minimized"],
+                    f"{use_case.minimize_stats['minimized_tokens_saved']:,}",
+                    use_case.minimize_stats["pictures"],
+                )
             self._set_status("状态：解析完成")
         finally:
+            if use_case.recorder is not None:
+                use_case.recorder.close()
+            if use_case.translation_memory is not None:
+                use_case.translation_memory.close()
             self._run_start_time = None
             self.action_mode = "detect"
             self._set_action_state("detect")
             self._run_task = None
 
+    async def _process_staged(
+        self,
+        detection: DetectionResult,
+        use_case: ParseQuizUseCase,
+        formatter: FormatterAdapter,
+        total_questions: int,
+    ) -> tuple[list, int]:
+        """Run the staged pipeline in a worker thread; rows update as each stage changes."""
+        indexed: list[tuple[int, object]] = []
+        preparsed_count = 0
+
+        def on_stage(index: int, stage: str, status: str) -> None:
+            self.app.call_from_thread(self._apply_stage_status, index, stage, status)
+
+        def consume() -> None:
+            nonlocal preparsed_count
+            for event in use_case.stream_blocks(detection.blocks, on_stage=on_stage):
+                preparsed_count += event.preparsed
+                if event.status == "success" and event.item:
+                    indexed.append((event.index, event.item))
+                self.app.call_from_thread(
+                    self._apply_staged_event, event, formatter, detection, total_questions
+                )
+
+        self._set_status(f"状态：分阶段解析 {total_questions} 题…")
+        await asyncio.to_thread(consume)
+        # 完成顺序与题序不同，按题序归位
+        indexed.sort(key=lambda pair: pair[0])
+        return [item for _, item in indexed], preparsed_count
+
+    def _apply_stage_status(self, index: int, stage: str, status: str) -> None:
+        """Reflect a single stage transition in the table row."""
+        row = self._rows.get(index)
+        if not row:
+            return
+        row.stages[stage] = status
+        if row.status == "Pending":
+            row.status = "In Progress"
+            self.questions_table.update_question_status(row.row_key, "In Progress")
+        self.questions_table.update_question_stages(row.row_key, row.stages)
+
+    def _apply_staged_event(
+        self,
+        event: QuizProcessingEvent,
+        formatter: FormatterAdapter,
+        detection: DetectionResult,
+        total_questions: int,
+    ) -> None:
+        """Apply a completed question from the staged pipeline."""
+        self._apply_event_to_row(event, formatter, detection.title_main, detection.title_sub)
+        self._processed_count += 1
+        self._total_tokens = event.total_tokens.total_tokens
+        self._update_total_progress(self._processed_count, total_questions)
+        self._refresh_stats(total_questions)
+
     # region detection helpers ----------------------------------------------------
     def _detect_worker(
         self,
@@ -625,6 +803,12 @@ class MainScreen(Screen):
                 )
             )
 
+        try:
+            plan = plan_quiz(self.settings, blocks, model_id, wire_format=self.settings.llm_wire_format)
+        except Exception:  # 估算失败不影响检测
+            self.logger.debug("Run plan estimation failed", exc_info=True)
+            plan = None
+
         return DetectionResult(
             file_path=file_path,
             markdown=markdown,
@@ -639,6 +823,7 @@ class MainScreen(Screen):
             output_filename=output_filename,
             detected_at=datetime.now(),
             questions=questions,
+            plan=plan,
         )
 
     def _capture_detection(self, detection: DetectionResult) -> None:
@@ -693,6 +878,8 @@ class MainScreen(Screen):
             f"[bold cyan]输出文件[/] {escape(detection.output_filename)}",
             f"[bold cyan]检测时间[/] {detection.detected_at.strftime('%H:%M:%S')}",
         ]
+        if detection.plan is not None:
+            summary_lines.extend(f"[bold cyan]预估[/] {escape(line)}" for line in detection.plan.describe())
         panel.update("\n".join(summary_lines))
 
     # endregion ------------------------------------------------------------------
@@ -710,6 +897,10 @@ class MainScreen(Screen):
         if not row:
             return
 
+        if event.stages:
+            row.stages = dict(event.stages)
+            self.questions_table.update_question_stages(row.row_key, row.stages)
+
         if event.status == "success" and event.item:
             row.status = "Done"
             row.qtype = event.item.qtype or row.qtype
@@ -875,6 +1066,11 @@ class MainScreen(Screen):
         if missing:
             self.logger.error("以下字段不能为空：%s", ", ".join(missing))
             return False
+        try:
+            check_columnar_format(self.settings.columnar_format)
+        except ImportError as exc:
+            self.logger.error("%s", exc)
+            return False
         return True
 
     def _refresh_model_options(self, provider: str) -> None:
@@ -903,21 +1099,11 @@ class MainScreen(Screen):
 
     def _create_llm_adapter(self, provider: str, model_id: str) -> LithoformerLLMAdapter:
         """Create LLM adapter based on provider."""
-        if provider == "anthropic":
+        if provider == "anthropic" and self.settings.llm_cassette_mode != "replay":
             if not self.settings.anthropic_api_key:
                 raise RuntimeError("未配置 ANTHROPIC_API_KEY")
-            llm_provider = AnthropicProvider(
-                model=model_id,
-                api_key=self.settings.anthropic_api_key,
-                temperature=self.settings.default_temperature,
-            )
-        else:
-            llm_provider = OpenAIProvider(
-                model=model_id,
-                api_key=self.settings.openai_api_key,
-                temperature=self.settings.default_temperature,
-            )
-        return LithoformerLLMAdapter.from_provider(llm_provider)
+        llm_provider = create_provider(provider, model_id, self.settings)
+        return LithoformerLLMAdapter.from_provider(llm_provider, wire_format=self.settings.llm_wire_format)
 
     @staticmethod
     def _guess_question_number(block: dict[str, str], index: int) -> str:
@@ -934,7 +1120,7 @@ class MainScreen(Screen):
     @staticmethod
     def _measure_characters(block: dict[str, str]) -> int:
         """Measure the total characters for a block."""
-        return sum(len(block.get(key, "")) for key in ("context", "question", "answer"))
+        return block_weight(block)
 
     @staticmethod
     def _infer_sequence_from_path(path: Path) -> str:
@@ -59,6 +59,30 @@ class LLMPort(Protocol):
         """
         ...
 
+    def repair_term(
+        self,
+        word: str,
+        zh_def: str,
+        current: dict,
+        problems: dict[str, str],
+    ) -> tuple[dict, dict]:
+        """
+        字段级修复：只重新生成未通过校验的字段
+
+        Args:
+            word: 英文词条
+            zh_def: 中文释义
+            current: 上一次返回的术语信息
+            problems: {别名字段: 校验错误}
+
+        Returns:
+            (fixes_dict, token_usage_dict) - fixes_dict 只含需修复的字段
+
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        ...
+
 
 # ============================================================
 # Term Repository Port - 术语存储能力
@@ -14,19 +14,27 @@ Reanimator Application Use Cases - 应用用例（业务协调）
 - 依赖端口接口（Protocol）
 - 不依赖具体实现（Adapter）
 """
-from typing import Iterable
+import time
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterable, Literal
+
+from pydantic import ValidationError
 
 from ..domain.models import TermInput, LLMResponse, TermOutput
 from ..domain.services import (
     apply_business_rules,
+    find_invalid_term_fields,
     get_chinese_tag,
     generate_memo_id,
+    low_confidence_reasons,
 )
 from .ports import LLMPort, TermListPort
 
 # 导入核心模型
-from ...core.models import ProcessResult, TokenUsage
-from ...shared.utils import Progress
+from ...core.interfaces import RunRecorder
+from ...core.models import CallRecord, ItemFailure, ProcessResult, TierUsage, TokenUsage
+from ...shared.utils import Progress, get_metrics, get_tracer, pop_call_model, pop_call_retries
 
 
 class ProcessTermsUseCase:
@@ -36,12 +44,18 @@ class ProcessTermsUseCase:
     业务流程：
     1. 接收术语输入列表
     2. 对每个术语：
-       a. 调用 LLM 生成术语信息
+       a. 调用 LLM 生成术语信息（字段校验失败时只就出错字段发起修复请求）
        b. 应用业务规则（POS 修正等）
        c. 映射英文标签到中文
        d. 生成 Memo ID
        e. 组装输出
-    3. 返回处理结果
+    3. 失败的术语（LLMError / 校验失败）进入重试队列，不中断其余术语；
+       全部处理完后按退避重试（可换用备用模型），仍失败的记入 failures
+    4. 成功的术语按输入顺序连续编号 Memo ID，返回处理结果（可部分成功）
+
+    模型级联（escalation_llm 非 None 时）：术语先交给 llm（便宜模型），
+    校验失败或结果可疑（见 low_confidence_reasons）时立即交给 escalation_llm 重做；
+    强模型也失败时保留便宜模型的可用结果。按层级（fast / strong / retry）统计 Token 与耗时。
 
     依赖注入：
     - llm: LLMPort（LLM 调用能力）
@@ -49,6 +63,10 @@ class ProcessTermsUseCase:
     - start_memo_index: 起始 Memo 编号
     - batch_id: 批次 ID
     - batch_note: 批次备注
+    - recorder: RunRecorder（可选，逐次记录调用用于历史分析）
+    - repair_rounds: 字段级修复的最大轮数（0 关闭）
+    - retry_rounds / retry_backoff / fallback_llm: 失败术语的延后重试
+    - escalation_llm / require_tag / min_definition_words: 模型级联
     """
 
     def __init__(
@@ -58,6 +76,14 @@ class ProcessTermsUseCase:
         start_memo_index: int,
         batch_id: str,
         batch_note: str = "",
+        recorder: RunRecorder | None = None,
+        repair_rounds: int = 2,
+        retry_rounds: int = 1,
+        retry_backoff: float = 2.0,
+        fallback_llm: LLMPort | None = None,
+        escalation_llm: LLMPort | None = None,
+        require_tag: bool = True,
+        min_definition_words: int = 4,
     ):
         """
         Args:
@@ -66,12 +92,28 @@ class ProcessTermsUseCase:
             start_memo_index: 起始 Memo 编号（如 2700 表示从 M002701 开始）
             batch_id: 批次 ID（如 "251007A015"）
             batch_note: 批次备注（可选）
+            recorder: 调用记录器（可选）
+            repair_rounds: 字段级修复的最大轮数（0 表示校验失败直接记为失败）
+            retry_rounds: 失败术语在全部处理完后的重试轮数（0 不重试）
+            retry_backoff: 第 N 轮重试前等待 retry_backoff × 2^(N-1) 秒
+            fallback_llm: 重试时使用的备用 LLM（None 沿用 escalation_llm 或 llm）
+            escalation_llm: 级联中的强模型（None 关闭级联）
+            require_tag: 级联时 TagEN 为空视为可疑
+            min_definition_words: 级联时 EnDef 少于该词数视为可疑
         """
         self.llm = llm
         self.term_list = term_list
         self.start_memo = start_memo_index
         self.batch_id = batch_id
         self.batch_note = f"「{batch_note.strip()}」" if batch_note else ""
+        self.recorder = recorder
+        self.repair_rounds = max(0, repair_rounds)
+        self.retry_rounds = max(0, retry_rounds)
+        self.retry_backoff = max(0.0, retry_backoff)
+        self.fallback_llm = fallback_llm
+        self.escalation_llm = escalation_llm
+        self.require_tag = require_tag
+        self.min_definition_words = max(0, min_definition_words)
 
     def execute(
         self,
@@ -86,11 +128,10 @@ class ProcessTermsUseCase:
             show_progress: 是否显示进度条
 
         Returns:
-            ProcessResult[TermOutput] - 包含结果列表和 token 统计
+            ProcessResult[TermOutput] - 包含结果列表、token 统计与最终失败的术语
 
-        Raises:
-            LLMError: LLM 调用失败
-            ValidationError: 数据验证失败
+        Note:
+            单个术语失败（LLMError / 校验失败）不会中断整批，最终失败的术语见 ProcessResult.failures
 
         Example:
             >>> use_case = ProcessTermsUseCase(
@@ -100,13 +141,12 @@ class ProcessTermsUseCase:
             ...     batch_id="251007A015"
             ... )
             >>> result = use_case.execute(terms)
-            >>> print(f"Processed {result.success_count} terms")
+            >>> print(f"Processed {result.success_count}/{result.total_count} terms")
         """
-        results: list[TermOutput] = []
-        total_tokens = TokenUsage()
-
-        # 尝试获取总数（避免强制转换为列表）
-        total = len(terms) if hasattr(terms, '__len__') else None
+        run = _RunState()
+        terms = list(terms)
+        total = len(terms)
+        metrics = get_metrics()
 
         # 配置进度条
         with Progress(
@@ -115,54 +155,279 @@ class ProcessTermsUseCase:
             unit="term",
             enabled=show_progress,
         ) as progress:
-            # 处理每个术语
+            metrics.set_queue_depth("reanimator", total)
+            # 处理每个术语（失败的进入重试队列，不中断其余术语）
             for index, term_input in enumerate(terms):
-                # 1. 调用 LLM（通过端口）
-                llm_dict, token_dict = self.llm.process_term(
+                escalate = self._attempt(run, index, term_input, self.llm, "fast")
+                if escalate and self.escalation_llm is not None:
+                    self._escalate(run, index, term_input, escalate)
+                progress.advance(desc=f"Processing [Tokens: {run.total_tokens.total_tokens:,}]")
+                if index not in run.pending:  # 队列深度 = 未处理 + 待重试
+                    metrics.record_item("reanimator", "success", remaining=total - index - 1 + len(run.pending))
+
+            # 延后重试：退避后（可换备用模型）再处理失败的术语
+            llm = self.fallback_llm or self.escalation_llm or self.llm
+            for round_no in range(1, self.retry_rounds + 1):
+                if not run.pending:
+                    break
+                delay = self.retry_backoff * 2 ** (round_no - 1)
+                with get_tracer().span("retry.round", round=round_no, pending=len(run.pending), delay=delay):
+                    time.sleep(delay)
+                    for index in sorted(run.pending):
+                        self._attempt(run, index, terms[index], llm, "retry")
+                        if index not in run.pending:
+                            metrics.record_item("reanimator", "success", remaining=len(run.pending))
+                        progress.set_postfix(重试=f"{round_no}/{self.retry_rounds}", 待处理=len(run.pending))
+
+        failures = [
+            ItemFailure(
+                index=index,
+                key=terms[index].word,
+                reason=run.pending[index],
+                attempts=run.attempts[index],
+                fields={"word": terms[index].word, "zh_def": terms[index].zh_def},
+            )
+            for index in sorted(run.pending)
+        ]
+        for _ in failures:
+            metrics.record_item("reanimator", "error", remaining=0)
+
+        # 成功的术语按输入顺序连续编号（Memo 区间只确认前 success_count 个）
+        results = [
+            output.model_copy(update={"memo_id": generate_memo_id(self.start_memo, position)})
+            for position, (_, output) in enumerate(sorted(run.outputs.items()))
+        ]
+
+        # 返回处理结果
+        return ProcessResult(
+            items=results,
+            success_count=len(results),
+            total_count=total,
+            token_usage=run.total_tokens,
+            stats={
+                **run.repair_stats,
+                "repair_prompt_tokens": run.repair_tokens.prompt_tokens,
+                "repair_completion_tokens": run.repair_tokens.completion_tokens,
+                "retried": sum(1 for count in run.attempts.values() if count > 1),
+                "rejected": len(failures),
+                "llm_retries": run.llm_retries,
+                **(run.cascade_stats() if self.escalation_llm is not None else {}),
+            },
+            failures=failures,
+        )
+
+    def _attempt(
+        self,
+        run: "_RunState",
+        index: int,
+        term_input: TermInput,
+        llm: LLMPort,
+        tier: str = "fast",
+    ) -> Literal["invalid", "low_confidence"] | None:
+        """
+        处理单个术语一次；成功写入 run.outputs，失败记入 run.pending（原因）
+
+        Returns:
+            级联升级原因：校验失败为 "invalid"，成功但结果可疑为 "low_confidence"，
+            其余（成功 / LLM 调用失败）为 None。只在 fast 层级判定可疑
+        """
+        if tier != "strong":  # 升级不算重试
+            run.attempts[index] = run.attempts.get(index, 0) + 1
+        tracer = get_tracer()
+        span_fields = {"index": index, "word": term_input.word, "attempt": run.attempts[index], "tier": tier}
+        with tracer.span("term", **span_fields) as term_span:
+            # 1. 调用 LLM（通过端口）
+            started = perf_counter()
+            try:
+                llm_dict, token_dict = llm.process_term(
                     word=term_input.word,
                     zh_def=term_input.zh_def
                 )
-
-                # 2. 累加 Token
-                tokens = TokenUsage(**token_dict)
-                total_tokens = total_tokens + tokens
-
-                # 3. 更新进度条
-                progress.advance(
-                    desc=f"Processing [Tokens: {total_tokens.total_tokens:,}]"
+            except Exception as exc:
+                retries = pop_call_retries()
+                run.llm_retries += retries
+                self._record_call(
+                    index, perf_counter() - started, TokenUsage(), "error", str(exc), retries,
+                    model=pop_call_model(), tier=tier,
                 )
+                run.tally(tier, TokenUsage(), perf_counter() - started)
+                run.pending[index] = f"LLM 调用失败：{exc}"
+                term_span.set(status="error")
+                return None
+            latency = perf_counter() - started
+            retries = pop_call_retries()
+            model = pop_call_model()
+
+            # 2. 累加 Token（失败的尝试同样计入）
+            tokens = TokenUsage(**token_dict)
+            run.total_tokens = run.total_tokens + tokens
+            term_span.set(total_tokens=tokens.total_tokens)
+
+            # 3. 转换为领域模型（自动验证；出错字段单独修复，不重跑整条提示词）
+            try:
+                with tracer.span("validate", index=index):
+                    llm_response, problems = find_invalid_term_fields(llm_dict)
+                if problems and self.repair_rounds:
+                    llm_dict, llm_response, used, calls = self._repair(index, term_input, llm_dict, problems, llm)
+                    retries += pop_call_retries()
+                    run.repair_tokens = run.repair_tokens + used
+                    run.total_tokens = run.total_tokens + used
+                    tokens = tokens + used
+                    run.repair_stats["repair_calls"] += calls
+                    run.repair_stats["repaired"] += llm_response is not None
+                if llm_response is None:
+                    llm_response = LLMResponse(**llm_dict)  # 抛出最终的校验错误
+
+                # 级联：便宜模型的结果可疑时（在业务规则清洗字段之前判定）交给强模型
+                doubts: list[str] = []
+                if self.escalation_llm is not None and tier == "fast":
+                    doubts = low_confidence_reasons(
+                        term_input.word,
+                        llm_response,
+                        require_tag=self.require_tag,
+                        min_definition_words=self.min_definition_words,
+                    )
+
+                with tracer.span("rules", index=index):
+                    # 4. 应用业务规则（领域服务）
+                    llm_response = apply_business_rules(term_input.word, llm_response)
+
+                    # 5. 映射英文标签到中文（领域服务）
+                    tag_cn = get_chinese_tag(llm_response.tag_en, self.term_list.mapping)
+
+                    # 6. 组装输出（Memo ID 在全部完成后按顺序重编）
+                    output = TermOutput.from_input_and_llm(
+                        term_input=term_input,
+                        llm_response=llm_response,
+                        memo_id=generate_memo_id(self.start_memo, index),
+                        tag_cn=tag_cn,
+                        batch_id=self.batch_id,
+                        batch_note=self.batch_note,
+                    )
+            except Exception as exc:
+                run.llm_retries += retries
+                run.tally(tier, tokens, perf_counter() - started)
+                self._record_call(index, latency, tokens, "invalid", str(exc), retries, model=model, tier=tier)
+                run.pending[index] = f"校验失败：{_describe_error(exc)}"
+                term_span.set(status="invalid")
+                return "invalid"
+            if doubts:
+                term_span.set(low_confidence=",".join(doubts))
+
+        run.outputs[index] = output
+        run.pending.pop(index, None)
+        run.llm_retries += retries
+        run.tally(tier, tokens, perf_counter() - started)
+        self._record_call(index, latency, tokens, "success", retries=retries, model=model, tier=tier)
+        return "low_confidence" if doubts else None
+
+    def _escalate(
+        self,
+        run: "_RunState",
+        index: int,
+        term_input: TermInput,
+        reason: Literal["invalid", "low_confidence"],
+    ) -> None:
+        """把术语交给强模型重做；强模型失败时保留便宜模型的可用结果（若有）"""
+        assert self.escalation_llm is not None
+        run.escalations[reason] += 1
+        with get_tracer().span("escalate", index=index, reason=reason):
+            fast_output = run.outputs.get(index)
+            self._attempt(run, index, term_input, self.escalation_llm, "strong")
+            if index in run.pending and fast_output is not None:
+                run.outputs[index] = fast_output
+                run.pending.pop(index)
+
+    def _repair(
+        self,
+        index: int,
+        term_input: TermInput,
+        llm_dict: dict,
+        problems: dict[str, str],
+        llm: LLMPort,
+    ) -> tuple[dict, LLMResponse | None, TokenUsage, int]:
+        """
+        字段级修复：只把出错字段发回模型，合并后重新校验，最多 repair_rounds 轮
 
-                # 4. 转换为领域模型（自动验证）
-                llm_response = LLMResponse(**llm_dict)
-
-                # 5. 应用业务规则（领域服务）
-                llm_response = apply_business_rules(term_input.word, llm_response)
-
-                # 6. 映射英文标签到中文（领域服务）
-                tag_cn = get_chinese_tag(llm_response.tag_en, self.term_list.mapping)
-
-                # 7. 生成 Memo ID（领域服务）
-                memo_id = generate_memo_id(self.start_memo, index)
-
-                # 8. 组装输出（领域模型工厂方法）
-                output = TermOutput.from_input_and_llm(
-                    term_input=term_input,
-                    llm_response=llm_response,
-                    memo_id=memo_id,
-                    tag_cn=tag_cn,
-                    batch_id=self.batch_id,
-                    batch_note=self.batch_note,
-                )
+        Returns:
+            (合并后的字典, 校验通过的 LLMResponse 或 None, 修复消耗的 Token, 修复调用次数)
+        """
+        used = TokenUsage()
+        current = dict(llm_dict)
+        calls = 0
+        with get_tracer().span("repair", index=index, fields=",".join(problems)) as span:
+            while problems and calls < self.repair_rounds:
+                calls += 1
+                try:
+                    fixes, token_dict = llm.repair_term(term_input.word, term_input.zh_def, current, problems)
+                except Exception:
+                    break
+                used = used + TokenUsage(**token_dict)
+                current.update({key: value for key, value in fixes.items() if key in problems})
+                llm_response, problems = find_invalid_term_fields(current)
+                if not problems:
+                    span.set(rounds=calls, repaired=True)
+                    return current, llm_response, used, calls
+            span.set(rounds=calls, repaired=False)
+        return current, None, used, calls
+
+    def _record_call(
+        self,
+        index: int,
+        latency: float,
+        tokens: TokenUsage,
+        outcome: Literal["success", "invalid", "error"],
+        error: str | None = None,
+        retries: int = 0,
+        *,
+        model: str | None = None,
+        tier: str | None = None,
+    ) -> None:
+        if self.recorder is None:
+            return
+        self.recorder.record(
+            CallRecord.from_usage(
+                index, latency, tokens, retries=retries, outcome=outcome, error=error, model=model, tier=tier
+            )
+        )
 
-                results.append(output)
 
-        # 返回处理结果
-        return ProcessResult(
-            items=results,
-            success_count=len(results),
-            total_count=len(results),
-            token_usage=total_tokens,
+def _describe_error(exc: Exception) -> str:
+    """Pydantic 校验错误压缩为「字段: 原因」，其它异常原样返回"""
+    if isinstance(exc, ValidationError):
+        return "；".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'model'}: {error['msg']}" for error in exc.errors()
         )
+    return str(exc)
+
+
+@dataclass
+class _RunState:
+    """单次 execute 的累计状态"""
+
+    outputs: dict[int, TermOutput] = field(default_factory=dict)
+    pending: dict[int, str] = field(default_factory=dict)  # 待重试 / 最终失败：序号 → 原因
+    attempts: dict[int, int] = field(default_factory=dict)
+    total_tokens: TokenUsage = field(default_factory=TokenUsage)
+    repair_tokens: TokenUsage = field(default_factory=TokenUsage)
+    repair_stats: dict[str, int] = field(default_factory=lambda: {"repaired": 0, "repair_calls": 0})
+    llm_retries: int = 0  # Provider 层重试次数（SDK / 策略层）
+    tiers: dict[str, TierUsage] = field(default_factory=dict)  # 级联层级 → 用量
+    escalations: dict[str, int] = field(default_factory=lambda: {"invalid": 0, "low_confidence": 0})
+
+    def tally(self, tier: str, tokens: TokenUsage, latency: float) -> None:
+        self.tiers[tier] = self.tiers.get(tier, TierUsage()).add(tokens, latency)
+
+    def cascade_stats(self) -> dict[str, int]:
+        """级联路由与分层用量（写入 ProcessResult.stats）"""
+        stats = {
+            "escalated": sum(self.escalations.values()),
+            "escalated_invalid": self.escalations["invalid"],
+            "escalated_low_confidence": self.escalations["low_confidence"],
+        }
+        for tier, usage in self.tiers.items():
+            stats.update(usage.to_stats(tier))
+        return stats
 
 
 # ============================================================
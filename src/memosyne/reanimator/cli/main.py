@@ -19,13 +19,22 @@ Architecture:
 from pathlib import Path
 
 from ...shared.config import get_settings
-from ...shared.infrastructure.llm import OpenAIProvider, AnthropicProvider
+from ...shared.infrastructure.llm import (
+    backend_usage,
+    create_provider,
+    hedge_stats,
+    hedge_unreported_usage,
+    key_usage,
+)
+from ...shared.infrastructure.storage import open_run_recorder
 from ...shared.utils import (
     BatchIDGenerator,
     resolve_model_input,
     get_provider_from_model,
     generate_output_filename,
     unique_path,
+    configure_tracing,
+    MetricsExporter,
 )
 from ...shared.cli.prompts import ask
 
@@ -35,6 +44,9 @@ from ..infrastructure import (
     ReanimatorLLMAdapter,
     CSVTermAdapter,
     TermListAdapter,
+    build_escalation_adapter,
+    build_fallback_adapter,
+    plan_terms,
 )
 
 
@@ -89,10 +101,24 @@ def resolve_model_choice(user_input: str, settings) -> tuple[str, str, str, str]
             return "openai", user_input, code, user_input.replace("-", " ").title()
 
 
+def _ask_start_memo() -> int | None:
+    """询问起始 Memo（留空 = 从 db/mmsdb 自动分配）"""
+    memo_str = ask(
+        "Starting Memo number (integer, e.g., 2700 for M002701; empty = auto-allocate):",
+        required=False,
+    )
+    if not memo_str:
+        return None
+    try:
+        return int(memo_str)
+    except ValueError:
+        raise ValueError("Starting Memo number must be an integer")
+
+
 def resolve_input_and_memo(
     user_path: str,
     default_dir: Path
-) -> tuple[Path, int]:
+) -> tuple[Path, int | None]:
     """
     Parse input path and starting Memo
 
@@ -101,7 +127,7 @@ def resolve_input_and_memo(
         default_dir: Default input directory
 
     Returns:
-        (input_path, start_memo_index)
+        (input_path, start_memo_index)；start_memo_index 为 None 表示自动分配
     """
     from ...shared.utils import resolve_input_path
 
@@ -116,21 +142,11 @@ def resolve_input_and_memo(
     # Contains .csv or path separator: ask for start Memo
     if ".csv" in s or any(ch in s for ch in ("/", "\\")):
         path = resolve_input_path(s, default_dir)
-        memo_str = ask("Starting Memo number (integer, e.g., 2700 for M002701):")
-        try:
-            memo = int(memo_str)
-        except ValueError:
-            raise ValueError("Starting Memo number must be an integer")
-        return path, memo
+        return path, _ask_start_memo()
 
     # Empty: use short.csv and ask for start Memo
     path = default_dir / "short.csv"
-    memo_str = ask("Starting Memo number (integer, e.g., 2700 for M002701):")
-    try:
-        memo = int(memo_str)
-    except ValueError:
-        raise ValueError("Starting Memo number must be an integer")
-    return path, memo
+    return path, _ask_start_memo()
 
 
 def main():
@@ -141,6 +157,7 @@ def main():
     try:
         settings = get_settings()
         settings.ensure_dirs()
+        tracer = configure_tracing(enabled=settings.trace_path is not None)
     except Exception as e:
         print(f"Configuration loading failed: {e}")
         print("Please check .env file and API keys")
@@ -166,18 +183,27 @@ def main():
     print(f"[Model   ] {model_id} ({model_display})")
     print(f"[Code    ] {model_code}")
     print(f"[Input   ] {input_path}")
-    print(f"[Start   ] Memo = {start_memo}")
+    print(f"[Start   ] Memo = {start_memo if start_memo is not None else 'auto'}")
     print(f"[TermList] {settings.term_list_path}")
 
     # 4. Read input terms (using Infrastructure adapter)
     try:
-        csv_adapter = CSVTermAdapter.create()
-        terms_input = csv_adapter.read_input(input_path)
+        csv_adapter = CSVTermAdapter.from_settings(settings)
+        with tracer.span("read", path=input_path.name):
+            terms_input = csv_adapter.read_input(input_path)
         print(f"Read {len(terms_input)} terms")
     except Exception as e:
         print(f"Failed to read input: {e}")
         return
 
+    # Pre-flight estimate (no LLM calls; calibrated against analytics history when enabled)
+    try:
+        plan = plan_terms(settings, terms_input, model_id, wire_format=settings.llm_wire_format)
+        for position, line in enumerate(plan.describe()):
+            print(f"{'[Plan    ]' if position == 0 else ' ' * 10} {line}")
+    except Exception as e:
+        print(f"[Plan    ] unavailable: {e}")
+
     # 5. Generate BatchID
     try:
         batch_gen = BatchIDGenerator(
@@ -202,34 +228,44 @@ def main():
 
     # 7. Create LLM Provider
     try:
-        if provider_type == "anthropic":
+        if provider_type == "anthropic" and settings.llm_cassette_mode != "replay":
             if not settings.anthropic_api_key:
                 print("Anthropic provider selected，但未配置 ANTHROPIC_API_KEY。请在 .env 中填写后重试。")
                 return
-            llm_provider = AnthropicProvider(
-                model=model_id,
-                api_key=settings.anthropic_api_key,
-                temperature=settings.default_temperature,
-            )
-        else:
-            llm_provider = OpenAIProvider(
-                model=model_id,
-                api_key=settings.openai_api_key,
-                temperature=settings.default_temperature,
-            )
+        llm_provider = create_provider(provider_type, model_id, settings)
     except Exception as e:
         print(f"Failed to create LLM Provider: {e}")
         return
 
     # 8. Create Infrastructure adapters (Dependency Injection)
     try:
-        llm_adapter = ReanimatorLLMAdapter.from_provider(llm_provider)
+        llm_adapter = ReanimatorLLMAdapter.from_provider(llm_provider, wire_format=settings.llm_wire_format)
+        fallback_adapter = build_fallback_adapter(settings, llm_adapter)
+        escalation_adapter = build_escalation_adapter(settings, llm_adapter)
         term_list_adapter = TermListAdapter.from_settings(settings)
     except Exception as e:
         print(f"Failed to create adapters: {e}")
         return
 
-    # 9. Create Use Case (Application layer)
+    # 9. Reserve Memo range (auto-allocation when no start Memo was given)
+    reservation = None
+    if start_memo is None:
+        if csv_adapter.memo_store is None:
+            print("Auto-allocation requires the memo store (MEMO_STORE_ENABLED); enter a starting Memo instead.")
+            return
+        try:
+            reservation = csv_adapter.memo_store.reserve_memo_range(len(terms_input), batch_id=batch_id)
+        except Exception as e:
+            print(f"Memo range reservation failed: {e}")
+            return
+        start_memo = reservation.start_index
+        print(f"[Memo    ] {reservation.first_memo_id}–{reservation.last_memo_id} (reserved)")
+
+    # 10. Create Use Case (Application layer)
+    recorder = open_run_recorder(
+        settings, pipeline="reanimator", provider=provider_type, model=model_id,
+        batch_id=batch_id, input_name=input_path.name,
+    )
     try:
         use_case = ProcessTermsUseCase(
             llm=llm_adapter,
@@ -237,30 +273,97 @@ def main():
             start_memo_index=start_memo,
             batch_id=batch_id,
             batch_note=note_input,
+            recorder=recorder,
+            repair_rounds=settings.llm_repair_rounds,
+            retry_rounds=settings.reanimator_retry_rounds,
+            retry_backoff=settings.reanimator_retry_backoff,
+            fallback_llm=fallback_adapter,
+            escalation_llm=escalation_adapter,
+            require_tag=settings.cascade_require_tag,
+            min_definition_words=settings.cascade_min_definition_words,
         )
     except Exception as e:
         print(f"Failed to create use case: {e}")
+        if reservation:
+            reservation.release()
         return
 
-    # 10. Execute Use Case
+    # 11. Execute Use Case (unused Memo IDs are returned on abort)
+    process_result = None
     try:
-        process_result = use_case.execute(terms_input, show_progress=True)
+        with MetricsExporter.from_settings(settings) as exporter:
+            if exporter.url:
+                print(f"[Metrics ] {exporter.url}")
+            process_result = use_case.execute(terms_input, show_progress=True)
+            process_result.token_usage = process_result.token_usage + hedge_unreported_usage(llm_provider)
     except Exception as e:
         import traceback
         print(f"Processing failed: {e}")
         traceback.print_exc()
         return
+    finally:
+        if recorder:
+            recorder.close()
+        if reservation:
+            reservation.commit(len(process_result.items) if process_result else 0)
 
-    # 11. Write output (using Infrastructure adapter)
+    # 12. Write output (using Infrastructure adapter)
     try:
-        csv_adapter.write_output(output_path, process_result.items)
+        with tracer.span("write", path=output_path.name, rows=len(process_result.items)):
+            csv_adapter.write_output(output_path, process_result.items)
         print(f"\n✅ Complete: {output_path}")
         print(f"   Processed {process_result.success_count}/{process_result.total_count} terms")
         print(f"   Token usage: {process_result.token_usage}")
+        if process_result.stats.get("repair_calls"):
+            stats = process_result.stats
+            print(
+                f"   Repaired: {stats['repaired']} ({stats['repair_calls']} calls, "
+                f"{stats['repair_prompt_tokens']:,} prompt + {stats['repair_completion_tokens']:,} completion tokens)"
+            )
+        if process_result.stats.get("llm_retries"):
+            print(f"   Provider retries: {process_result.stats['llm_retries']}")
+        if "escalated" in process_result.stats:
+            stats = process_result.stats
+            print(
+                f"   Escalated: {stats['escalated']} ({stats['escalated_invalid']} invalid, "
+                f"{stats['escalated_low_confidence']} low confidence)"
+            )
+            for tier in ("fast", "strong", "retry"):
+                if stats.get(f"tier_{tier}_calls"):
+                    tokens = stats[f"tier_{tier}_prompt_tokens"] + stats[f"tier_{tier}_completion_tokens"]
+                    print(
+                        f"   Tier {tier}: {stats[f'tier_{tier}_calls']} calls, {tokens:,} tokens, "
+                        f"{stats[f'tier_{tier}_latency_ms'] / 1000:.1f}s"
+                    )
+        hedging = hedge_stats(llm_provider)
+        if hedging and hedging["hedged"]:
+            print(
+                f"   Hedged: {hedging['hedged']}/{hedging['calls']} calls ({hedging['hedge_wins']} won, "
+                f"{hedging['wasted_prompt_tokens'] + hedging['wasted_completion_tokens']:,} extra tokens)"
+            )
+        for label, usage in (backend_usage(llm_provider) or {}).items():
+            print(
+                f"   Backend {label}: {usage['calls']} calls, {usage['errors']} errors, "
+                f"{usage['total_tokens']:,} tokens"
+            )
+        for label, usage in (key_usage(llm_provider) or {}).items():
+            print(
+                f"   Key {label}: {usage['calls']} calls, {usage['errors']} errors, "
+                f"{usage['quarantines']} quarantined, {usage['total_tokens']:,} tokens"
+            )
+        if process_result.failures:
+            rejects_path = output_path.with_name(f"{output_path.stem}.rejects.csv")
+            csv_adapter.write_rejects(rejects_path, process_result.failures)
+            print(f"⚠️  Rejected {len(process_result.failures)} terms after retries: {rejects_path}")
+            for failure in process_result.failures[:5]:
+                print(f"   - {failure.key}: {failure.reason[:100]}")
     except Exception as e:
         print(f"Failed to write output: {e}")
         return
 
+    if settings.trace_path:
+        print(f"   Trace: {tracer.export(settings.trace_path)}")
+
 
 if __name__ == "__main__":
     main()
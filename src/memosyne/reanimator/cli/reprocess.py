@@ -0,0 +1,71 @@
+"""
+Reanimator Reprocess - 对输出存档离线重新应用业务规则与标签映射（不调用 LLM）
+
+默认只输出差异摘要；--write 原地写回，--out 写到其它目录，--report 导出逐字段差异 CSV。
+
+Usage:
+    python -m memosyne.reanimator.cli.reprocess                           # 默认 data/output/reanimator + data/output/archived
+    python -m memosyne.reanimator.cli.reprocess data/output --report diff.csv
+    python -m memosyne.reanimator.cli.reprocess data/output --write --memo   # 写回并同步生成记录库
+    python -m memosyne.reanimator.cli.reprocess archive/ --out /tmp/fixed --term-list db/term_list_v2.csv
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from ...shared.config import OfflineSettings
+from ...shared.infrastructure.storage import MemoStore
+from ..infrastructure.reprocess import reprocess_archives
+from ..infrastructure.term_list_adapter import TermListAdapter
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI 入口"""
+    parser = argparse.ArgumentParser(description="对 Reanimator 输出存档重新应用业务规则")
+    parser.add_argument("paths", nargs="*", type=Path, help="CSV 文件或目录（递归）")
+    parser.add_argument("--term-list", type=Path, default=None, help="术语表（默认 REANIMATOR_TERM_LIST_VERSION 对应文件）")
+    parser.add_argument("--write", action="store_true", help="原地写回有变化的文件")
+    parser.add_argument("--out", type=Path, default=None, help="写到指定目录（不覆盖原文件）")
+    parser.add_argument("--report", type=Path, default=None, help="导出逐字段差异 CSV")
+    parser.add_argument("--memo", action="store_true", help="把写出的文件同步到生成记录库（db/mmsdb）")
+    parser.add_argument("--show", type=int, default=10, help="打印前 N 条差异")
+    args = parser.parse_args(argv)
+
+    settings = OfflineSettings()  # 不调用 LLM，无需 API 密钥
+    paths = args.paths or [settings.reanimator_output_dir, settings.data_dir / "output" / "archived"]
+    term_list = TermListAdapter.from_path(args.term_list or settings.term_list_path)
+
+    report = reprocess_archives(
+        [path for path in paths if path.exists()], term_list.mapping, write=args.write, out_dir=args.out
+    )
+
+    print(f"{report.files} 个文件 / {report.rows:,} 行，{report.elapsed:.2f}s")
+    for path, reason in report.skipped.items():
+        print(f"[skipped  ] {path}: {reason}")
+    if report.diff.empty:
+        print("无需修改")
+    else:
+        columns = "，".join(f"{column} {count}" for column, count in report.by_column().items())
+        print(f"需修改 {report.changed_rows:,} 行 / {report.changed_files} 个文件（{columns}）")
+        for row in report.diff.head(args.show).itertuples(index=False):
+            print(f"  {row.memo_id} {row.word} [{row.column}] {row.before!r} → {row.after!r}  ({Path(row.file).name}:{row.line + 1})")
+    if not report.stale_tags.empty:
+        tags = "，".join(f"{tag}×{count}" for tag, count in report.stale_tags.head(10).items())
+        print(f"无法映射的标签（不在当前术语表中）：{tags}")
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        report.diff.to_csv(args.report, index=False)
+        print(f"差异报告：{args.report}")
+    for path in report.written:
+        print(f"[written  ] {path}")
+    if args.memo and report.written:
+        count = MemoStore(settings.memo_db_path).import_term_csvs(report.written)
+        print(f"已同步 {count:,} 行到 {settings.memo_db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
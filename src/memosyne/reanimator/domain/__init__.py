@@ -14,6 +14,8 @@ from .services import (
     generate_memo_id,
     validate_word_format,
     should_force_phrase_pos,
+    find_invalid_term_fields,
+    low_confidence_reasons,
 )
 from .exceptions import (
     ReanimatorDomainError,
@@ -35,6 +37,8 @@ __all__ = [
     "generate_memo_id",
     "validate_word_format",
     "should_force_phrase_pos",
+    "find_invalid_term_fields",
+    "low_confidence_reasons",
     # Exceptions
     "ReanimatorDomainError",
     "InvalidTermError",
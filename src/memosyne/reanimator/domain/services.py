@@ -12,7 +12,13 @@ Reanimator Domain Services - 领域服务（纯业务逻辑）
 3. Example 与 EnDef 相同 → 清空 Example
 4. PPfix/PPmeans → 小写化、空白折叠
 5. 英文标签 → 中文标签（精确匹配或包含匹配）
+6. 校验失败 → 定位出错字段（用于字段级修复请求）
+7. 低置信度判定 → 决定是否升级到更强模型（模型级联）
 """
+from typing import Any
+
+from pydantic import ValidationError
+
 from .models import LLMResponse, MemoID
 
 
@@ -165,6 +171,69 @@ def should_force_phrase_pos(word: str, current_pos: str) -> bool:
     return " " in word and current_pos != "abbr."
 
 
+def find_invalid_term_fields(llm_dict: dict[str, Any]) -> tuple[LLMResponse | None, dict[str, str]]:
+    """
+    校验 LLM 返回的术语字段，定位出错字段
+
+    Args:
+        llm_dict: LLM 返回的字典（别名字段，如 IPA / PPmeans）
+
+    Returns:
+        (llm_response, problems)
+        - 校验通过：(LLMResponse, {})
+        - 校验失败：(None, {别名字段: 错误原因})
+
+    Example:
+        >>> resp, problems = find_invalid_term_fields({"IPA": "ˈnʊrɑn", "POS": "n.", "EnDef": "...", "Example": "..."})
+        >>> list(problems)
+        ['IPA']
+    """
+    try:
+        return LLMResponse(**llm_dict), {}
+    except ValidationError as exc:
+        problems: dict[str, str] = {}
+        for error in exc.errors():
+            field = str(error["loc"][0]) if error["loc"] else "POS"
+            problems.setdefault(field, error["msg"])
+        return None, problems
+
+
+def low_confidence_reasons(
+    word: str,
+    llm_response: LLMResponse,
+    *,
+    require_tag: bool = True,
+    min_definition_words: int = 4,
+) -> list[str]:
+    """
+    判断通过校验的 LLM 响应是否"可疑"（用于模型级联：可疑结果升级到强模型重做）
+
+    Args:
+        word: 原始词条
+        llm_response: 已通过校验的 LLM 响应
+        require_tag: 是否要求非空 TagEN
+        min_definition_words: EnDef 的最少词数
+
+    Returns:
+        可疑原因列表（空列表表示可信）
+
+    Example:
+        >>> resp = LLMResponse(POS="n.", EnDef="A cell.", Example="A neuron fires.", TagEN="")
+        >>> low_confidence_reasons("neuron", resp)
+        ['TagEN', 'EnDef']
+    """
+    reasons: list[str] = []
+    if require_tag and not llm_response.tag_en.strip():
+        reasons.append("TagEN")
+    if len(llm_response.en_def.split()) < min_definition_words:
+        reasons.append("EnDef")
+    # 例句应包含目标词（词组取首词，兼容屈折变化）
+    head = word.strip().lower().split(" ")[0][:4]
+    if head and head not in llm_response.example.lower():
+        reasons.append("Example")
+    return reasons
+
+
 # ============================================================
 # 使用示例
 # ============================================================
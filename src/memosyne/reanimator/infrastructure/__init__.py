@@ -5,13 +5,34 @@ The outermost layer that implements ports (adapters).
 
 Exports:
 - Adapters: ReanimatorLLMAdapter, CSVTermAdapter, TermListAdapter
+- Factories: build_fallback_adapter, build_escalation_adapter
+- Planning: plan_terms
+- Reprocessing: reprocess_archives（对输出存档离线重新应用业务规则）
 """
-from .llm_adapter import ReanimatorLLMAdapter
+from .llm_adapter import ReanimatorLLMAdapter, build_escalation_adapter, build_fallback_adapter
 from .csv_adapter import CSVTermAdapter
 from .term_list_adapter import TermListAdapter
+from .planning import plan_terms
+from .reprocess import (
+    ReprocessReport,
+    TermArchive,
+    apply_business_rules_frame,
+    apply_tag_mapping_frame,
+    load_archives,
+    reprocess_archives,
+)
 
 __all__ = [
     "ReanimatorLLMAdapter",
     "CSVTermAdapter",
     "TermListAdapter",
+    "build_fallback_adapter",
+    "build_escalation_adapter",
+    "plan_terms",
+    "TermArchive",
+    "ReprocessReport",
+    "load_archives",
+    "apply_business_rules_frame",
+    "apply_tag_mapping_frame",
+    "reprocess_archives",
 ]
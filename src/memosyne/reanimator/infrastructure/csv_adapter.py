@@ -6,12 +6,24 @@ CSV 适配器：实现 Application 层的 TermRepositoryPort 接口
 职责：
 - 读取输入术语 CSV
 - 写出处理结果 CSV
+- 写出最终失败的术语（rejects CSV）
 - 委托给现有的 CSVTermRepository
+- 同步写入生成记录库（MemoStore，可选；整批写出 CSV 后一次入库：Memo ID 在全部术语完成后才按顺序确定。
+  记录库属于旁路功能，写入失败只记警告）
+- 旁写列式副本（COLUMNAR_FORMAT，可选）
 """
+import logging
+import sqlite3
 from pathlib import Path
+from typing import Iterable
 
+from ...core.models import ItemFailure
 from ..domain.models import TermInput, TermOutput
 from ...shared.infrastructure.storage.csv_repository import CSVTermRepository
+from ...shared.infrastructure.storage.columnar import ColumnarFormat, check_columnar_format, export_terms
+from ...shared.infrastructure.storage.memo_store import MemoStore, open_memo_store
+
+logger = logging.getLogger(__name__)
 
 
 class CSVTermAdapter:
@@ -21,10 +33,17 @@ class CSVTermAdapter:
     封装 CSVTermRepository，提供符合端口接口的方法。
     """
 
-    def __init__(self):
-        """初始化适配器"""
+    def __init__(self, memo_store: MemoStore | None = None, columnar: ColumnarFormat = "off"):
+        """
+        初始化适配器
+
+        Args:
+            memo_store: 生成记录库（可选，写出 CSV 时同步入库）
+            columnar: 列式副本格式（off / mmcol / parquet，写在 CSV 旁）
+        """
         # CSVTermRepository 是无状态的，直接使用类方法
-        pass
+        self.memo_store = memo_store
+        self.columnar = columnar
 
     def read_input(self, path: Path) -> list[TermInput]:
         """
@@ -56,16 +75,46 @@ class CSVTermAdapter:
         """
         # 委托给 CSVTermRepository
         CSVTermRepository.write_output(path, terms)
+        export_terms(Path(path), terms, fmt=self.columnar)
+        if self.memo_store is not None:
+            try:
+                self.memo_store.add_terms(terms, source=Path(path).name)
+            except sqlite3.Error as exc:
+                logger.warning("生成记录库写入失败（%s），已跳过：%s", self.memo_store.path, exc)
+
+    def write_rejects(self, path: Path, failures: Iterable[ItemFailure]) -> None:
+        """
+        写出最终失败的术语（Word,ZhDef,Reason,Attempts，可直接作为输入重新处理）
+
+        Args:
+            path: 输出文件路径
+            failures: ProcessResult.failures
+        """
+        CSVTermRepository.write_rejects(path, failures)
 
     @classmethod
-    def create(cls) -> "CSVTermAdapter":
+    def create(cls, memo_store: MemoStore | None = None, columnar: ColumnarFormat = "off") -> "CSVTermAdapter":
         """
         工厂方法：创建适配器实例
 
         Returns:
             CSVTermAdapter 实例
         """
-        return cls()
+        return cls(memo_store, columnar)
+
+    @classmethod
+    def from_settings(cls, settings) -> "CSVTermAdapter":
+        """
+        工厂方法：按配置创建（MEMO_STORE_ENABLED 时写入 db/mmsdb，COLUMNAR_FORMAT 时旁写列式副本）
+
+        Returns:
+            CSVTermAdapter 实例
+
+        Raises:
+            ImportError: COLUMNAR_FORMAT=parquet 但未安装 pyarrow（在发出任何请求之前）
+        """
+        check_columnar_format(settings.columnar_format)
+        return cls(open_memo_store(settings), settings.columnar_format)
 
 
 # ============================================================
@@ -16,12 +16,36 @@ DDD 原则（Phase 4.6）：
 - Prompts 和 Schemas 属于子域业务逻辑
 - 不应放在 Shared Kernel 中
 - Adapter 负责组装完整的请求
+
+线上格式（wire_format）：
+- verbose：完整字段名（默认）
+- compact：单字母键，减少补全 Token；响应在返回前解码为 verbose 字段
 """
-from typing import Any
+import json
+from typing import Any, Literal
 
 from ...core.interfaces import LLMProvider, LLMError
-from .prompts import REANIMATER_SYSTEM_PROMPT, REANIMATER_USER_TEMPLATE
-from .schemas import TERM_RESULT_SCHEMA
+from ...shared.infrastructure.llm import provider_for_model
+from ...shared.utils import get_metrics, get_tracer
+from .prompts import (
+    REANIMATER_COMPACT_KEY_LEGEND,
+    REANIMATER_COMPACT_USER_TEMPLATE,
+    REANIMATER_REPAIR_USER_TEMPLATE,
+    REANIMATER_SYSTEM_PROMPT,
+    REANIMATER_USER_TEMPLATE,
+)
+from .schemas import TERM_RESULT_COMPACT_SCHEMA, TERM_RESULT_SCHEMA, decode_term_compact, term_repair_schema
+
+
+# 线上格式 → (系统提示词, 用户提示词模板, Schema)
+_WIRE_FORMATS: dict[str, tuple[str, str, dict[str, Any]]] = {
+    "verbose": (REANIMATER_SYSTEM_PROMPT, REANIMATER_USER_TEMPLATE, TERM_RESULT_SCHEMA),
+    "compact": (
+        REANIMATER_SYSTEM_PROMPT + REANIMATER_COMPACT_KEY_LEGEND,
+        REANIMATER_COMPACT_USER_TEMPLATE,
+        TERM_RESULT_COMPACT_SCHEMA,
+    ),
+}
 
 
 class ReanimatorLLMAdapter:
@@ -31,12 +55,17 @@ class ReanimatorLLMAdapter:
     封装 LLM Provider，提供术语处理专用的接口。
     """
 
-    def __init__(self, provider: LLMProvider):
+    def __init__(self, provider: LLMProvider, wire_format: Literal["verbose", "compact"] = "verbose"):
         """
         Args:
             provider: LLM 提供商（OpenAI/Anthropic）
+            wire_format: 线上格式（verbose / compact）
         """
         self.provider = provider
+        self.wire_format = wire_format
+        self._system_prompt, self._user_template, self._schema = _WIRE_FORMATS[
+            "compact" if wire_format == "compact" else "verbose"
+        ]
 
     def process_term(self, word: str, zh_def: str) -> tuple[dict[str, Any], dict[str, int]]:
         """
@@ -54,23 +83,14 @@ class ReanimatorLLMAdapter:
         """
         try:
             # 组装 Reanimator 特定的 prompts
-            system_prompt = REANIMATER_SYSTEM_PROMPT
-            user_prompt = REANIMATER_USER_TEMPLATE.format(word=word, zh_def=zh_def)
+            with get_tracer().span("prompt.build", word=word):
+                system_prompt = self._system_prompt
+                user_prompt = self._user_template.format(word=word, zh_def=zh_def)
 
-            # 调用底层 LLM Provider 的通用方法
-            llm_response, token_usage = self.provider.complete_structured(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                schema=TERM_RESULT_SCHEMA["schema"],
-                schema_name="TermResult"
-            )
+            llm_response, token_dict = self._complete(system_prompt, user_prompt, self._schema)
 
-            # 转换 TokenUsage 对象为字典（适配端口接口）
-            token_dict = {
-                "prompt_tokens": token_usage.prompt_tokens,
-                "completion_tokens": token_usage.completion_tokens,
-                "total_tokens": token_usage.total_tokens,
-            }
+            if self.wire_format == "compact" and isinstance(llm_response, dict):
+                llm_response = decode_term_compact(llm_response)
 
             return llm_response, token_dict
 
@@ -82,18 +102,139 @@ class ReanimatorLLMAdapter:
             # 其他错误包装为 LLMError
             raise LLMError(f"LLM 调用失败：{e}") from e
 
+    def repair_term(
+        self,
+        word: str,
+        zh_def: str,
+        current: dict[str, Any],
+        problems: dict[str, str],
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        字段级修复（实现 LLMPort.repair_term）
+
+        只把上次结果和出错字段发给模型，Schema 仅含这些字段（不随 wire_format 切换）。
+
+        Returns:
+            (fixes_dict, token_usage_dict)
+
+        Raises:
+            LLMError: LLM 调用失败
+        """
+        try:
+            fields = list(problems)
+            with get_tracer().span("prompt.build", word=word, repair=",".join(fields)):
+                user_prompt = REANIMATER_REPAIR_USER_TEMPLATE.format(
+                    word=word,
+                    zh_def=zh_def,
+                    current=json.dumps(current, ensure_ascii=False),
+                    problems="\n".join(f"- {field}: {reason}" for field, reason in problems.items()),
+                    fields=", ".join(fields),
+                )
+            fixes, token_dict = self._complete(REANIMATER_SYSTEM_PROMPT, user_prompt, term_repair_schema(fields))
+            if not isinstance(fixes, dict):
+                raise LLMError("LLM 返回的数据格式不正确")
+            return {key: value for key, value in fixes.items() if key in problems}, token_dict
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise LLMError(f"LLM 调用失败：{e}") from e
+
+    def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+    ) -> tuple[Any, dict[str, int]]:
+        # 调用底层 LLM Provider 的通用方法
+        with get_metrics().track_llm_call(
+            "reanimator",
+            getattr(self.provider, "provider_name", type(self.provider).__name__),
+            getattr(self.provider, "model", ""),
+        ) as call:
+            llm_response, token_usage = self.provider.complete_structured(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                schema=schema["schema"],
+                schema_name=schema["name"]
+            )
+            call["usage"] = token_usage
+
+        # 转换 TokenUsage 对象为字典（适配端口接口）
+        token_dict = {
+            "prompt_tokens": token_usage.prompt_tokens,
+            "completion_tokens": token_usage.completion_tokens,
+            "total_tokens": token_usage.total_tokens,
+            "cached_tokens": token_usage.cached_tokens,
+        }
+        return llm_response, token_dict
+
     @classmethod
-    def from_provider(cls, provider: LLMProvider) -> "ReanimatorLLMAdapter":
+    def from_provider(
+        cls,
+        provider: LLMProvider,
+        wire_format: Literal["verbose", "compact"] = "verbose",
+    ) -> "ReanimatorLLMAdapter":
         """
         工厂方法：从 LLM Provider 创建适配器
 
         Args:
             provider: LLM 提供商
+            wire_format: 线上格式（verbose / compact）
 
         Returns:
             ReanimatorLLMAdapter 实例
         """
-        return cls(provider=provider)
+        return cls(provider=provider, wire_format=wire_format)
+
+
+def request_text(word: str, zh_def: str, wire_format: Literal["verbose", "compact"] = "verbose") -> str:
+    """
+    单个术语请求的完整文本（系统提示词 + 用户提示词 + Schema），供运行前估算 Token
+
+    与 ReanimatorLLMAdapter.process_term 发送的内容一致，不需要 Provider。
+    """
+    system_prompt, user_template, schema = _WIRE_FORMATS["compact" if wire_format == "compact" else "verbose"]
+    return "\n".join(
+        (system_prompt, user_template.format(word=word, zh_def=zh_def), json.dumps(schema["schema"], ensure_ascii=False))
+    )
+
+
+def build_fallback_adapter(settings, adapter: ReanimatorLLMAdapter) -> ReanimatorLLMAdapter | None:
+    """
+    按 REANIMATOR_FALLBACK_MODEL 创建重试用的备用适配器（沿用 adapter 的线上格式）
+
+    Returns:
+        未配置时返回 None（重试沿用本次运行的模型）
+
+    Example:
+        >>> fallback = build_fallback_adapter(settings, adapter)
+        >>> ProcessTermsUseCase(llm=adapter, ..., fallback_llm=fallback)
+    """
+    model_value = settings.reanimator_fallback_model
+    if not model_value:
+        return None
+    provider = provider_for_model(settings, model_value)
+    return ReanimatorLLMAdapter.from_provider(provider, wire_format=adapter.wire_format)
+
+
+def build_escalation_adapter(settings, adapter: ReanimatorLLMAdapter) -> ReanimatorLLMAdapter | None:
+    """
+    按 CASCADE_MODEL 创建模型级联的强模型适配器（沿用 adapter 的线上格式）
+
+    Returns:
+        未配置时返回 None（不启用级联）
+
+    Example:
+        >>> strong = build_escalation_adapter(settings, adapter)
+        >>> ProcessTermsUseCase(llm=adapter, ..., escalation_llm=strong)
+    """
+    model_value = settings.cascade_model
+    if not model_value:
+        return None
+    provider = provider_for_model(settings, model_value)
+    return ReanimatorLLMAdapter.from_provider(provider, wire_format=adapter.wire_format)
 
 
 # ============================================================
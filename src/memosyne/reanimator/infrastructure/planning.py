@@ -0,0 +1,53 @@
+"""
+Reanimator Infrastructure - Run Planner
+
+运行前估算：按实际提示词近似每个术语的 Token，用分析库历史校准，
+结合价格表与账号限流给出成本、耗时与推荐并发（见 shared.utils.planning）。
+"""
+from typing import Iterable, Literal
+
+from ...shared.infrastructure.llm import account_rate_limits
+from ...shared.infrastructure.storage import load_call_profile
+from ...shared.utils import RunPlan, approx_tokens, build_plan, get_provider_from_model
+from ..domain.models import TermInput
+from .llm_adapter import request_text
+
+# 无历史时每个术语的补全 Token（compact 短键约省 1/3）
+_DEFAULT_COMPLETION = {"verbose": 150, "compact": 100}
+
+
+def plan_terms(
+    settings,
+    terms: Iterable[TermInput],
+    model: str,
+    *,
+    wire_format: Literal["verbose", "compact"] | None = None,
+    concurrency: int = 1,
+) -> RunPlan:
+    """
+    估算一次 Reanimator 运行
+
+    Args:
+        settings: 配置
+        terms: 待处理的术语
+        model: 模型 ID
+        wire_format: 线上格式（None 使用 LLM_WIRE_FORMAT）
+        concurrency: 估算耗时所用的并发数
+
+    Example:
+        >>> plan = plan_terms(settings, terms, "gpt-4o-mini")
+        >>> print("\\n".join(plan.describe()))
+    """
+    wire_format = wire_format or settings.llm_wire_format
+    estimates = [approx_tokens(request_text(term.word, term.zh_def, wire_format)) for term in terms]
+    rpm, tpm = account_rate_limits(get_provider_from_model(model), settings)
+    return build_plan(
+        "reanimator",
+        model,
+        estimates,
+        profile=load_call_profile(settings, "reanimator", model),
+        default_completion=_DEFAULT_COMPLETION.get(wire_format, 150),
+        concurrency=concurrency,
+        rpm=rpm,
+        tpm=tpm,
+    )
@@ -48,3 +48,33 @@ ZhDef: {zh_def}
 
 Task:
 Return the JSON with keys: IPA, POS, Rarity, EnDef, Example, PPfix, PPmeans, TagEN."""
+
+
+# compact 线上格式：追加在系统提示词末尾的键说明（提示词可缓存，补全 Token 才是瓶颈）
+REANIMATER_COMPACT_KEY_LEGEND = """
+WIRE FORMAT (overrides the key names above)
+- Use these short keys instead of the field names: i=IPA, p=POS, r=Rarity, d=EnDef, e=Example, x=PPfix, m=PPmeans, t=TagEN.
+- All FIELD RULES still apply to the corresponding short key.
+"""
+
+REANIMATER_COMPACT_USER_TEMPLATE = """Given:
+Word: {word}
+ZhDef: {zh_def}
+
+Task:
+Return the JSON with short keys: i, p, r, d, e, x, m, t."""
+
+
+# 字段级修复：只重新生成未通过校验的字段（系统提示词沿用 REANIMATER_SYSTEM_PROMPT 的字段规则）
+REANIMATER_REPAIR_USER_TEMPLATE = """Given:
+Word: {word}
+ZhDef: {zh_def}
+
+Your previous answer (JSON):
+{current}
+
+These fields failed validation:
+{problems}
+
+Task:
+Return the JSON with ONLY the keys: {fields}. Follow the FIELD RULES exactly."""
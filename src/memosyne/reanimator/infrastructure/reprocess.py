@@ -0,0 +1,287 @@
+"""
+Reanimator Infrastructure - Archive reprocessing
+
+业务规则（domain.services.apply_business_rules）与标签映射（get_chinese_tag）
+只在 LLM 运行时逐条应用；修改规则或更新术语表后，已有的输出存档不会随之更新。
+
+本模块把存档 CSV 读入 pandas 列式表，以整列运算重新应用同样的规则，
+生成逐字段差异报告，并只写回有变化的文件（不调用 LLM）：
+
+1. 词组（Word 含空格）→ POS='P.'（abbr. 例外）
+2. abbr. → IPA 清空
+3. Example 与 EnDef 相同（忽略大小写与首尾空白）→ 清空 Example
+4. PPfix / PPmeans → 小写、空白折叠
+5. Tag 按当前术语表重新映射（按唯一值调用 get_chinese_tag）：存档含 TagEN 列时以其为准；
+   否则只映射 Tag 列中残留的英文标签（早期存档直接写入了 TagEN）。仍无法映射的标签只报告
+
+存档格式与 MemoStore.import_term_csvs 一致：有 / 无表头、BOM、早期无 Example 列的 V3 存档。
+写回时保留原有列、表头、BOM 与换行符；memo_id 非法的行原样保留、不参与规则。
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping
+
+import pandas as pd
+
+from ..domain.services import get_chinese_tag
+
+TERM_COLUMNS = (
+    "wm_pair", "memo_id", "word", "zh_def", "ipa", "pos", "tag", "rarity",
+    "en_def", "example", "pp_fix", "pp_means", "batch_id", "batch_note",
+)
+RULE_COLUMNS = ("pos", "ipa", "example", "pp_fix", "pp_means", "tag")
+
+# 存档 CSV 表头 → 列名（与 MemoStore 一致，另识别 TagEN）
+_HEADER_MAP = {
+    "wmpair": "wm_pair", "memoid": "memo_id", "word": "word", "zhdef": "zh_def",
+    "ipa": "ipa", "pos": "pos", "tag": "tag", "rarity": "rarity", "endef": "en_def",
+    "example": "example", "ppfix": "pp_fix", "ppmeans": "pp_means",
+    "batchid": "batch_id", "batchnote": "batch_note", "tagen": "tag_en",
+}
+_LEGACY_COLUMNS = tuple(c for c in TERM_COLUMNS if c != "example")
+_MEMO_ID = r"^M\d{6}$"
+_ENGLISH_TAG = r"^[A-Za-z][A-Za-z .&/-]*$"
+
+
+@dataclass(slots=True)
+class ArchiveFile:
+    """单个存档文件的格式信息（写回时保持不变）"""
+
+    path: Path
+    columns: tuple[str, ...]
+    header: list[str] | None  # 原表头（None 表示无表头）
+    bom: bool
+    newline: str
+
+
+@dataclass(slots=True)
+class TermArchive:
+    """
+    存档列式表
+
+    Attributes:
+        frame: 全部行（TERM_COLUMNS + tag_en，缺失列为空串；_file / _line 记录来源）
+        files: _file → 文件格式信息
+        skipped: 无法识别的文件 → 原因
+    """
+
+    frame: pd.DataFrame
+    files: dict[str, ArchiveFile] = field(default_factory=dict)
+    skipped: dict[str, str] = field(default_factory=dict)
+
+
+def _read_file(path: Path) -> tuple[ArchiveFile, list[list[str]]]:
+    raw = path.read_bytes()
+    rows = [row for row in csv.reader(io.StringIO(raw.decode("utf-8-sig"), newline="")) if row]
+    if not rows:
+        raise ValueError("empty")
+    keys = [cell.replace("\ufeff", "").strip().lower() for cell in rows[0]]
+    if "memoid" in keys:
+        header, columns, rows = rows[0], tuple(_HEADER_MAP.get(key, key) for key in keys), rows[1:]
+    elif len(rows[0]) in (len(TERM_COLUMNS), len(_LEGACY_COLUMNS)):
+        header, columns = None, TERM_COLUMNS if len(rows[0]) == len(TERM_COLUMNS) else _LEGACY_COLUMNS
+    else:
+        raise ValueError(f"unrecognized layout ({len(rows[0])} columns)")
+    if any(len(row) != len(columns) for row in rows):
+        raise ValueError("ragged rows")
+    meta = ArchiveFile(
+        path=path,
+        columns=columns,
+        header=header,
+        bom=raw.startswith(codecs.BOM_UTF8),
+        newline="\r\n" if b"\r\n" in raw else "\n",
+    )
+    return meta, rows
+
+
+def load_archives(paths: Iterable[str | Path]) -> TermArchive:
+    """
+    读取存档 CSV（目录递归查找 *.csv）为列式表
+
+    Example:
+        >>> archive = load_archives(["data/output/archived"])
+        >>> archive.frame[["memo_id", "word", "pos"]].head()
+    """
+    files: list[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob("*.csv")) if path.is_dir() else [path])
+
+    frames: list[pd.DataFrame] = []
+    archive = TermArchive(frame=pd.DataFrame(columns=[*TERM_COLUMNS, "_file", "_line"]))
+    for path in files:
+        key = str(path)
+        try:
+            meta, rows = _read_file(path)
+        except (OSError, UnicodeDecodeError, csv.Error, ValueError) as exc:
+            archive.skipped[key] = str(exc)
+            continue
+        archive.files[key] = meta
+        frame = pd.DataFrame(rows, columns=list(meta.columns), dtype=str)
+        frame["_file"] = key
+        frame["_line"] = range(len(frame))
+        frames.append(frame)
+    if frames:
+        frame = pd.concat(frames, ignore_index=True)
+        for column in (*TERM_COLUMNS, "tag_en"):
+            if column not in frame:
+                frame[column] = ""
+        archive.frame = frame.fillna("")
+    return archive
+
+
+def apply_business_rules_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """apply_business_rules 的列式版本（返回新表；memo_id 非法的行不变）"""
+    out = frame.copy()
+    valid = out["memo_id"].str.strip().str.match(_MEMO_ID)
+
+    # 规则1：词组 → P.（abbr. 例外）
+    phrase = valid & out["word"].str.strip().str.contains(" ", regex=False) & (out["pos"] != "abbr.")
+    out.loc[phrase, "pos"] = "P."
+    # 规则2：abbr. → IPA 清空
+    out.loc[valid & (out["pos"] == "abbr.") & (out["ipa"] != ""), "ipa"] = ""
+    # 规则3：Example 与 EnDef 相同 → 清空 Example
+    same = out["example"].str.strip().str.lower() == out["en_def"].str.strip().str.lower()
+    out.loc[valid & same & (out["example"] != ""), "example"] = ""
+    # 规则4：PPfix / PPmeans 小写、空白折叠
+    for column in ("pp_fix", "pp_means"):
+        out.loc[valid, column] = (
+            out.loc[valid, column].str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+        )
+    return out
+
+
+def apply_tag_mapping_frame(frame: pd.DataFrame, mapping: Mapping[str, str]) -> pd.DataFrame:
+    """
+    重新映射中文标签（每个唯一值只匹配一次）
+
+    有 TagEN 的行以 TagEN 为准；其余行中 Tag 为英文的映射为中文（映射不到时保持原值）。
+    """
+    out = frame.copy()
+    mapping = dict(mapping)
+    valid = out["memo_id"].str.strip().str.match(_MEMO_ID)
+    has_tag_en = valid & (out["tag_en"].str.strip() != "")
+    english = valid & ~has_tag_en & out["tag"].str.strip().str.match(_ENGLISH_TAG)
+
+    source = pd.concat([out.loc[has_tag_en, "tag_en"], out.loc[english, "tag"]])
+    table = {value: get_chinese_tag(value, mapping) for value in source.unique()}
+    out.loc[has_tag_en, "tag"] = out.loc[has_tag_en, "tag_en"].map(table)
+    mapped = out.loc[english, "tag"].map(table)
+    out.loc[english, "tag"] = mapped.where(mapped != "", out.loc[english, "tag"])
+    return out
+
+
+def stale_tags(frame: pd.DataFrame, mapping: Mapping[str, str]) -> pd.Series:
+    """不在当前术语表中的非空中文标签（按标签计数）"""
+    tags = frame["tag"].str.strip()
+    stale = tags[(tags != "") & ~tags.isin(set(mapping.values()))]
+    return stale.value_counts()
+
+
+def diff_frames(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """逐字段差异（file, line, memo_id, word, column, before, after）"""
+    parts = []
+    for column in RULE_COLUMNS:
+        changed = before[column] != after[column]
+        if changed.any():
+            parts.append(pd.DataFrame({
+                "file": before.loc[changed, "_file"],
+                "line": before.loc[changed, "_line"],
+                "memo_id": before.loc[changed, "memo_id"],
+                "word": before.loc[changed, "word"],
+                "column": column,
+                "before": before.loc[changed, column],
+                "after": after.loc[changed, column],
+            }))
+    if not parts:
+        return pd.DataFrame(columns=["file", "line", "memo_id", "word", "column", "before", "after"])
+    return pd.concat(parts).sort_values(["file", "line", "column"], kind="stable").reset_index(drop=True)
+
+
+def write_archives(
+    archive: TermArchive,
+    frame: pd.DataFrame,
+    keys: Iterable[str],
+    out_dir: Path | None = None,
+) -> list[Path]:
+    """写回指定文件（保留原列、表头、BOM 与换行；out_dir 为空时原地覆盖，否则保留相对目录结构）"""
+    keys = list(keys)
+    written: list[Path] = []
+    groups = frame.groupby("_file", sort=False)
+    root = Path(os.path.commonpath([archive.files[key].path.resolve().parent for key in keys])) if keys else None
+    for key in keys:
+        meta = archive.files[key]
+        rows = groups.get_group(key).sort_values("_line")[list(meta.columns)]
+        target = Path(out_dir) / meta.path.resolve().relative_to(root) if out_dir else meta.path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8-sig" if meta.bom else "utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator=meta.newline)
+            if meta.header is not None:
+                writer.writerow([cell.replace("\ufeff", "") for cell in meta.header])
+            writer.writerows(rows.itertuples(index=False, name=None))
+        written.append(target)
+    return written
+
+
+@dataclass(slots=True)
+class ReprocessReport:
+    """重新应用规则的结果"""
+
+    rows: int
+    files: int
+    diff: pd.DataFrame
+    stale_tags: pd.Series
+    skipped: dict[str, str]
+    written: list[Path]
+    elapsed: float
+
+    @property
+    def changed_rows(self) -> int:
+        return self.diff[["file", "line"]].drop_duplicates().shape[0]
+
+    @property
+    def changed_files(self) -> int:
+        return self.diff["file"].nunique()
+
+    def by_column(self) -> dict[str, int]:
+        return self.diff["column"].value_counts().to_dict()
+
+
+def reprocess_archives(
+    paths: Iterable[str | Path],
+    mapping: Mapping[str, str],
+    *,
+    write: bool = False,
+    out_dir: Path | None = None,
+) -> ReprocessReport:
+    """
+    读取存档 → 重新应用业务规则与标签映射 → 差异报告（write / out_dir 时写出有变化的文件）
+
+    Example:
+        >>> report = reprocess_archives(["data/output"], TermListAdapter.from_settings(settings).mapping)
+        >>> report.by_column()
+        {'pp_fix': 12, 'example': 3}
+    """
+    started = time.perf_counter()
+    archive = load_archives(paths)
+    before = archive.frame
+    after = apply_tag_mapping_frame(apply_business_rules_frame(before), mapping)
+    diff = diff_frames(before, after)
+    written = []
+    if (write or out_dir) and not diff.empty:
+        written = write_archives(archive, after, diff["file"].unique(), out_dir)
+    return ReprocessReport(
+        rows=len(before),
+        files=len(archive.files),
+        diff=diff,
+        stale_tags=stale_tags(after, mapping),
+        skipped=archive.skipped,
+        written=written,
+        elapsed=time.perf_counter() - started,
+    )
@@ -2,7 +2,13 @@
 Term Schema - 术语结果 JSON Schema
 
 用于 Reanimater 的 LLM 结构化输出
+
+两种线上格式（wire format）：
+- verbose：TERM_RESULT_SCHEMA，字段名即 LLMResponse 别名
+- compact：TERM_RESULT_COMPACT_SCHEMA，单字母键，减少补全 Token；
+  由 decode_term_compact 还原为 verbose 字段后再做 Pydantic 校验
 """
+from typing import Any
 
 TERM_RESULT_SCHEMA = {
     "name": "TermResult",
@@ -48,3 +54,62 @@ TERM_RESULT_SCHEMA = {
         "required": ["IPA", "POS", "Rarity", "EnDef", "Example", "PPfix", "PPmeans", "TagEN"]
     }
 }
+
+
+# compact 键 → verbose 字段
+TERM_COMPACT_KEYS = {
+    "i": "IPA",
+    "p": "POS",
+    "r": "Rarity",
+    "d": "EnDef",
+    "e": "Example",
+    "x": "PPfix",
+    "m": "PPmeans",
+    "t": "TagEN",
+}
+
+TERM_RESULT_COMPACT_SCHEMA = {
+    "name": "TermResultCompact",
+    "description": "Terminology fields for a single headword (compact keys).",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            short: TERM_RESULT_SCHEMA["schema"]["properties"][full]
+            for short, full in TERM_COMPACT_KEYS.items()
+        },
+        "required": list(TERM_COMPACT_KEYS),
+    },
+}
+
+
+def decode_term_compact(data: dict[str, Any]) -> dict[str, Any]:
+    """compact 响应 → verbose 字段（未知键原样保留，交给校验层报错）"""
+    return {TERM_COMPACT_KEYS.get(key, key): value for key, value in data.items()}
+
+
+def encode_term_compact(data: dict[str, Any]) -> dict[str, Any]:
+    """verbose 字段 → compact 键（用于基准测试与 Mock）"""
+    reverse = {full: short for short, full in TERM_COMPACT_KEYS.items()}
+    return {reverse.get(key, key): value for key, value in data.items()}
+
+
+def term_repair_schema(fields: list[str]) -> dict[str, Any]:
+    """
+    字段级修复用的子 Schema（只含未通过校验的字段）
+
+    修复请求只重新生成少数字段，统一使用 verbose 字段名（短键节省的 Token 可以忽略）。
+    """
+    properties = TERM_RESULT_SCHEMA["schema"]["properties"]
+    fields = [field for field in fields if field in properties]
+    return {
+        "name": "TermRepair",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {field: properties[field] for field in fields},
+            "required": fields,
+        },
+    }
@@ -0,0 +1,142 @@
+"""
+Analytics Report - 历史运行分析报表
+
+读取 AnalyticsStore 的 llm_calls 表，按模型 / 流水线 / 批次聚合：
+- 调用次数、p50 / p95 延迟
+- 每条目 Token、命中缓存 Token
+- 有效率（outcome == success）、重试次数
+- 估算成本（见 shared.utils.pricing）
+
+Usage:
+    python -m memosyne.shared.cli.analytics
+    python -m memosyne.shared.cli.analytics --since 30d --by model
+    python -m memosyne.shared.cli.analytics --by batch --db db/analytics.sqlite3
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from ..utils.pricing import PRICING
+
+_GROUP_COLUMNS = {
+    "model": "model",
+    "pipeline": "pipeline",
+    "batch": "batch_id",
+    "tier": "tier",
+}
+
+_SINCE_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_since(value: str | None) -> float | None:
+    """解析时间窗口（如 90m / 12h / 30d / 2w），返回起始时间戳"""
+    if not value:
+        return None
+    match = re.fullmatch(r"(\d+)([mhdw])", value.strip().lower())
+    if not match:
+        raise ValueError(f"无法解析时间窗口: {value!r}（示例：30d、12h）")
+    amount, unit = match.groups()
+    return time.time() - int(amount) * _SINCE_UNITS[unit]
+
+
+def load_calls(db_path: Path, since: float | None = None) -> pd.DataFrame:
+    """读取调用记录"""
+    query = "SELECT * FROM llm_calls"
+    params: tuple = ()
+    if since is not None:
+        query += " WHERE ts >= ?"
+        params = (since,)
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def add_cost_column(calls: pd.DataFrame) -> pd.DataFrame:
+    """按价格表向量化计算每次调用成本（未知模型为 NaN）"""
+    model = calls["model"].str.lower()
+    price_in = model.map({k: v.input for k, v in PRICING.items()})
+    price_cached = model.map({k: v.cached_input for k, v in PRICING.items()})
+    price_out = model.map({k: v.output for k, v in PRICING.items()})
+
+    cached = calls["cached_tokens"].clip(upper=calls["prompt_tokens"])
+    calls["cost"] = (
+        (calls["prompt_tokens"] - cached) * price_in
+        + cached * price_cached
+        + calls["completion_tokens"] * price_out
+    ) / 1_000_000
+    return calls
+
+
+def summarize(calls: pd.DataFrame, by: str) -> pd.DataFrame:
+    """聚合报表"""
+    key = _GROUP_COLUMNS[by]
+    calls = calls.assign(
+        total_tokens=calls["prompt_tokens"] + calls["completion_tokens"],
+        valid=(calls["outcome"] == "success").astype(float),
+    )
+    grouped = calls.groupby(calls[key].fillna("-"), sort=True)
+    report = grouped.agg(
+        calls=("latency", "size"),
+        p50_s=("latency", lambda s: s.quantile(0.50)),
+        p95_s=("latency", lambda s: s.quantile(0.95)),
+        tokens_per_item=("total_tokens", "mean"),
+        cached_tokens=("cached_tokens", "sum"),
+        valid_rate=("valid", "mean"),
+        retries=("retries", "sum"),
+        cost_usd=("cost", lambda s: s.sum(min_count=1)),
+    )
+    report.index.name = by
+    return report.sort_values("calls", ascending=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI 入口"""
+    parser = argparse.ArgumentParser(description="Memosyne 历史运行分析报表")
+    parser.add_argument("--db", type=Path, default=None, help="分析库路径（默认读取 ANALYTICS_DB_PATH）")
+    parser.add_argument("--since", default=None, help="时间窗口，如 30d / 12h（默认全部）")
+    parser.add_argument("--by", choices=sorted(_GROUP_COLUMNS), default="model", help="聚合维度")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    db_path = args.db
+    if db_path is None:
+        from ..config import get_settings
+        db_path = get_settings().analytics_db_path
+    if not Path(db_path).exists():
+        print(f"分析库不存在: {db_path}")
+        return 1
+
+    try:
+        since = parse_since(args.since)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    calls = load_calls(Path(db_path), since)
+    if calls.empty:
+        print("没有符合条件的调用记录")
+        return 0
+
+    calls = add_cost_column(calls)
+    report = summarize(calls, args.by)
+
+    with pd.option_context("display.width", 160, "display.max_columns", None, "display.float_format", "{:,.4f}".format):
+        print(report)
+
+    total_cost = calls["cost"].sum(min_count=1)
+    print(f"\n{len(calls):,} calls · {calls['run_id'].nunique()} runs", end="")
+    if pd.notna(total_cost):
+        print(f" · ${total_cost:,.4f}", end="")
+    print(f" · {time.perf_counter() - started:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Columnar - 列式副本的转换与查询
+
+Usage:
+    python -m memosyne.shared.cli.columnar export data/output                 # 为已有 CSV 存档 / .items.jsonl 生成 .mmcol
+    python -m memosyne.shared.cli.columnar export data/output --format parquet --out /tmp/columnar
+    python -m memosyne.shared.cli.columnar find memo_id M002701               # 默认在 data/output 下查找
+    python -m memosyne.shared.cli.columnar find lcode L000012 --kind quiz
+    python -m memosyne.shared.cli.columnar stats
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from ..infrastructure.storage.columnar import (
+    QUIZ_COLUMNS,
+    TERM_COLUMNS,
+    columnar_path,
+    export_quiz_items,
+    open_archive,
+    write_table,
+)
+from ..infrastructure.storage.memo_store import read_term_archive
+
+_SIDECAR_SUFFIX = ".items.jsonl"
+
+
+def _target(path: Path, root: Path, out: Path | None) -> Path:
+    if out is None:
+        return path
+    relative = path.relative_to(root) if path.is_relative_to(root) else Path(path.name)
+    return out / relative
+
+
+def export(paths: list[Path], fmt: str, out: Path | None) -> tuple[int, int]:
+    """转换 CSV 术语存档与 Lithoformer 旁路文件，返回 (文件数, 行数)"""
+    from ...lithoformer.infrastructure.sidecar import read_sidecar
+
+    files = rows = 0
+    for root in paths:
+        base = root if root.is_dir() else root.parent
+        candidates = sorted(root.rglob("*")) if root.is_dir() else [root]
+        for path in candidates:
+            if path.suffix == ".csv":
+                records = list(read_term_archive(path))
+                if not records:
+                    continue
+                columns = {column: [record.get(column, "") for record in records] for column in TERM_COLUMNS}
+                target = columnar_path(_target(path, base, out), fmt, "terms")
+                write_table(target, columns, kind="terms", meta={"source": path.name}, fmt=fmt)
+            elif path.name.endswith(_SIDECAR_SUFFIX):
+                header, records = read_sidecar(path)
+                if not records:
+                    continue
+                output = _target(path, base, out).with_name(path.name[: -len(_SIDECAR_SUFFIX)] + ".txt")
+                export_quiz_items(output, [(r.code, r.batch or header.batch_id, r.item) for r in records], fmt=fmt)
+            else:
+                continue
+            files += 1
+            rows += len(records)
+    return files, rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI 入口"""
+    parser = argparse.ArgumentParser(description="Memosyne 列式副本（.mmcol / .parquet）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="为已有 CSV 存档与 .items.jsonl 生成列式副本")
+    p_export.add_argument("paths", nargs="+", type=Path, help="文件或目录（递归）")
+    p_export.add_argument("--format", choices=("mmcol", "parquet"), default="mmcol")
+    p_export.add_argument("--out", type=Path, default=None, help="输出目录（默认写在源文件旁）")
+
+    p_find = sub.add_parser("find", help="按列精确查找")
+    p_find.add_argument("column", help=f"列名（术语：{', '.join(TERM_COLUMNS)}；题目：{', '.join(QUIZ_COLUMNS)}）")
+    p_find.add_argument("value")
+    p_find.add_argument("--kind", choices=("terms", "quiz"), default=None)
+    p_find.add_argument("--path", type=Path, nargs="+", default=None, help="默认 data/output")
+
+    p_stats = sub.add_parser("stats", help="文件数 / 行数统计")
+    p_stats.add_argument("--path", type=Path, nargs="+", default=None, help="默认 data/output")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        started = time.perf_counter()
+        files, rows = export(args.paths, args.format, args.out)
+        print(f"转换 {files} 个文件 / {rows:,} 行（{time.perf_counter() - started:.2f}s）")
+        return 0
+
+    paths = args.path
+    if paths is None:
+        from ..config import get_settings
+        paths = [get_settings().data_dir / "output"]
+    started = time.perf_counter()
+    with open_archive(paths) as archive:
+        opened = time.perf_counter() - started
+        for path, reason in archive.skipped.items():
+            print(f"[skipped  ] {path}: {reason}")
+        if args.command == "stats":
+            kinds: dict[str, tuple[int, int]] = {}
+            for table in archive.tables:
+                files, rows = kinds.get(table.kind, (0, 0))
+                kinds[table.kind] = (files + 1, rows + table.rows)
+            for kind, (files, rows) in sorted(kinds.items()):
+                print(f"{kind or '?':<6} {files:>5} 个文件 {rows:>10,} 行")
+            print(f"打开 {len(archive.tables)} 个文件：{opened * 1000:.1f}ms")
+        else:
+            results = archive.find(args.column, args.value, kind=args.kind)
+            elapsed = time.perf_counter() - started
+            for row in results:
+                print("  ".join(str(value)[:60] for key, value in row.items() if key != "item_json"))
+            print(f"{len(results)} 条（{archive.rows:,} 行 / {len(archive.tables)} 个文件，{elapsed * 1000:.1f}ms）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Memo DB - 生成记录库命令行
+
+Usage:
+    python -m memosyne.shared.cli.memodb import data/output           # 批量导入 CSV 存档
+    python -m memosyne.shared.cli.memodb word amygdala                # 哪些批次定义过该词
+    python -m memosyne.shared.cli.memodb memo M002701                 # 按 Memo ID 查询
+    python -m memosyne.shared.cli.memodb batch 251007A015             # 批次内容
+    python -m memosyne.shared.cli.memodb last                         # 已使用的最大 Memo ID
+    python -m memosyne.shared.cli.memodb ranges                       # Memo 区间预留情况
+    python -m memosyne.shared.cli.memodb stats
+    python -m memosyne.shared.cli.memodb tm-import                    # 用已登记题目回填翻译记忆
+    python -m memosyne.shared.cli.memodb tm "All of the above"        # 查询片段译文
+    python -m memosyne.shared.cli.memodb tm-stats                     # 翻译记忆统计与高频片段
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from ..infrastructure.storage.memo_store import MemoStore
+from ..infrastructure.storage.translation_memory import TranslationMemory
+
+_TERM_FIELDS = ("memo_id", "batch_id", "word", "zh_def", "pos", "tag", "source")
+
+
+def _print_terms(rows: list[dict]) -> None:
+    if not rows:
+        print("（无记录）")
+        return
+    for row in rows:
+        print("  ".join(str(row.get(field, "")) for field in _TERM_FIELDS))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI 入口"""
+    parser = argparse.ArgumentParser(description="Memosyne 生成记录库（db/mmsdb）")
+    parser.add_argument("--db", type=Path, default=None, help="数据库路径（默认读取 MEMO_DB_PATH）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="批量导入 Reanimator CSV 存档")
+    p_import.add_argument("paths", nargs="+", type=Path, help="CSV 文件或目录（递归）")
+    sub.add_parser("word", help="按单词查询").add_argument("word")
+    sub.add_parser("memo", help="按 Memo ID 查询").add_argument("memo_id")
+    sub.add_parser("batch", help="按批次查询").add_argument("batch_id")
+    sub.add_parser("last", help="已使用的最大 Memo ID")
+    sub.add_parser("ranges", help="Memo 区间预留情况")
+    sub.add_parser("stats", help="行数统计")
+    sub.add_parser("tm-import", help="用已登记的题目回填翻译记忆")
+    sub.add_parser("tm", help="查询片段的翻译记忆").add_argument("text")
+    sub.add_parser("tm-stats", help="翻译记忆统计与高频片段")
+    args = parser.parse_args(argv)
+
+    db_path = args.db
+    if db_path is None:
+        from ..config import get_settings
+        db_path = get_settings().memo_db_path
+    store = MemoStore(db_path)
+
+    if args.command.startswith("tm"):
+        from ..config import get_settings
+        memory = TranslationMemory(get_settings().translation_memory_path)
+        return _translation_memory_command(args, store, memory)
+
+    if args.command == "import":
+        started = time.perf_counter()
+        count = store.import_term_csvs(args.paths)
+        print(f"导入 {count:,} 行 → {store.path}（{time.perf_counter() - started:.2f}s）")
+    elif args.command == "word":
+        _print_terms(store.find_word(args.word))
+    elif args.command == "memo":
+        _print_terms(store.get_memo(args.memo_id))
+    elif args.command == "batch":
+        _print_terms(store.batch_terms(args.batch_id))
+        for row in store.batch_quiz_items(args.batch_id):
+            print(f"{row['lcode']}  {row['qtype']}  {row['answer']}  {row['stem'][:60]}")
+    elif args.command == "last":
+        print(store.last_memo_id() or "（无记录）")
+    elif args.command == "ranges":
+        for row in store.memo_ranges():
+            first, last = row["start_index"] + 1, row["start_index"] + row["count"]
+            print(f"M{first:06d}–M{last:06d}  {row['status']:<9}  {row['batch_id'] or '-'}  pid={row['pid'] or '-'}")
+        print(f"next: M{store.next_memo_index() + 1:06d}")
+    elif args.command == "stats":
+        for key, value in store.stats().items():
+            print(f"{key}: {value:,}")
+    return 0
+
+
+def _translation_memory_command(args: argparse.Namespace, store: MemoStore, memory: TranslationMemory) -> int:
+    from ...lithoformer.domain import normalize_segment
+
+    if args.command == "tm-import":
+        started = time.perf_counter()
+        count = memory.import_memo_store(store)
+        print(f"收录 {count:,} 个片段 → {memory.path}（{time.perf_counter() - started:.2f}s）")
+    elif args.command == "tm":
+        key = normalize_segment(args.text)
+        print(memory.lookup([key]).get(key, "（无记录）"))
+    elif args.command == "tm-stats":
+        for key, value in memory.stats().items():
+            print(f"{key}: {value:,}")
+        for source, zh, uses in memory.top():
+            print(f"{uses:>6}  {source}  →  {zh}")
+    memory.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
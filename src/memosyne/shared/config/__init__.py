@@ -8,9 +8,10 @@ Following DDD principles:
 - Environment-based settings (12-factor app)
 - Validation at startup
 """
-from .settings import Settings, get_settings
+from .settings import OfflineSettings, Settings, get_settings
 
 __all__ = [
+    "OfflineSettings",
     "Settings",
     "get_settings",
 ]
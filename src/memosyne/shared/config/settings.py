@@ -47,11 +47,72 @@ class Settings(BaseSettings):
         description="Anthropic API 密钥（可选）"
     )
 
+    # 额外的 API Key（逗号分隔，与上面的主 Key 组成 Key 池，按每个 Key 的余量调度）
+    openai_api_keys: str | None = None
+    anthropic_api_keys: str | None = None
+    llm_key_rpm: int = Field(default=0, ge=0)  # 每个 Key 的每分钟请求上限（0 未知，只看响应头余量）
+    llm_key_tpm: int = Field(default=0, ge=0)  # 每个 Key 的每分钟 Token 上限（0 未知）
+    llm_key_quarantine: float = Field(default=300.0, ge=0)  # 鉴权 / 额度错误的 Key 隔离时长（秒）
+
     # === 默认模型配置 ===
     default_llm_provider: Literal["openai", "anthropic"] = "openai"
     default_openai_model: str = "gpt-4o-mini"
     default_anthropic_model: str = "claude-sonnet-4-5"
     default_temperature: float | None = None
+    llm_wire_format: Literal["verbose", "compact"] = "verbose"  # compact=短键结构化输出，减少补全 Token
+    llm_repair_rounds: int = Field(default=2, ge=0, le=3)  # 校验失败时只修复出错字段的最大轮数（0 关闭）
+
+    # === API 地址（留空使用官方地址；压测时可指向本地 Mock 服务）===
+    openai_base_url: str | None = None
+    anthropic_base_url: str | None = None
+
+    # === LLM 调用策略（重试 / 超时 / 熔断；llm_max_retries=0 时关闭策略层，沿用 SDK 内置重试）===
+    llm_timeout: float = Field(default=60.0, gt=0)  # 单次请求超时（秒）
+    llm_deadline: float = Field(default=180.0, gt=0)  # 单次调用总时限（秒，含重试与退避）
+    llm_max_retries: int = Field(default=3, ge=0, le=10)  # 429 / 5xx / 超时的最大重试次数
+    llm_backoff_base: float = Field(default=0.5, ge=0)  # 首次重试退避上限（秒），逐次翻倍并加抖动
+    llm_backoff_max: float = Field(default=20.0, ge=0)  # 单次退避上限（秒）
+    llm_breaker_threshold: int = Field(default=5, ge=0)  # 连续暂时性失败多少次后熔断（0 关闭）
+    llm_breaker_cooldown: float = Field(default=30.0, ge=0)  # 熔断冷却时间（秒）
+
+    # === 多后端负载均衡（本次模型之外的后端，如 "claude-sonnet-4-5@1,gpt-4o@0.5"；留空不启用）===
+    llm_backends: str | None = None
+
+    # === 对冲请求（慢于近期耗时分位时补发一份，先返回者胜出）===
+    llm_hedge_enabled: bool = False
+    llm_hedge_model: str | None = None  # 对冲请求使用的备用模型（同一 provider，留空使用原模型）
+    llm_hedge_percentile: float = Field(default=0.95, gt=0, lt=1)
+    llm_hedge_min_samples: int = Field(default=20, ge=1)  # 同一 Schema 积累多少个耗时样本后开始对冲
+    llm_hedge_min_delay: float = Field(default=1.0, ge=0)  # 对冲等待下限（秒）
+    llm_hedge_budget: float = Field(default=0.1, ge=0, le=1)  # 单次运行最多对冲的调用比例
+    llm_hedge_max_tokens: int = Field(default=0, ge=0)  # 单次运行对冲额外 Token 上限（0 不限）
+
+    # === LLM 录制 / 回放（off=直连，record=录制到磁带，replay=离线回放）===
+    llm_cassette_mode: Literal["off", "record", "replay"] = "off"
+    llm_cassette_path: Path = Field(default=Path("db/cassettes/llm_cassette.jsonl"))
+    llm_cassette_realtime: bool = False  # 回放时按录制耗时等待
+
+    # === 诊断配置 ===
+    trace_path: Path | None = None  # 设置后导出分阶段 trace（Chrome Trace Event JSON）
+    metrics_port: int | None = Field(default=None, ge=0, le=65535)  # Prometheus 文本端点端口
+    metrics_snapshot_path: Path | None = None  # 周期性 JSON 指标快照
+    metrics_snapshot_interval: float = Field(default=10.0, gt=0)  # 快照间隔（秒）
+
+    # === 历史分析（逐次 LLM 调用记录）===
+    analytics_enabled: bool = True
+    analytics_db_path: Path = Field(default=Path("db/analytics.sqlite3"))
+
+    # === 生成记录库（db/mmsdb）===
+    memo_store_enabled: bool = True
+    memo_db_path: Path = Field(default=Path("db/mmsdb/memosyne.sqlite3"))
+
+    # === 翻译记忆（选项 / 步骤片段 → 中文，预填并提示模型跳过）===
+    translation_memory_enabled: bool = False  # 首次收录的译文即固定，默认关闭（启用前可先 tm-import 已审校的输出）
+    translation_memory_path: Path = Field(default=Path("db/mmsdb/translation_memory.sqlite3"))
+    translation_memory_min_uses: int = Field(default=1, ge=1)  # 片段至少出现几次才参与预填
+
+    # === 列式副本（输出 CSV / TXT 旁写 TermOutput / QuizItem 列式文件，供快速查询与报表）===
+    columnar_format: Literal["off", "mmcol", "parquet"] = "off"  # parquet 需安装 pyarrow
 
     # === 路径配置 ===
     project_root: Path = Field(default=_PROJECT_ROOT)
@@ -62,6 +123,32 @@ class Settings(BaseSettings):
     batch_timezone: str = "America/New_York"
     max_batch_runs_per_day: int = Field(default=26, ge=1, le=26)
     reanimator_term_list_version: str = "v1"
+    reanimator_retry_rounds: int = Field(default=1, ge=0, le=5)  # 失败术语在整批完成后的重试轮数
+    reanimator_retry_backoff: float = Field(default=2.0, ge=0)  # 第 N 轮重试前等待 backoff × 2^(N-1) 秒
+    reanimator_fallback_model: str | None = None  # 重试时使用的备用模型（留空沿用本次运行的模型）
+    lithoformer_preparse: bool = True  # 本地预解析格式规范的题目块，LLM 只补充翻译与解析
+    lithoformer_minimize: bool = True  # 调用前精简题目块（成绩页残留、空白、内嵌图片 → §Pic.N§）
+    lithoformer_incremental: bool = False  # 增量重建：同一输入以相同模型等条件再次运行时只处理改动的题目
+    lithoformer_manifest_dir: Path = Field(default=Path("db/manifests"))  # 增量重建清单目录
+    lithoformer_sidecar: bool = True  # 输出旁写 .items.jsonl（QuizItem + L 编号，可离线重新渲染）
+
+    # === Lithoformer 分阶段流水线（结构 → 翻译 → 解析）===
+    lithoformer_staged: bool = False
+    lithoformer_structure_model: str | None = None  # 留空使用本次运行的模型
+    lithoformer_translate_model: str | None = None
+    lithoformer_analyse_model: str | None = None
+    lithoformer_structure_concurrency: int = Field(default=2, ge=1, le=64)
+    lithoformer_translate_concurrency: int = Field(default=4, ge=1, le=64)
+    lithoformer_analyse_concurrency: int = Field(default=4, ge=1, le=64)
+    lithoformer_stage_queue_size: int = Field(default=8, ge=1)
+    lithoformer_stage_retries: int = Field(default=1, ge=0, le=5)  # 阶段失败后只重跑该阶段
+    lithoformer_dispatch: Literal["lpt", "fifo"] = "lpt"  # 派发顺序：最长优先 / 文件顺序
+
+    # === 模型级联（本次运行的模型为便宜层，校验失败 / 结果可疑时升级）===
+    cascade_model: str | None = None  # 强模型（留空关闭级联）
+    cascade_require_tag: bool = True  # Reanimator：TagEN 为空视为可疑
+    cascade_min_definition_words: int = Field(default=4, ge=0)  # Reanimator：EnDef 少于该词数视为可疑
+    cascade_min_rationale_chars: int = Field(default=40, ge=0)  # Lithoformer：解析少于该字符数视为可疑
 
     # === 日志配置 ===
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
@@ -74,15 +161,29 @@ class Settings(BaseSettings):
         extra="ignore",  # 忽略额外的环境变量
     )
 
-    @field_validator("anthropic_api_key", mode="before")
+    @field_validator(
+        "anthropic_api_key",
+        "openai_base_url",
+        "anthropic_base_url",
+        "lithoformer_structure_model",
+        "lithoformer_translate_model",
+        "lithoformer_analyse_model",
+        "reanimator_fallback_model",
+        "cascade_model",
+        "llm_hedge_model",
+        "llm_backends",
+        "openai_api_keys",
+        "anthropic_api_keys",
+        mode="before",
+    )
     @classmethod
     def optional_api_key_empty_to_none(cls, v: str | None) -> str | None:
-        """将空字符串转换为 None（用于可选的 API Key）"""
+        """将空字符串转换为 None（用于可选的 API Key / Base URL）"""
         if isinstance(v, str) and v.strip() == "":
             return None
         return v
 
-    @field_validator("default_temperature", mode="before")
+    @field_validator("default_temperature", "metrics_port", mode="before")
     @classmethod
     def empty_str_to_none(cls, v: str | float | None) -> float | None:
         """将空字符串转换为 None"""
@@ -90,7 +191,16 @@ class Settings(BaseSettings):
             return None
         return v
 
-    @field_validator("data_dir", "db_dir", mode="before")
+    @field_validator(
+        "data_dir",
+        "db_dir",
+        "llm_cassette_path",
+        "analytics_db_path",
+        "memo_db_path",
+        "translation_memory_path",
+        "lithoformer_manifest_dir",
+        mode="before",
+    )
     @classmethod
     def resolve_relative_path(cls, v: Path | str) -> Path:
         """将相对路径解析为绝对路径"""
@@ -99,6 +209,14 @@ class Settings(BaseSettings):
             return _PROJECT_ROOT / path
         return path
 
+    @field_validator("trace_path", "metrics_snapshot_path", mode="before")
+    @classmethod
+    def resolve_optional_path(cls, v: Path | str | None) -> Path | None:
+        """可选路径：空值转为 None，相对路径解析为绝对路径"""
+        if v is None or (isinstance(v, str) and v.strip() == ""):
+            return None
+        return cls.resolve_relative_path(v)
+
     @property
     def reanimator_input_dir(self) -> Path:
         """Reanimator 输入目录"""
@@ -136,6 +254,17 @@ class Settings(BaseSettings):
             dir_path.mkdir(parents=True, exist_ok=True)
 
 
+class OfflineSettings(Settings):
+    """
+    离线工具（不调用 LLM）使用的配置
+
+    与 Settings 读取相同的环境变量与 .env，只是 API 密钥可缺省，
+    便于在没有凭据的环境中对已有输出做重新处理。
+    """
+
+    openai_api_key: str = ""
+
+
 # === 单例模式 - 全局配置实例 ===
 _settings_instance: Settings | None = None
 
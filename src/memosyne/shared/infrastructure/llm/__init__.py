@@ -11,8 +11,37 @@ Following DDD principles:
 """
 from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
+from .cassette import CassetteProvider, request_fingerprint
+from .factory import account_rate_limits, create_provider, provider_for_model
+from .mock_server import FaultSchedule, MockLLMServer
+from .balancer import BalancedProvider, backend_usage, normalize_output, parse_backends
+from .key_pool import KeyPoolProvider, key_usage
+from .hedging import HedgedProvider, HedgePolicy, hedge_stats, hedge_unreported_usage
+from .resilience import CircuitBreaker, CircuitOpenError, ResilientProvider, RetryPolicy, get_breaker
 
 __all__ = [
     "OpenAIProvider",
     "AnthropicProvider",
+    "create_provider",
+    "provider_for_model",
+    "account_rate_limits",
+    "CassetteProvider",
+    "request_fingerprint",
+    "MockLLMServer",
+    "FaultSchedule",
+    "ResilientProvider",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_breaker",
+    "HedgedProvider",
+    "HedgePolicy",
+    "hedge_stats",
+    "hedge_unreported_usage",
+    "BalancedProvider",
+    "backend_usage",
+    "normalize_output",
+    "parse_backends",
+    "KeyPoolProvider",
+    "key_usage",
 ]
@@ -10,25 +10,38 @@ DDD 原则：
 改进：继承抽象基类、移除业务特定逻辑
 """
 import json
+from time import perf_counter
 from typing import Any
 from anthropic import Anthropic, APIError
 
 from ....core.interfaces import BaseLLMProvider, LLMError
 from ....core.models import TokenUsage
+from ...utils.metrics import get_metrics
+from ...utils.tracing import get_tracer, trace_sdk_response
+from .resilience import current_attempt_timeout, parse_rate_limit_headroom, sdk_error_details
 
 
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude LLM Provider"""
 
+    provider_name = "anthropic"
+
     def __init__(
         self,
         model: str,
         api_key: str,
         temperature: float | None = None,
-        max_tokens: int | None = None  # None 则使用模型最大输出
+        max_tokens: int | None = None,  # None 则使用模型最大输出
+        base_url: str | None = None,  # 自定义 API 地址（如本地 Mock 服务）
+        max_retries: int = 2,  # SDK 内置重试次数（由 ResilientProvider 统一重试时为 0）
+        timeout: float | None = None,  # 请求超时秒数（None 使用 SDK 默认值）
     ):
-        self.client = Anthropic(api_key=api_key)
+        client_kwargs: dict[str, Any] = {"api_key": api_key, "base_url": base_url, "max_retries": max_retries}
+        if timeout is not None:
+            client_kwargs["timeout"] = timeout
+        self.client = Anthropic(**client_kwargs)
         super().__init__(model=model, temperature=temperature)
+        self.rate_limit_headroom: float | None = None  # 最近一次响应头中的限流余量（0-1）
         # Anthropic API 要求必须提供 max_tokens（与 OpenAI 不同）
         # 设置为足够大的值，让 API 自己决定实际能用多少
         # Claude 3.5 Sonnet 最大输出约 8192 tokens，但设置更大值也安全
@@ -41,6 +54,7 @@ class AnthropicProvider(BaseLLMProvider):
             model=settings.default_anthropic_model,
             api_key=settings.anthropic_api_key,
             temperature=settings.default_temperature,
+            base_url=settings.anthropic_base_url,
         )
 
     def complete_structured(
@@ -69,25 +83,59 @@ class AnthropicProvider(BaseLLMProvider):
         if self.temperature is not None:
             kwargs["temperature"] = self.temperature
 
-        try:
-            resp = self.client.messages.create(**kwargs)
-        except APIError as e:
-            if "tool_choice" in str(e):
-                kwargs.pop("tool_choice", None)
-                resp = self.client.messages.create(**kwargs)
-            else:
-                raise LLMError(f"Anthropic API 错误：{e}") from e
-        except Exception as e:
-            raise LLMError(f"调用 Anthropic 时发生意外错误：{e}") from e
-
-        # 提取 token 使用信息
-        usage = resp.usage
-        tokens = TokenUsage(
-            prompt_tokens=usage.input_tokens if usage else 0,
-            completion_tokens=usage.output_tokens if usage else 0,
-            total_tokens=(usage.input_tokens + usage.output_tokens) if usage else 0,
-        )
-
+        with get_tracer().span(
+            "llm.request", cat="llm", provider=self.provider_name, model=self.model, schema=schema_name,
+        ) as span:
+            try:
+                resp = self._create_message(kwargs, span)
+            except APIError as e:
+                if "tool_choice" in str(e):
+                    kwargs.pop("tool_choice", None)
+                    resp = self._create_message(kwargs, span)
+                else:
+                    raise LLMError(f"Anthropic API 错误：{e}", **sdk_error_details(e)) from e
+            except Exception as e:
+                raise LLMError(f"调用 Anthropic 时发生意外错误：{e}", **sdk_error_details(e)) from e
+
+            # 提取 token 使用信息（Anthropic 的 input_tokens 不含缓存部分，这里统一并入 prompt_tokens）
+            usage = resp.usage
+            cache_read = (getattr(usage, "cache_read_input_tokens", 0) or 0) if usage else 0
+            cache_write = (getattr(usage, "cache_creation_input_tokens", 0) or 0) if usage else 0
+            prompt_tokens = (usage.input_tokens + cache_read + cache_write) if usage else 0
+            tokens = TokenUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=usage.output_tokens if usage else 0,
+                total_tokens=(prompt_tokens + usage.output_tokens) if usage else 0,
+                cached_tokens=cache_read,
+            )
+            span.set(
+                prompt_tokens=tokens.prompt_tokens,
+                completion_tokens=tokens.completion_tokens,
+                total_tokens=tokens.total_tokens,
+            )
+
+            with get_tracer().span("parse", cat="llm", model=self.model):
+                return self._extract_structured(resp, schema_name), tokens
+
+    def _create_message(self, kwargs: dict[str, Any], span: Any) -> Any:
+        """发送请求（使用 raw response）：拆分排队/重试等待与网络往返，并上报重试次数"""
+        tracer, metrics = get_tracer(), get_metrics()
+        timeout = current_attempt_timeout()
+        if timeout is not None:
+            kwargs = {**kwargs, "timeout": timeout}
+        started = perf_counter()
+        raw = self.client.messages.with_raw_response.create(**kwargs)
+        resp = raw.parse()
+        trace_sdk_response(tracer, span, raw, started, perf_counter(), model=self.model)
+        metrics.record_retries(getattr(raw, "retries_taken", 0))
+        headroom = parse_rate_limit_headroom(getattr(raw, "headers", None))
+        if headroom is not None:
+            self.rate_limit_headroom = headroom  # 供 BalancedProvider 调整权重
+        return resp
+
+    @staticmethod
+    def _extract_structured(resp: Any, schema_name: str) -> dict[str, Any]:
+        """从 tool_use 区块（或文本兜底）中提取结构化结果"""
         # 解析 tool_use 区块
         for block in (resp.content or []):
             btype = getattr(block, "type", None) if hasattr(block, "type") else block.get("type")
@@ -95,7 +143,7 @@ class AnthropicProvider(BaseLLMProvider):
             if btype == "tool_use" and bname == schema_name:
                 binput = getattr(block, "input", None) if hasattr(block, "input") else block.get("input")
                 if isinstance(binput, dict):
-                    return binput, tokens
+                    return binput
 
         # 容错：尝试从文本提取 JSON
         text_parts = []
@@ -107,11 +155,11 @@ class AnthropicProvider(BaseLLMProvider):
         text = "".join(text_parts).strip()
 
         try:
-            return json.loads(text), tokens
+            return json.loads(text)
         except json.JSONDecodeError:
             s, e = text.find("{"), text.rfind("}")
             if s != -1 and e != -1 and e > s:
-                return json.loads(text[s:e+1]), tokens
+                return json.loads(text[s:e+1])
             raise LLMError("Claude 未返回可解析的结构化结果")
 
     def _validate_config(self) -> None:
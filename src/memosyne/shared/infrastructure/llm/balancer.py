@@ -0,0 +1,277 @@
+"""
+Balancer - 多 Provider / 模型负载均衡
+
+BalancedProvider 把请求分发到多个后端（如 OpenAI + Anthropic），突破单个账号的限流：
+- 自适应权重：配置权重 × 限流余量 ÷ 平滑耗时 × 成功率²，
+  每个后端保留最低权重，持续获得少量请求以更新观测
+- 故障转移：某个后端报错（含熔断拒绝）时换下一个后端重试本次请求
+- 输出规范化：按 Schema 补齐缺失字段、解开被编码成字符串的嵌套对象 / 数组、
+  丢弃多余字段，下游校验无需关心由哪个后端回答
+- 按后端统计调用、失败、故障转移与 Token（见 BalancedProvider.usage()）
+- 实际响应的后端模型写入线程本地（note_call_model），分析记录据此计价
+
+后端配置格式（settings.llm_backends）："gpt-4o-mini@2,claude-sonnet-4-5@1"（@ 后为权重，默认 1）。
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Callable
+
+from ....core.interfaces import LLMError, LLMProvider
+from ....core.models import TokenUsage
+from ...utils.metrics import note_call_model
+from ...utils.tracing import get_tracer
+
+# 平滑系数（越大越偏向最近的观测）
+_EWMA_ALPHA = 0.2
+# 最低权重占最大权重的比例
+_MIN_SHARE = 0.05
+
+
+@dataclass(slots=True)
+class BackendSpec:
+    """单个后端的配置"""
+
+    model: str
+    weight: float = 1.0
+
+
+def parse_backends(spec: str | None) -> list[BackendSpec]:
+    """
+    解析后端配置
+
+    Example:
+        >>> parse_backends("gpt-4o-mini@2, claude-sonnet-4-5")
+        [BackendSpec(model='gpt-4o-mini', weight=2.0), BackendSpec(model='claude-sonnet-4-5', weight=1.0)]
+    """
+    backends: list[BackendSpec] = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        model, _, weight = part.partition("@")
+        try:
+            value = float(weight) if weight else 1.0
+        except ValueError as exc:
+            raise ValueError(f"后端权重无效：{part}") from exc
+        if value <= 0:
+            raise ValueError(f"后端权重必须大于 0：{part}")
+        backends.append(BackendSpec(model.strip(), value))
+    return backends
+
+
+# ============================================================
+# 输出规范化
+# ============================================================
+def normalize_output(data: Any, schema: dict[str, Any]) -> Any:
+    """
+    按 JSON Schema 规范化后端输出
+
+    - 对象 / 数组被编码成 JSON 字符串时解码（Tool Use 偶发）
+    - 对象补齐 properties 中缺失的字段（string→""、array→[]、object→递归补齐，其它→None）
+    - additionalProperties 为 False 时丢弃多余字段
+    """
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), None)
+    if kind in ("object", "array") and isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            return data
+
+    if kind == "object" and isinstance(data, dict):
+        properties: dict[str, Any] = schema.get("properties") or {}
+        if not properties:
+            return data
+        result = {
+            key: normalize_output(data[key], sub) if key in data else _empty(sub)
+            for key, sub in properties.items()
+        }
+        if schema.get("additionalProperties", True) is not False:
+            result.update({key: value for key, value in data.items() if key not in properties})
+        return result
+    if kind == "array" and isinstance(data, list):
+        items = schema.get("items") or {}
+        return [normalize_output(value, items) for value in data]
+    return data
+
+
+def _empty(schema: dict[str, Any]) -> Any:
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), None)
+    if kind == "string":
+        return ""
+    if kind == "array":
+        return []
+    if kind == "object":
+        return normalize_output({}, schema)
+    return None
+
+
+# ============================================================
+# 后端状态
+# ============================================================
+@dataclass
+class BackendState:
+    """单个后端的观测值与用量"""
+
+    label: str
+    provider: LLMProvider
+    weight: float = 1.0
+    latency: float | None = None  # 平滑耗时（秒）
+    error_rate: float = 0.0  # 平滑失败率
+    calls: int = 0
+    errors: int = 0
+    failovers: int = 0  # 本后端失败后转移给其它后端的次数
+    usage: TokenUsage = field(default_factory=TokenUsage)
+
+    def score(self) -> float:
+        headroom = rate_limit_headroom(self.provider)
+        # 余量低于 10% 时快速降权；未知时按充足处理
+        headroom_factor = 1.0 if headroom is None else min(1.0, headroom / 0.1)
+        latency = self.latency if self.latency is not None else 1.0
+        return self.weight * headroom_factor * (1.0 - self.error_rate) ** 2 / max(latency, 0.05)
+
+    def observe(self, elapsed: float | None, ok: bool) -> None:
+        self.error_rate += _EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+        if elapsed is not None:
+            self.latency = elapsed if self.latency is None else self.latency + _EWMA_ALPHA * (elapsed - self.latency)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "failovers": self.failovers,
+            "prompt_tokens": self.usage.prompt_tokens,
+            "completion_tokens": self.usage.completion_tokens,
+            "total_tokens": self.usage.total_tokens,
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+        }
+
+
+def rate_limit_headroom(provider: Any) -> float | None:
+    """沿包装链查找 Provider 最近一次响应头中的限流余量（0-1）"""
+    while provider is not None:
+        headroom = getattr(provider, "rate_limit_headroom", None)
+        if headroom is not None:
+            return headroom
+        provider = getattr(provider, "inner", None)
+    return None
+
+
+def _breaker_open(provider: Any) -> bool:
+    while provider is not None:
+        breaker = getattr(provider, "breaker", None)
+        if breaker is not None:
+            return breaker.state == "open"
+        provider = getattr(provider, "inner", None)
+    return False
+
+
+class BalancedProvider:
+    """
+    多后端负载均衡 Provider（满足 LLMProvider 协议）
+
+    Example:
+        >>> provider = BalancedProvider({"openai/gpt-4o-mini": openai, "anthropic/claude-sonnet-4-5": claude})
+        >>> data, usage = provider.complete_structured(system, user, schema, "TermResult")
+        >>> provider.usage()
+    """
+
+    provider_name = "balanced"
+
+    def __init__(
+        self,
+        backends: dict[str, LLMProvider],
+        weights: dict[str, float] | None = None,
+        *,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Args:
+            backends: 后端标签 → Provider（第一个为主后端，决定 model 属性）
+            weights: 后端标签 → 配置权重（缺省为 1）
+            rng: [0, 1) 随机数函数（便于测试替换）
+        """
+        if not backends:
+            raise ValueError("BalancedProvider 至少需要一个后端")
+        weights = weights or {}
+        self.backends = [
+            BackendState(label, provider, weights.get(label, 1.0)) for label, provider in backends.items()
+        ]
+        primary = self.backends[0].provider
+        self.model = getattr(primary, "model", "")
+        self.temperature = getattr(primary, "temperature", None)
+        self._rng = rng
+        self._lock = threading.Lock()
+
+    def usage(self) -> dict[str, dict[str, Any]]:
+        """按后端统计（调用 / 失败 / 故障转移 / Token / 平滑耗时）"""
+        with self._lock:
+            return {backend.label: backend.to_dict() for backend in self.backends}
+
+    def _order(self) -> list[BackendState]:
+        """按自适应权重抽取首选后端，其余按得分降序作为故障转移顺序"""
+        with self._lock:
+            candidates = [backend for backend in self.backends if not _breaker_open(backend.provider)]
+            if not candidates:
+                candidates = list(self.backends)
+            scores = [backend.score() for backend in candidates]
+            floor = max(scores) * _MIN_SHARE
+            scores = [max(score, floor) for score in scores]
+            pick = self._rng() * sum(scores)
+            chosen = candidates[-1]
+            for backend, score in zip(candidates, scores):
+                pick -= score
+                if pick < 0:
+                    chosen = backend
+                    break
+            rest = sorted((b for b in self.backends if b is not chosen), key=BackendState.score, reverse=True)
+            return [chosen, *rest]
+
+    def complete_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        schema_name: str = "Response",
+    ) -> tuple[dict[str, Any], TokenUsage]:
+        last_error: LLMError | None = None
+        order = self._order()
+        for position, backend in enumerate(order):
+            started = perf_counter()
+            try:
+                with get_tracer().span("llm.backend", cat="llm", backend=backend.label, schema=schema_name):
+                    data, usage = backend.provider.complete_structured(system_prompt, user_prompt, schema, schema_name)
+            except LLMError as exc:
+                with self._lock:
+                    backend.calls += 1
+                    backend.errors += 1
+                    backend.failovers += position + 1 < len(order)
+                    backend.observe(None, ok=False)
+                last_error = exc
+                continue
+            with self._lock:
+                backend.calls += 1
+                backend.usage = backend.usage + usage
+                backend.observe(perf_counter() - started, ok=True)
+            note_call_model(getattr(backend.provider, "model", None) or backend.label.partition("/")[2])
+            return normalize_output(data, schema), usage
+
+        assert last_error is not None
+        raise last_error
+
+
+def backend_usage(provider: Any) -> dict[str, dict[str, Any]] | None:
+    """沿包装链查找 BalancedProvider 并返回按后端的用量；未启用负载均衡时为 None"""
+    while provider is not None:
+        if isinstance(provider, BalancedProvider):
+            return provider.usage()
+        provider = getattr(provider, "inner", None)
+    return None
@@ -0,0 +1,205 @@
+"""
+Cassette Provider - LLM 请求录制与回放
+
+用途：
+- record：透传给真实 Provider，同时把每次 请求/响应/用量/耗时 追加写入 JSONL 磁带
+- replay：不访问网络，按请求指纹从磁带中确定性地返回录制结果
+- realtime=True 时按录制时的耗时回放，可模拟“真实速度”
+
+磁带格式（每行一个 JSON 对象）：
+    {"fingerprint": "...", "model": "...", "schema_name": "...",
+     "system_prompt": "...", "user_prompt": "...",
+     "response": {...}, "usage": {...}, "latency": 1.234, "recorded_at": "..."}
+
+同一指纹出现多次时，回放按录制顺序依次返回，用尽后重复最后一条。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+from ....core.interfaces import LLMError, LLMProvider
+from ....core.models import TokenUsage
+from ...utils.metrics import get_metrics
+
+CassetteMode = Literal["record", "replay"]
+
+
+def request_fingerprint(
+    model: str | None,
+    system_prompt: str,
+    user_prompt: str,
+    schema: dict[str, Any],
+    schema_name: str,
+) -> str:
+    """计算请求指纹（sha256，键顺序无关）"""
+    canonical = json.dumps(
+        {
+            "model": model or "",
+            "system": system_prompt,
+            "user": user_prompt,
+            "schema": schema,
+            "schema_name": schema_name,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CassetteProvider:
+    """
+    录制 / 回放 LLM 交互的 Provider 包装器（满足 LLMProvider 协议）
+
+    Example:
+        >>> recorder = CassetteProvider(OpenAIProvider(...), "db/cassettes/run.jsonl", mode="record")
+        >>> player = CassetteProvider(None, "db/cassettes/run.jsonl", mode="replay", realtime=True)
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider | None,
+        path: str | Path,
+        mode: CassetteMode = "replay",
+        *,
+        realtime: bool = False,
+        model: str | None = None,
+    ):
+        """
+        Args:
+            inner: 被包装的真实 Provider（replay 模式可为 None）
+            path: 磁带文件路径（JSONL）
+            mode: "record" 或 "replay"
+            realtime: 回放时是否按录制耗时等待
+            model: 模型 ID（默认取 inner.model；replay 且无 inner 时用于匹配指纹）
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"不支持的 cassette 模式: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("record 模式需要提供真实 Provider")
+
+        self.inner = inner
+        self.path = Path(path)
+        self.mode = mode
+        self.realtime = realtime
+        self.model = model or getattr(inner, "model", None)
+        self.temperature = getattr(inner, "temperature", None)
+        self.provider_name = getattr(inner, "provider_name", "cassette")
+
+        self._lock = threading.Lock()
+        self._tracks: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # LLMProvider 协议
+    # ------------------------------------------------------------------
+    def complete_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        schema_name: str = "Response",
+    ) -> tuple[dict[str, Any], TokenUsage]:
+        fingerprint = request_fingerprint(self.model, system_prompt, user_prompt, schema, schema_name)
+        if self.mode == "replay":
+            return self._replay(fingerprint, schema_name)
+
+        started = time.perf_counter()
+        result, usage = self.inner.complete_structured(  # type: ignore[union-attr]
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            schema=schema,
+            schema_name=schema_name,
+        )
+        latency = time.perf_counter() - started
+        self._append({
+            "fingerprint": fingerprint,
+            "model": self.model,
+            "schema_name": schema_name,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "response": result,
+            "usage": usage.model_dump(),
+            "latency": round(latency, 6),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        })
+        return result, usage
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    def _replay(self, fingerprint: str, schema_name: str) -> tuple[dict[str, Any], TokenUsage]:
+        with self._lock:
+            track = self._tracks.get(fingerprint)
+            if not track:
+                raise LLMError(
+                    f"Cassette 未命中：{schema_name} 请求（指纹 {fingerprint[:12]}）不在 {self.path.name} 中"
+                )
+            index = min(self._cursor[fingerprint], len(track) - 1)
+            self._cursor[fingerprint] += 1
+            record = track[index]
+
+        get_metrics().record_cache_hit("cassette")
+        if self.realtime:
+            time.sleep(float(record.get("latency") or 0.0))
+        return json.loads(json.dumps(record["response"])), TokenUsage(**record.get("usage", {}))
+
+    def _append(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette 文件不存在: {self.path}")
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Cassette 第 {line_no} 行不是合法 JSON: {exc}") from exc
+                self._tracks[record["fingerprint"]].append(record)
+
+    def __len__(self) -> int:
+        return sum(len(track) for track in self._tracks.values())
+
+    def __repr__(self) -> str:
+        return f"CassetteProvider(mode={self.mode!r}, path={str(self.path)!r}, model={self.model!r})"
+
+
+# ============================================================
+# 使用示例
+# ============================================================
+if __name__ == "__main__":
+    import tempfile
+
+    class EchoProvider:
+        model = "echo-1"
+
+        def complete_structured(self, system_prompt, user_prompt, schema, schema_name="Response"):
+            time.sleep(0.05)
+            return {"echo": user_prompt}, TokenUsage(prompt_tokens=3, completion_tokens=2, total_tokens=5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tape = Path(tmp) / "demo.jsonl"
+        recorder = CassetteProvider(EchoProvider(), tape, mode="record")
+        print(recorder.complete_structured("sys", "hello", {"type": "object"}, "Echo"))
+
+        player = CassetteProvider(None, tape, mode="replay", model="echo-1", realtime=True)
+        print(player.complete_structured("sys", "hello", {"type": "object"}, "Echo"))
@@ -0,0 +1,197 @@
+"""
+Provider Factory - 统一的 LLM Provider 构造入口
+
+API / CLI / TUI 共用同一个构造函数，避免各处重复拼装
+api_key、temperature、base_url 等参数。
+
+同一 provider 配置了多个 API Key（*_api_keys）时，直连层为 KeyPoolProvider（按 Key 余量调度）。
+直连 Provider 由 ResilientProvider 包装（重试 / 超时 / 熔断，SDK 内置重试关闭）；
+settings.llm_max_retries 为 0 时不包装，沿用 SDK 内置重试。
+settings.llm_backends 配置了其它后端时，由 BalancedProvider 在本次模型与这些后端之间分发请求。
+settings.llm_hedge_enabled 时再由 HedgedProvider 包装（慢请求对冲，可指定备用模型）。
+若 settings.llm_cassette_mode 为 record / replay，返回的 Provider
+会被 CassetteProvider 包装（replay 模式完全不访问网络）。
+"""
+from __future__ import annotations
+
+from ....core.interfaces import LLMProvider
+from ...utils.model_codes import get_provider_from_model, resolve_model_input
+from .anthropic_provider import AnthropicProvider
+from .balancer import BackendSpec, BalancedProvider, parse_backends
+from .cassette import CassetteProvider
+from .hedging import HedgedProvider, HedgePolicy
+from .key_pool import KeyPoolProvider
+from .openai_provider import OpenAIProvider
+from .resilience import ResilientProvider
+
+
+def create_provider(
+    provider: str,
+    model: str,
+    settings,
+    *,
+    temperature: float | None = None,
+) -> LLMProvider:
+    """
+    根据 provider 类型创建 LLM Provider
+
+    Args:
+        provider: "openai" 或 "anthropic"
+        model: 模型 ID
+        settings: Settings 对象（提供 API Key / Base URL / 默认温度）
+        temperature: 温度参数（None 使用 settings.default_temperature）
+
+    Returns:
+        满足 LLMProvider 协议的实例
+
+    Raises:
+        ValueError: 不支持的 provider 或缺少 API Key
+
+    Example:
+        >>> provider = create_provider("openai", "gpt-4o-mini", get_settings())
+    """
+    if temperature is None:
+        temperature = settings.default_temperature
+
+    cassette_mode = getattr(settings, "llm_cassette_mode", "off")
+    if cassette_mode == "replay":
+        if provider not in ("openai", "anthropic"):
+            raise ValueError(f"不支持的 provider: {provider}")
+        return CassetteProvider(
+            None,
+            settings.llm_cassette_path,
+            mode="replay",
+            realtime=settings.llm_cassette_realtime,
+            model=model,
+        )
+
+    llm_provider = _create_policy_provider(provider, model, settings, temperature)
+    backends = parse_backends(getattr(settings, "llm_backends", None))
+    if backends:
+        llm_provider = _create_balanced_provider(provider, model, llm_provider, backends, settings, temperature)
+    if getattr(settings, "llm_hedge_enabled", False):
+        hedge_model = settings.llm_hedge_model
+        alternate = (
+            _create_policy_provider(provider, hedge_model, settings, temperature)
+            if hedge_model and hedge_model != model else None
+        )
+        llm_provider = HedgedProvider(llm_provider, HedgePolicy.from_settings(settings), alternate=alternate)
+    if cassette_mode == "record":
+        return CassetteProvider(llm_provider, settings.llm_cassette_path, mode="record")
+    return llm_provider
+
+
+def provider_for_model(settings, value: str) -> LLMProvider:
+    """
+    按模型输入（编号或模型 ID）创建 Provider，provider 类型由模型 ID 推断
+
+    用于备用模型、级联强模型、流水线阶段模型等单独配置的模型；
+    无法识别的输入按原样作为模型 ID。
+
+    Example:
+        >>> provider = provider_for_model(settings, settings.cascade_model)
+    """
+    try:
+        model_id, _ = resolve_model_input(value)
+    except ValueError:
+        model_id = value.strip()
+    return create_provider(get_provider_from_model(model_id), model_id, settings)
+
+
+def _create_balanced_provider(
+    provider: str,
+    model: str,
+    primary: LLMProvider,
+    backends: list[BackendSpec],
+    settings,
+    temperature: float | None,
+) -> LLMProvider:
+    """本次运行的模型作为主后端（权重取配置中同名项，默认 1），再加入其它已配置后端"""
+    label = f"{provider}/{model}"
+    providers: dict[str, LLMProvider] = {label: primary}
+    weights: dict[str, float] = {label: 1.0}
+    for spec in backends:
+        backend_provider = get_provider_from_model(spec.model)
+        backend_label = f"{backend_provider}/{spec.model}"
+        weights[backend_label] = spec.weight
+        if backend_label not in providers:
+            providers[backend_label] = _create_policy_provider(backend_provider, spec.model, settings, temperature)
+    if len(providers) == 1:
+        return primary
+    return BalancedProvider(providers, weights)
+
+
+def _create_policy_provider(provider: str, model: str, settings, temperature: float | None) -> LLMProvider:
+    llm_provider = _create_direct_provider(provider, model, settings, temperature)
+    if _policy_enabled(settings):
+        return ResilientProvider.from_settings(llm_provider, settings)
+    return llm_provider
+
+
+def _policy_enabled(settings) -> bool:
+    return getattr(settings, "llm_max_retries", 0) > 0
+
+
+def _create_direct_provider(provider: str, model: str, settings, temperature: float | None) -> LLMProvider:
+    """直连 Provider；同一 provider 配置了多个 API Key 时返回 KeyPoolProvider（每个 Key 一个客户端）"""
+    if provider == "anthropic" and not settings.anthropic_api_key:
+        raise ValueError("Anthropic API Key 未配置")
+    keys = _api_keys(provider, settings)
+    clients = [_create_key_provider(provider, model, key, settings, temperature) for key in keys]
+    if len(clients) == 1:
+        return clients[0]
+    return KeyPoolProvider(
+        clients,
+        rpm=settings.llm_key_rpm,
+        tpm=settings.llm_key_tpm,
+        quarantine=settings.llm_key_quarantine,
+    )
+
+
+def account_rate_limits(provider: str, settings) -> tuple[int, int]:
+    """
+    本次运行可用的总限流 (RPM, TPM)：每个 Key 的 LLM_KEY_RPM / LLM_KEY_TPM × Key 数（未配置为 0）
+
+    供运行前估算使用，不创建客户端。
+    """
+    try:
+        keys = max(1, len(_api_keys(provider, settings)))
+    except ValueError:
+        keys = 1
+    return settings.llm_key_rpm * keys, settings.llm_key_tpm * keys
+
+
+def _api_keys(provider: str, settings) -> list[str]:
+    if provider == "openai":
+        primary, extra = settings.openai_api_key, getattr(settings, "openai_api_keys", None)
+    elif provider == "anthropic":
+        primary, extra = settings.anthropic_api_key, getattr(settings, "anthropic_api_keys", None)
+    else:
+        raise ValueError(f"不支持的 provider: {provider}")
+    keys = [primary, *(key.strip() for key in (extra or "").split(","))]
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def _create_key_provider(
+    provider: str, model: str, api_key: str, settings, temperature: float | None
+) -> LLMProvider:
+    # 策略层启用时由它负责重试，SDK 不再重复重试
+    sdk_retries = 0 if _policy_enabled(settings) else 2
+    timeout = getattr(settings, "llm_timeout", None)
+    if provider == "openai":
+        return OpenAIProvider(
+            model=model,
+            api_key=api_key,
+            temperature=temperature,
+            max_retries=sdk_retries,
+            base_url=settings.openai_base_url,
+            timeout=timeout,
+        )
+    return AnthropicProvider(
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
+        base_url=settings.anthropic_base_url,
+        max_retries=sdk_retries,
+        timeout=timeout,
+    )
@@ -0,0 +1,321 @@
+"""
+Hedging - 对冲请求，削减长尾延迟
+
+HedgedProvider 包装任意 LLMProvider：
+- 按 schema_name 记录主请求最近的成功耗时（主请求落败时同样记录，窗口不会因对冲而偏低），
+  请求超过该分位（如 p95）仍未返回时，向同一模型或备用模型再发一份相同请求，
+  先返回且满足 Schema 的结果胜出
+- 尚未发出的对冲请求直接取消；已发出的 HTTP 请求无法从另一线程中断，
+  其结果被丢弃，完成后的 Token 计入对冲开销（wasted_tokens）
+- 胜者返回前已完成的败者 Token 计入本次调用返回的 TokenUsage；
+  之后才完成的（或本次调用最终失败的）记为 unreported_tokens，
+  由 hedge_unreported_usage() 补入运行总计
+- 每个 Provider 实例（即一次运行）有对冲预算：最多对冲 budget 比例的调用，
+  额外 Token 达到 max_extra_tokens 后停止对冲
+
+在 ResilientProvider 之外包装：每一路请求各自重试，互不影响。
+"""
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from ....core.interfaces import LLMError, LLMProvider
+from ....core.models import TokenUsage
+from ...utils.metrics import get_metrics, note_call_model, pop_call_model, pop_call_retries
+from ...utils.tracing import get_tracer
+
+
+@dataclass(frozen=True, slots=True)
+class HedgePolicy:
+    """
+    对冲策略
+
+    Attributes:
+        percentile: 触发对冲的耗时分位（0-1）
+        min_samples: 同一 Schema 至少观测多少次成功耗时后才开始对冲
+        min_delay: 对冲等待下限（秒），避免对本就很快的请求对冲
+        budget: 最多对冲的调用比例（0-1）
+        max_extra_tokens: 对冲额外 Token 上限（0 不限）
+        window: 每个 Schema 保留的耗时样本数
+    """
+
+    percentile: float = 0.95
+    min_samples: int = 20
+    min_delay: float = 1.0
+    budget: float = 0.1
+    max_extra_tokens: int = 0
+    window: int = 200
+
+    @classmethod
+    def from_settings(cls, settings) -> "HedgePolicy":
+        return cls(
+            percentile=settings.llm_hedge_percentile,
+            min_samples=settings.llm_hedge_min_samples,
+            min_delay=settings.llm_hedge_min_delay,
+            budget=settings.llm_hedge_budget,
+            max_extra_tokens=settings.llm_hedge_max_tokens,
+        )
+
+
+@dataclass
+class HedgeStats:
+    """对冲统计（单个 HedgedProvider 实例，即一次运行）"""
+
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    cancelled: int = 0
+    wasted_tokens: TokenUsage = field(default_factory=TokenUsage)
+    unreported_tokens: TokenUsage = field(default_factory=TokenUsage)  # 未计入任何调用返回值的败者 Token
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "cancelled": self.cancelled,
+            "wasted_prompt_tokens": self.wasted_tokens.prompt_tokens,
+            "wasted_completion_tokens": self.wasted_tokens.completion_tokens,
+            "unreported_prompt_tokens": self.unreported_tokens.prompt_tokens,
+            "unreported_completion_tokens": self.unreported_tokens.completion_tokens,
+        }
+
+
+@dataclass(slots=True)
+class _Leg:
+    """一路请求（primary / hedge）的结果"""
+
+    name: str
+    data: dict[str, Any] | None = None
+    usage: TokenUsage | None = None
+    error: Exception | None = None
+    retries: int = 0
+    elapsed: float = 0.0
+    model: str | None = None  # 实际响应的模型（负载均衡时为选中的后端）
+
+
+def matches_schema(data: Any, schema: dict[str, Any]) -> bool:
+    """轻量 Schema 检查：对象类型且包含全部顶层 required 字段（完整校验由子域领域模型负责）"""
+    if not isinstance(data, dict):
+        return False
+    return all(key in data for key in schema.get("required") or [])
+
+
+class HedgedProvider:
+    """
+    对冲请求 Provider 包装器（满足 LLMProvider 协议）
+
+    Example:
+        >>> provider = HedgedProvider(primary, HedgePolicy(percentile=0.9), alternate=backup)
+        >>> data, usage = provider.complete_structured(system, user, schema, "TermResult")
+        >>> provider.stats.to_dict()
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        policy: HedgePolicy | None = None,
+        *,
+        alternate: LLMProvider | None = None,
+    ):
+        """
+        Args:
+            inner: 主 Provider
+            policy: 对冲策略（默认 HedgePolicy()）
+            alternate: 对冲请求使用的 Provider（None 使用主 Provider）
+        """
+        self.inner = inner
+        self.alternate = alternate or inner
+        self.policy = policy or HedgePolicy()
+        self.provider_name = getattr(inner, "provider_name", "llm")
+        self.model = getattr(inner, "model", "")
+        self.temperature = getattr(inner, "temperature", None)
+        self.stats = HedgeStats()
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 延迟观测与预算
+    # ------------------------------------------------------------------
+    def hedge_delay(self, schema_name: str) -> float | None:
+        """当前 Schema 的对冲等待秒数（样本不足时为 None，不对冲）"""
+        with self._lock:
+            samples = self._latencies.get(schema_name)
+            if not samples or len(samples) < self.policy.min_samples:
+                return None
+            ordered = sorted(samples)
+        position = min(len(ordered) - 1, int(self.policy.percentile * len(ordered)))
+        return max(self.policy.min_delay, ordered[position])
+
+    def _observe(self, schema_name: str, elapsed: float) -> None:
+        with self._lock:
+            samples = self._latencies.setdefault(schema_name, deque(maxlen=self.policy.window))
+            samples.append(elapsed)
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self.stats.hedged + 1 > self.policy.budget * self.stats.calls:
+                return False
+            if self.policy.max_extra_tokens and self.stats.wasted_tokens.total_tokens >= self.policy.max_extra_tokens:
+                return False
+            self.stats.hedged += 1
+            return True
+
+    def _waste(self, usage: TokenUsage, *, reported: bool) -> None:
+        """记录败者 Token（reported：已计入本次调用返回的用量）"""
+        with self._lock:
+            self.stats.wasted_tokens = self.stats.wasted_tokens + usage
+            if not reported:
+                self.stats.unreported_tokens = self.stats.unreported_tokens + usage
+
+    # ------------------------------------------------------------------
+    # 调用
+    # ------------------------------------------------------------------
+    def complete_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        schema_name: str = "Response",
+    ) -> tuple[dict[str, Any], TokenUsage]:
+        with self._lock:
+            self.stats.calls += 1
+        delay = self.hedge_delay(schema_name)
+        request = (system_prompt, user_prompt, schema, schema_name)
+        if delay is None:
+            # 样本不足：在当前线程直接调用，只积累耗时样本
+            started = perf_counter()
+            data, usage = self.inner.complete_structured(*request)
+            self._observe(schema_name, perf_counter() - started)
+            return data, usage
+
+        outcomes: queue.Queue[_Leg] = queue.Queue()
+        settled = threading.Event()
+        self._start("primary", self.inner, request, outcomes, settled)
+        running = 1
+        try:
+            first = outcomes.get(timeout=delay)
+        except queue.Empty:
+            first = None
+            if self._reserve_hedge():
+                with get_tracer().span("llm.hedge", cat="llm", model=self.model, schema=schema_name, delay=delay):
+                    self._start("hedge", self.alternate, request, outcomes, settled)
+                running += 1
+
+        last_error: Exception | None = None
+        spent = TokenUsage()  # 已完成的败者 Token（计入本次返回的用量）
+        while True:
+            leg = first if first is not None else outcomes.get()
+            first = None
+            running -= 1
+            if leg.error is None and matches_schema(leg.data, schema):
+                spent = spent + self._settle(settled, outcomes, reported=True)
+                if leg.name == "hedge":
+                    with self._lock:
+                        self.stats.hedge_wins += 1
+                get_metrics().add_call_retries(leg.retries)
+                note_call_model(leg.model)
+                return leg.data, leg.usage + spent
+            if leg.error is None:
+                spent = spent + leg.usage
+                last_error = LLMError(f"{schema_name} 响应缺少必需字段")
+            else:
+                last_error = leg.error
+            if running == 0:
+                self._settle(settled, outcomes, reported=False)
+                # 调用失败：已消耗的 Token 无法随返回值上报
+                self._waste(spent, reported=False)
+                raise last_error
+
+    def _settle(self, settled: threading.Event, outcomes: "queue.Queue[_Leg]", *, reported: bool) -> TokenUsage:
+        """标记已有结果，并把已排队但未被取走的败者 Token 记为对冲开销（返回其合计）"""
+        drained = TokenUsage()
+        with self._lock:
+            settled.set()
+            while True:
+                try:
+                    leg = outcomes.get_nowait()
+                except queue.Empty:
+                    break
+                if leg.usage is not None:
+                    drained = drained + leg.usage
+            self._waste(drained, reported=reported)
+        return drained
+
+    def _start(
+        self,
+        name: str,
+        provider: LLMProvider,
+        request: tuple,
+        outcomes: "queue.Queue[_Leg]",
+        settled: threading.Event,
+    ) -> None:
+        # 复制上下文：tracing span / 指标标签在工作线程中保持一致
+        context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=context.run,
+            args=(self._run_leg, name, provider, request, outcomes, settled),
+            name=f"llm-{name}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _run_leg(
+        self,
+        name: str,
+        provider: LLMProvider,
+        request: tuple,
+        outcomes: "queue.Queue[_Leg]",
+        settled: threading.Event,
+    ) -> None:
+        leg = _Leg(name)
+        if settled.is_set():  # 已有胜者：尚未发出的请求直接取消
+            with self._lock:
+                self.stats.cancelled += 1
+            return
+        started = perf_counter()
+        try:
+            leg.data, leg.usage = provider.complete_structured(*request)
+        except Exception as exc:  # 交给调用线程决定是否抛出
+            leg.error = exc
+        leg.elapsed = perf_counter() - started
+        leg.retries = pop_call_retries()
+        leg.model = pop_call_model() or getattr(provider, "model", None)
+        if name == "primary" and leg.error is None:
+            # 主请求无论胜负都记录耗时（对冲请求的耗时从发出对冲时算起，不代表请求耗时）
+            self._observe(request[3], leg.elapsed)
+        with self._lock:
+            if not settled.is_set():
+                outcomes.put(leg)
+            elif leg.usage is not None:
+                # 败者：结果丢弃，Token 记为对冲开销（胜者已返回，补入运行总计）
+                self._waste(leg.usage, reported=False)
+
+
+def hedge_unreported_usage(provider: Any) -> TokenUsage:
+    """
+    沿包装链查找 HedgedProvider，返回未计入任何调用返回值的败者 Token（未启用对冲时为空）
+
+    运行结束时补入 token_usage 总计；此后才完成的在途败者请求无法再计入。
+    """
+    while provider is not None:
+        if isinstance(provider, HedgedProvider):
+            with provider._lock:
+                return provider.stats.unreported_tokens
+        provider = getattr(provider, "inner", None)
+    return TokenUsage()
+
+
+def hedge_stats(provider: Any) -> dict[str, int] | None:
+    """沿包装链（CassetteProvider 等的 inner）查找 HedgedProvider 并返回其统计；未启用对冲时为 None"""
+    while provider is not None:
+        if isinstance(provider, HedgedProvider):
+            return provider.stats.to_dict()
+        provider = getattr(provider, "inner", None)
+    return None
@@ -0,0 +1,235 @@
+"""
+Key Pool - 同一 Provider 的多 API Key 调度
+
+KeyPoolProvider 持有多个直连 Provider（每个 Key 一个独立客户端）：
+- 每个 Key 维护 60 秒滑动窗口的请求数 / Token 数（对照配置的 RPM / TPM），
+  并结合响应头中的限流余量，请求发给余量最大的 Key（余量相同时选进行中、再选窗口内请求最少的）
+- 鉴权失败（401 / 403）与额度耗尽（insufficient_quota）的 Key 隔离 quarantine 秒；
+  被限流（429）的 Key 按 Retry-After 短暂冷却。本次请求立即换下一个 Key
+- 所有 Key 都不可用时抛出暂时性 LLMError（retry_after 为最早恢复时间），交由 ResilientProvider 退避重试
+
+位于 ResilientProvider 之内：策略层每次重试都会重新选 Key。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from ....core.interfaces import LLMError, LLMProvider
+from ....core.models import TokenUsage
+
+_WINDOW = 60.0
+_AUTH_STATUS = {401, 403}
+
+
+def mask_key(api_key: str) -> str:
+    """Key 脱敏（只保留末 4 位），用于统计与日志"""
+    return f"…{api_key[-4:]}" if len(api_key) > 4 else "…"
+
+
+@dataclass
+class KeyState:
+    """单个 Key 的滑动窗口用量与健康状态"""
+
+    label: str
+    provider: LLMProvider
+    requests: deque[float] = field(default_factory=deque)
+    tokens: deque[tuple[float, int]] = field(default_factory=deque)
+    token_sum: int = 0
+    in_flight: int = 0
+    unavailable_until: float = 0.0
+    calls: int = 0
+    errors: int = 0
+    quarantines: int = 0
+    usage: TokenUsage = field(default_factory=TokenUsage)
+
+    def prune(self, now: float) -> None:
+        while self.requests and now - self.requests[0] >= _WINDOW:
+            self.requests.popleft()
+        while self.tokens and now - self.tokens[0][0] >= _WINDOW:
+            self.token_sum -= self.tokens.popleft()[1]
+
+    def headroom(self, rpm: int, tpm: int) -> float:
+        """剩余额度比例（0-1）：本地 RPM / TPM 窗口与响应头余量中的最小值，均未知时为 1"""
+        ratios = [1.0]
+        if rpm:
+            ratios.append((rpm - len(self.requests)) / rpm)  # requests 已含进行中的请求
+        if tpm:
+            ratios.append((tpm - self.token_sum) / tpm)
+        reported = getattr(self.provider, "rate_limit_headroom", None)
+        if reported is not None:
+            ratios.append(reported)
+        return max(0.0, min(ratios))
+
+    def ready_at(self, rpm: int, tpm: int) -> float:
+        """本地窗口恢复出额度的时间点"""
+        moments = [self.unavailable_until]
+        if rpm and self.requests and len(self.requests) >= rpm:
+            moments.append(self.requests[0] + _WINDOW)
+        if tpm and self.tokens and self.token_sum >= tpm:
+            moments.append(self.tokens[0][0] + _WINDOW)
+        return max(moments)
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "quarantines": self.quarantines,
+            "total_tokens": self.usage.total_tokens,
+        }
+
+
+class KeyPoolProvider:
+    """
+    多 API Key Provider（满足 LLMProvider 协议）
+
+    Example:
+        >>> pool = KeyPoolProvider([OpenAIProvider(model, key1), OpenAIProvider(model, key2)], rpm=500)
+        >>> data, usage = pool.complete_structured(system, user, schema, "TermResult")
+        >>> pool.usage()
+    """
+
+    def __init__(
+        self,
+        providers: list[LLMProvider],
+        *,
+        rpm: int = 0,
+        tpm: int = 0,
+        quarantine: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            providers: 每个 Key 一个直连 Provider（同一 provider / 模型）
+            rpm: 每个 Key 的每分钟请求上限（0 表示未知，只看响应头余量）
+            tpm: 每个 Key 的每分钟 Token 上限（0 表示未知）
+            quarantine: 鉴权 / 额度错误后的隔离时长（秒）
+            clock: 单调时钟（便于测试替换）
+        """
+        if not providers:
+            raise ValueError("KeyPoolProvider 至少需要一个 Key")
+        self.keys = [
+            KeyState(mask_key(getattr(getattr(provider, "client", None), "api_key", "") or ""), provider)
+            for provider in providers
+        ]
+        primary = providers[0]
+        self.provider_name = getattr(primary, "provider_name", "llm")
+        self.model = getattr(primary, "model", "")
+        self.temperature = getattr(primary, "temperature", None)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.quarantine = quarantine
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def rate_limit_headroom(self) -> float | None:
+        """可用 Key 中的最大余量（供 BalancedProvider 调整权重）"""
+        with self._lock:
+            now = self._clock()
+            available = [key for key in self.keys if key.unavailable_until <= now]
+            for key in available:
+                key.prune(now)
+            return max((key.headroom(self.rpm, self.tpm) for key in available), default=0.0)
+
+    def usage(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {key.label: key.to_dict() for key in self.keys}
+
+    def _acquire(self, tried: set[int]) -> KeyState:
+        """选出余量最大的可用 Key 并登记一次请求；没有可用 Key 时抛出暂时性 LLMError"""
+        with self._lock:
+            now = self._clock()
+            best: tuple[float, int, int] | None = None
+            chosen: KeyState | None = None
+            for position, key in enumerate(self.keys):
+                if position in tried or key.unavailable_until > now:
+                    continue
+                key.prune(now)
+                headroom = key.headroom(self.rpm, self.tpm)
+                if headroom <= 0:
+                    continue
+                rank = (headroom, -key.in_flight, -len(key.requests))
+                if best is None or rank > best:
+                    best, chosen = rank, key
+            if chosen is None:
+                wait = min(key.ready_at(self.rpm, self.tpm) for key in self.keys) - now
+                raise LLMError(
+                    f"{self.provider_name} 的 {len(self.keys)} 个 API Key 均无可用额度",
+                    status_code=429,
+                    retry_after=max(0.0, wait),
+                    transient=True,
+                )
+            chosen.requests.append(now)
+            chosen.in_flight += 1
+            chosen.calls += 1
+            return chosen
+
+    def _release(self, key: KeyState, usage: TokenUsage | None, error: LLMError | None) -> None:
+        with self._lock:
+            now = self._clock()
+            key.in_flight -= 1
+            if usage is not None:
+                key.usage = key.usage + usage
+                key.tokens.append((now, usage.total_tokens))
+                key.token_sum += usage.total_tokens
+            if error is None:
+                return
+            key.errors += 1
+            if _is_key_failure(error):
+                key.unavailable_until = now + self.quarantine
+                key.quarantines += 1
+            elif error.status_code == 429:
+                key.unavailable_until = now + (error.retry_after or 1.0)
+
+    def complete_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        schema_name: str = "Response",
+    ) -> tuple[dict[str, Any], TokenUsage]:
+        tried: set[int] = set()
+        while True:
+            key = self._acquire(tried)
+            tried.add(self.keys.index(key))
+            try:
+                data, usage = key.provider.complete_structured(system_prompt, user_prompt, schema, schema_name)
+            except LLMError as exc:
+                self._release(key, None, exc)
+                # 只有 Key 本身的问题（鉴权 / 额度 / 限流）才换 Key，其它错误交给上层
+                if not (_is_key_failure(exc) or exc.status_code == 429) or len(tried) == len(self.keys):
+                    raise
+                continue
+            except Exception:
+                self._release(key, None, None)
+                raise
+            self._release(key, usage, None)
+            return data, usage
+
+
+def _is_key_failure(error: LLMError) -> bool:
+    """鉴权失败或额度耗尽：Key 本身不可用"""
+    if error.status_code in _AUTH_STATUS:
+        return True
+    return error.status_code == 429 and "quota" in str(error).lower()
+
+
+def key_usage(provider: Any) -> dict[str, dict[str, int]] | None:
+    """在包装链中（含 BalancedProvider 的各个后端）查找 KeyPoolProvider，按 Key 汇总；未使用 Key 池时为 None"""
+    found: dict[str, dict[str, int]] = {}
+    stack = [provider]
+    while stack:
+        current = stack.pop()
+        if current is None:
+            continue
+        if isinstance(current, KeyPoolProvider):
+            prefix = f"{current.provider_name}/{current.model}"
+            found.update({f"{prefix} {label}": stats for label, stats in current.usage().items()})
+            continue
+        stack.append(getattr(current, "inner", None))
+        stack.extend(getattr(backend, "provider", None) for backend in getattr(current, "backends", []) or [])
+    return found or None
@@ -0,0 +1,589 @@
+"""
+Mock LLM Server - 本地 OpenAI / Anthropic 兼容 HTTP 服务
+
+用途：
+- 让真实的 SDK 客户端（连接池、重试、超时、响应解析分支）走完整网络栈
+- 端到端压测时不消耗真实 API 额度
+- 按计划注入 429 / 5xx / 慢响应 / 非法 JSON / 超时
+
+支持的端点：
+- POST /v1/chat/completions  （OpenAI Chat Completions，含 json_schema 与 stream）
+- POST /v1/messages          （Anthropic Messages，含 tool_use 与 stream）
+- GET  /_mock/stats          （各注入动作的计数）
+
+故障计划语法（逗号分隔，按请求顺序循环）：
+    "ok*8,429,500,slow,malformed,timeout"
+    - ok         正常响应
+    - 429        限流（附带 Retry-After）
+    - 5xx        任意三位状态码，例如 500 / 503
+    - slow       延迟 slow_delay 秒后正常响应
+    - malformed  HTTP 200，但结构化内容不是合法 JSON
+    - timeout    挂起 hang_seconds 秒后直接断开连接
+    - 动作*N     重复 N 次
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+# ============================================================
+# 故障计划
+# ============================================================
+@dataclass
+class FaultSchedule:
+    """按请求序号循环的确定性故障计划（线程安全）"""
+
+    actions: list[str] = field(default_factory=lambda: ["ok"])
+    _cycle: Any = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        if not self.actions:
+            self.actions = ["ok"]
+        for action in self.actions:
+            if action not in {"ok", "slow", "malformed", "timeout"} and not _is_status(action):
+                raise ValueError(f"未知的故障动作: {action}")
+        self._cycle = itertools.cycle(self.actions)
+
+    @classmethod
+    def parse(cls, spec: str | None) -> "FaultSchedule":
+        """
+        解析故障计划字符串
+
+        Example:
+            >>> FaultSchedule.parse("ok*2,429").actions
+            ['ok', 'ok', '429']
+        """
+        actions: list[str] = []
+        for token in (spec or "ok").split(","):
+            token = token.strip().lower()
+            if not token:
+                continue
+            name, _, times = token.partition("*")
+            actions.extend([name.strip()] * (int(times) if times else 1))
+        return cls(actions)
+
+    def next(self) -> str:
+        with self._lock:
+            return next(self._cycle)
+
+
+def _is_status(action: str) -> bool:
+    return action.isdigit() and len(action) == 3 and 400 <= int(action) <= 599
+
+
+# ============================================================
+# 响应内容
+# ============================================================
+CANNED_PAYLOADS: dict[str, dict[str, Any]] = {
+    "TermResult": {
+        "IPA": "/ˈmɑk/",
+        "POS": "n.",
+        "Rarity": "",
+        "EnDef": "a placeholder definition returned by the mock server",
+        "Example": "The mock server returned this example sentence.",
+        "PPfix": "",
+        "PPmeans": "",
+        "TagEN": "",
+    },
+    "QuizQuestion": {
+        "qtype": "MCQ",
+        "stem": "Which component returns deterministic responses in load tests?",
+        "stem_translation": "在压测中，哪个组件返回确定性的响应？",
+        "steps": [],
+        "steps_translation": [],
+        "options": {"A": "Mock server", "B": "Real API", "C": "DNS", "D": "Disk", "E": "", "F": ""},
+        "options_translation": {"A": "模拟服务", "B": "真实 API", "C": "域名解析", "D": "磁盘", "E": "", "F": ""},
+        "answer": "A",
+        "cloze_answers": [],
+        "cloze_answers_translation": [],
+        "analysis": {
+            "domain": "Testing",
+            "rationale": "本地模拟服务按固定内容返回，便于复现。",
+            "key_points": ["确定性", "无需网络"],
+            "distractors": [{"option": "B", "reason": "真实 API 的输出不确定。"}],
+        },
+    },
+}
+# 本地预解析后的精简请求只需要翻译与解析
+CANNED_PAYLOADS["QuizEnrichment"] = {
+    key: CANNED_PAYLOADS["QuizQuestion"][key]
+    for key in (
+        "stem_translation",
+        "steps_translation",
+        "options_translation",
+        "cloze_answers_translation",
+        "analysis",
+    )
+}
+
+# 分阶段流水线：结构 / 翻译 / 解析
+_STAGE_FIELDS = {
+    "QuizStructure": ("qtype", "stem", "steps", "options", "answer", "cloze_answers"),
+    "QuizTranslation": ("stem_translation", "steps_translation", "options_translation", "cloze_answers_translation"),
+    "QuizAnalysis": ("analysis",),
+}
+for _name, _fields in _STAGE_FIELDS.items():
+    CANNED_PAYLOADS[_name] = {key: CANNED_PAYLOADS["QuizQuestion"][key] for key in _fields}
+
+# compact 线上格式（短键 + 选项数组）
+CANNED_PAYLOADS["TermResultCompact"] = {
+    "i": "/ˈmɑk/",
+    "p": "n.",
+    "r": "",
+    "d": "a placeholder definition returned by the mock server",
+    "e": "The mock server returned this example sentence.",
+    "x": "",
+    "m": "",
+    "t": "",
+}
+CANNED_PAYLOADS["QuizQuestionCompact"] = {
+    "t": "MCQ",
+    "s": "Which component returns deterministic responses in load tests?",
+    "st": "在压测中，哪个组件返回确定性的响应？",
+    "sp": [],
+    "spt": [],
+    "o": ["Mock server", "Real API", "DNS", "Disk"],
+    "ot": ["模拟服务", "真实 API", "域名解析", "磁盘"],
+    "a": "A",
+    "c": [],
+    "ct": [],
+    "an": {
+        "d": "Testing",
+        "r": "本地模拟服务按固定内容返回，便于复现。",
+        "k": ["确定性", "无需网络"],
+        "x": [{"o": "B", "r": "真实 API 的输出不确定。"}],
+    },
+}
+_COMPACT_FIELDS = {
+    "QuizEnrichmentCompact": ("st", "spt", "ot", "ct", "an"),
+    "QuizStructureCompact": ("t", "s", "sp", "o", "a", "c"),
+    "QuizTranslationCompact": ("st", "spt", "ot", "ct"),
+    "QuizAnalysisCompact": ("an",),
+}
+for _name, _fields in _COMPACT_FIELDS.items():
+    CANNED_PAYLOADS[_name] = {key: CANNED_PAYLOADS["QuizQuestionCompact"][key] for key in _fields}
+
+
+def synthesize_from_schema(schema: dict[str, Any]) -> Any:
+    """根据 JSON Schema 生成一个最小合法实例（未知 schema 的兜底）"""
+    if "enum" in schema:
+        return schema["enum"][0]
+    stype = schema.get("type")
+    if isinstance(stype, list):
+        stype = next((t for t in stype if t != "null"), "null")
+    if stype == "object":
+        props = schema.get("properties", {})
+        return {key: synthesize_from_schema(sub) for key, sub in props.items()}
+    if stype == "array":
+        return []
+    if stype == "string":
+        return "mock" if schema.get("minLength") else ""
+    if stype == "integer":
+        return 0
+    if stype == "number":
+        return 0.0
+    if stype == "boolean":
+        return False
+    return None
+
+
+# 字段级修复：子 Schema 只含出错字段，从完整响应中截取
+_REPAIR_SOURCES = {"TermRepair": "TermResult", "QuizRepair": "QuizQuestion"}
+
+
+def build_payload(schema_name: str | None, schema: dict[str, Any] | None) -> dict[str, Any]:
+    if schema_name in CANNED_PAYLOADS:
+        return dict(CANNED_PAYLOADS[schema_name])
+    if schema_name in _REPAIR_SOURCES:
+        source = CANNED_PAYLOADS[_REPAIR_SOURCES[schema_name]]
+        return {key: source[key] for key in (schema or {}).get("properties", {}) if key in source}
+    return synthesize_from_schema(schema or {"type": "object"}) or {}
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数（约 4 字符 / token）"""
+    return max(1, len(text) // 4)
+
+
+MALFORMED_JSON = '{"truncated": "mock output'
+
+
+# ============================================================
+# HTTP Handler
+# ============================================================
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive，以便验证 SDK 连接池
+    server: "_MockHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ------------------------------------------------------------------
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip("/") == "/_mock/stats":
+            self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"type": "invalid_request_error", "message": "invalid JSON body"}})
+            return
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            flavor = "openai"
+        elif path.endswith("/messages"):
+            flavor = "anthropic"
+        else:
+            self._send_json(404, {"error": {"message": f"unknown endpoint {path}"}})
+            return
+
+        action = self.server.schedule.next()
+        self.server.record(action)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if action == "timeout":
+            time.sleep(self.server.hang_seconds)
+            self.close_connection = True
+            return
+        if action == "429":
+            self._send_error(flavor, 429, "rate_limit_error", "mock rate limit", {"Retry-After": "1"})
+            return
+        if _is_status(action):
+            self._send_error(flavor, int(action), "api_error", f"mock server error {action}")
+            return
+        if action == "slow":
+            time.sleep(self.server.slow_delay)
+
+        malformed = action == "malformed"
+        if flavor == "openai":
+            self._handle_openai(body, malformed)
+        else:
+            self._handle_anthropic(body, malformed)
+
+    # ------------------------------------------------------------------
+    # OpenAI
+    # ------------------------------------------------------------------
+    def _handle_openai(self, body: dict[str, Any], malformed: bool) -> None:
+        json_schema = (body.get("response_format") or {}).get("json_schema") or {}
+        payload = build_payload(json_schema.get("name"), json_schema.get("schema"))
+        content = MALFORMED_JSON if malformed else json.dumps(payload, ensure_ascii=False)
+
+        prompt_text = "".join(str(m.get("content", "")) for m in body.get("messages", []))
+        prompt_tokens = estimate_tokens(prompt_text)
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "mock-model")
+        created = int(time.time())
+
+        if not body.get("stream"):
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content, "refusal": None},
+                    "finish_reason": "stop",
+                    "logprobs": None,
+                }],
+                "usage": usage,
+            })
+            return
+
+        def chunk(delta: dict[str, Any], finish: str | None = None, with_usage: bool = False) -> dict[str, Any]:
+            data: dict[str, Any] = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}] if not with_usage else [],
+            }
+            if with_usage:
+                data["usage"] = usage
+            return data
+
+        events = [chunk({"role": "assistant", "content": ""})]
+        events += [chunk({"content": piece}) for piece in _split(content)]
+        events.append(chunk({}, finish="stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            events.append(chunk({}, with_usage=True))
+        self._send_sse([(None, e) for e in events], done_marker=True)
+
+    # ------------------------------------------------------------------
+    # Anthropic
+    # ------------------------------------------------------------------
+    def _handle_anthropic(self, body: dict[str, Any], malformed: bool) -> None:
+        tools = body.get("tools") or []
+        tool_name = (body.get("tool_choice") or {}).get("name") or (tools[0]["name"] if tools else None)
+        tool = next((t for t in tools if t.get("name") == tool_name), None)
+        payload = build_payload(tool_name, (tool or {}).get("input_schema"))
+
+        prompt_text = str(body.get("system", "")) + "".join(
+            str(m.get("content", "")) for m in body.get("messages", [])
+        )
+        input_tokens = estimate_tokens(prompt_text)
+        message_id = f"msg_mock_{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "mock-model")
+
+        # malformed：不返回 tool_use，只给一段无法解析的文本，覆盖文本兜底分支
+        if malformed or tool is None:
+            text = MALFORMED_JSON if malformed else json.dumps(payload, ensure_ascii=False)
+            block: dict[str, Any] = {"type": "text", "text": text}
+            stop_reason = "end_turn"
+            serialized = text
+        else:
+            block = {"type": "tool_use", "id": f"toolu_mock_{uuid.uuid4().hex[:12]}", "name": tool_name, "input": payload}
+            stop_reason = "tool_use"
+            serialized = json.dumps(payload, ensure_ascii=False)
+        output_tokens = estimate_tokens(serialized)
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+
+        if not body.get("stream"):
+            self._send_json(200, {
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [block],
+                "stop_reason": stop_reason,
+                "stop_sequence": None,
+                "usage": usage,
+            })
+            return
+
+        if block["type"] == "tool_use":
+            start_block = {**block, "input": {}}
+            deltas = [{"type": "input_json_delta", "partial_json": piece} for piece in _split(serialized)]
+        else:
+            start_block = {"type": "text", "text": ""}
+            deltas = [{"type": "text_delta", "text": piece} for piece in _split(serialized)]
+
+        events: list[tuple[str | None, dict[str, Any]]] = [
+            ("message_start", {"type": "message_start", "message": {
+                "id": message_id, "type": "message", "role": "assistant", "model": model,
+                "content": [], "stop_reason": None, "stop_sequence": None,
+                "usage": {**usage, "output_tokens": 1},
+            }}),
+            ("content_block_start", {"type": "content_block_start", "index": 0, "content_block": start_block}),
+        ]
+        events += [("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": d}) for d in deltas]
+        events += [
+            ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+            ("message_delta", {"type": "message_delta",
+                               "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                               "usage": {"output_tokens": output_tokens}}),
+            ("message_stop", {"type": "message_stop"}),
+        ]
+        self._send_sse(events, done_marker=False)
+
+    # ------------------------------------------------------------------
+    # 输出工具
+    # ------------------------------------------------------------------
+    def _send_json(self, status: int, data: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+        raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _send_error(
+        self,
+        flavor: str,
+        status: int,
+        err_type: str,
+        message: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if flavor == "anthropic":
+            data = {"type": "error", "error": {"type": err_type, "message": message}}
+        else:
+            data = {"error": {"type": err_type, "message": message, "code": None, "param": None}}
+        self._send_json(status, data, headers)
+
+    def _send_sse(self, events: list[tuple[str | None, dict[str, Any]]], *, done_marker: bool) -> None:
+        # 流式响应不预知长度：以关闭连接结束本次响应
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for name, data in events:
+            frame = f"event: {name}\n" if name else ""
+            frame += f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+            self.wfile.write(frame.encode("utf-8"))
+            self.wfile.flush()
+        if done_marker:
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+
+def _split(text: str, size: int = 24) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], schedule: FaultSchedule, *,
+                 latency: float, slow_delay: float, hang_seconds: float, verbose: bool):
+        super().__init__(address, _MockHandler)
+        self.schedule = schedule
+        self.latency = latency
+        self.slow_delay = slow_delay
+        self.hang_seconds = hang_seconds
+        self.verbose = verbose
+        self.stats: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+
+    def record(self, action: str) -> None:
+        with self._stats_lock:
+            self.stats[action] += 1
+            self.stats["requests"] += 1
+
+
+# ============================================================
+# 对外接口
+# ============================================================
+class MockLLMServer:
+    """
+    本地 Mock LLM 服务（后台线程运行）
+
+    Example:
+        >>> with MockLLMServer(schedule="ok*3,429") as server:
+        ...     provider = OpenAIProvider(model="gpt-4o-mini", api_key="sk-mock",
+        ...                               base_url=server.openai_base_url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        schedule: FaultSchedule | str | None = None,
+        latency: float = 0.0,
+        slow_delay: float = 2.0,
+        hang_seconds: float = 30.0,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            host: 监听地址
+            port: 端口（0 表示随机空闲端口）
+            schedule: 故障计划（FaultSchedule 或计划字符串）
+            latency: 每个请求的基础延迟（秒）
+            slow_delay: slow 动作的额外延迟（秒）
+            hang_seconds: timeout 动作挂起的时长（秒）
+            verbose: 是否打印访问日志
+        """
+        if not isinstance(schedule, FaultSchedule):
+            schedule = FaultSchedule.parse(schedule)
+        self._httpd = _MockHTTPServer(
+            (host, port), schedule,
+            latency=latency, slow_delay=slow_delay, hang_seconds=hang_seconds, verbose=verbose,
+        )
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def anthropic_base_url(self) -> str:
+        return self.url
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(self._httpd.stats)
+
+    def start(self) -> "MockLLMServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memosyne 本地 Mock LLM 服务（OpenAI / Anthropic 兼容）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--schedule", default="ok", help='故障计划，例如 "ok*8,429,500,slow,malformed,timeout"')
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的基础延迟（秒）")
+    parser.add_argument("--slow-delay", type=float, default=2.0, help="slow 动作的延迟（秒）")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="timeout 动作挂起的时长（秒）")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        args.host, args.port,
+        schedule=args.schedule, latency=args.latency,
+        slow_delay=args.slow_delay, hang_seconds=args.hang_seconds, verbose=args.verbose,
+    )
+    print(f"[Mock LLM] listening on {server.url}")
+    print(f"  OPENAI_BASE_URL={server.openai_base_url}")
+    print(f"  ANTHROPIC_BASE_URL={server.anthropic_base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,26 +15,47 @@ DDD 原则：
 from __future__ import annotations
 
 import json
+from time import perf_counter
 from typing import Any
 
 from openai import BadRequestError, OpenAI
 
 from ....core.interfaces import BaseLLMProvider, LLMError
 from ....core.models import TokenUsage
+from ...utils.metrics import get_metrics
+from ...utils.tracing import get_tracer, trace_sdk_response
+from .resilience import current_attempt_timeout, parse_rate_limit_headroom, sdk_error_details
 
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI LLM Provider"""
 
+    provider_name = "openai"
+
     def __init__(
         self,
         model: str,
         api_key: str,
         temperature: float | None = None,
-        max_retries: int = 2
+        max_retries: int = 2,
+        base_url: str | None = None,
+        timeout: float | None = None,
     ):
-        self.client = OpenAI(api_key=api_key, max_retries=max_retries)
+        """
+        Args:
+            model: 模型 ID
+            api_key: OpenAI API Key
+            temperature: 温度（None 使用模型默认值）
+            max_retries: SDK 内置重试次数（由 ResilientProvider 统一重试时为 0）
+            base_url: 自定义 API 地址（如本地 Mock 服务 http://127.0.0.1:8787/v1）
+            timeout: 请求超时秒数（None 使用 SDK 默认值）
+        """
+        client_kwargs: dict[str, Any] = {"api_key": api_key, "max_retries": max_retries, "base_url": base_url}
+        if timeout is not None:
+            client_kwargs["timeout"] = timeout
+        self.client = OpenAI(**client_kwargs)
         super().__init__(model=model, temperature=temperature)
+        self.rate_limit_headroom: float | None = None  # 最近一次响应头中的限流余量（0-1）
 
     @classmethod
     def from_settings(cls, settings) -> "OpenAIProvider":
@@ -43,6 +64,7 @@ class OpenAIProvider(BaseLLMProvider):
             model=settings.default_openai_model,
             api_key=settings.openai_api_key,
             temperature=settings.default_temperature,
+            base_url=settings.openai_base_url,
         )
 
     def complete_structured(
@@ -99,22 +121,51 @@ class OpenAIProvider(BaseLLMProvider):
         if self.temperature is not None:
             kwargs["temperature"] = self.temperature
 
-        try:
-            response = self.client.chat.completions.create(**kwargs)
-            data = self._extract_chat_output(response)
+        with get_tracer().span(
+            "llm.request", cat="llm", provider=self.provider_name, model=self.model,
+            schema=schema_payload.get("name"),
+        ) as span:
+            try:
+                response = self._create_completion(kwargs, span)
+            except BadRequestError as exc:
+                error_msg = str(exc).lower()
+                if "temperature" in error_msg and "unsupported" in error_msg:
+                    kwargs.pop("temperature", None)
+                    response = self._create_completion(kwargs, span)
+                else:
+                    raise LLMError(f"OpenAI API 错误：{exc}", **sdk_error_details(exc)) from exc
+            except Exception as exc:  # noqa: BLE001
+                raise LLMError(f"调用 OpenAI 时发生意外错误：{exc}", **sdk_error_details(exc)) from exc
+
+            with get_tracer().span("parse", cat="llm", model=self.model):
+                data = self._extract_chat_output(response)
             tokens = self._extract_token_usage(response)
+            span.set(
+                prompt_tokens=tokens.prompt_tokens,
+                completion_tokens=tokens.completion_tokens,
+                total_tokens=tokens.total_tokens,
+            )
             return data, tokens
-        except BadRequestError as exc:
-            error_msg = str(exc).lower()
-            if "temperature" in error_msg and "unsupported" in error_msg:
-                kwargs.pop("temperature", None)
-                response = self.client.chat.completions.create(**kwargs)
-                data = self._extract_chat_output(response)
-                tokens = self._extract_token_usage(response)
-                return data, tokens
-            raise LLMError(f"OpenAI API 错误：{exc}") from exc
-        except Exception as exc:  # noqa: BLE001
-            raise LLMError(f"调用 OpenAI 时发生意外错误：{exc}") from exc
+
+    def _create_completion(self, kwargs: dict[str, Any], span: Any) -> Any:
+        """
+        发送请求（使用 raw response）：拆分排队/重试等待（llm.queue）
+        与最后一次 HTTP 往返（llm.network），并上报 SDK 内部重试次数。
+        """
+        tracer, metrics = get_tracer(), get_metrics()
+        timeout = current_attempt_timeout()
+        if timeout is not None:
+            kwargs = {**kwargs, "timeout": timeout}
+        started = perf_counter()
+        raw = self.client.chat.completions.with_raw_response.create(**kwargs)
+        response = raw.parse()
+        finished = perf_counter()
+        trace_sdk_response(tracer, span, raw, started, finished, model=self.model)
+        metrics.record_retries(getattr(raw, "retries_taken", 0))
+        headroom = parse_rate_limit_headroom(getattr(raw, "headers", None))
+        if headroom is not None:
+            self.rate_limit_headroom = headroom  # 供 BalancedProvider 调整权重
+        return response
 
     @staticmethod
     def _extract_chat_output(response: Any) -> dict[str, Any]:
@@ -169,11 +220,14 @@ class OpenAIProvider(BaseLLMProvider):
         """从响应中提取 Token 使用量"""
         try:
             usage = response.usage
+            details = getattr(usage, "prompt_tokens_details", None) if usage else None
             return TokenUsage(
                 prompt_tokens=usage.prompt_tokens if usage else 0,
                 completion_tokens=usage.completion_tokens if usage else 0,
                 total_tokens=usage.total_tokens if usage else 0,
+                cached_tokens=(getattr(details, "cached_tokens", 0) or 0) if details else 0,
             )
         except (AttributeError, TypeError):
             # 如果没有 usage 信息，返回全 0
             return TokenUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+
@@ -0,0 +1,380 @@
+"""
+Resilience - Provider 重试 / 超时 / 熔断策略层
+
+ResilientProvider 包装任意 LLMProvider（满足协议即可）：
+- 单次请求超时 + 单次调用总时限（含重试与退避等待）
+- 错误分类：429 / 408 / 409 / 5xx / 超时 / 连接中断重试；鉴权、参数、Schema 等错误立即失败
+- 指数退避 + 全抖动（full jitter），服务端给出 Retry-After 时至少等待该时长
+- 按 (provider, model) 共享的熔断器：连续暂时性失败达到阈值后打开，
+  冷却期内直接拒绝（CircuitOpenError），冷却结束放行一次试探请求
+
+启用策略层时 SDK 内置重试应关闭（max_retries=0），由本层统一重试与计数；
+重试次数累加到 pop_call_retries()，随 CallRecord / 运行统计上报。
+"""
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterator, Literal
+
+from ....core.interfaces import LLMError, LLMProvider
+from ....core.models import TokenUsage
+from ...utils.metrics import get_metrics, pop_call_retries
+from ...utils.tracing import get_tracer
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+# SDK 异常类名（openai / anthropic 同名）：无状态码但可重试
+_TRANSIENT_ERRORS = {"APITimeoutError", "APIConnectionError", "TimeoutError", "ConnectionError"}
+_TRANSIENT_STATUS = {408, 409, 429}
+
+# 当前请求的单次超时（Provider 发送请求时读取）
+_attempt_timeout: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "memosyne_llm_attempt_timeout", default=None
+)
+
+
+class CircuitOpenError(LLMError):
+    """熔断器打开：Provider / 模型处于故障期，请求被直接拒绝"""
+
+
+def current_attempt_timeout() -> float | None:
+    """当前请求应使用的超时秒数（不在策略层内调用时为 None，使用客户端默认值）"""
+    return _attempt_timeout.get()
+
+
+@contextmanager
+def attempt_timeout(seconds: float | None) -> Iterator[None]:
+    token = _attempt_timeout.set(seconds)
+    try:
+        yield
+    finally:
+        _attempt_timeout.reset(token)
+
+
+# ============================================================
+# 错误分类
+# ============================================================
+def parse_retry_after(headers: Any) -> float | None:
+    """解析 retry-after-ms / Retry-After（秒数或 HTTP 日期）"""
+    if headers is None:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value:
+            return max(0.0, float(value) / 1000)
+        value = headers.get("retry-after")
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# 限流响应头：(剩余, 上限)，OpenAI 与 Anthropic 命名不同
+_RATE_LIMIT_HEADERS = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-limit-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-limit-tokens"),
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-limit"),
+    ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-limit"),
+)
+
+
+def parse_rate_limit_headroom(headers: Any) -> float | None:
+    """从响应头计算限流余量（剩余 / 上限，取请求数与 Token 中较小者；无相关响应头时为 None）"""
+    if headers is None:
+        return None
+    ratios: list[float] = []
+    for remaining_key, limit_key in _RATE_LIMIT_HEADERS:
+        try:
+            remaining, limit = headers.get(remaining_key), headers.get(limit_key)
+            if remaining is not None and limit and float(limit) > 0:
+                ratios.append(max(0.0, min(1.0, float(remaining) / float(limit))))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return min(ratios) if ratios else None
+
+
+def sdk_error_details(exc: BaseException) -> dict[str, Any]:
+    """
+    从 SDK 异常中提取 LLMError 的分类字段（status_code / retry_after / transient）
+
+    Example:
+        >>> raise LLMError(f"OpenAI API 错误：{exc}", **sdk_error_details(exc)) from exc
+    """
+    status = getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if isinstance(status, int):
+        transient = status in _TRANSIENT_STATUS or status >= 500
+    else:
+        status = None
+        transient = any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(exc).__mro__)
+    return {
+        "status_code": status,
+        "retry_after": parse_retry_after(getattr(response, "headers", None)),
+        "transient": transient,
+    }
+
+
+def _reason(exc: LLMError) -> str:
+    if isinstance(exc, CircuitOpenError):
+        return "circuit_open"
+    return str(exc.status_code) if exc.status_code is not None else "timeout"
+
+
+# ============================================================
+# 策略与熔断器
+# ============================================================
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    重试策略
+
+    Attributes:
+        max_retries: 暂时性错误的最大重试次数（0 不重试）
+        timeout: 单次请求超时（秒）
+        deadline: 单次调用的总时限（秒，含全部重试与退避等待）
+        backoff_base: 第 1 次重试的退避上限（秒），之后逐次翻倍
+        backoff_max: 退避上限（秒）
+    """
+
+    max_retries: int = 3
+    timeout: float = 60.0
+    deadline: float = 180.0
+    backoff_base: float = 0.5
+    backoff_max: float = 20.0
+
+    @classmethod
+    def from_settings(cls, settings) -> "RetryPolicy":
+        return cls(
+            max_retries=settings.llm_max_retries,
+            timeout=settings.llm_timeout,
+            deadline=settings.llm_deadline,
+            backoff_base=settings.llm_backoff_base,
+            backoff_max=settings.llm_backoff_max,
+        )
+
+    def backoff(self, retry: int, retry_after: float | None = None) -> float:
+        """第 retry 次重试（从 1 开始）前的等待秒数：全抖动指数退避，不短于 Retry-After"""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (retry - 1))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    熔断器（closed → open → half_open → closed）
+
+    - closed：正常放行；连续 threshold 次暂时性失败后打开
+    - open：cooldown 秒内拒绝全部请求
+    - half_open：放行一次试探请求，成功则关闭，失败重新打开
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            threshold: 打开熔断所需的连续暂时性失败次数（0 表示不熔断）
+            cooldown: 打开后的冷却时间（秒）
+            clock: 单调时钟（便于测试替换）
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> BreakerState:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """是否放行一次请求（half_open 时同一时刻只放行一个试探请求）"""
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """距离可以试探还需等待的秒数"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.cooldown - (self._clock() - self._opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """记录一次暂时性失败"""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+_breakers: dict[tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str, model: str, threshold: int = 5, cooldown: float = 30.0) -> CircuitBreaker:
+    """按 (provider, model) 获取进程内共享的熔断器（首次创建时的参数生效）"""
+    with _breakers_lock:
+        breaker = _breakers.get((provider, model))
+        if breaker is None:
+            breaker = _breakers[(provider, model)] = CircuitBreaker(threshold, cooldown)
+        return breaker
+
+
+# ============================================================
+# Provider 包装器
+# ============================================================
+class ResilientProvider:
+    """
+    带重试 / 超时 / 熔断的 Provider 包装器（满足 LLMProvider 协议）
+
+    Example:
+        >>> provider = ResilientProvider(OpenAIProvider(..., max_retries=0), RetryPolicy(max_retries=3))
+        >>> data, usage = provider.complete_structured(system, user, schema, "TermResult")
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            inner: 被包装的 Provider（其 SDK 内置重试应关闭）
+            policy: 重试策略（默认 RetryPolicy()）
+            breaker: 熔断器（默认按 provider / model 共享）
+            sleep: 退避等待函数（便于测试替换）
+        """
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+        self.provider_name = getattr(inner, "provider_name", "llm")
+        self.model = getattr(inner, "model", "")
+        self.temperature = getattr(inner, "temperature", None)
+        self.breaker = breaker or get_breaker(self.provider_name, self.model)
+        self._sleep = sleep
+
+    @classmethod
+    def from_settings(cls, inner: LLMProvider, settings) -> "ResilientProvider":
+        provider_name = getattr(inner, "provider_name", "llm")
+        model = getattr(inner, "model", "")
+        return cls(
+            inner,
+            RetryPolicy.from_settings(settings),
+            get_breaker(provider_name, model, settings.llm_breaker_threshold, settings.llm_breaker_cooldown),
+        )
+
+    def complete_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: dict[str, Any],
+        schema_name: str = "Response",
+    ) -> tuple[dict[str, Any], TokenUsage]:
+        metrics = get_metrics()
+        started = time.monotonic()
+        retries = 0
+        try:
+            while True:
+                if not self.breaker.allow():
+                    metrics.record_circuit_rejection()
+                    raise CircuitOpenError(
+                        f"{self.provider_name}/{self.model} 熔断中，{self.breaker.retry_in():.1f} 秒后重试",
+                        retry_after=self.breaker.retry_in(),
+                        transient=True,
+                    )
+                remaining = self.policy.deadline - (time.monotonic() - started)
+                try:
+                    with attempt_timeout(max(0.001, min(self.policy.timeout, remaining))):
+                        result = self.inner.complete_structured(system_prompt, user_prompt, schema, schema_name)
+                except LLMError as exc:
+                    if not exc.transient:
+                        self.breaker.record_success()  # 服务可达，只是请求本身有问题
+                        raise
+                    self.breaker.record_failure()
+                    if retries >= self.policy.max_retries:
+                        raise
+                    delay = self.policy.backoff(retries + 1, exc.retry_after)
+                    if time.monotonic() - started + delay >= self.policy.deadline:
+                        raise LLMError(
+                            f"超过调用时限 {self.policy.deadline:.0f} 秒（已重试 {retries} 次）：{exc}",
+                            status_code=exc.status_code,
+                            transient=True,
+                        ) from exc
+                    retries += 1
+                    metrics.record_policy_retry(_reason(exc))
+                    with get_tracer().span(
+                        "llm.backoff", cat="llm", model=self.model, retry=retries, reason=_reason(exc), delay=delay,
+                    ):
+                        self._sleep(delay)
+                    continue
+                except Exception:
+                    self.breaker.record_success()  # 非 LLM 错误不计入熔断，同时释放试探名额
+                    raise
+                self.breaker.record_success()
+                return result
+        finally:
+            metrics.add_call_retries(retries)
+
+
+# ============================================================
+# 使用示例
+# ============================================================
+if __name__ == "__main__":
+    class FlakyProvider:
+        provider_name = "demo"
+        model = "flaky"
+
+        def __init__(self):
+            self.calls = 0
+
+        def complete_structured(self, system_prompt, user_prompt, schema, schema_name="Response"):
+            self.calls += 1
+            if self.calls < 3:
+                raise LLMError("503 Service Unavailable", status_code=503, transient=True)
+            return {"ok": True}, TokenUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+
+    provider = ResilientProvider(FlakyProvider(), RetryPolicy(max_retries=3, backoff_base=0.01))
+    print(provider.complete_structured("system", "user", {}, "Demo"), "retries:", pop_call_retries())
@@ -1,8 +1,8 @@
 """
 Shared Storage Infrastructure
 
-Provides data persistence implementations (CSV, File repositories) that can be
-reused across different bounded contexts.
+Provides data persistence implementations (CSV, File repositories, columnar
+exports) that can be reused across different bounded contexts.
 
 Following DDD principles:
 - Repository pattern for data access abstraction
@@ -11,8 +11,43 @@ Following DDD principles:
 """
 from .csv_repository import CSVTermRepository
 from .term_list_repository import TermListRepo
+from .analytics_store import AnalyticsStore, RunRecorderSession, load_call_profile, open_run_recorder
+from .memo_store import MemoReservation, MemoStore, open_memo_store, read_term_archive
+from .columnar import (
+    ColumnarArchive,
+    ColumnarFormat,
+    ColumnarTable,
+    ParquetTable,
+    check_columnar_format,
+    export_quiz_items,
+    export_terms,
+    open_archive,
+    open_table,
+    write_table,
+)
+from .translation_memory import TranslationMemory, open_translation_memory
 
 __all__ = [
     "CSVTermRepository",
     "TermListRepo",
+    "AnalyticsStore",
+    "RunRecorderSession",
+    "open_run_recorder",
+    "load_call_profile",
+    "MemoStore",
+    "MemoReservation",
+    "open_memo_store",
+    "read_term_archive",
+    "ColumnarFormat",
+    "ColumnarTable",
+    "ParquetTable",
+    "ColumnarArchive",
+    "check_columnar_format",
+    "write_table",
+    "export_terms",
+    "export_quiz_items",
+    "open_table",
+    "open_archive",
+    "TranslationMemory",
+    "open_translation_memory",
 ]
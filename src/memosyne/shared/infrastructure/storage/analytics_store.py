@@ -0,0 +1,291 @@
+"""
+Analytics Store - 历史运行分析存储（SQLite）
+
+每次运行：
+- runs 表追加一行（run_id、pipeline、provider、model、batch_id、输入文件）
+- llm_calls 表逐次追加 LLM 调用记录（实际响应的模型与级联层级、耗时、Token、重试、结果）
+
+写入采用缓冲批量提交，避免逐条 commit 拖慢主流程。
+报表见 ``memosyne.shared.cli.analytics``；运行前估算的校准画像见 ``AnalyticsStore.call_profile``。
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from ....core.models import CallRecord
+from ...utils.planning import CallProfile
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    pipeline    TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    batch_id    TEXT,
+    input_name  TEXT
+);
+CREATE TABLE IF NOT EXISTS llm_calls (
+    run_id            TEXT NOT NULL,
+    ts                REAL NOT NULL,
+    pipeline          TEXT NOT NULL,
+    provider          TEXT NOT NULL,
+    model             TEXT NOT NULL,
+    batch_id          TEXT,
+    item_index        INTEGER NOT NULL,
+    latency           REAL NOT NULL,
+    prompt_tokens     INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cached_tokens     INTEGER NOT NULL,
+    retries           INTEGER NOT NULL,
+    outcome           TEXT NOT NULL,
+    error             TEXT,
+    tier              TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_ts ON llm_calls (ts);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_model ON llm_calls (model);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls (run_id);
+"""
+
+_INSERT_CALL = """
+INSERT INTO llm_calls (
+    run_id, ts, pipeline, provider, model, batch_id, item_index, latency,
+    prompt_tokens, completion_tokens, cached_tokens, retries, outcome, error, tier
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 早期数据库缺少的列（启动时补齐）
+_MIGRATIONS = {"tier": "ALTER TABLE llm_calls ADD COLUMN tier TEXT"}
+
+
+class AnalyticsStore:
+    """SQLite 分析存储"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(llm_calls)")}
+        for column, statement in _MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(statement)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> "AnalyticsStore | None":
+        """根据配置创建存储；未启用时返回 None"""
+        if not settings.analytics_enabled:
+            return None
+        return cls(settings.analytics_db_path)
+
+    def start_run(
+        self,
+        *,
+        pipeline: str,
+        provider: str,
+        model: str,
+        batch_id: str | None = None,
+        input_name: str | None = None,
+    ) -> "RunRecorderSession":
+        """登记一次运行并返回记录器（实现 core.interfaces.RunRecorder）"""
+        run_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, pipeline, provider, model, batch_id, input_name)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, time.time(), pipeline, provider, model, batch_id, input_name),
+            )
+            self._conn.commit()
+        return RunRecorderSession(
+            self, run_id=run_id, pipeline=pipeline, provider=provider, model=model, batch_id=batch_id
+        )
+
+    def call_profile(
+        self,
+        pipeline: str,
+        model: str | None = None,
+        *,
+        recent_runs: int = 20,
+        min_samples: int = 20,
+    ) -> CallProfile | None:
+        """
+        最近 recent_runs 次运行的调用画像（供运行前估算校准）
+
+        优先使用同一模型的调用（按实际响应的模型，级联强模型 / 其它后端的调用不计入）；
+        样本不足 min_samples 时退回同一流水线的全部模型，仍不足返回 None。
+        """
+        candidates = [(model, "model"), (None, "pipeline")] if model else [(None, "pipeline")]
+        for model_filter, source in candidates:
+            with self._lock:
+                row = self._conn.execute(
+                    """
+                    SELECT COUNT(*),
+                           COUNT(DISTINCT run_id || ':' || item_index),
+                           SUM(prompt_tokens),
+                           SUM(completion_tokens),
+                           AVG(CASE WHEN outcome = 'success' THEN latency END)
+                    FROM llm_calls
+                    WHERE (? IS NULL OR model = ?) AND run_id IN (
+                        SELECT run_id FROM runs
+                        WHERE pipeline = ? AND (? IS NULL OR model = ?) AND finished_at IS NOT NULL
+                        ORDER BY started_at DESC LIMIT ?
+                    )
+                    """,
+                    (model_filter, model_filter, pipeline, model_filter, model_filter, recent_runs),
+                ).fetchone()
+            calls, items, prompt_tokens, completion_tokens, latency = row
+            if calls >= min_samples and items and latency is not None:
+                return CallProfile(
+                    samples=calls,
+                    prompt_tokens=prompt_tokens / items,
+                    completion_tokens=completion_tokens / items,
+                    latency=latency,
+                    calls_per_item=calls / items,
+                    source=source,
+                )
+        return None
+
+    def _insert_calls(self, rows: list[tuple[Any, ...]]) -> None:
+        with self._lock:
+            self._conn.executemany(_INSERT_CALL, rows)
+            self._conn.commit()
+
+    def _finish_run(self, run_id: str, batch_id: str | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ?, batch_id = COALESCE(?, batch_id) WHERE run_id = ?",
+                (time.time(), batch_id, run_id),
+            )
+            if batch_id:
+                self._conn.execute(
+                    "UPDATE llm_calls SET batch_id = ? WHERE run_id = ? AND batch_id IS NULL",
+                    (batch_id, run_id),
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "AnalyticsStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class RunRecorderSession:
+    """
+    单次运行的调用记录器（缓冲写入，线程安全）
+
+    Example:
+        >>> with store.start_run(pipeline="reanimator", provider="openai", model="gpt-4o-mini") as rec:
+        ...     rec.record(CallRecord(index=0, latency=1.2, prompt_tokens=300, completion_tokens=80))
+    """
+
+    def __init__(
+        self,
+        store: AnalyticsStore,
+        *,
+        run_id: str,
+        pipeline: str,
+        provider: str,
+        model: str,
+        batch_id: str | None,
+        flush_every: int = 50,
+    ):
+        self.store = store
+        self.run_id = run_id
+        self.pipeline = pipeline
+        self.provider = provider
+        self.model = model
+        self.batch_id = batch_id
+        self.flush_every = flush_every
+        self._buffer: list[tuple[Any, ...]] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def record(self, record: CallRecord) -> None:
+        """追加一条调用记录（model 取实际响应的模型，未提供时为运行的模型）"""
+        row = (
+            self.run_id, time.time(), self.pipeline, self.provider, record.model or self.model, self.batch_id,
+            record.index, record.latency, record.prompt_tokens, record.completion_tokens,
+            record.cached_tokens, record.retries, record.outcome, record.error, record.tier,
+        )
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) < self.flush_every:
+                return
+            rows, self._buffer = self._buffer, []
+        self.store._insert_calls(rows)
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if rows:
+            self.store._insert_calls(rows)
+
+    def close(self, batch_id: str | None = None, *, close_store: bool = True) -> None:
+        """写出剩余记录并标记运行结束（batch_id 可在运行后补登）"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self.store._finish_run(self.run_id, batch_id)
+        if close_store:
+            self.store.close()
+
+    def __enter__(self) -> "RunRecorderSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def open_run_recorder(
+    settings,
+    *,
+    pipeline: str,
+    provider: str,
+    model: str,
+    batch_id: str | None = None,
+    input_name: str | None = None,
+) -> RunRecorderSession | None:
+    """
+    便捷入口：按配置打开分析存储并登记运行（未启用或打开失败时返回 None）
+
+    分析记录属于旁路功能，数据库不可写时不应中断主流程。
+    """
+    try:
+        store = AnalyticsStore.from_settings(settings)
+    except sqlite3.Error:
+        return None
+    if store is None:
+        return None
+    return store.start_run(
+        pipeline=pipeline, provider=provider, model=model, batch_id=batch_id, input_name=input_name
+    )
+
+
+def load_call_profile(settings, pipeline: str, model: str | None = None) -> CallProfile | None:
+    """便捷入口：读取历史调用画像（未启用分析或读取失败时返回 None）"""
+    try:
+        store = AnalyticsStore.from_settings(settings)
+    except sqlite3.Error:
+        return None
+    if store is None:
+        return None
+    with store:
+        try:
+            return store.call_profile(pipeline, model)
+        except sqlite3.Error:
+            return None
@@ -0,0 +1,405 @@
+"""
+Columnar Store - 列式输出与内存映射读取
+
+Reanimator 的 CSV 与 Lithoformer 的 TXT 供下游导入使用，但分析 / 查询时每次都要逐行重新解析。
+本模块为 TermOutput 与 QuizItem 记录提供可选的列式副本（与 CSV / TXT 并存）：
+
+- mmcol（默认，仅标准库）：按列存放 UTF-8 字符串（uint64 偏移数组 + 数据块），
+  读取时 mmap 整个文件，只解析头部；整列解码或按值查找（直接在映射内存中搜索字节）按需进行
+- parquet（可选，需安装 pyarrow）：zstd 压缩，读取时 memory_map
+
+文件格式（mmcol）：
+    8 字节魔数 | uint32 头部长度 | 4 字节填充 | JSON 头部 | 8 字节对齐的各列（偏移数组、数据块）
+
+Example:
+    >>> export_terms(Path("data/output/reanimator/251007A015-221-4oMi.csv"), terms, fmt="mmcol")
+    PosixPath('data/output/reanimator/251007A015-221-4oMi.terms.mmcol')
+    >>> archive = open_archive(["data/output"])
+    >>> archive.find("memo_id", "M002701")
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import sys
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Mapping, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+    from ....lithoformer.domain.models import QuizItem
+    from ....reanimator.domain.models import TermOutput
+
+ColumnarFormat = Literal["off", "mmcol", "parquet"]
+
+MAGIC = b"MMCOL\x00\x01\x00"
+SUFFIXES = {"mmcol": ".mmcol", "parquet": ".parquet"}
+
+TERM_COLUMNS = (
+    "wm_pair", "memo_id", "word", "zh_def", "ipa", "pos", "tag", "rarity",
+    "en_def", "example", "pp_fix", "pp_means", "batch_id", "batch_note",
+)
+QUIZ_COLUMNS = ("lcode", "batch_id", "qtype", "stem", "answer", "domain", "item_json")
+
+_PREAMBLE = 16
+_LITTLE = sys.byteorder == "little"
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("COLUMNAR_FORMAT=parquet 需要安装 pyarrow（pip install pyarrow），或改用 mmcol") from exc
+    return pyarrow
+
+
+def check_columnar_format(fmt: ColumnarFormat) -> None:
+    """
+    运行前检查列式格式可用（parquet 缺少 pyarrow 时立即抛出 ImportError，
+    避免 LLM 调用全部完成、写出副本时才失败）
+    """
+    if fmt == "parquet":
+        _require_pyarrow()
+    elif fmt not in SUFFIXES and fmt != "off":
+        raise ValueError(f"未知的列式格式：{fmt}")
+
+
+# ============================================================
+# 写入
+# ============================================================
+def columnar_path(path: Path, fmt: ColumnarFormat, kind: str) -> Path:
+    """输出文件旁的列式副本路径（X.csv → X.terms.mmcol，X.txt → X.quiz.parquet）"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{kind}{SUFFIXES[fmt]}")
+
+
+def write_table(
+    path: Path,
+    columns: Mapping[str, Sequence[str]],
+    *,
+    kind: str = "",
+    meta: Mapping[str, Any] | None = None,
+    fmt: ColumnarFormat = "mmcol",
+) -> Path:
+    """
+    写出列式文件（所有列为字符串、等长）
+
+    Raises:
+        ValueError: 列长度不一致 / 格式未知
+        ImportError: parquet 格式但未安装 pyarrow
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"列长度不一致：{lengths}")
+    rows = lengths.pop() if lengths else 0
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = {"kind": kind, "rows": rows, "meta": dict(meta or {})}
+
+    if fmt == "parquet":
+        pa = _require_pyarrow()
+        table = pa.table({name: pa.array(list(values), pa.string()) for name, values in columns.items()})
+        table = table.replace_schema_metadata({"memosyne": json.dumps(header, ensure_ascii=False)})
+        pa.parquet.write_table(table, path, compression="zstd")
+        return path
+    if fmt != "mmcol":
+        raise ValueError(f"未知的列式格式：{fmt}")
+
+    # 先编码各列，计算相对数据区起点的位置
+    encoded: list[tuple[array, bytes]] = []
+    layout = []
+    position = 0
+    for name, values in columns.items():
+        chunks = [str(value).encode("utf-8") for value in values]
+        offsets = array("Q", [0])
+        total = 0
+        for chunk in chunks:
+            total += len(chunk)
+            offsets.append(total)
+        if not _LITTLE:
+            offsets.byteswap()
+        blob = b"".join(chunks)
+        layout.append({"name": name, "offsets": position, "data": position + 8 * (rows + 1), "length": len(blob)})
+        position = _align(position + 8 * (rows + 1) + len(blob))
+        encoded.append((offsets, blob))
+    header["columns"] = layout
+    head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    start = _align(_PREAMBLE + len(head))
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + len(head).to_bytes(4, "little") + b"\x00" * 4 + head)
+        f.write(b"\x00" * (start - _PREAMBLE - len(head)))
+        for offsets, blob in encoded:
+            f.write(offsets.tobytes())
+            f.write(blob)
+            f.write(b"\x00" * (_align(len(blob)) - len(blob)))
+    tmp.replace(path)
+    return path
+
+
+def export_terms(path: Path, terms: Iterable["TermOutput"], *, fmt: ColumnarFormat) -> Path | None:
+    """Reanimator 结果的列式副本（fmt="off" 时不写出）"""
+    if fmt == "off":
+        return None
+    terms = list(terms)
+    columns = {column: [getattr(term, column) for term in terms] for column in TERM_COLUMNS}
+    batch = terms[0].batch_id if terms else ""
+    return write_table(columnar_path(path, fmt, "terms"), columns, kind="terms", meta={"batch_id": batch}, fmt=fmt)
+
+
+def export_quiz_items(
+    path: Path,
+    entries: Iterable[tuple[str, str, "QuizItem"]],
+    *,
+    fmt: ColumnarFormat,
+) -> Path | None:
+    """Lithoformer 题目的列式副本（entries 为 (L 编号, 批次号, QuizItem)；fmt="off" 时不写出）"""
+    if fmt == "off":
+        return None
+    columns: dict[str, list[str]] = {column: [] for column in QUIZ_COLUMNS}
+    for lcode, batch_id, item in entries:
+        columns["lcode"].append(lcode)
+        columns["batch_id"].append(batch_id)
+        columns["qtype"].append(item.qtype)
+        columns["stem"].append(item.stem)
+        columns["answer"].append(item.answer)
+        columns["domain"].append(item.analysis.domain if item.analysis else "")
+        columns["item_json"].append(item.model_dump_json())
+    return write_table(columnar_path(path, fmt, "quiz"), columns, kind="quiz", fmt=fmt)
+
+
+# ============================================================
+# 读取
+# ============================================================
+class ColumnarTable:
+    """
+    mmcol 文件（内存映射，打开时只解析头部）
+
+    Example:
+        >>> with ColumnarTable(Path("x.mmcol")) as table:
+        ...     rows = table.find("word", "amygdala")
+        ...     print([table.row(i) for i in rows])
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._offsets: dict[str, Sequence[int]] = {}
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else None
+        if self._mm is None or self._mm[:8] != MAGIC:
+            self.close()
+            raise ValueError(f"不是 mmcol 文件：{self.path}")
+        size = int.from_bytes(self._mm[8:12], "little")
+        header = json.loads(self._mm[_PREAMBLE:_PREAMBLE + size].decode("utf-8"))
+        start = _align(_PREAMBLE + size)
+        self.kind: str = header.get("kind", "")
+        self.rows: int = header["rows"]
+        self.meta: dict[str, Any] = header.get("meta", {})
+        self._layout = {
+            column["name"]: (start + column["offsets"], start + column["data"], column["length"])
+            for column in header["columns"]
+        }
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._layout)
+
+    def _column_offsets(self, name: str) -> Sequence[int]:
+        if name not in self._offsets:
+            at = self._layout[name][0]
+            raw = memoryview(self._mm)[at:at + 8 * (self.rows + 1)]
+            if _LITTLE:
+                self._offsets[name] = raw.cast("Q")
+            else:
+                offsets = array("Q", raw.tobytes())
+                offsets.byteswap()
+                self._offsets[name] = offsets
+        return self._offsets[name]
+
+    def column(self, name: str) -> list[str]:
+        """解码整列"""
+        offsets = self._column_offsets(name)
+        _, data, length = self._layout[name]
+        blob = self._mm[data:data + length]
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.rows)]
+
+    def value(self, name: str, row: int) -> str:
+        offsets = self._column_offsets(name)
+        data = self._layout[name][1]
+        return self._mm[data + offsets[row]:data + offsets[row + 1]].decode("utf-8")
+
+    def row(self, index: int) -> dict[str, str]:
+        return {name: self.value(name, index) for name in self._layout}
+
+    def find(self, name: str, value: str) -> list[int]:
+        """按值精确查找（在映射内存中搜索字节，不解码整列），返回行号"""
+        offsets = self._column_offsets(name)
+        _, data, length = self._layout[name]
+        needle = value.encode("utf-8")
+        if not needle:
+            return [i for i in range(self.rows) if offsets[i] == offsets[i + 1]]
+        hits: list[int] = []
+        end = data + length
+        position = self._mm.find(needle, data, end)
+        while position != -1:
+            relative = position - data
+            index = bisect_right(offsets, relative, 0, self.rows) - 1
+            if offsets[index] == relative and offsets[index + 1] == relative + len(needle):
+                hits.append(index)
+            position = self._mm.find(needle, position + 1, end)
+        return hits
+
+    def to_frame(self, columns: Sequence[str] | None = None) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column(name) for name in columns or self.columns})
+
+    def close(self) -> None:
+        for offsets in self._offsets.values():
+            if isinstance(offsets, memoryview):
+                offsets.release()
+        self._offsets.clear()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> "ColumnarTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ParquetTable:
+    """Parquet 文件（pyarrow memory_map；接口与 ColumnarTable 相同）"""
+
+    def __init__(self, path: Path):
+        pa = _require_pyarrow()
+        self.path = Path(path)
+        self._table = pa.parquet.read_table(self.path, memory_map=True)
+        header = json.loads((self._table.schema.metadata or {}).get(b"memosyne", b"{}"))
+        self.kind: str = header.get("kind", "")
+        self.rows: int = self._table.num_rows
+        self.meta: dict[str, Any] = header.get("meta", {})
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._table.column_names)
+
+    def column(self, name: str) -> list[str]:
+        return self._table.column(name).to_pylist()
+
+    def value(self, name: str, row: int) -> str:
+        return self._table.column(name)[row].as_py()
+
+    def row(self, index: int) -> dict[str, str]:
+        return {name: self.value(name, index) for name in self.columns}
+
+    def find(self, name: str, value: str) -> list[int]:
+        import pyarrow.compute as pc
+
+        mask = pc.equal(self._table.column(name), value)
+        return pc.indices_nonzero(mask).to_pylist()
+
+    def to_frame(self, columns: Sequence[str] | None = None) -> "pd.DataFrame":
+        return self._table.select(list(columns or self.columns)).to_pandas()
+
+    def close(self) -> None:
+        self._table = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> "ParquetTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_table(path: Path) -> ColumnarTable | ParquetTable:
+    """按扩展名打开列式文件"""
+    path = Path(path)
+    return ParquetTable(path) if path.suffix == SUFFIXES["parquet"] else ColumnarTable(path)
+
+
+class ColumnarArchive:
+    """
+    多个列式文件组成的存档（按 kind 分组查询）
+
+    Example:
+        >>> with open_archive(["data/output"]) as archive:
+        ...     archive.find("memo_id", "M002701")
+        ...     archive.to_frame("quiz")
+    """
+
+    def __init__(self, tables: list[ColumnarTable | ParquetTable], skipped: dict[str, str] | None = None):
+        self.tables = tables
+        self.skipped = skipped or {}
+
+    @property
+    def rows(self) -> int:
+        return sum(table.rows for table in self.tables)
+
+    def find(self, column: str, value: str, *, kind: str | None = None) -> list[dict[str, str]]:
+        """在所有含该列的文件中精确查找（结果附带 _path）"""
+        results: list[dict[str, str]] = []
+        for table in self.tables:
+            if (kind and table.kind != kind) or column not in table.columns:
+                continue
+            for index in table.find(column, value):
+                results.append({**table.row(index), "_path": str(table.path)})
+        return results
+
+    def to_frame(self, kind: str, columns: Sequence[str] | None = None) -> "pd.DataFrame":
+        """合并同类文件为一个 DataFrame（附带 _path 列）"""
+        import pandas as pd
+
+        frames = []
+        for table in self.tables:
+            if table.kind == kind:
+                frame = table.to_frame(columns)
+                frame["_path"] = str(table.path)
+                frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[*(columns or ()), "_path"])
+
+    def close(self) -> None:
+        for table in self.tables:
+            table.close()
+
+    def __enter__(self) -> "ColumnarArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_archive(paths: Iterable[str | Path]) -> ColumnarArchive:
+    """打开目录（递归）下全部 .mmcol / .parquet 文件"""
+    files: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            for suffix in SUFFIXES.values():
+                files.extend(sorted(path.rglob(f"*{suffix}")))
+        elif path.exists():
+            files.append(path)
+    tables: list[ColumnarTable | ParquetTable] = []
+    skipped: dict[str, str] = {}
+    for file in files:
+        try:
+            tables.append(open_table(file))
+        except (OSError, ValueError, ImportError) as exc:
+            skipped[str(file)] = str(exc)
+    return ColumnarArchive(tables, skipped)
@@ -8,6 +8,7 @@ import csv
 from pathlib import Path
 from typing import Iterable
 
+from ....core.models import ItemFailure
 from ....reanimator.domain.models import TermInput, TermOutput
 
 
@@ -114,3 +115,28 @@ class CSVTermRepository:
             writer = csv.writer(f)
             for term in terms:
                 writer.writerow(term.to_csv_row())
+
+    @staticmethod
+    def write_rejects(path: Path | str, failures: Iterable[ItemFailure]) -> None:
+        """
+        写出最终失败的术语（带表头：Word,ZhDef,Reason,Attempts）
+
+        Word / ZhDef 列可被 read_input 直接读取，修正后即可重新处理。
+
+        Args:
+            path: 输出文件路径
+            failures: ItemFailure 列表（fields 含 word / zh_def）
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Word", "ZhDef", "Reason", "Attempts"])
+            for failure in failures:
+                writer.writerow([
+                    failure.fields.get("word", failure.key),
+                    failure.fields.get("zh_def", ""),
+                    " ".join(failure.reason.split()),
+                    failure.attempts,
+                ])
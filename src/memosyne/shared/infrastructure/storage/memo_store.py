@@ -0,0 +1,557 @@
+"""
+Memo Store - 生成记录库（SQLite，db/mmsdb）
+
+收录所有生成结果，替代在 data/output 下逐个 CSV 中 grep：
+- terms：Reanimator 的 TermOutput（主键 memo_id + batch_id，保留同一 Memo 的历次版本）
+- quiz_items：Lithoformer 的 QuizItem 及其 L 编号
+
+- memo_counter / memo_ranges：Memo ID 区间分配（见 reserve_memo_range）
+
+索引：word（大小写不敏感）、memo_id、batch_id、tag / domain。
+
+写入方：
+- CSVTermAdapter.write_output 同步写入新生成的术语
+- Lithoformer 写出 TXT 后登记题目
+- import_term_csvs 批量导入历史 CSV 存档（单事务 executemany）
+"""
+from __future__ import annotations
+
+import csv
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from ....lithoformer.domain.models import QuizItem
+    from ....reanimator.domain.models import TermOutput
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    memo_id     TEXT NOT NULL,
+    batch_id    TEXT NOT NULL DEFAULT '',
+    word        TEXT NOT NULL,
+    zh_def      TEXT NOT NULL,
+    wm_pair     TEXT NOT NULL DEFAULT '',
+    ipa         TEXT NOT NULL DEFAULT '',
+    pos         TEXT NOT NULL DEFAULT '',
+    tag         TEXT NOT NULL DEFAULT '',
+    rarity      TEXT NOT NULL DEFAULT '',
+    en_def      TEXT NOT NULL DEFAULT '',
+    example     TEXT NOT NULL DEFAULT '',
+    pp_fix      TEXT NOT NULL DEFAULT '',
+    pp_means    TEXT NOT NULL DEFAULT '',
+    batch_note  TEXT NOT NULL DEFAULT '',
+    source      TEXT,
+    created_at  REAL NOT NULL,
+    PRIMARY KEY (memo_id, batch_id)
+);
+CREATE INDEX IF NOT EXISTS idx_terms_word ON terms (word COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_terms_batch ON terms (batch_id);
+CREATE INDEX IF NOT EXISTS idx_terms_tag ON terms (tag);
+
+CREATE TABLE IF NOT EXISTS quiz_items (
+    lcode       TEXT NOT NULL,
+    batch_id    TEXT NOT NULL,
+    qtype       TEXT NOT NULL,
+    stem        TEXT NOT NULL,
+    answer      TEXT NOT NULL DEFAULT '',
+    domain      TEXT NOT NULL DEFAULT '',
+    item_json   TEXT NOT NULL,
+    source      TEXT,
+    created_at  REAL NOT NULL,
+    PRIMARY KEY (lcode, batch_id)
+);
+CREATE INDEX IF NOT EXISTS idx_quiz_batch ON quiz_items (batch_id);
+CREATE INDEX IF NOT EXISTS idx_quiz_domain ON quiz_items (domain);
+
+CREATE TABLE IF NOT EXISTS memo_counter (
+    name        TEXT PRIMARY KEY,
+    next_index  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS memo_ranges (
+    range_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+    start_index INTEGER NOT NULL,
+    count       INTEGER NOT NULL,
+    status      TEXT NOT NULL,  -- active / committed / free
+    batch_id    TEXT,
+    pid         INTEGER,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memo_ranges_status ON memo_ranges (status, start_index);
+"""
+
+# 与 TermOutput.to_csv_row() 顺序一致
+_TERM_COLUMNS = (
+    "wm_pair", "memo_id", "word", "zh_def", "ipa", "pos", "tag", "rarity",
+    "en_def", "example", "pp_fix", "pp_means", "batch_id", "batch_note",
+)
+
+# 存档 CSV 表头 → 列名（早期 V3 存档没有 Example 列）
+_HEADER_MAP = {
+    "wmpair": "wm_pair", "memoid": "memo_id", "word": "word", "zhdef": "zh_def",
+    "ipa": "ipa", "pos": "pos", "tag": "tag", "rarity": "rarity", "endef": "en_def",
+    "example": "example", "ppfix": "pp_fix", "ppmeans": "pp_means",
+    "batchid": "batch_id", "batchnote": "batch_note",
+}
+_LEGACY_COLUMNS = tuple(c for c in _TERM_COLUMNS if c != "example")
+
+_INSERT_TERM = f"""
+INSERT OR REPLACE INTO terms ({", ".join(_TERM_COLUMNS)}, source, created_at)
+VALUES ({", ".join("?" * len(_TERM_COLUMNS))}, ?, ?)
+"""
+
+_INSERT_QUIZ = """
+INSERT OR REPLACE INTO quiz_items (lcode, batch_id, qtype, stem, answer, domain, item_json, source, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_MEMO_ID_RE = re.compile(r"^M\d{6}$")
+
+
+class MemoStore:
+    """
+    生成记录库
+
+    每次操作独立连接（写入方分散在 CLI / TUI / API 中，无需管理连接生命周期）。
+
+    Example:
+        >>> store = MemoStore("db/mmsdb/memosyne.sqlite3")
+        >>> store.import_term_csvs(["data/output/archived"])
+        >>> store.find_word("amygdala")
+        >>> store.last_memo_id()
+        'M002736'
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_settings(cls, settings) -> "MemoStore | None":
+        """根据配置创建存储；未启用时返回 None"""
+        if not settings.memo_store_enabled:
+            return None
+        return cls(settings.memo_db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _execute_many(self, sql: str, rows: Iterable[tuple[Any, ...]]) -> int:
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.executemany(sql, rows)
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write_lock(self):
+        """BEGIN IMMEDIATE：跨进程独占写锁（其他进程在 timeout 内排队等待）"""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def add_terms(self, terms: Iterable["TermOutput"], *, source: str | None = None) -> int:
+        """写入 Reanimator 结果（同一 memo_id + batch_id 覆盖）"""
+        now = time.time()
+        return self._execute_many(
+            _INSERT_TERM,
+            (
+                (*(getattr(term, column) for column in _TERM_COLUMNS), source, now)
+                for term in terms
+            ),
+        )
+
+    def add_quiz_items(
+        self,
+        entries: Iterable[tuple[str, "QuizItem"]],
+        *,
+        batch_id: str,
+        source: str | None = None,
+    ) -> int:
+        """写入 Lithoformer 题目（entries 为 (L 编号, QuizItem)）"""
+        now = time.time()
+        return self._execute_many(
+            _INSERT_QUIZ,
+            (
+                (
+                    lcode,
+                    batch_id,
+                    item.qtype,
+                    item.stem,
+                    item.answer,
+                    item.analysis.domain if item.analysis else "",
+                    item.model_dump_json(),
+                    source,
+                    now,
+                )
+                for lcode, item in entries
+            ),
+        )
+
+    def import_term_csvs(self, paths: Iterable[str | Path]) -> int:
+        """
+        批量导入 Reanimator CSV 存档（目录递归查找 *.csv）
+
+        兼容有 / 无表头、早期无 Example 列的存档；跳过 memo_id 非法的行。
+        为了速度不走 Pydantic 校验，所有文件在同一事务内写入。
+
+        Returns:
+            导入行数
+        """
+        files: list[Path] = []
+        for path in map(Path, paths):
+            files.extend(sorted(path.rglob("*.csv")) if path.is_dir() else [path])
+
+        now = time.time()
+
+        def rows() -> Iterable[tuple[Any, ...]]:
+            for file in files:
+                for record in read_term_archive(file):
+                    yield (*(record.get(c, "") for c in _TERM_COLUMNS), file.name, now)
+
+        return self._execute_many(_INSERT_TERM, rows())
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def find_word(self, word: str) -> list[dict[str, Any]]:
+        """按单词查询所有版本（大小写不敏感，最新批次在前）"""
+        return self._query(
+            "SELECT * FROM terms WHERE word = ? COLLATE NOCASE ORDER BY batch_id DESC",
+            (word.strip(),),
+        )
+
+    def get_memo(self, memo_id: str) -> list[dict[str, Any]]:
+        """按 Memo ID 查询所有版本（最新批次在前）"""
+        return self._query(
+            "SELECT * FROM terms WHERE memo_id = ? ORDER BY batch_id DESC", (memo_id,)
+        )
+
+    def batch_terms(self, batch_id: str) -> list[dict[str, Any]]:
+        """查询某批次的全部术语"""
+        return self._query(
+            "SELECT * FROM terms WHERE batch_id = ? ORDER BY memo_id", (batch_id,)
+        )
+
+    def terms_by_tag(self, tag: str) -> list[dict[str, Any]]:
+        """按中文标签查询"""
+        return self._query("SELECT * FROM terms WHERE tag = ? ORDER BY memo_id", (tag,))
+
+    def batch_quiz_items(self, batch_id: str) -> list[dict[str, Any]]:
+        """查询某批次的全部题目"""
+        return self._query(
+            "SELECT * FROM quiz_items WHERE batch_id = ? ORDER BY lcode", (batch_id,)
+        )
+
+    def iter_quiz_item_json(self) -> Iterator[str]:
+        """逐行读取全部题目的 QuizItem JSON（用于回填翻译记忆等离线任务）"""
+        conn = self._connect()
+        try:
+            for row in conn.execute("SELECT item_json FROM quiz_items ORDER BY batch_id, lcode"):
+                yield row["item_json"]
+        finally:
+            conn.close()
+
+    def last_memo_id(self) -> str | None:
+        """已使用的最大 Memo ID"""
+        rows = self._query("SELECT MAX(memo_id) AS memo_id FROM terms")
+        return rows[0]["memo_id"] if rows else None
+
+    # ------------------------------------------------------------------
+    # Memo ID 区间分配
+    # ------------------------------------------------------------------
+    def reserve_memo_range(
+        self,
+        count: int,
+        *,
+        batch_id: str | None = None,
+        start_index: int | None = None,
+    ) -> "MemoReservation":
+        """
+        原子预留连续的 Memo 区间 [start_index, start_index + count)
+
+        - 默认优先复用已释放的空档（首次适配），否则从计数器末尾分配
+        - 指定 start_index 时按手动区间登记，与已有区间重叠则报错
+        - 计数器首次使用时以 terms 表中最大的 Memo ID 为起点
+
+        Args:
+            count: 区间大小（通常为输入条目数或分片大小）
+            batch_id: 批次 ID（仅用于登记）
+            start_index: 手动指定起点（与 use case 的 start_memo_index 同义）
+
+        Returns:
+            MemoReservation（用完后 commit(used)，中止时 release()）
+
+        Raises:
+            ValueError: count 非正数，或手动区间与已有区间重叠
+        """
+        if count <= 0:
+            raise ValueError(f"预留数量必须为正数：{count}")
+        now = time.time()
+        with self._write_lock() as conn:
+            next_index = self._next_index(conn)
+            if start_index is not None:
+                overlap = conn.execute(
+                    "SELECT start_index, count, batch_id FROM memo_ranges"
+                    " WHERE status != 'free' AND start_index < ? AND start_index + count > ? LIMIT 1",
+                    (start_index + count, start_index),
+                ).fetchone()
+                if overlap:
+                    first, size, owner = overlap
+                    raise ValueError(
+                        f"Memo 区间 M{start_index + 1:06d}–M{start_index + count:06d} 与已预留区间 "
+                        f"M{first + 1:06d}–M{first + size:06d}（{owner or '未知批次'}）重叠"
+                    )
+                self._carve_free(conn, start_index, count, now)
+                start = start_index
+                next_index = max(next_index, start + count)
+            else:
+                for range_id, gap_start, size in conn.execute(
+                    "SELECT range_id, start_index, count FROM memo_ranges"
+                    " WHERE status = 'free' AND count >= ? ORDER BY start_index",
+                    (count,),
+                ).fetchall():
+                    # 空档已被手动运行占用 → 作废
+                    if self._range_has_terms(conn, gap_start, size):
+                        conn.execute("DELETE FROM memo_ranges WHERE range_id = ?", (range_id,))
+                        continue
+                    start = gap_start
+                    self._shrink_free(conn, range_id, start + count, size - count, now)
+                    break
+                else:
+                    start = next_index
+                    next_index += count
+            conn.execute(
+                "INSERT OR REPLACE INTO memo_counter (name, next_index) VALUES ('memo', ?)", (next_index,)
+            )
+            cursor = conn.execute(
+                "INSERT INTO memo_ranges (start_index, count, status, batch_id, pid, created_at, updated_at)"
+                " VALUES (?, ?, 'active', ?, ?, ?, ?)",
+                (start, count, batch_id, os.getpid(), now, now),
+            )
+        return MemoReservation(self, cursor.lastrowid, start, count)
+
+    def next_memo_index(self) -> int:
+        """下一次从末尾分配的起点（不预留）"""
+        conn = self._connect()
+        try:
+            return self._next_index(conn)
+        finally:
+            conn.close()
+
+    def memo_ranges(self, status: str | None = None) -> list[dict[str, Any]]:
+        """查询已登记的 Memo 区间（active / committed / free）"""
+        if status is None:
+            return self._query("SELECT * FROM memo_ranges ORDER BY start_index")
+        return self._query(
+            "SELECT * FROM memo_ranges WHERE status = ? ORDER BY start_index", (status,)
+        )
+
+    def _finish_reservation(self, range_id: int, used: int, batch_id: str | None) -> None:
+        """结算预留：前 used 个标记为 committed，其余归还（位于末尾则回退计数器）"""
+        now = time.time()
+        with self._write_lock() as conn:
+            row = conn.execute(
+                "SELECT start_index, count FROM memo_ranges WHERE range_id = ? AND status = 'active'",
+                (range_id,),
+            ).fetchone()
+            if row is None:
+                return
+            start, count = row
+            used = max(0, min(used, count))
+            if used:
+                conn.execute(
+                    "UPDATE memo_ranges SET status = 'committed', count = ?,"
+                    " batch_id = COALESCE(?, batch_id), updated_at = ? WHERE range_id = ?",
+                    (used, batch_id, now, range_id),
+                )
+            else:
+                conn.execute("DELETE FROM memo_ranges WHERE range_id = ?", (range_id,))
+            if used == count:
+                return
+            unused_start, unused_end = start + used, start + count
+            if self._next_index(conn) == unused_end:
+                # 位于末尾：回退计数器，并吞并紧邻的空档
+                while True:
+                    gap = conn.execute(
+                        "SELECT range_id, start_index FROM memo_ranges"
+                        " WHERE status = 'free' AND start_index + count = ?",
+                        (unused_start,),
+                    ).fetchone()
+                    if gap is None:
+                        break
+                    conn.execute("DELETE FROM memo_ranges WHERE range_id = ?", (gap[0],))
+                    unused_start = gap[1]
+                conn.execute(
+                    "UPDATE memo_counter SET next_index = ? WHERE name = 'memo'", (unused_start,)
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO memo_ranges (start_index, count, status, created_at, updated_at)"
+                    " VALUES (?, ?, 'free', ?, ?)",
+                    (unused_start, unused_end - unused_start, now, now),
+                )
+
+    def _next_index(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT next_index FROM memo_counter WHERE name = 'memo'").fetchone()
+        # 手动指定起点的运行不经过分配器，但结果会入库：始终越过已入库的最大 Memo ID
+        # （M002716 → 下一个起点 2716；主键索引上的 MAX 为 O(log n)）
+        last = conn.execute("SELECT MAX(memo_id) FROM terms").fetchone()[0]
+        return max(row[0] if row else 0, int(last[1:]) if last else 0)
+
+    @staticmethod
+    def _range_has_terms(conn: sqlite3.Connection, start: int, count: int) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM terms WHERE memo_id BETWEEN ? AND ? LIMIT 1",
+            (f"M{start + 1:06d}", f"M{start + count:06d}"),
+        ).fetchone() is not None
+
+    def _carve_free(self, conn: sqlite3.Connection, start: int, count: int, now: float) -> None:
+        """从空档中扣除手动区间"""
+        end = start + count
+        for range_id, free_start, size in conn.execute(
+            "SELECT range_id, start_index, count FROM memo_ranges"
+            " WHERE status = 'free' AND start_index < ? AND start_index + count > ?",
+            (end, start),
+        ).fetchall():
+            free_end = free_start + size
+            self._shrink_free(conn, range_id, free_start, max(0, start - free_start), now)
+            if free_end > end:
+                conn.execute(
+                    "INSERT INTO memo_ranges (start_index, count, status, created_at, updated_at)"
+                    " VALUES (?, ?, 'free', ?, ?)",
+                    (end, free_end - end, now, now),
+                )
+
+    @staticmethod
+    def _shrink_free(conn: sqlite3.Connection, range_id: int, start: int, size: int, now: float) -> None:
+        if size > 0:
+            conn.execute(
+                "UPDATE memo_ranges SET start_index = ?, count = ?, updated_at = ? WHERE range_id = ?",
+                (start, size, now, range_id),
+            )
+        else:
+            conn.execute("DELETE FROM memo_ranges WHERE range_id = ?", (range_id,))
+
+    def stats(self) -> dict[str, int]:
+        """行数统计"""
+        rows = self._query(
+            "SELECT (SELECT COUNT(*) FROM terms) AS terms,"
+            " (SELECT COUNT(DISTINCT batch_id) FROM terms) AS term_batches,"
+            " (SELECT COUNT(*) FROM quiz_items) AS quiz_items"
+        )
+        return rows[0]
+
+
+class MemoReservation:
+    """
+    已预留的 Memo 区间
+
+    start_index 可直接作为 ProcessTermsUseCase 的 start_memo_index。
+    作为上下文管理器使用时，未 commit 即退出（异常 / 中止）会自动归还整个区间。
+
+    Example:
+        >>> with store.reserve_memo_range(len(terms), batch_id=batch_id) as reservation:
+        ...     result = run(start_memo_index=reservation.start_index)
+        ...     reservation.commit(len(result.items))
+    """
+
+    def __init__(self, store: MemoStore, range_id: int, start_index: int, count: int):
+        self.store = store
+        self.range_id = range_id
+        self.start_index = start_index
+        self.count = count
+        self._settled = False
+
+    @property
+    def first_memo_id(self) -> str:
+        return f"M{self.start_index + 1:06d}"
+
+    @property
+    def last_memo_id(self) -> str:
+        return f"M{self.start_index + self.count:06d}"
+
+    def commit(self, used: int | None = None, *, batch_id: str | None = None) -> None:
+        """确认使用前 used 个（默认全部），其余归还"""
+        if self._settled:
+            return
+        self._settled = True
+        self.store._finish_reservation(self.range_id, self.count if used is None else used, batch_id)
+
+    def release(self) -> None:
+        """归还整个区间"""
+        self.commit(0)
+
+    def __enter__(self) -> "MemoReservation":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"MemoReservation({self.first_memo_id}–{self.last_memo_id})"
+
+
+def read_term_archive(path: Path) -> Iterable[dict[str, str]]:
+    """读取单个 CSV 存档，产出列名 → 值"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        columns: tuple[str, ...] | None = None
+        for row in reader:
+            if not row:
+                continue
+            if columns is None:
+                keys = [cell.replace("\ufeff", "").strip().lower() for cell in row]
+                if "memoid" in keys:
+                    columns = tuple(_HEADER_MAP.get(key, key) for key in keys)
+                    continue
+                columns = _LEGACY_COLUMNS if len(row) == len(_LEGACY_COLUMNS) else _TERM_COLUMNS
+            record = dict(zip(columns, (cell.strip() for cell in row)))
+            if _MEMO_ID_RE.match(record.get("memo_id", "")) and record.get("word"):
+                record.setdefault("zh_def", "")
+                yield record
+
+
+def open_memo_store(settings) -> MemoStore | None:
+    """
+    便捷入口：按配置打开生成记录库（未启用或打开失败时返回 None）
+
+    记录库属于旁路功能，数据库不可写时不应中断主流程。
+    """
+    try:
+        return MemoStore.from_settings(settings)
+    except sqlite3.Error:
+        return None
@@ -0,0 +1,170 @@
+"""
+Translation Memory - 选项 / 步骤片段翻译记忆（SQLite，默认 db/mmsdb/translation_memory.sqlite3）
+
+表 segments：规范化英文片段（主键，WITHOUT ROWID 聚簇 B-Tree）→ 简体中文译文。
+- lookup 按题目批量查询（单条 IN 语句），并缓存在进程内 LRU 中（含未命中），
+  几十万条片段下单题查询仍是若干次主键查找
+- remember 以 upsert 写入：首次收录的译文保持不变（译名稳定），uses 记录出现次数
+- 单连接 + 锁：分阶段流水线的多个工作线程共用同一实例
+
+规范化与收集规则见 lithoformer.domain.translation_memory。
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from .memo_store import MemoStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    source      TEXT PRIMARY KEY,
+    zh          TEXT NOT NULL,
+    uses        INTEGER NOT NULL DEFAULT 1,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO segments (source, zh, uses, created_at, updated_at) VALUES (?, ?, 1, ?, ?)
+ON CONFLICT(source) DO UPDATE SET uses = uses + 1, updated_at = excluded.updated_at
+"""
+
+# SQLite 默认最多 999 个绑定参数
+_CHUNK = 500
+
+
+class TranslationMemory:
+    """
+    片段翻译记忆（实现 lithoformer.application.ports.TranslationMemoryPort）
+
+    Example:
+        >>> memory = TranslationMemory("db/mmsdb/translation_memory.sqlite3")
+        >>> memory.remember([("all of the above", "以上皆是")])
+        >>> memory.lookup(["all of the above", "none of the above"])
+        {'all of the above': '以上皆是'}
+    """
+
+    def __init__(self, path: str | Path, *, min_uses: int = 1, cache_size: int = 100_000):
+        """
+        Args:
+            path: SQLite 文件路径
+            min_uses: 片段至少在多少道已验证题目中出现过才参与预填
+            cache_size: 进程内 LRU 缓存条目数
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.min_uses = min_uses
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, str | None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings) -> "TranslationMemory | None":
+        """根据配置创建翻译记忆；未启用时返回 None"""
+        if not settings.translation_memory_enabled:
+            return None
+        return cls(settings.translation_memory_path, min_uses=settings.translation_memory_min_uses)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 查询 / 写入
+    # ------------------------------------------------------------------
+    def lookup(self, keys: Iterable[str]) -> dict[str, str]:
+        """批量查询规范化片段，返回命中的 {片段: 译文}"""
+        found: dict[str, str] = {}
+        with self._lock:
+            missing: list[str] = []
+            for key in dict.fromkeys(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    if self._cache[key] is not None:
+                        found[key] = self._cache[key]
+                else:
+                    missing.append(key)
+
+            for start in range(0, len(missing), _CHUNK):
+                chunk = missing[start:start + _CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source, zh FROM segments WHERE source IN ({placeholders}) AND uses >= ?",
+                    (*chunk, self.min_uses),
+                ).fetchall()
+                hits = dict(rows)
+                for key in chunk:
+                    self._remember_cache(key, hits.get(key))
+                found.update(hits)
+        return found
+
+    def remember(self, pairs: Iterable[tuple[str, str]]) -> int:
+        """收录 (规范化片段, 译文)；已存在的片段只累计 uses"""
+        now = time.time()
+        rows = [(key, zh, now, now) for key, zh in pairs if key and zh]
+        if not rows:
+            return 0
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(_UPSERT, rows)
+            # uses 变化可能让片段跨过 min_uses 阈值，丢弃相关缓存
+            for key, *_ in rows:
+                self._cache.pop(key, None)
+        return len(rows)
+
+    def _remember_cache(self, key: str, value: str | None) -> None:
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 维护
+    # ------------------------------------------------------------------
+    def import_memo_store(self, memo_store: "MemoStore") -> int:
+        """从生成记录库中已登记的题目回填记忆（单事务）"""
+        from ....lithoformer.domain.models import QuizItem
+        from ....lithoformer.domain.translation_memory import harvest_pairs
+
+        pairs: list[tuple[str, str]] = []
+        for item_json in memo_store.iter_quiz_item_json():
+            try:
+                pairs.extend(harvest_pairs(QuizItem.model_validate_json(item_json)))
+            except ValueError:
+                continue
+        return self.remember(pairs)
+
+    def top(self, limit: int = 20) -> list[tuple[str, str, int]]:
+        """出现次数最多的片段"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source, zh, uses FROM segments ORDER BY uses DESC, source LIMIT ?", (limit,)
+            ).fetchall()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            total, recurring = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(uses >= ?), 0) FROM segments", (max(self.min_uses, 2),)
+            ).fetchone()
+        return {"segments": total, "recurring": recurring}
+
+
+def open_translation_memory(settings) -> TranslationMemory | None:
+    """
+    便捷入口：按配置打开翻译记忆（未启用或打开失败时返回 None）
+
+    翻译记忆属于旁路优化，数据库不可用时按无记忆处理。
+    """
+    try:
+        return TranslationMemory.from_settings(settings)
+    except sqlite3.Error:
+        return None
@@ -20,6 +20,19 @@ from .model_codes import (
 from .filename import extract_short_filename, generate_output_filename
 from .logger import get_logger, setup_logger
 from .progress import Progress, indeterminate_progress, iterate_with_progress
+from .tracing import Tracer, configure_tracing, get_tracer
+from .metrics import (
+    MetricsExporter,
+    MetricsRegistry,
+    configure_metrics,
+    get_metrics,
+    note_call_model,
+    pop_call_model,
+    pop_call_retries,
+)
+from .pricing import PRICING, ModelPrice, estimate_cost, get_price
+from .planning import CallProfile, RunPlan, approx_tokens, build_plan, recommend_concurrency
+from .scheduling import lpt_order, simulate_makespan
 
 __all__ = [
     "BatchIDGenerator",
@@ -36,4 +49,25 @@ __all__ = [
     "Progress",
     "indeterminate_progress",
     "iterate_with_progress",
+    "Tracer",
+    "configure_tracing",
+    "get_tracer",
+    "MetricsRegistry",
+    "MetricsExporter",
+    "configure_metrics",
+    "get_metrics",
+    "pop_call_retries",
+    "pop_call_model",
+    "note_call_model",
+    "PRICING",
+    "ModelPrice",
+    "estimate_cost",
+    "get_price",
+    "CallProfile",
+    "RunPlan",
+    "approx_tokens",
+    "build_plan",
+    "recommend_concurrency",
+    "lpt_order",
+    "simulate_makespan",
 ]
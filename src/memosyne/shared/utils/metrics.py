@@ -0,0 +1,527 @@
+"""
+Metrics - 运行时指标（Counter / Gauge / Histogram）
+
+用途：
+- 长时间运行（上千条）时观察吞吐与饱和度
+- 标签统一为 pipeline / provider / model
+- 两种导出方式：
+  - 本地 HTTP 端点（Prometheus 文本格式，GET /metrics）
+  - 周期性 JSON 快照文件
+
+内置指标（见 ``MetricsRegistry.__init__``）：
+    memosyne_llm_requests_in_flight      进行中的 LLM 请求
+    memosyne_llm_requests_total          LLM 请求数（status=ok/error）
+    memosyne_llm_request_seconds         LLM 请求耗时分布
+    memosyne_llm_tokens_total            Token 数（kind=prompt/completion）
+    memosyne_llm_tokens_per_second       最近 60 秒的 Token 吞吐
+    memosyne_llm_retries_total           SDK 内部重试次数
+    memosyne_llm_policy_retries_total    策略层重试次数（reason=429/503/timeout/...）
+    memosyne_llm_circuit_rejections_total 熔断期间被直接拒绝的请求
+    memosyne_items_total                 处理条目数（status=success/invalid/error）
+    memosyne_validation_failure_ratio    校验失败占比
+    memosyne_cache_hits_total            缓存命中（cache=cassette/...）
+    memosyne_queue_depth                 待处理条目数
+
+禁用时 ``track_llm_call()`` 等辅助函数直接返回，开销可忽略。
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+LabelKey = tuple[tuple[str, str], ...]
+
+DEFAULT_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+_THROUGHPUT_WINDOW = 60.0
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _format_labels(key: LabelKey, extra: dict[str, str] | None = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# ============================================================
+# 指标类型
+# ============================================================
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in self._values.items()]
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    """可增可减的瞬时值"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """累积分桶直方图"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelKey, dict[str, Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> list[str]:
+        lines: list[str] = []
+        with self._lock:
+            for key, series in self._series.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    le = {"le": _format_value(bound)}
+                    lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(key),
+                    "count": series["count"],
+                    "sum": series["sum"],
+                    "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], series["counts"])),
+                }
+                for key, series in self._series.items()
+            ]
+
+
+# ============================================================
+# 注册表
+# ============================================================
+_call_local = threading.local()
+_active_call: contextvars.ContextVar[dict[str, str] | None] = contextvars.ContextVar(
+    "memosyne_active_llm_call", default=None
+)
+
+
+class MetricsRegistry:
+    """指标注册表（含 Memosyne 内置指标与记录辅助方法）"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._token_window: dict[LabelKey, deque[tuple[float, int]]] = {}
+        self._item_totals: dict[str, list[int]] = {}
+
+        self.in_flight = self.gauge("memosyne_llm_requests_in_flight", "LLM requests currently in flight")
+        self.requests = self.counter("memosyne_llm_requests_total", "LLM requests by outcome")
+        self.latency = self.histogram("memosyne_llm_request_seconds", "LLM request latency in seconds")
+        self.tokens = self.counter("memosyne_llm_tokens_total", "Tokens consumed by kind")
+        self.tokens_per_second = self.gauge(
+            "memosyne_llm_tokens_per_second", f"Token throughput over the last {int(_THROUGHPUT_WINDOW)}s"
+        )
+        self.retries = self.counter("memosyne_llm_retries_total", "Retries performed inside the SDK client")
+        self.policy_retries = self.counter(
+            "memosyne_llm_policy_retries_total", "Retries performed by the provider resilience policy"
+        )
+        self.circuit_rejections = self.counter(
+            "memosyne_llm_circuit_rejections_total", "Requests rejected while the circuit breaker was open"
+        )
+        self.items = self.counter("memosyne_items_total", "Processed items by status")
+        self.validation_failure_ratio = self.gauge(
+            "memosyne_validation_failure_ratio", "Share of processed items that failed validation"
+        )
+        self.cache_hits = self.counter("memosyne_cache_hits_total", "Cache hits by cache name")
+        self.queue_depth = self.gauge("memosyne_queue_depth", "Items waiting to be processed")
+
+    # --- 注册 ---
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(
+        self, name: str, help_text: str = "", buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    # --- 记录辅助 ---
+    @contextmanager
+    def track_llm_call(self, pipeline: str, provider: str, model: str) -> Iterator[dict[str, Any]]:
+        """
+        记录一次 LLM 调用（in-flight、耗时、结果、Token 吞吐）
+
+        Example:
+            >>> with registry.track_llm_call("reanimator", "openai", "gpt-4o-mini") as call:
+            ...     data, usage = provider.complete_structured(...)
+            ...     call["usage"] = usage
+
+        无论是否启用，都会把 model 保存到线程本地，供 pop_call_model() 读取。
+        """
+        _call_local.model = model
+        if not self.enabled:
+            yield {}
+            return
+
+        labels = {"pipeline": pipeline, "provider": provider, "model": model}
+        call: dict[str, Any] = {}
+        token = _active_call.set(labels)
+        self.in_flight.inc(**labels)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield call
+            status = "ok"
+        finally:
+            elapsed = time.perf_counter() - started
+            _active_call.reset(token)
+            self.in_flight.dec(**labels)
+            self.latency.observe(elapsed, **labels)
+            self.requests.inc(status=status, **labels)
+            usage = call.get("usage")
+            if usage is not None:
+                self._record_tokens(labels, usage.prompt_tokens, usage.completion_tokens)
+
+    def record_retries(self, count: int) -> None:
+        """
+        记录 SDK 内部重试（标签取自当前 track_llm_call 上下文）
+
+        无论是否启用，都会把次数累加到线程本地（策略层多次尝试的 SDK 重试合计），
+        由调用方通过 pop_call_retries() 读取并清零。
+        """
+        _call_local.retries = getattr(_call_local, "retries", 0) + count
+        if not self.enabled or not count:
+            return
+        self.retries.inc(count, **(_active_call.get() or {}))
+
+    def add_call_retries(self, count: int) -> None:
+        """把策略层重试累加到线程本地次数（与 SDK 内部重试合计，供 pop_call_retries() 读取）"""
+        _call_local.retries = getattr(_call_local, "retries", 0) + count
+
+    def record_policy_retry(self, reason: str) -> None:
+        if not self.enabled:
+            return
+        self.policy_retries.inc(reason=reason, **(_active_call.get() or {}))
+
+    def record_circuit_rejection(self) -> None:
+        if not self.enabled:
+            return
+        self.circuit_rejections.inc(**(_active_call.get() or {}))
+
+    def record_cache_hit(self, cache: str, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        merged = {**(_active_call.get() or {}), **labels}
+        self.cache_hits.inc(cache=cache, **merged)
+
+    def record_item(self, pipeline: str, status: str, remaining: int | None = None) -> None:
+        """记录一个条目的处理结果，并更新失败率与队列深度"""
+        if not self.enabled:
+            return
+        self.items.inc(pipeline=pipeline, status=status)
+        with self._lock:
+            totals = self._item_totals.setdefault(pipeline, [0, 0])
+            totals[0] += 1
+            if status != "success":
+                totals[1] += 1
+            ratio = totals[1] / totals[0]
+        self.validation_failure_ratio.set(ratio, pipeline=pipeline)
+        if remaining is not None:
+            self.queue_depth.set(remaining, pipeline=pipeline)
+
+    def set_queue_depth(self, pipeline: str, depth: int) -> None:
+        if self.enabled:
+            self.queue_depth.set(depth, pipeline=pipeline)
+
+    def _record_tokens(self, labels: dict[str, str], prompt: int, completion: int) -> None:
+        self.tokens.inc(prompt, kind="prompt", **labels)
+        self.tokens.inc(completion, kind="completion", **labels)
+        now = time.monotonic()
+        key = _label_key(labels)
+        with self._lock:
+            window = self._token_window.setdefault(key, deque())
+            window.append((now, prompt + completion))
+            while window and now - window[0][0] > _THROUGHPUT_WINDOW:
+                window.popleft()
+            span = max(now - window[0][0], 1.0) if len(window) > 1 else _THROUGHPUT_WINDOW
+            rate = sum(tokens for _, tokens in window) / span
+        self.tokens_per_second.set(rate, **labels)
+
+    # --- 导出 ---
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            "timestamp": time.time(),
+            "metrics": {m.name: {"type": m.kind, "series": m.snapshot()} for m in metrics},
+        }
+
+    def write_snapshot(self, path: str | Path) -> Path:
+        """原子写出 JSON 快照（先写临时文件再替换）"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+# ============================================================
+# 导出器（HTTP 端点 + 周期快照）
+# ============================================================
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class MetricsExporter:
+    """
+    指标导出器：可选 HTTP 端点 + 可选周期快照
+
+    Example:
+        >>> with MetricsExporter.from_settings(settings):
+        ...     run_pipeline()
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        *,
+        port: int | None = None,
+        host: str = "127.0.0.1",
+        snapshot_path: str | Path | None = None,
+        snapshot_interval: float = 10.0,
+    ):
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = max(snapshot_interval, 0.1)
+        self._httpd: ThreadingHTTPServer | None = None
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_settings(cls, settings) -> "MetricsExporter":
+        """根据配置启用全局注册表并创建导出器（未配置时为空操作）"""
+        enabled = settings.metrics_port is not None or settings.metrics_snapshot_path is not None
+        registry = configure_metrics(enabled=enabled)
+        return cls(
+            registry,
+            port=settings.metrics_port,
+            snapshot_path=settings.metrics_snapshot_path,
+            snapshot_interval=settings.metrics_snapshot_interval,
+        )
+
+    @property
+    def url(self) -> str | None:
+        if self._httpd is None:
+            return None
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsExporter":
+        if self.port is not None and self._httpd is None:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+            self._httpd.daemon_threads = True
+            self._httpd.registry = self.registry  # type: ignore[attr-defined]
+            thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.snapshot_path is not None:
+            thread = threading.Thread(target=self._snapshot_loop, name="metrics-snapshot", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads.clear()
+        if self.snapshot_path is not None:
+            self.registry.write_snapshot(self.snapshot_path)  # 结束时写出最终快照
+
+    def _snapshot_loop(self) -> None:
+        while not self._stop.wait(self.snapshot_interval):
+            try:
+                self.registry.write_snapshot(self.snapshot_path)  # type: ignore[arg-type]
+            except OSError:
+                continue
+
+    def __enter__(self) -> "MetricsExporter":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def pop_call_retries() -> int:
+    """读取并清零当前线程最近一次 LLM 调用的重试次数"""
+    retries = getattr(_call_local, "retries", 0)
+    _call_local.retries = 0
+    return retries
+
+
+def note_call_model(model: str | None) -> None:
+    """覆盖当前线程最近一次 LLM 调用实际使用的模型（负载均衡 / 对冲由其它后端响应时）"""
+    if model:
+        _call_local.model = model
+
+
+def pop_call_model() -> str | None:
+    """读取并清空当前线程最近一次 LLM 调用实际使用的模型（未记录时为 None）"""
+    model = getattr(_call_local, "model", None)
+    _call_local.model = None
+    return model
+
+
+# === 全局注册表（默认禁用）===
+_registry = MetricsRegistry(enabled=False)
+
+
+def get_metrics() -> MetricsRegistry:
+    """获取全局指标注册表"""
+    return _registry
+
+
+def configure_metrics(enabled: bool = True) -> MetricsRegistry:
+    """
+    重置全局指标注册表
+
+    Args:
+        enabled: 是否启用记录
+
+    Returns:
+        新的全局 MetricsRegistry
+    """
+    global _registry
+    _registry = MetricsRegistry(enabled=enabled)
+    return _registry
+
+
+# === 使用示例 ===
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    registry = configure_metrics(enabled=True)
+    for i in range(3):
+        with registry.track_llm_call("reanimator", "openai", "gpt-4o-mini") as call:
+            time.sleep(0.01)
+            call["usage"] = SimpleNamespace(prompt_tokens=100, completion_tokens=40)
+        registry.record_item("reanimator", "success" if i else "invalid", remaining=2 - i)
+    print(registry.render_prometheus())
@@ -0,0 +1,234 @@
+"""
+运行规划 - 运行前估算 Token、成本与耗时
+
+- approx_tokens：本地分词近似（CJK 约 1 字 1 Token，其余约 4 字符 1 Token），
+  对完整请求文本（系统提示词 + 用户提示词 + JSON Schema）计数
+- CallProfile：分析库中同一流水线（优先同一模型）的历史画像，用于校准
+  （提示词 Token 的整体偏差、补全 Token、单次耗时、每条目调用次数）
+- build_plan：合成 RunPlan（Token / 成本 / 给定并发与限流下的耗时 / 推荐并发）
+
+耗时模型：调用数 × 单次耗时 ÷ 并发，与 RPM / TPM 限流下的最短耗时取较大值。
+推荐并发：恰好用满限流所需的并发（限流未知时取上限），不超过条目数。
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import asdict, dataclass
+
+from .pricing import estimate_cost
+
+# CJK 统一表意文字 / 全角标点 / 韩文音节：分词器大多按 1 字 ≥ 1 Token 切分
+_WIDE_CHARS = re.compile(r"[　-〿㐀-鿿가-힯＀-￯]")
+# 历史校准系数的允许范围（历史批次与本批次的条目长度不同，避免过度修正）
+_SCALE_RANGE = (0.5, 2.0)
+# 无历史时的单次耗时：固定开销 + 补全 Token ÷ 生成速度
+_BASE_LATENCY = 1.0
+_TOKENS_PER_SECOND = 50.0
+
+
+def approx_tokens(text: str) -> int:
+    """
+    本地 Token 数近似（无需分词器依赖）
+
+    Example:
+        >>> approx_tokens("neuron 神经元")
+        5
+    """
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+@dataclass(frozen=True, slots=True)
+class CallProfile:
+    """
+    历史调用画像（按条目归一）
+
+    Attributes:
+        samples: 参与统计的调用数
+        prompt_tokens: 每条目平均提示词 Token（含修复 / 重试调用）
+        completion_tokens: 每条目平均补全 Token
+        latency: 成功调用的平均耗时（秒）
+        calls_per_item: 每条目平均调用次数
+        source: "model"（同一模型）或 "pipeline"（同一流水线的全部模型）
+    """
+
+    samples: int
+    prompt_tokens: float
+    completion_tokens: float
+    latency: float
+    calls_per_item: float
+    source: str = "model"
+
+
+@dataclass(slots=True)
+class RunPlan:
+    """
+    运行前估算结果
+
+    Attributes:
+        pipeline: reanimator / lithoformer
+        model: 模型 ID
+        items: 条目数
+        calls: 预计 LLM 调用数
+        prompt_tokens / completion_tokens: 预计 Token
+        cost: 预计成本（美元，价格表未登记的模型为 None）
+        duration: 给定并发下的预计耗时（秒）
+        concurrency: 估算所用的并发数
+        recommended_concurrency: 推荐并发数
+        rpm / tpm: 估算所用的限流（0 表示未知）
+        calibration: 校准来源（model / pipeline / none）
+        samples: 校准所用的历史调用数
+    """
+
+    pipeline: str
+    model: str
+    items: int
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float | None
+    duration: float
+    concurrency: int
+    recommended_concurrency: int
+    rpm: int = 0
+    tpm: int = 0
+    calibration: str = "none"
+    samples: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+    def describe(self) -> list[str]:
+        """人类可读的摘要行（CLI / TUI 共用）"""
+        cost = f"${self.cost:,.4f}" if self.cost is not None else "n/a"
+        limits = f"{self.rpm or '?'} RPM / {self.tpm or '?'} TPM"
+        calibration = f"{self.calibration}, {self.samples} calls" if self.samples else "uncalibrated"
+        return [
+            f"{self.items} items → ~{self.calls} calls, "
+            f"~{self.prompt_tokens:,} prompt + {self.completion_tokens:,} completion tokens ({calibration})",
+            f"Cost ~{cost} on {self.model}",
+            f"Duration ~{_format_duration(self.duration)} at concurrency {self.concurrency} ({limits}); "
+            f"recommended concurrency {self.recommended_concurrency}",
+        ]
+
+
+def build_plan(
+    pipeline: str,
+    model: str,
+    prompt_estimates: list[int],
+    *,
+    profile: CallProfile | None = None,
+    default_completion: int,
+    default_calls_per_item: float = 1.0,
+    concurrency: int = 1,
+    rpm: int = 0,
+    tpm: int = 0,
+    max_concurrency: int = 16,
+) -> RunPlan:
+    """
+    合成运行规划
+
+    Args:
+        pipeline: 流水线名称
+        model: 模型 ID
+        prompt_estimates: 每个条目全部请求的近似提示词 Token（approx_tokens）
+        profile: 历史画像（None 使用默认值，不校准）
+        default_completion: 无历史时每条目的补全 Token
+        default_calls_per_item: 无历史时每条目的调用次数（分阶段模式为阶段数）
+        concurrency: 估算耗时所用的并发数
+        rpm / tpm: 账号限流（0 表示未知）
+        max_concurrency: 推荐并发的上限
+
+    Example:
+        >>> plan = build_plan("reanimator", "gpt-4o-mini", [900] * 100, default_completion=120)
+        >>> plan.describe()
+    """
+    items = len(prompt_estimates)
+    estimated = sum(prompt_estimates)
+    calls_per_item = default_calls_per_item
+    completion = float(default_completion) * items
+    scale = 1.0
+    latency: float | None = None
+    if profile is not None and items and estimated:
+        low, high = _SCALE_RANGE
+        scale = min(high, max(low, profile.prompt_tokens * items / estimated))
+        completion = profile.completion_tokens * items
+        # 请求结构（分阶段 / 预解析）以本次为准；历史只能补充修复与重试调用
+        calls_per_item = max(default_calls_per_item, profile.calls_per_item)
+        latency = profile.latency
+
+    calls = max(items, round(items * calls_per_item)) if items else 0
+    prompt_tokens = round(estimated * scale)
+    completion_tokens = round(completion)
+    if latency is None:
+        latency = _BASE_LATENCY + (completion_tokens / max(calls, 1)) / _TOKENS_PER_SECOND
+    tokens_per_call = (prompt_tokens + completion_tokens) / max(calls, 1)
+
+    concurrency = max(1, concurrency)
+    duration = calls * latency / concurrency
+    if rpm:
+        duration = max(duration, calls / rpm * 60)
+    if tpm:
+        duration = max(duration, (prompt_tokens + completion_tokens) / tpm * 60)
+
+    return RunPlan(
+        pipeline=pipeline,
+        model=model,
+        items=items,
+        calls=calls,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cost=estimate_cost(model, prompt_tokens, completion_tokens),
+        duration=duration,
+        concurrency=concurrency,
+        recommended_concurrency=recommend_concurrency(
+            latency, tokens_per_call, rpm=rpm, tpm=tpm, items=items, ceiling=max_concurrency
+        ),
+        rpm=rpm,
+        tpm=tpm,
+        calibration=profile.source if profile is not None else "none",
+        samples=profile.samples if profile is not None else 0,
+    )
+
+
+def recommend_concurrency(
+    latency: float,
+    tokens_per_call: float,
+    *,
+    rpm: int = 0,
+    tpm: int = 0,
+    items: int,
+    ceiling: int = 16,
+) -> int:
+    """
+    推荐并发：吞吐恰好用满限流（并发 = 限流允许的调用速率 × 单次耗时）
+
+    Example:
+        >>> recommend_concurrency(4.0, 1500, rpm=500, tpm=200_000, items=300)
+        9
+    """
+    rates = []
+    if rpm:
+        rates.append(rpm / 60)
+    if tpm and tokens_per_call:
+        rates.append(tpm / 60 / tokens_per_call)
+    best = math.ceil(min(rates) * latency) if rates else ceiling
+    return max(1, min(best, ceiling, items or 1))
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = round(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
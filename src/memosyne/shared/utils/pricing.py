@@ -0,0 +1,77 @@
+"""
+模型价格表 - 用于成本估算
+
+单位：美元 / 百万 Token（官方标价，未含批量折扣）
+- input: 未命中缓存的提示词
+- cached_input: 命中提示词缓存的部分
+- output: 补全
+
+未登记的模型返回 None，调用方自行决定如何展示。
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class ModelPrice(NamedTuple):
+    input: float
+    cached_input: float
+    output: float
+
+
+PRICING: dict[str, ModelPrice] = {
+    # OpenAI
+    "gpt-5": ModelPrice(1.25, 0.125, 10.00),
+    "gpt-5-mini": ModelPrice(0.25, 0.025, 2.00),
+    "gpt-4o": ModelPrice(2.50, 1.25, 10.00),
+    "gpt-4o-mini": ModelPrice(0.15, 0.075, 0.60),
+    "o3": ModelPrice(2.00, 0.50, 8.00),
+    "o4-mini": ModelPrice(1.10, 0.275, 4.40),
+
+    # Anthropic
+    "claude-opus-4-1": ModelPrice(15.00, 1.50, 75.00),
+    "claude-opus-4-0": ModelPrice(15.00, 1.50, 75.00),
+    "claude-opus-4": ModelPrice(15.00, 1.50, 75.00),
+    "claude-sonnet-4-5": ModelPrice(3.00, 0.30, 15.00),
+    "claude-3-7-sonnet-latest": ModelPrice(3.00, 0.30, 15.00),
+    "claude-3-5-haiku-latest": ModelPrice(0.80, 0.08, 4.00),
+    "claude-haiku-4": ModelPrice(0.80, 0.08, 4.00),
+}
+
+
+def get_price(model: str) -> ModelPrice | None:
+    """查询模型价格（大小写不敏感）"""
+    return PRICING.get(model) or PRICING.get(model.lower())
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int = 0,
+) -> float | None:
+    """
+    估算单次调用成本（美元）
+
+    Args:
+        model: 模型 ID
+        prompt_tokens: 提示词 Token（含缓存命中部分）
+        completion_tokens: 补全 Token
+        cached_tokens: 缓存命中 Token
+
+    Returns:
+        成本（美元）；未知模型返回 None
+
+    Example:
+        >>> round(estimate_cost("gpt-4o-mini", 1_000_000, 0), 2)
+        0.15
+    """
+    price = get_price(model)
+    if price is None:
+        return None
+    cached = min(cached_tokens, prompt_tokens)
+    return (
+        (prompt_tokens - cached) * price.input
+        + cached * price.cached_input
+        + completion_tokens * price.output
+    ) / 1_000_000
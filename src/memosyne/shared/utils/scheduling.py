@@ -0,0 +1,47 @@
+"""
+调度 - 最长处理时间优先（LPT）派发
+
+并发执行时按文件顺序派发，末尾少数超长条目（如病例题）会在其它工作线程空闲后
+才开始，独自拉长总耗时。LPT 先派发预测耗时最长的条目，短条目填补空隙：
+贪心列表调度的总耗时不超过最优解的 4/3 − 1/(3m)（m 为工作线程数）。
+
+- lpt_order：按预测成本降序给出派发顺序（成本相同保持原顺序）
+- simulate_makespan：给定耗时、工作线程数与派发顺序，模拟贪心调度的总耗时（基准用）
+
+只改变派发顺序：条目的序号（L-code / Memo ID、输出位置）由调用方按原位置绑定。
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Sequence
+
+
+def lpt_order(costs: Sequence[float]) -> list[int]:
+    """
+    LPT 派发顺序（原位置下标，预测成本降序，稳定）
+
+    Example:
+        >>> lpt_order([120, 900, 120, 4000])
+        [3, 1, 0, 2]
+    """
+    return sorted(range(len(costs)), key=lambda position: -costs[position])
+
+
+def simulate_makespan(
+    durations: Sequence[float],
+    workers: int,
+    order: Sequence[int] | None = None,
+) -> float:
+    """
+    模拟贪心列表调度：每个条目按 order 交给最早空闲的工作线程，返回全部完成的时间
+
+    Example:
+        >>> simulate_makespan([1, 1, 1, 3], workers=2)
+        4.0
+        >>> simulate_makespan([1, 1, 1, 3], workers=2, order=lpt_order([1, 1, 1, 3]))
+        3.0
+    """
+    free_at = [0.0] * max(1, workers)
+    for position in order if order is not None else range(len(durations)):
+        heapq.heappush(free_at, heapq.heappop(free_at) + durations[position])
+    return max(free_at)
@@ -0,0 +1,216 @@
+"""
+Tracing - 轻量级分阶段计时（Chrome Trace Event 格式）
+
+用途：
+- 为管线各阶段（read / split / prompt.build / llm.request / llm.network /
+  parse / validate / rules / format / write）记录 span
+- span 可携带属性（model、item 索引、tokens、retries 等）
+- 导出为 JSON trace 文件，可直接用 chrome://tracing 或 Perfetto 打开
+
+禁用时 ``span()`` 返回共享的空对象，不读时钟、不分配，开销可忽略。
+
+Example:
+    >>> tracer = configure_tracing(enabled=True)
+    >>> with tracer.span("read", path="quiz.md"):
+    ...     text = Path("quiz.md").read_text()
+    >>> tracer.export("trace.json")
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+class _NoopSpan:
+    """禁用状态下的空 span（单例）"""
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> "_NoopSpan":
+        return self
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """一次计时区间（上下文管理器）"""
+
+    __slots__ = ("_tracer", "name", "cat", "attrs", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, attrs: dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.attrs = attrs
+        self._start = 0.0
+
+    def set(self, **attrs: Any) -> "Span":
+        """追加 / 覆盖属性（如请求完成后补充 tokens）"""
+        self.attrs.update(attrs)
+        return self
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.attrs.setdefault("error", f"{exc_type.__name__}: {exc}")
+        self._tracer.add_span(self.name, self._start, time.perf_counter(), cat=self.cat, **self.attrs)
+
+
+class Tracer:
+    """
+    Span 收集器（线程安全）
+
+    时间戳使用 perf_counter，导出时换算为相对 tracer 创建时刻的微秒。
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+        self._events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, cat: str = "pipeline", **attrs: Any) -> Span | _NoopSpan:
+        """创建 span；禁用时返回空对象"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, cat, attrs)
+
+    def add_span(self, name: str, start: float, end: float, cat: str = "pipeline", **attrs: Any) -> None:
+        """
+        记录一个已完成的区间（start/end 为 time.perf_counter() 读数）
+
+        用于事后补记的阶段，例如根据 HTTP 响应耗时拆出的网络时间。
+        """
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1_000_000, 3),
+            "dur": round(max(end - start, 0.0) * 1_000_000, 3),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": {key: _jsonable(value) for key, value in attrs.items()},
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(thread.ident or 0, thread.name)
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+        self._origin = time.perf_counter()
+
+    def export(self, path: str | Path) -> Path:
+        """导出 Chrome Trace Event JSON 文件"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        with self._lock:
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            payload = {"traceEvents": metadata + list(self._events), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """按 span 名称汇总次数与总耗时（毫秒）"""
+        totals: dict[str, dict[str, float]] = {}
+        for event in self.events:
+            entry = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += event["dur"] / 1000
+        return totals
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def trace_sdk_response(
+    tracer: Tracer,
+    span: Span | _NoopSpan,
+    raw: Any,
+    started: float,
+    finished: float,
+    **attrs: Any,
+) -> None:
+    """
+    根据 OpenAI / Anthropic SDK 的 raw response 拆分请求耗时
+
+    - llm.queue：连接池等待 + SDK 内部重试与退避
+    - llm.network：最后一次 HTTP 往返（httpx elapsed）
+    """
+    retries = getattr(raw, "retries_taken", 0) or 0
+    try:
+        network = raw.http_response.elapsed.total_seconds()
+    except Exception:  # noqa: BLE001 - elapsed 仅在响应读取完毕后可用
+        network = finished - started
+    network_start = max(started, finished - network)
+    if network_start > started:
+        tracer.add_span("llm.queue", started, network_start, cat="llm", retries=retries, **attrs)
+    tracer.add_span("llm.network", network_start, finished, cat="llm",
+                    status=getattr(raw.http_response, "status_code", None), **attrs)
+    span.set(retries=retries)
+
+
+# === 全局 Tracer（默认禁用）===
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    """获取全局 Tracer"""
+    return _tracer
+
+
+def configure_tracing(enabled: bool = True) -> Tracer:
+    """
+    重置全局 Tracer
+
+    Args:
+        enabled: 是否启用记录
+
+    Returns:
+        新的全局 Tracer
+    """
+    global _tracer
+    _tracer = Tracer(enabled=enabled)
+    return _tracer
+
+
+# === 使用示例 ===
+if __name__ == "__main__":
+    tracer = configure_tracing(enabled=True)
+    with tracer.span("read", path="demo.md"):
+        time.sleep(0.01)
+    with tracer.span("llm.request", model="gpt-4o-mini", index=1) as span:
+        time.sleep(0.02)
+        span.set(total_tokens=123, retries=0)
+    print(tracer.summary())